@@ -0,0 +1,83 @@
+"""
+Measures password verification throughput for different hashing pool sizes, simulating a burst of
+concurrent logins. Run from the repo root:
+
+    python dev/scripts/login_benchmark.py --logins 64 --concurrency 32 --rounds 12
+"""
+
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from rich.console import Console
+from rich.table import Table
+
+from mealie.core.security.hasher import BcryptHasher, HashingPool
+
+console = Console()
+
+
+def run(workers: int, rounds: int, logins: int, concurrency: int) -> tuple[float, list[float], HashingPool]:
+    pool = HashingPool(workers)
+    hasher = BcryptHasher(rounds=rounds, pool=pool)
+    hashed = BcryptHasher(rounds=rounds).hash("MyPassword")
+
+    def login(_: int) -> float:
+        start = time.perf_counter()
+        assert hasher.verify("MyPassword", hashed)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as clients:
+        latencies = list(clients.map(login, range(logins)))
+    elapsed = time.perf_counter() - start
+
+    pool.shutdown()
+    return elapsed, latencies, pool
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=64, help="number of logins per run")
+    parser.add_argument("--concurrency", type=int, default=32, help="number of concurrent clients")
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt work factor")
+    parser.add_argument("--workers", type=int, nargs="+", help="hashing pool sizes to compare")
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    workers = args.workers or sorted({1, 2, 4, cpus})
+
+    table = Table(
+        title=f"{args.logins} logins, {args.concurrency} concurrent clients, {args.rounds} rounds ({cpus} CPUs)"
+    )
+    table.add_column("Workers", justify="right")
+    table.add_column("Logins/s", justify="right")
+    table.add_column("Logins/s per Worker", justify="right")
+    table.add_column("p50 Latency (ms)", justify="right")
+    table.add_column("p95 Latency (ms)", justify="right")
+    table.add_column("Avg Queue Wait (ms)", justify="right")
+    table.add_column("Max Queue Wait (ms)", justify="right")
+
+    for n in workers:
+        elapsed, latencies, pool = run(n, args.rounds, args.logins, args.concurrency)
+        stats = pool.stats()
+        throughput = args.logins / elapsed
+        latencies_ms = sorted(latency * 1000 for latency in latencies)
+
+        table.add_row(
+            str(n),
+            f"{throughput:.1f}",
+            f"{throughput / n:.1f}",
+            f"{statistics.median(latencies_ms):.0f}",
+            f"{latencies_ms[int(len(latencies_ms) * 0.95) - 1]:.0f}",
+            f"{stats.avg_wait_ms:.0f}",
+            f"{stats.max_wait_ms:.0f}",
+        )
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Compares the two ways `QueryFilterBuilder` can filter on attributes of related models, using representative
+cookbook filters: outer joins for every relationship (the previous implementation), or correlated EXISTS
+subqueries for one-to-many and many-to-many relationships. Each run counts the matching recipes the way
+pagination does, then loads a page of them.
+
+Recipes are seeded into a throwaway SQLite database, or into the Postgres database configured with the usual
+POSTGRES_* environment variables; use an empty database, since benchmark recipes are added to it. Run from the
+repo root:
+
+    python dev/scripts/query_filter_benchmark.py --recipes 1000 10000 --db-engine sqlite
+    POSTGRES_SERVER=localhost python dev/scripts/query_filter_benchmark.py --db-engine postgres
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import UTC, datetime
+from uuid import uuid4
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument("--recipes", type=int, nargs="+", default=[1000, 10000], help="recipe counts")
+parser.add_argument("--db-engine", choices=["sqlite", "postgres"], default="sqlite")
+parser.add_argument("--per-page", type=int, default=50, help="recipes loaded per page")
+parser.add_argument("--repeat", type=int, default=5, help="runs per measurement; the best is reported")
+args = parser.parse_args()
+
+# must be set before mealie is imported, so the settings pick up a throwaway data directory
+os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="mealie-benchmark-")
+os.environ["DB_ENGINE"] = args.db_engine
+os.environ["PRODUCTION"] = "True"
+
+import sqlalchemy as sa  # noqa: E402
+from rich.console import Console  # noqa: E402
+from rich.table import Table  # noqa: E402
+from sqlalchemy.orm import InstrumentedAttribute  # noqa: E402
+
+from mealie.db.db_setup import session_context  # noqa: E402
+from mealie.db.init_db import main as init_db  # noqa: E402
+from mealie.db.models.recipe.category import Category, recipes_to_categories  # noqa: E402
+from mealie.db.models.recipe.ingredient import IngredientFoodModel, RecipeIngredientModel  # noqa: E402
+from mealie.db.models.recipe.recipe import RecipeModel  # noqa: E402
+from mealie.db.models.recipe.tag import Tag, recipes_to_tags  # noqa: E402
+from mealie.db.models.recipe.tool import Tool, recipes_to_tools  # noqa: E402
+from mealie.repos.all_repositories import get_repositories  # noqa: E402
+from mealie.services.query_filter.builder import QueryFilterBuilder  # noqa: E402
+
+console = Console()
+
+ORGANIZERS = (
+    (Category, recipes_to_categories, "category_id", 2),
+    (Tag, recipes_to_tags, "tag_id", 3),
+    (Tool, recipes_to_tools, "tool_id", 1),
+)
+INGREDIENTS_PER_RECIPE = 8
+
+FILTERS = {
+    "tag": 'tags.name IN ["Tag 1", "Tag 2"]',
+    "tag and category": 'tags.name IN ["Tag 1", "Tag 2"] AND recipeCategory.name IN ["Category 3"]',
+    "tags contain all": 'tags.name CONTAINS ALL ["Tag 1", "Tag 2"]',
+    "tag or tool": 'tags.name IN ["Tag 4"] OR tools.name IN ["Tool 5"]',
+    "food": 'recipeIngredient.food.name IN ["Food 1", "Food 2", "Food 3"]',
+    "food and tag": 'recipeIngredient.food.name IN ["Food 1"] AND tags.name IN ["Tag 6"]',
+    "household (many-to-one)": "household_id IS NOT NULL",
+}
+
+
+class JoinQueryFilterBuilder(QueryFilterBuilder):
+    """Joins every relationship path, as `QueryFilterBuilder` did before it compiled paths to EXISTS"""
+
+    @staticmethod
+    def _compiles_to_exists(path: list[InstrumentedAttribute]) -> bool:
+        return False
+
+
+def seed(session: sa.orm.Session, group_id, user_id, total: int) -> None:
+    """Tops up the database to `total` recipes, each with some organizers and ingredients with foods"""
+
+    existing = session.scalar(sa.select(sa.func.count(RecipeModel.id))) or 0
+    if existing >= total:
+        return
+
+    organizer_ids: dict[type, list] = {}
+    for model, *_ in ORGANIZERS:
+        ids = session.scalars(sa.select(model.id)).all()
+        if not ids:
+            rows = [{"id": uuid4(), "group_id": group_id, "name": f"{model.__name__} {i}"} for i in range(25)]
+            for row in rows:
+                row["slug"] = row["name"].lower().replace(" ", "-")
+            session.execute(sa.insert(model), rows)
+            ids = [row["id"] for row in rows]
+        organizer_ids[model] = list(ids)
+
+    food_ids = session.scalars(sa.select(IngredientFoodModel.id)).all()
+    if not food_ids:
+        foods = [
+            {"id": uuid4(), "group_id": group_id, "name": f"Food {i}", "name_normalized": f"food {i}"}
+            for i in range(500)
+        ]
+        session.execute(sa.insert(IngredientFoodModel), foods)
+        food_ids = [food["id"] for food in foods]
+
+    now = datetime.now(UTC)
+    recipes = []
+    for i in range(existing, total):
+        name = f"Benchmark Recipe {i}"
+        recipes.append(
+            {
+                "id": uuid4(),
+                "group_id": group_id,
+                "user_id": user_id,
+                "name": name,
+                "name_normalized": name.lower(),
+                "slug": f"benchmark-recipe-{i}",
+                "date_added": now.date(),
+                "date_updated": now,
+            }
+        )
+
+    session.execute(sa.insert(RecipeModel), recipes)
+    for model, table, column, per_recipe in ORGANIZERS:
+        links = [
+            {"recipe_id": recipe["id"], column: organizer_id}
+            for recipe in recipes
+            for organizer_id in random.sample(organizer_ids[model], per_recipe)
+        ]
+        session.execute(sa.insert(table), links)
+
+    ingredients = [
+        {"recipe_id": recipe["id"], "position": position, "food_id": food_id, "quantity": 1}
+        for recipe in recipes
+        for position, food_id in enumerate(random.sample(food_ids, INGREDIENTS_PER_RECIPE))
+    ]
+    session.execute(sa.insert(RecipeIngredientModel), ingredients)
+    session.commit()
+
+
+def run_filter(
+    session: sa.orm.Session, builder_type: type[QueryFilterBuilder], query_filter: str, group_id, per_page: int
+) -> tuple[int, int]:
+    """Counts the matching recipes and loads the first page of them, like `RepositoryGeneric.page_all`"""
+
+    query = sa.select(RecipeModel).filter(RecipeModel.group_id == group_id)
+    query = builder_type(query_filter).filter_query(query, RecipeModel)
+
+    count_query = sa.select(sa.func.count()).select_from(query.order_by(None).distinct().subquery())
+    count = session.scalar(count_query) or 0
+
+    page = session.execute(query.order_by(RecipeModel.name).limit(per_page)).unique().scalars().all()
+    return count, len(page)
+
+
+def timed(
+    session: sa.orm.Session, builder_type: type[QueryFilterBuilder], query_filter: str, group_id, per_page: int
+) -> tuple[float, tuple[int, int]]:
+    """Returns the best time, in ms, out of `args.repeat` runs, along with the count and page size"""
+
+    times: list[float] = []
+    result = (0, 0)
+    for _ in range(args.repeat):
+        session.expunge_all()
+
+        start = time.perf_counter()
+        result = run_filter(session, builder_type, query_filter, group_id, per_page)
+        times.append(time.perf_counter() - start)
+
+    return min(times) * 1000, result
+
+
+def main():
+    init_db()
+
+    table = Table(title=f"Cookbook filters ({args.db_engine})")
+    table.add_column("Recipes", justify="right")
+    table.add_column("Filter")
+    table.add_column("Matches", justify="right")
+    table.add_column("Join (ms)", justify="right")
+    table.add_column("Page (join)", justify="right")
+    table.add_column("EXISTS (ms)", justify="right")
+    table.add_column("Speedup", justify="right")
+
+    with session_context() as session:
+        user = get_repositories(session, group_id=None, household_id=None).users.get_all()[0]
+        for total in sorted(args.recipes):
+            console.print(f"Seeding {total} recipes...")
+            seed(session, user.group_id, user.id, total)
+
+            for name, query_filter in FILTERS.items():
+                join_ms, (join_count, join_page) = timed(
+                    session, JoinQueryFilterBuilder, query_filter, user.group_id, args.per_page
+                )
+                exists_ms, (count, _) = timed(session, QueryFilterBuilder, query_filter, user.group_id, args.per_page)
+                if count != join_count:
+                    console.print(f"[red]{name}: EXISTS matched {count} recipes, joins matched {join_count}")
+
+                table.add_row(
+                    str(total),
+                    name,
+                    str(count),
+                    f"{join_ms:.1f}",
+                    # joined rows are deduplicated after the limit, so a page can come back short
+                    str(join_page),
+                    f"{exists_ms:.1f}",
+                    f"{join_ms / exists_ms:.1f}x",
+                )
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
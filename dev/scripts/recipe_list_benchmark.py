@@ -0,0 +1,171 @@
+"""
+Compares loading a page of recipe summaries through full ORM objects (the previous implementation) with the
+column projection used by `RepositoryRecipes.page_all`. Recipes are seeded into a throwaway SQLite database.
+Run from the repo root:
+
+    python dev/scripts/recipe_list_benchmark.py --recipes 1000 10000 50000 --per-page 50 -1
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import UTC, datetime
+from uuid import uuid4
+
+# must be set before mealie is imported, so the settings pick up a throwaway data directory
+os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="mealie-benchmark-")
+os.environ["DB_ENGINE"] = "sqlite"
+os.environ["PRODUCTION"] = "True"
+
+import orjson  # noqa: E402
+import sqlalchemy as sa  # noqa: E402
+from rich.console import Console  # noqa: E402
+from rich.table import Table  # noqa: E402
+
+from mealie.db.db_setup import session_context  # noqa: E402
+from mealie.db.init_db import main as init_db  # noqa: E402
+from mealie.db.models.recipe.category import Category, recipes_to_categories  # noqa: E402
+from mealie.db.models.recipe.recipe import RecipeModel  # noqa: E402
+from mealie.db.models.recipe.tag import Tag, recipes_to_tags  # noqa: E402
+from mealie.db.models.recipe.tool import Tool, recipes_to_tools  # noqa: E402
+from mealie.repos.all_repositories import get_repositories  # noqa: E402
+from mealie.schema.recipe.recipe import RecipeSummary  # noqa: E402
+from mealie.schema.response.pagination import PaginationQuery  # noqa: E402
+
+console = Console()
+
+ORGANIZERS = ((Category, recipes_to_categories, "category_id"), (Tag, recipes_to_tags, "tag_id"))
+
+
+def seed(session: sa.orm.Session, group_id, user_id, total: int) -> None:
+    """Tops up the database to `total` recipes, each with a couple of categories, tags and a tool"""
+
+    existing = session.scalar(sa.select(sa.func.count(RecipeModel.id))) or 0
+    if existing >= total:
+        return
+
+    organizer_ids: dict[type, list] = {}
+    for model in (Category, Tag, Tool):
+        ids = session.scalars(sa.select(model.id)).all()
+        if not ids:
+            rows = [{"id": uuid4(), "group_id": group_id, "name": f"{model.__name__} {i}"} for i in range(25)]
+            for row in rows:
+                row["slug"] = row["name"].lower().replace(" ", "-")
+            session.execute(sa.insert(model), rows)
+            ids = [row["id"] for row in rows]
+        organizer_ids[model] = list(ids)
+
+    now = datetime.now(UTC)
+    recipes = []
+    for i in range(existing, total):
+        name = f"Benchmark Recipe {i}"
+        recipes.append(
+            {
+                "id": uuid4(),
+                "group_id": group_id,
+                "user_id": user_id,
+                "name": name,
+                "name_normalized": name.lower(),
+                "slug": f"benchmark-recipe-{i}",
+                "description": "A recipe seeded for benchmarking the recipe list endpoint. " * 3,
+                "recipe_yield": "4 servings",
+                "recipe_servings": 4,
+                "total_time": "1 Hour",
+                "org_url": f"https://example.com/recipes/{i}",
+                "date_added": now.date(),
+                "date_updated": now,
+                "rating": random.randint(1, 5),
+            }
+        )
+
+    session.execute(sa.insert(RecipeModel), recipes)
+    for model, table, column in (*ORGANIZERS, (Tool, recipes_to_tools, "tool_id")):
+        links = [
+            {"recipe_id": recipe["id"], column: organizer_id}
+            for recipe in recipes
+            for organizer_id in random.sample(organizer_ids[model], 2 if model is not Tool else 1)
+        ]
+        session.execute(sa.insert(table), links)
+
+    session.commit()
+
+
+def load_orm(session: sa.orm.Session, group_id, per_page: int) -> list[RecipeSummary]:
+    """The previous implementation: load full ORM objects with their organizers, then validate each one"""
+
+    q = sa.select(RecipeModel).filter(RecipeModel.group_id == group_id).order_by(RecipeModel.name)
+    if per_page > 0:
+        q = q.limit(per_page)
+
+    q = q.options(*RecipeSummary.loader_options())
+    data = session.execute(q).scalars().unique().all()
+    return [RecipeSummary.model_validate(item) for item in data]
+
+
+def load_projection(session: sa.orm.Session, group_id, per_page: int) -> list[RecipeSummary]:
+    repos = get_repositories(session, group_id=group_id, household_id=None)
+    query = PaginationQuery(page=1, per_page=per_page, order_by="name")
+    return repos.recipes.page_all(query).items
+
+
+def timed(fn, session: sa.orm.Session, group_id, per_page: int, repeat: int) -> tuple[float, float]:
+    """Returns the best load and serialization times, in ms, out of `repeat` runs"""
+
+    load_times: list[float] = []
+    dump_times: list[float] = []
+    for _ in range(repeat):
+        session.expunge_all()
+
+        start = time.perf_counter()
+        items = fn(session, group_id, per_page)
+        load_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        orjson.dumps([item.model_dump(by_alias=True) for item in items])
+        dump_times.append(time.perf_counter() - start)
+
+    return min(load_times) * 1000, min(dump_times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recipes", type=int, nargs="+", default=[1000, 10000, 50000], help="recipe counts")
+    parser.add_argument("--per-page", type=int, nargs="+", default=[50, -1], help="page sizes; -1 loads everything")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement; the best is reported")
+    args = parser.parse_args()
+
+    init_db()
+
+    table = Table(title="Recipe summary loading (SQLite)")
+    table.add_column("Recipes", justify="right")
+    table.add_column("Page Size", justify="right")
+    table.add_column("ORM Load (ms)", justify="right")
+    table.add_column("Projection Load (ms)", justify="right")
+    table.add_column("Serialize (ms)", justify="right")
+    table.add_column("Speedup", justify="right")
+
+    with session_context() as session:
+        user = get_repositories(session, group_id=None, household_id=None).users.get_all()[0]
+        for total in sorted(args.recipes):
+            console.print(f"Seeding {total} recipes...")
+            seed(session, user.group_id, user.id, total)
+
+            for per_page in args.per_page:
+                orm_ms, _ = timed(load_orm, session, user.group_id, per_page, args.repeat)
+                projection_ms, dump_ms = timed(load_projection, session, user.group_id, per_page, args.repeat)
+                table.add_row(
+                    str(total),
+                    "all" if per_page < 0 else str(per_page),
+                    f"{orm_ms:.1f}",
+                    f"{projection_ms:.1f}",
+                    f"{dump_ms:.1f}",
+                    f"{orm_ms / projection_ms:.1f}x",
+                )
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -145,6 +145,14 @@ export interface ImportJob {
   force?: boolean;
   rebase?: boolean;
 }
+export interface IndexRecommendationReport {
+  table: string;
+  columns: string[];
+  reason: string;
+  statements: number;
+  totalMs: number;
+  ddl: string;
+}
 export interface MaintenanceLogs {
   logs: string[];
 }
@@ -174,6 +182,35 @@ export interface Migrations {
   type: string;
   files?: MigrationFile[];
 }
+export interface QueryShapeReport {
+  shape: string;
+  requests: number;
+  statements: number;
+  totalMs: number;
+  meanMs: number;
+  maxMs: number;
+  slowStatements: number;
+}
+export interface QueryStatementReport {
+  template: string;
+  calls: number;
+  totalMs: number;
+  meanMs: number;
+  maxMs: number;
+  slowCalls: number;
+  meanRows?: number | null;
+  plan?: string[] | null;
+  queryShapes?: string[];
+}
+export interface QueryStatsReport {
+  enabled: boolean;
+  slowQueryMs: number;
+  since: string;
+  dropped: number;
+  shapes?: QueryShapeReport[];
+  statements?: QueryStatementReport[];
+  indexRecommendations?: IndexRecommendationReport[];
+}
 export interface RecipeImport {
   name: string;
   status: boolean;
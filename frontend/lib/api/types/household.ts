@@ -22,6 +22,7 @@ export interface CreateHouseholdPreferences {
   recipeShowAssets?: boolean;
   recipeLandscapeView?: boolean;
   recipeDisableComments?: boolean;
+  shoppingListMaxCheckedItems?: number;
 }
 export interface CreateInviteToken {
   uses: number;
@@ -200,6 +201,7 @@ export interface ReadHouseholdPreferences {
   recipeShowAssets?: boolean;
   recipeLandscapeView?: boolean;
   recipeDisableComments?: boolean;
+  shoppingListMaxCheckedItems?: number;
   id: string;
 }
 export interface HouseholdUserSummary {
@@ -277,6 +279,7 @@ export interface SaveHouseholdPreferences {
   recipeShowAssets?: boolean;
   recipeLandscapeView?: boolean;
   recipeDisableComments?: boolean;
+  shoppingListMaxCheckedItems?: number;
   householdId: string;
 }
 export interface SaveInviteToken {
@@ -766,6 +769,7 @@ export interface UpdateHouseholdPreferences {
   recipeShowAssets?: boolean;
   recipeLandscapeView?: boolean;
   recipeDisableComments?: boolean;
+  shoppingListMaxCheckedItems?: number;
 }
 export interface RecipeIngredientBase {
   quantity?: number | null;
@@ -19,6 +19,12 @@ export interface CreatePlanEntry {
   text?: string;
   recipeId?: string | null;
 }
+export interface CreateRandomEntries {
+  startDate: string;
+  endDate: string;
+  entryTypes?: PlanEntryType[];
+  recentlyMadeDays?: number;
+}
 export interface CreateRandomEntry {
   date: string;
   entryType?: PlanEntryType;
@@ -122,6 +122,16 @@ export interface ExportRecipes {
   recipes: string[];
   exportType?: ExportTypes;
 }
+export interface DuplicateIngredient {
+  id: string;
+  name: string;
+  usageCount?: number;
+}
+export interface DuplicateIngredientCluster {
+  score: number;
+  targetId: string;
+  items: DuplicateIngredient[];
+}
 export interface IngredientConfidence {
   average?: number | null;
   comment?: number | null;
@@ -157,6 +167,15 @@ export interface MultiPurposeLabelSummary {
 export interface IngredientReferences {
   referenceId?: string | null;
 }
+export interface IngredientParserChunkStats {
+  ingredients: number;
+  attempt?: number;
+  succeeded?: boolean;
+  cached?: boolean;
+  promptTokens?: number;
+  completionTokens?: number;
+  latencyMs?: number;
+}
 export interface IngredientRequest {
   parser?: RegisteredParser;
   ingredient: string;
@@ -180,6 +199,10 @@ export interface IngredientUnit {
 export interface IngredientUnitAlias {
   name: string;
 }
+export interface IngredientsBatchRequest {
+  parser?: RegisteredParser;
+  recipes: string[][];
+}
 export interface IngredientsRequest {
   parser?: RegisteredParser;
   ingredients: string[];
@@ -188,10 +211,24 @@ export interface MergeFood {
   fromFood: string;
   toFood: string;
 }
+export interface MergeFoodClusters {
+  clusters: MergeFoods[];
+}
+export interface MergeFoods {
+  fromFoods: string[];
+  toFood: string;
+}
 export interface MergeUnit {
   fromUnit: string;
   toUnit: string;
 }
+export interface MergeUnitClusters {
+  clusters: MergeUnits[];
+}
+export interface MergeUnits {
+  fromUnits: string[];
+  toUnit: string;
+}
 export interface Nutrition {
   calories?: string | null;
   carbohydrateContent?: string | null;
@@ -210,6 +247,12 @@ export interface ParsedIngredient {
   confidence?: IngredientConfidence;
   ingredient: RecipeIngredient;
 }
+export interface ParsedIngredientsBatchItem {
+  index: number;
+  ingredients?: ParsedIngredient[];
+  error?: string | null;
+  chunks?: IngredientParserChunkStats[];
+}
 export interface RecipeIngredient {
   quantity?: number | null;
   unit?: IngredientUnit | CreateIngredientUnit | null;
@@ -124,6 +124,8 @@ export default defineNuxtConfig({
 
   nitro: {
     baseURL: process.env.SUB_PATH || "",
+    // write .br/.gz siblings of static assets, so the backend can serve them without compressing on every request
+    compressPublicAssets: { gzip: true, brotli: true },
   },
 
   // eslint rules
@@ -0,0 +1,27 @@
+"""'Add recipe storage bytes'
+
+Revision ID: 5b8e2d7c4f19
+Revises: a3c9e1f0b7d2
+Create Date: 2026-10-19 16:04:21.583102
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5b8e2d7c4f19"
+down_revision: str | None = "a3c9e1f0b7d2"
+branch_labels: str | tuple[str, ...] | None = None
+depends_on: str | tuple[str, ...] | None = None
+
+
+def upgrade():
+    # existing recipes are counted by the storage reconciliation task, which runs on startup
+    with op.batch_alter_table("recipes", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("storage_bytes", sa.BigInteger(), nullable=False, server_default="0"))
+
+
+def downgrade():
+    with op.batch_alter_table("recipes", schema=None) as batch_op:
+        batch_op.drop_column("storage_bytes")
@@ -0,0 +1,59 @@
+"""'Add shopping list revisions'
+
+Revision ID: c41f7a2e9d53
+Revises: 5b8e2d7c4f19
+Create Date: 2026-10-19 17:26:08.419263
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+import mealie.db.migration_types
+
+# revision identifiers, used by Alembic.
+revision = "c41f7a2e9d53"
+down_revision: str | None = "5b8e2d7c4f19"
+branch_labels: str | tuple[str, ...] | None = None
+depends_on: str | tuple[str, ...] | None = None
+
+
+def upgrade():
+    with op.batch_alter_table("shopping_lists", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("revision", sa.Integer(), nullable=False, server_default="0"))
+
+    op.create_table(
+        "shopping_list_item_changes",
+        sa.Column("id", mealie.db.migration_types.GUID(), nullable=False),
+        sa.Column("shopping_list_id", mealie.db.migration_types.GUID(), nullable=False),
+        sa.Column("item_id", mealie.db.migration_types.GUID(), nullable=False),
+        sa.Column("revision", sa.Integer(), nullable=False),
+        sa.Column("created_revision", sa.Integer(), nullable=True),
+        sa.Column("deleted", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("update_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["shopping_list_id"],
+            ["shopping_lists.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("shopping_list_id", "item_id", name="shopping_list_id_item_id_key"),
+    )
+    op.create_index(
+        op.f("ix_shopping_list_item_changes_created_at"), "shopping_list_item_changes", ["created_at"], unique=False
+    )
+    op.create_index(
+        "ix_shopping_list_item_changes_shopping_list_id_revision",
+        "shopping_list_item_changes",
+        ["shopping_list_id", "revision"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_shopping_list_item_changes_shopping_list_id_revision", table_name="shopping_list_item_changes")
+    op.drop_index(op.f("ix_shopping_list_item_changes_created_at"), table_name="shopping_list_item_changes")
+    op.drop_table("shopping_list_item_changes")
+
+    with op.batch_alter_table("shopping_lists", schema=None) as batch_op:
+        batch_op.drop_column("revision")
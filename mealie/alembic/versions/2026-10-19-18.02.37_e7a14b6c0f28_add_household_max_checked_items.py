@@ -0,0 +1,28 @@
+"""'Add household shopping list max checked items'
+
+Revision ID: e7a14b6c0f28
+Revises: c41f7a2e9d53
+Create Date: 2026-10-19 18:02:37.851406
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e7a14b6c0f28"
+down_revision: str | None = "c41f7a2e9d53"
+branch_labels: str | tuple[str, ...] | None = None
+depends_on: str | tuple[str, ...] | None = None
+
+
+def upgrade():
+    with op.batch_alter_table("household_preferences", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("shopping_list_max_checked_items", sa.Integer(), nullable=True, server_default="100")
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("household_preferences", schema=None) as batch_op:
+        batch_op.drop_column("shopping_list_max_checked_items")
@@ -0,0 +1,26 @@
+"""'Add bulk import job heartbeat'
+
+Revision ID: 9d2f61b8a4c7
+Revises: e7a14b6c0f28
+Create Date: 2026-10-20 09:14:52.203918
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9d2f61b8a4c7"
+down_revision: str | None = "e7a14b6c0f28"
+branch_labels: str | tuple[str, ...] | None = None
+depends_on: str | tuple[str, ...] | None = None
+
+
+def upgrade():
+    with op.batch_alter_table("recipe_bulk_import_jobs", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("heartbeat_at", sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("recipe_bulk_import_jobs", schema=None) as batch_op:
+        batch_op.drop_column("heartbeat_at")
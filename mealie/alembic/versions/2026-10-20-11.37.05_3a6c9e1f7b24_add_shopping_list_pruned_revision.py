@@ -0,0 +1,26 @@
+"""'Add shopping list pruned revision'
+
+Revision ID: 3a6c9e1f7b24
+Revises: 9d2f61b8a4c7
+Create Date: 2026-10-20 11:37:05.614382
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3a6c9e1f7b24"
+down_revision: str | None = "9d2f61b8a4c7"
+branch_labels: str | tuple[str, ...] | None = None
+depends_on: str | tuple[str, ...] | None = None
+
+
+def upgrade():
+    with op.batch_alter_table("shopping_lists", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("pruned_revision", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade():
+    with op.batch_alter_table("shopping_lists", schema=None) as batch_op:
+        batch_op.drop_column("pruned_revision")
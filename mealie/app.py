@@ -7,6 +7,7 @@ warnings.filterwarnings(
 )
 
 # ruff: noqa: E402
+import asyncio
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
@@ -18,13 +19,18 @@ from fastapi.routing import APIRoute
 from starlette.middleware.sessions import SessionMiddleware
 
 from mealie.core.config import get_app_settings
+from mealie.core.loop_clients import close_loop_clients
+from mealie.core.loop_monitor import LoopLagMonitor
 from mealie.core.root_logger import get_logger
 from mealie.core.settings.static import APP_VERSION
+from mealie.db.db_setup import engine
 from mealie.middleware.locale_context import LocaleContextMiddleware
 from mealie.routes import router, spa, utility_routes
 from mealie.routes.handlers import register_debug_handler
 from mealie.routes.media import media_router
+from mealie.services.event_bus_service.event_stream import start_event_stream_relay
 from mealie.services.scheduler import SchedulerRegistry, SchedulerService, tasks
+from mealie.services.scraper.recipe_bulk_scraper import resume_bulk_import_jobs
 
 settings = get_app_settings()
 
@@ -67,6 +73,7 @@ async def lifespan_fn(_: FastAPI) -> AsyncGenerator[None, None]:
     logger.info("end: database initialization")
 
     await start_scheduler()
+    start_background_jobs()
 
     logger.info("-----SYSTEM STARTUP-----")
     logger.info("------APP SETTINGS------")
@@ -94,6 +101,7 @@ async def lifespan_fn(_: FastAPI) -> AsyncGenerator[None, None]:
 
     yield
 
+    await close_loop_clients()
     logger.info("-----SYSTEM SHUTDOWN----- \n")
 
 
@@ -106,6 +114,7 @@ app = FastAPI(
     lifespan=lifespan_fn,
 )
 
+# responses that are already encoded, such as precompressed frontend assets, are passed through untouched
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 app.add_middleware(SessionMiddleware, secret_key=settings.SESSION_SECRET)
 app.add_middleware(LocaleContextMiddleware)
@@ -132,6 +141,8 @@ async def start_scheduler():
         tasks.purge_group_data_exports,
         tasks.create_mealplan_timeline_events,
         tasks.delete_old_checked_list_items,
+        tasks.purge_shopping_list_item_changes,
+        tasks.reconcile_recipe_storage,
     )
 
     SchedulerRegistry.register_minutely(
@@ -147,6 +158,24 @@ async def start_scheduler():
     await SchedulerService.start()
 
 
+_background_jobs: set[asyncio.Task] = set()
+
+
+def start_background_jobs():
+    # storage is also reconciled on startup, so recipes from before storage was recorded are counted right away
+    jobs = [resume_bulk_import_jobs(), asyncio.to_thread(tasks.reconcile_recipe_storage)]
+    if settings.LOOP_LAG_WARNING_MS > 0:
+        jobs.append(LoopLagMonitor(settings.LOOP_LAG_WARNING_MS).run())
+    if relay := start_event_stream_relay(engine):
+        jobs.append(relay.run())
+
+    for job in jobs:
+        # keep a reference to each task, otherwise they may be garbage collected before they finish
+        task = asyncio.create_task(job)
+        _background_jobs.add(task)
+        task.add_done_callback(_background_jobs.discard)
+
+
 def api_routers():
     app.include_router(router)
     app.include_router(media_router)
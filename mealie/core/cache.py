@@ -0,0 +1,145 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+CLEAR_ALL = "*"
+"""pending invalidation that clears the whole cache"""
+
+
+class GenerationTTLCache[K, V]:
+    """
+    Thread-safe, in-process LRU cache whose entries expire after `ttl` seconds. The cache is disabled
+    when either `ttl` or `max_size` is 0.
+
+    Caches of database data should read `generation` before loading a value and pass it to `set`; it's
+    incremented on every invalidation, so a value loaded before a concurrent change is never cached after
+    that change was invalidated.
+    """
+
+    def __init__(self, ttl: float, max_size: int) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+
+        self._lock = threading.RLock()
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._generation = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_size > 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: K) -> V | None:
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            try:
+                expires, value = self._entries[key]
+            except KeyError:
+                return None
+
+            if expires <= time.monotonic():
+                self._remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: K, value: V, generation: int | None = None) -> None:
+        """Caches `value`, unless the cache has been invalidated since `generation` was read"""
+
+        if not self.enabled:
+            return
+
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._added(key, value)
+
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, *keys: K) -> None:
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._remove(key)
+
+    def invalidate_where(self, predicate: Callable[[K, V], bool]) -> None:
+        with self._lock:
+            self._generation += 1
+            for key in [key for key, (_, value) in self._entries.items() if predicate(key, value)]:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _added(self, key: K, value: V) -> None:
+        """Called, with the lock held, after an entry is cached"""
+
+    def _removed(self, key: K, value: V) -> None:
+        """Called, with the lock held, after an entry is evicted, expires, or is invalidated; `clear` skips it"""
+
+    def _remove(self, key: K) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._removed(key, entry[1])
+
+
+def _pending_key(name: str) -> str:
+    return f"{name}_pending"
+
+
+def invalidate_on_commit(session: Session, name: str, *pending: object) -> None:
+    """
+    Adds to the named cache's pending invalidations, which are applied once the session's transaction commits.
+    Changes made with bulk `UPDATE`/`DELETE` statements don't pass through the flush, so whoever runs them has
+    to say what they affect.
+    """
+
+    session.info.setdefault(_pending_key(name), set()).update(pending)
+
+
+def register_invalidation_hooks[T](
+    name: str,
+    collect: Callable[[Session, set[T | str]], None],
+    invalidate: Callable[[T], None],
+    clear: Callable[[], None],
+) -> None:
+    """
+    Keeps a cache in sync with the database. After every flush, `collect` adds whatever the flushed changes
+    affect to the session's pending set, or `CLEAR_ALL` to start over. Invalidation is deferred until the
+    transaction commits, otherwise a concurrent request could re-cache the old, still committed, value.
+    """
+
+    pending_key = _pending_key(name)
+
+    @event.listens_for(Session, "after_flush")
+    def _collect_invalidations(session: Session, _) -> None:
+        collect(session, session.info.setdefault(pending_key, set()))
+
+    @event.listens_for(Session, "after_commit")
+    def _apply_invalidations(session: Session) -> None:
+        pending: set[T | str] = session.info.pop(pending_key, set())
+        if CLEAR_ALL in pending:
+            clear()
+            return
+
+        for item in pending:
+            invalidate(item)  # type: ignore[arg-type]
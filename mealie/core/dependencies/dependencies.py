@@ -19,6 +19,8 @@ from mealie.repos.all_repositories import get_repositories
 from mealie.schema.user import PrivateUser, TokenData
 from mealie.schema.user.user import DEFAULT_INTEGRATION_ID, GroupInDB
 
+from .principal_cache import principal_cache
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token")
 oauth2_scheme_soft_fail = OAuth2PasswordBearer(tokenUrl="/api/auth/token", auto_error=False)
 ALGORITHM = "HS256"
@@ -33,7 +35,7 @@ credentials_exception = HTTPException(
 )
 
 
-async def is_logged_in(token: str = Depends(oauth2_scheme_soft_fail), session=Depends(generate_session)) -> bool:
+def is_logged_in(token: str = Depends(oauth2_scheme_soft_fail), session=Depends(generate_session)) -> bool:
     """
     When you need to determine if the user is logged in, but don't need the user, you can use this
     function to return a boolean value to represent if the user is logged in. No Auth exceptions are raised
@@ -64,7 +66,7 @@ async def is_logged_in(token: str = Depends(oauth2_scheme_soft_fail), session=De
         return False
 
 
-async def get_public_group(group_slug: str = fastapi.Path(...), session=Depends(generate_session)) -> GroupInDB:
+def get_public_group(group_slug: str = fastapi.Path(...), session=Depends(generate_session)) -> GroupInDB:
     repos = get_repositories(session)
     group = repos.groups.get_by_slug_or_id(group_slug)
 
@@ -74,18 +76,18 @@ async def get_public_group(group_slug: str = fastapi.Path(...), session=Depends(
         return group
 
 
-async def try_get_current_user(
+def try_get_current_user(
     request: Request,
     token: str = Depends(oauth2_scheme_soft_fail),
     session=Depends(generate_session),
 ) -> PrivateUser | None:
     try:
-        return await get_current_user(request, token, session)
+        return get_current_user(request, token, session)
     except Exception:
         return None
 
 
-async def get_current_user(
+def get_current_user(
     request: Request,
     token: str | None = Depends(oauth2_scheme_soft_fail),
     session=Depends(generate_session),
@@ -111,6 +113,11 @@ async def get_current_user(
     except PyJWTError as e:
         raise credentials_exception from e
 
+    cache_key = principal_cache.user_key(token_data.user_id)
+    if user := principal_cache.get(cache_key):
+        return user
+
+    generation = principal_cache.generation
     repos = get_repositories(session, group_id=None, household_id=None)
 
     user = repos.users.get_one(token_data.user_id, "id", any_case=False)
@@ -120,6 +127,8 @@ async def get_current_user(
     session.commit()
     if user is None:
         raise credentials_exception
+
+    principal_cache.set(cache_key, user, generation)
     return user
 
 
@@ -132,22 +141,30 @@ async def get_integration_id(token: str = Depends(oauth2_scheme)) -> str:
         raise credentials_exception from e
 
 
-async def get_admin_user(current_user: PrivateUser = Depends(get_current_user)) -> PrivateUser:
+def get_admin_user(current_user: PrivateUser = Depends(get_current_user)) -> PrivateUser:
     if not current_user.admin:
         raise HTTPException(status.HTTP_403_FORBIDDEN)
     return current_user
 
 
 def validate_long_live_token(session: Session, client_token: str, user_id: str) -> PrivateUser:
+    cache_key = principal_cache.token_key(client_token)
+    if user := principal_cache.get(cache_key):
+        return user
+
+    generation = principal_cache.generation
     repos = get_repositories(session, group_id=None, household_id=None)
 
     token = repos.api_tokens.multi_query({"token": client_token, "user_id": user_id})
 
     try:
-        return token[0].user
+        user = token[0].user
     except IndexError as e:
         raise HTTPException(status.HTTP_401_UNAUTHORIZED) from e
 
+    principal_cache.set(cache_key, user, generation)
+    return user
+
 
 def validate_file_token(token: str | None = None) -> Path:
     """
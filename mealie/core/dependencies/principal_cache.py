@@ -0,0 +1,89 @@
+import hashlib
+
+from pydantic import UUID4
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+from mealie.core.cache import CLEAR_ALL, GenerationTTLCache, register_invalidation_hooks
+from mealie.core.config import get_app_settings
+from mealie.db.models.group import Group
+from mealie.db.models.household import Household
+from mealie.db.models.users import LongLiveToken, User
+from mealie.schema.user.user import PrivateUser
+
+
+class PrincipalCache(GenerationTTLCache[str, PrivateUser]):
+    """
+    Short-lived, in-process cache of authenticated users, so that authenticating a request doesn't
+    require a database query. Entries are keyed by user id (login sessions) or by a hash of the API token,
+    and are explicitly invalidated whenever the user, their API tokens, or their group/household change.
+
+    The cache is per-process, so with several workers a change made through another worker can take up
+    to `ttl` seconds to apply.
+    """
+
+    def __init__(self, ttl: float, max_size: int) -> None:
+        super().__init__(ttl, max_size)
+        self._keys_by_user: dict[UUID4, set[str]] = {}
+
+    @staticmethod
+    def user_key(user_id: UUID4 | str) -> str:
+        return f"user:{user_id}"
+
+    @staticmethod
+    def token_key(token: str) -> str:
+        return f"token:{hashlib.sha256(token.encode()).hexdigest()}"
+
+    def get(self, key: str) -> PrivateUser | None:
+        # callers are free to modify the user they're given, so never hand out the cached instance
+        user = super().get(key)
+        return user.model_copy(deep=True) if user else None
+
+    def set(self, key: str, value: PrivateUser, generation: int | None = None) -> None:
+        super().set(key, value.model_copy(deep=True), generation)
+
+    def invalidate_user(self, user_id: UUID4) -> None:
+        with self._lock:
+            self.invalidate(*self._keys_by_user.get(user_id, ()))
+
+    def clear(self) -> None:
+        with self._lock:
+            super().clear()
+            self._keys_by_user.clear()
+
+    def _added(self, key: str, value: PrivateUser) -> None:
+        self._keys_by_user.setdefault(value.id, set()).add(key)
+
+    def _removed(self, key: str, value: PrivateUser) -> None:
+        keys = self._keys_by_user.get(value.id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[value.id]
+
+
+_settings = get_app_settings()
+principal_cache = PrincipalCache(_settings.SECURITY_PRINCIPAL_CACHE_TTL, _settings.SECURITY_PRINCIPAL_CACHE_SIZE)
+
+
+def _name_changed(target: Group | Household) -> bool:
+    state = inspect(target)
+    return state.attrs.name.history.has_changes() or state.attrs.slug.history.has_changes()
+
+
+def _collect_invalidations(session: Session, pending: set[UUID4 | str]) -> None:
+    """Records which cached users are affected by the flushed changes"""
+
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, User) and obj.id is not None:
+            pending.add(obj.id)
+        elif isinstance(obj, LongLiveToken) and obj.user_id is not None:
+            pending.add(obj.user_id)
+        elif isinstance(obj, Group | Household) and (obj in session.deleted or _name_changed(obj)):
+            # group and household names are embedded in every cached user; renames are rare enough to start over
+            pending.add(CLEAR_ALL)
+
+
+register_invalidation_hooks(
+    "principal_cache", _collect_invalidations, principal_cache.invalidate_user, principal_cache.clear
+)
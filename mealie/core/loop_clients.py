@@ -0,0 +1,63 @@
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable
+from weakref import WeakKeyDictionary, WeakSet
+
+from mealie.core.root_logger import get_logger
+
+_pools: "WeakSet[LoopClientPool]" = WeakSet()
+
+
+class LoopClientPool[Client]:
+    """
+    Long-lived async clients, one per event loop and key, so requests reuse a client's pooled connections rather
+    than each opening their own. Clients are kept per event loop, since their connections can't be shared between
+    loops, and loops are only weakly referenced, so a pool never keeps a finished loop alive.
+
+    Clients are closed with `close_loop_clients` when the app shuts down.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[..., Client],
+        close: Callable[[Client], Awaitable[object]],
+        is_closed: Callable[[Client], bool] | None = None,
+    ) -> None:
+        self._factory = factory
+        self._close = close
+        self._is_closed = is_closed
+
+        self._lock = threading.Lock()
+        self._clients: WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, Client]] = WeakKeyDictionary()
+        _pools.add(self)
+
+    def get(self, key: str = "", **options) -> Client:
+        """Returns the running loop's client for `key`, creating it with `options` if there isn't an open one"""
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._clients.setdefault(loop, {})
+            client = clients.get(key)
+            if client is None or (self._is_closed is not None and self._is_closed(client)):
+                client = clients[key] = self._factory(**options)
+
+            return client
+
+    async def aclose(self) -> None:
+        """Closes the running loop's clients; clients on other loops can only be closed by their own loop"""
+
+        with self._lock:
+            clients = list(self._clients.pop(asyncio.get_running_loop(), {}).values())
+
+        for client in clients:
+            try:
+                await self._close(client)
+            except Exception as e:
+                get_logger().warning(f"Failed to close {type(client).__name__}: {e}")
+
+
+async def close_loop_clients() -> None:
+    """Closes every pool's clients on the running loop"""
+
+    for pool in list(_pools):
+        await pool.aclose()
@@ -0,0 +1,64 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from logging import Logger
+
+from mealie.core.root_logger import get_logger
+
+
+class LoopLagMonitor:
+    """
+    Reports code that blocks the event loop, e.g. a sync database query or password hash in an `async` route.
+
+    A coroutine on the loop records a heartbeat every few milliseconds and logs how late it woke up. Since a
+    late wake-up can't say what held the loop, a watchdog thread also checks the heartbeat and, while the loop
+    is stalled, logs the stack of the loop's thread (once per stall) so the blocking call can be found.
+    """
+
+    def __init__(self, threshold_ms: int, logger: Logger | None = None) -> None:
+        self.threshold = threshold_ms / 1000
+        self.interval = max(self.threshold / 2, 0.01)
+        self.logger = logger or get_logger("loop_monitor")
+
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: int | None = None
+        self._stall_reported = False
+        self._stopped = threading.Event()
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+
+        watchdog = threading.Thread(target=self._watch, name="mealie-loop-monitor", daemon=True)
+        watchdog.start()
+
+        try:
+            while True:
+                expected = loop.time() + self.interval
+                await asyncio.sleep(self.interval)
+
+                self._heartbeat = time.monotonic()
+                self._stall_reported = False
+
+                lag = loop.time() - expected
+                if lag >= self.threshold:
+                    self.logger.warning(f"Event loop was blocked for {lag * 1000:.0f}ms")
+        finally:
+            self._stopped.set()
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.interval):
+            stalled_for = time.monotonic() - self._heartbeat
+            if stalled_for < self.threshold or self._stall_reported or self._loop_thread_id is None:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+
+            self._stall_reported = True
+            stack = "".join(traceback.format_stack(frame))
+            self.logger.warning(f"Event loop has been blocked for {stalled_for * 1000:.0f}ms at:\n{stack}")
@@ -1,16 +1,27 @@
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from functools import lru_cache
-from typing import Protocol
+from typing import Protocol, TypeVar
 
 import bcrypt
 
 from mealie.core.config import get_app_settings
 
+T = TypeVar("T")
+
+DEFAULT_BCRYPT_ROUNDS = 12
+
 
 class Hasher(Protocol):
     def hash(self, password: str) -> str: ...
 
     def verify(self, password: str, hashed: str) -> bool: ...
 
+    def needs_rehash(self, hashed: str) -> bool: ...
+
 
 class FakeHasher:
     def hash(self, password: str) -> str:
@@ -19,20 +30,111 @@ class FakeHasher:
     def verify(self, password: str, hashed: str) -> bool:
         return password == hashed
 
+    def needs_rehash(self, hashed: str) -> bool:
+        return False
+
+
+@dataclass(frozen=True)
+class HashingPoolStats:
+    workers: int
+    queued: int
+    """calls waiting for a free worker"""
+    running: int
+    completed: int
+    total_wait_ms: float
+    """total time calls spent waiting for a free worker"""
+    max_wait_ms: float
+
+    @property
+    def avg_wait_ms(self) -> float:
+        return self.total_wait_ms / self.completed if self.completed else 0
+
+
+class HashingPool:
+    """
+    Runs password hashing on a fixed number of worker threads. bcrypt releases the GIL while hashing,
+    so the workers run in parallel, while the pool size bounds how many CPU cores a burst of logins can
+    take from the rest of the app. Calls beyond the pool size wait in a queue, which is tracked in `stats`.
+    """
+
+    def __init__(self, workers: int) -> None:
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hashing")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def run(self, fn: Callable[..., T], *args) -> T:
+        """Runs `fn` on a worker and blocks until it returns"""
+
+        submitted = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+
+        def task() -> T:
+            wait = time.perf_counter() - submitted
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+
+        return self._executor.submit(task).result()
+
+    def stats(self) -> HashingPoolStats:
+        with self._lock:
+            return HashingPoolStats(
+                workers=self.workers,
+                queued=self._queued,
+                running=self._running,
+                completed=self._completed,
+                total_wait_ms=self._total_wait * 1000,
+                max_wait_ms=self._max_wait * 1000,
+            )
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
 
 class BcryptHasher:
+    def __init__(self, rounds: int = DEFAULT_BCRYPT_ROUNDS, pool: HashingPool | None = None) -> None:
+        self.rounds = rounds
+        self.pool = pool
+
     def _get_password_bytes(self, password: str) -> bytes:
         return password.encode("utf-8")[:72]
 
+    def _run(self, fn: Callable[..., T], *args) -> T:
+        return self.pool.run(fn, *args) if self.pool else fn(*args)
+
     def hash(self, password: str) -> str:
         password_bytes = self._get_password_bytes(password)
-        hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt())
+        hashed = self._run(bcrypt.hashpw, password_bytes, bcrypt.gensalt(self.rounds))
         return hashed.decode("utf-8")
 
     def verify(self, password: str, hashed: str) -> bool:
         password_bytes = self._get_password_bytes(password)
         hashed_bytes = hashed.encode("utf-8")
-        return bcrypt.checkpw(password_bytes, hashed_bytes)
+        return self._run(bcrypt.checkpw, password_bytes, hashed_bytes)
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """Returns True if the hash wasn't made with the configured number of rounds, e.g. `$2b$10$...`"""
+
+        try:
+            _, _, rounds, _ = hashed.split("$", 3)
+            return int(rounds) != self.rounds
+        except ValueError:
+            return True
 
 
 @lru_cache(maxsize=1)
@@ -42,4 +144,7 @@ def get_hasher() -> Hasher:
     if settings.TESTING:
         return FakeHasher()
 
-    return BcryptHasher()
+    return BcryptHasher(
+        rounds=settings.SECURITY_BCRYPT_ROUNDS,
+        pool=HashingPool(settings.SECURITY_HASHING_WORKERS),
+    )
@@ -1,17 +1,26 @@
 from datetime import timedelta
+from functools import lru_cache
 
 from sqlalchemy.orm.session import Session
 
 from mealie.core import root_logger
 from mealie.core.config import get_app_settings
 from mealie.core.exceptions import UserLockedOut
-from mealie.core.security.hasher import get_hasher
+from mealie.core.security.hasher import Hasher, get_hasher
 from mealie.core.security.providers.auth_provider import AuthProvider
 from mealie.db.models.users.users import AuthMethod
 from mealie.repos.all_repositories import get_repositories
 from mealie.schema.user.auth import CredentialsRequest
 from mealie.services.user_services.user_service import UserService
 
+_FAKE_PASSWORD = "abc123cba321"
+
+
+@lru_cache(maxsize=1)
+def _fake_password_hash(hasher: Hasher) -> str:
+    # hashed with the configured work factor, so a failed lookup takes as long as a real verify
+    return hasher.hash(_FAKE_PASSWORD)
+
 
 class CredentialsProvider(AuthProvider[CredentialsRequest]):
     """Authentication provider that authenticates a user the database using username/password combination"""
@@ -53,15 +62,18 @@ class CredentialsProvider(AuthProvider[CredentialsRequest]):
 
         user.login_attemps = 0
         user = db.users.update(user.id, user)
+
+        hasher = get_hasher()
+        if user.password and hasher.needs_rehash(user.password):
+            # the work factor has changed since this password was hashed, so upgrade it while we have the plain text
+            user = db.users.update_password(user.id, hasher.hash(self.data.password))
+
         return self.get_access_token(user, self.data.remember_me)  # type: ignore
 
     def verify_fake_password(self):
         # To prevent user enumeration we perform the verify_password computation to ensure
         # server side time is relatively constant and not vulnerable to timing attacks.
-        CredentialsProvider.verify_password(
-            "abc123cba321",
-            "$2b$12$JdHtJOlkPFwyxdjdygEzPOtYmdQF5/R5tHxw5Tq8pxjubyLqdIX5i",
-        )
+        CredentialsProvider.verify_password(_FAKE_PASSWORD, _fake_password_hash(get_hasher()))
 
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
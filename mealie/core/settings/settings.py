@@ -186,6 +186,28 @@ class AppSettings(AppLoggingSettings):
     SECURITY_MAX_LOGIN_ATTEMPTS: int = 5
     SECURITY_USER_LOCKOUT_TIME: int = 24
     "time in hours"
+    SECURITY_PRINCIPAL_CACHE_TTL: float = 10
+    """time in seconds an authenticated user is cached for between requests; 0 disables the cache"""
+    SECURITY_PRINCIPAL_CACHE_SIZE: int = 1024
+    """maximum number of authenticated users/tokens held in the cache"""
+    SECURITY_BCRYPT_ROUNDS: int = 12
+    """bcrypt work factor for new password hashes; existing hashes are upgraded when the user next logs in"""
+    SECURITY_HASHING_WORKERS: int = 2
+    """number of threads that run password hashing, per worker process"""
+
+    @field_validator("SECURITY_BCRYPT_ROUNDS")
+    @classmethod
+    def validate_bcrypt_rounds(cls, v: int) -> int:
+        if not 4 <= v <= 31:
+            raise ValueError("SECURITY_BCRYPT_ROUNDS must be between 4 and 31")
+        return v
+
+    @field_validator("SECURITY_HASHING_WORKERS")
+    @classmethod
+    def validate_hashing_workers(cls, v: int) -> int:
+        if v < 1:
+            raise ValueError("SECURITY_HASHING_WORKERS must be at least 1")
+        return v
 
     @field_validator("BASE_URL")
     @classmethod
@@ -211,6 +233,13 @@ class AppSettings(AppLoggingSettings):
 
     SQLITE_MIGRATE_JOURNAL_WAL: bool = False
 
+    DB_QUERY_STATS: bool = False
+    """Times every database statement, by query filter, for the admin query report. Adds a little overhead"""
+    DB_SLOW_QUERY_MS: int = 200
+    """Statements slower than this have their query plan captured for the admin query report"""
+    DB_QUERY_STATS_SIZE: int = 1000
+    """Maximum number of distinct statements, and of query filters, tracked for the admin query report"""
+
     @property
     def DB_URL(self) -> str | None:
         return self.DB_PROVIDER.db_url if self.DB_PROVIDER else None
@@ -422,6 +451,20 @@ class AppSettings(AppLoggingSettings):
     Path to a folder containing custom prompt files;
     files are individually optional, each prompt name will fall back to the default if no custom file exists
     """
+    OPENAI_RESPONSE_CACHE_TTL: int = 3600
+    """
+    The number of seconds a response is reused for an identical request (same model, prompt, content, and
+    response format); 0 disables the cache
+    """
+    OPENAI_RESPONSE_CACHE_SIZE: int = 256
+    """The maximum number of responses held in the cache"""
+    OPENAI_MAX_CONCURRENT_REQUESTS: int = 8
+    """
+    The maximum number of OpenAI requests each worker sends at once, across all of its requests;
+    0 removes the limit
+    """
+    OPENAI_REQUESTS_PER_MINUTE: int = 0
+    """The maximum number of OpenAI requests each worker starts per minute; 0 removes the limit"""
 
     @property
     def OPENAI_FEATURE(self) -> FeatureDetails:
@@ -441,6 +484,31 @@ class AppSettings(AppLoggingSettings):
         """Validates OpenAI settings are all set"""
         return self.OPENAI_FEATURE.enabled
 
+    # ===============================================
+    # Bulk Recipe Import
+
+    BULK_IMPORT_FETCH_WORKERS: int = 4
+    """Number of pages downloaded concurrently during a bulk URL import"""
+    BULK_IMPORT_PARSE_WORKERS: int = 2
+    """Number of pages parsed into recipes concurrently during a bulk URL import"""
+    BULK_IMPORT_PERSIST_WORKERS: int = 1
+    """Number of recipes saved to the database concurrently during a bulk URL import"""
+    BULK_IMPORT_IMAGE_WORKERS: int = 4
+    """Number of recipe images downloaded concurrently during a bulk URL import"""
+    BULK_IMPORT_LEASE_SECONDS: int = 300
+    """
+    A worker renews its lease on a bulk import job while it runs the job; a job whose lease hasn't been renewed for
+    this many seconds is taken over by another worker
+    """
+
+    # ===============================================
+    # Event Stream
+
+    EVENT_STREAM_QUEUE_SIZE: int = 100
+    """Number of events queued for a single event stream client before it's told to resync instead"""
+    EVENT_STREAM_BROKER: str = "memory"  # Options: 'memory', 'postgres'
+    """How events reach event streams: within each worker, or between workers through Postgres LISTEN/NOTIFY"""
+
     # ===============================================
     # Web Concurrency
 
@@ -450,6 +518,16 @@ class AppSettings(AppLoggingSettings):
     UVICORN_WORKERS: int = 1
     """Number of Uvicorn workers to run."""
 
+    LOOP_LAG_WARNING_MS: int = 250
+    """Log a warning, with the blocking stack, when the event loop is blocked for longer than this; 0 disables it"""
+
+    RECIPE_CACHE_TTL: float = 60
+    """time in seconds a serialized recipe is cached for between views; 0 disables the cache"""
+    RECIPE_CACHE_SIZE: int = 256
+    """maximum number of serialized recipes held in the cache"""
+    STATISTICS_CACHE_TTL: float = 60
+    """time in seconds household statistics are cached for; 0 disables the cache"""
+
     @property
     def WORKERS(self) -> int:
         return max(1, self.WORKER_PER_CORE * self.UVICORN_WORKERS)
@@ -8,6 +8,7 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm.session import Session
 
 from mealie.core.config import get_app_settings
+from mealie.db.query_stats import query_stats_recorder
 
 settings = get_app_settings()
 
@@ -44,6 +45,9 @@ def sql_global_init(db_url: str):
 
 SessionLocal, engine = sql_global_init(settings.DB_URL)  # type: ignore
 
+if settings.DB_QUERY_STATS:
+    query_stats_recorder.install(engine)
+
 
 @contextmanager
 def session_context() -> Generator[Session, None, None]:
@@ -1,3 +1,4 @@
+from .bulk_import import *
 from .exports import *
 from .group import *
 from .preferences import *
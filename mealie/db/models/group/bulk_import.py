@@ -0,0 +1,66 @@
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import ForeignKey, Integer, String, orm
+from sqlalchemy.orm import Mapped, mapped_column
+
+from mealie.db.models._model_base import BaseMixins, SqlAlchemyBase
+from mealie.db.models._model_utils.datetime import NaiveDateTime
+
+from .._model_utils.auto_init import auto_init
+from .._model_utils.guid import GUID
+
+if TYPE_CHECKING:
+    from .report import ReportModel
+
+
+class BulkImportJobItemModel(SqlAlchemyBase, BaseMixins):
+    __tablename__ = "recipe_bulk_import_job_items"
+    id: Mapped[GUID] = mapped_column(GUID, primary_key=True, default=GUID.generate)
+
+    job_id: Mapped[GUID] = mapped_column(GUID, ForeignKey("recipe_bulk_import_jobs.id"), nullable=False, index=True)
+    job: Mapped["BulkImportJobModel"] = orm.relationship("BulkImportJobModel", back_populates="items")
+
+    position: Mapped[int] = mapped_column(Integer, nullable=False)
+    url: Mapped[str] = mapped_column(String, nullable=False)
+    status: Mapped[str] = mapped_column(String, nullable=False, index=True)
+
+    # serialized tags and categories to apply to the imported recipe
+    tags: Mapped[str | None] = mapped_column(String, nullable=True)
+    categories: Mapped[str | None] = mapped_column(String, nullable=True)
+
+    # set once the recipe has been persisted, so the image stage can be resumed on its own
+    recipe_id: Mapped[GUID | None] = mapped_column(GUID, nullable=True)
+    image_url: Mapped[str | None] = mapped_column(String, nullable=True)
+
+    @auto_init()
+    def __init__(self, **_) -> None:
+        pass
+
+
+class BulkImportJobModel(SqlAlchemyBase, BaseMixins):
+    __tablename__ = "recipe_bulk_import_jobs"
+    id: Mapped[GUID] = mapped_column(GUID, primary_key=True, default=GUID.generate)
+
+    status: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    runner_id: Mapped[str | None] = mapped_column(String, nullable=True)
+    # renewed by the runner while the job runs; once it's stale, another worker may take the job over
+    heartbeat_at: Mapped[datetime | None] = mapped_column(NaiveDateTime, nullable=True)
+
+    report_id: Mapped[GUID] = mapped_column(GUID, ForeignKey("group_reports.id"), nullable=False, index=True)
+    report: Mapped["ReportModel"] = orm.relationship("ReportModel", back_populates="bulk_import_job")
+
+    group_id: Mapped[GUID] = mapped_column(GUID, nullable=False, index=True)
+    household_id: Mapped[GUID] = mapped_column(GUID, nullable=False)
+    user_id: Mapped[GUID] = mapped_column(GUID, nullable=False)
+
+    items: Mapped[list[BulkImportJobItemModel]] = orm.relationship(
+        BulkImportJobItemModel,
+        back_populates="job",
+        cascade="all, delete-orphan",
+        order_by="BulkImportJobItemModel.position",
+    )
+
+    @auto_init()
+    def __init__(self, **_) -> None:
+        pass
@@ -13,6 +13,7 @@ from .._model_utils.datetime import NaiveDateTime, get_utc_now
 from .._model_utils.guid import GUID
 
 if TYPE_CHECKING:
+    from .bulk_import import BulkImportJobModel
     from .group import Group
 
 
@@ -45,6 +46,9 @@ class ReportModel(SqlAlchemyBase, BaseMixins):
     entries: Mapped[list[ReportEntryModel]] = orm.relationship(
         ReportEntryModel, back_populates="report", cascade="all, delete-orphan"
     )
+    bulk_import_job: Mapped["BulkImportJobModel | None"] = orm.relationship(
+        "BulkImportJobModel", back_populates="report", uselist=False, cascade="all, delete-orphan"
+    )
 
     # Relationships
     group_id: Mapped[GUID] = mapped_column(GUID, ForeignKey("groups.id"), nullable=False, index=True)
@@ -10,6 +10,7 @@ from .shopping_list import (
     ShoppingList,
     ShoppingListExtras,
     ShoppingListItem,
+    ShoppingListItemChange,
     ShoppingListItemRecipeReference,
     ShoppingListMultiPurposeLabel,
     ShoppingListRecipeReference,
@@ -30,6 +31,7 @@ __all__ = [
     "ShoppingList",
     "ShoppingListExtras",
     "ShoppingListItem",
+    "ShoppingListItemChange",
     "ShoppingListItemRecipeReference",
     "ShoppingListMultiPurposeLabel",
     "ShoppingListRecipeReference",
@@ -1,9 +1,22 @@
-from contextvars import ContextVar
+from collections.abc import Iterable
 from datetime import UTC, datetime
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Literal, Optional
 
 from pydantic import ConfigDict
-from sqlalchemy import Boolean, Float, ForeignKey, Integer, String, UniqueConstraint, event, orm
+from sqlalchemy import (
+    Boolean,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+    event,
+    inspect,
+    orm,
+    select,
+    update,
+)
 from sqlalchemy.ext.associationproxy import AssociationProxy, association_proxy
 from sqlalchemy.ext.orderinglist import ordering_list
 from sqlalchemy.orm import Mapped, mapped_column
@@ -142,6 +155,35 @@ class ShoppingListMultiPurposeLabel(SqlAlchemyBase, BaseMixins):
         pass
 
 
+class ShoppingListItemChange(SqlAlchemyBase, BaseMixins):
+    """
+    The latest change to each item on a shopping list, so clients can fetch only the items that changed since
+    the list revision they last saw. Deleted items keep their change, since the item itself is gone, until
+    it's pruned by `purge_shopping_list_item_changes`.
+    """
+
+    __tablename__ = "shopping_list_item_changes"
+    __table_args__ = (
+        UniqueConstraint("shopping_list_id", "item_id", name="shopping_list_id_item_id_key"),
+        Index("ix_shopping_list_item_changes_shopping_list_id_revision", "shopping_list_id", "revision"),
+    )
+    id: Mapped[GUID] = mapped_column(GUID, primary_key=True, default=GUID.generate)
+
+    shopping_list_id: Mapped[GUID] = mapped_column(GUID, ForeignKey("shopping_lists.id"), nullable=False)
+    shopping_list: Mapped["ShoppingList"] = orm.relationship("ShoppingList", back_populates="item_changes")
+    item_id: Mapped[GUID] = mapped_column(GUID, nullable=False)
+
+    revision: Mapped[int] = mapped_column(Integer, nullable=False)
+    """the list revision of the item's latest change"""
+    created_revision: Mapped[int | None] = mapped_column(Integer)
+    """the list revision the item was created at, if it was created after change tracking was added"""
+    deleted: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+
+    @auto_init()
+    def __init__(self, **_) -> None:
+        pass
+
+
 class ShoppingList(SqlAlchemyBase, BaseMixins):
     __tablename__ = "shopping_lists"
     id: Mapped[GUID] = mapped_column(GUID, primary_key=True, default=GUID.generate)
@@ -154,6 +196,11 @@ class ShoppingList(SqlAlchemyBase, BaseMixins):
     user: Mapped["User"] = orm.relationship("User", back_populates="shopping_lists")
 
     name: Mapped[str | None] = mapped_column(String)
+    revision: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    """incremented whenever the list's items change; managed by `update_shopping_lists`"""
+    pruned_revision: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    """the latest revision whose deleted items have been pruned from the change log"""
+
     list_items: Mapped[list[ShoppingListItem]] = orm.relationship(
         ShoppingListItem,
         cascade="all, delete, delete-orphan",
@@ -170,8 +217,11 @@ class ShoppingList(SqlAlchemyBase, BaseMixins):
         order_by="ShoppingListMultiPurposeLabel.position",
         collection_class=ordering_list("position"),
     )
+    item_changes: Mapped[list[ShoppingListItemChange]] = orm.relationship(
+        ShoppingListItemChange, cascade="all, delete, delete-orphan"
+    )
     extras: Mapped[list[ShoppingListExtras]] = orm.relationship("ShoppingListExtras", cascade="all, delete-orphan")
-    model_config = ConfigDict(exclude={"id", "list_items"})
+    model_config = ConfigDict(exclude={"id", "list_items", "revision", "pruned_revision", "item_changes"})
 
     @api_extras
     @auto_init()
@@ -179,58 +229,136 @@ class ShoppingList(SqlAlchemyBase, BaseMixins):
         pass
 
 
+ItemOperation = Literal["create", "update", "delete"]
+
+_SESSION_BUFFER_KEY = "shopping_list_session_buffer"
+
+
 class SessionBuffer:
+    """The shopping list items changed by a session since its last flush, grouped by shopping list id"""
+
     def __init__(self) -> None:
-        self.shopping_list_ids: set[GUID] = set()
+        self.changes: dict[GUID, dict[GUID, ItemOperation]] = {}
 
-    def add(self, shopping_list_id: GUID) -> None:
-        self.shopping_list_ids.add(shopping_list_id)
+    def add(self, shopping_list_id: GUID, item_id: GUID, operation: ItemOperation) -> None:
+        item_changes = self.changes.setdefault(shopping_list_id, {})
+        if item_changes.get(item_id) == "create" and operation == "update":
+            return
 
-    def pop(self) -> GUID | None:
-        try:
-            return self.shopping_list_ids.pop()
-        except KeyError:
-            return None
+        item_changes[item_id] = operation
 
-    def clear(self) -> None:
-        self.shopping_list_ids.clear()
+    def pop_all(self) -> dict[GUID, dict[GUID, ItemOperation]]:
+        changes = self.changes
+        self.changes = {}
+        return changes
 
 
-session_buffer_context = ContextVar("session_buffer", default=SessionBuffer())  # noqa: B039
+def _buffer_change(target: ShoppingListItem, operation: ItemOperation, shopping_list_id: GUID | None = None) -> None:
+    session = orm.object_session(target)
+    shopping_list_id = shopping_list_id or target.shopping_list_id
+    if session is None or shopping_list_id is None:
+        return
+
+    session_buffer: SessionBuffer = session.info.setdefault(_SESSION_BUFFER_KEY, SessionBuffer())
+    session_buffer.add(shopping_list_id, target.id, operation)
 
 
 @event.listens_for(ShoppingListItem, "after_insert")
+def buffer_created_shopping_list_item(_, connection, target: ShoppingListItem):
+    """Adds the item to the session buffer so its shopping list can be updated later"""
+
+    _buffer_change(target, "create")
+
+
 @event.listens_for(ShoppingListItem, "after_update")
+def buffer_updated_shopping_list_item(_, connection, target: ShoppingListItem):
+    """Adds the item to the session buffer so its shopping list can be updated later"""
+
+    for previous_list_id in inspect(target).attrs.shopping_list_id.history.deleted:
+        # the item was moved to another list, so as far as the old list is concerned it's gone
+        _buffer_change(target, "delete", shopping_list_id=previous_list_id)
+
+    _buffer_change(target, "update")
+
+
 @event.listens_for(ShoppingListItem, "after_delete")
-def buffer_shopping_list_updates(_, connection, target: ShoppingListItem):
-    """Adds the shopping list id to the session buffer so its `updated_at` property can be updated later"""
+def buffer_deleted_shopping_list_item(_, connection, target: ShoppingListItem):
+    """Adds the item to the session buffer so its shopping list can be updated later"""
+
+    _buffer_change(target, "delete")
+
+
+def _record_list_changes(
+    session: orm.Session, shopping_list_id: GUID, revision: int, item_changes: dict[GUID, ItemOperation]
+) -> None:
+    stmt = select(ShoppingListItemChange).where(
+        ShoppingListItemChange.shopping_list_id == shopping_list_id,
+        ShoppingListItemChange.item_id.in_(item_changes.keys()),
+    )
+    existing_changes = {change.item_id: change for change in session.scalars(stmt)}
+
+    for item_id, operation in item_changes.items():
+        change = existing_changes.get(item_id)
+        if change is None:
+            change = ShoppingListItemChange(session=session, shopping_list_id=shopping_list_id, item_id=item_id)
+            session.add(change)
+
+        change.revision = revision
+        change.deleted = operation == "delete"
+        if operation == "create":
+            change.created_revision = revision
+
 
-    session_buffer = session_buffer_context.get()
-    session_buffer.add(target.shopping_list_id)
+def record_item_changes(session: orm.Session, changes: dict[GUID, dict[GUID, ItemOperation]]) -> None:
+    """
+    Bumps the `revision` and `updated_at` properties of each shopping list, and records its item changes in the
+    list's change log. Changes made through the ORM are recorded automatically; bulk statements must call this.
+    """
+
+    for shopping_list_id, item_changes in changes.items():
+        # increment in the database, so concurrent transactions can't hand out the same revision
+        stmt = (
+            update(ShoppingList)
+            .where(ShoppingList.id == shopping_list_id)
+            .values(revision=ShoppingList.revision + 1, update_at=datetime.now(UTC))
+            .returning(ShoppingList.revision)
+        )
+        revision = session.execute(stmt).scalar_one_or_none()
+        if revision is None:
+            # the list was deleted along with its items
+            continue
+
+        _record_list_changes(session, shopping_list_id, revision, item_changes)
+
+
+def record_item_updates(session: orm.Session, items: Iterable[tuple[GUID, GUID]]) -> None:
+    """Records the `(shopping_list_id, item_id)` pairs updated by a bulk statement with `record_item_changes`"""
+
+    changes: dict[GUID, dict[GUID, ItemOperation]] = {}
+    for shopping_list_id, item_id in items:
+        changes.setdefault(shopping_list_id, {})[item_id] = "update"
+
+    record_item_changes(session, changes)
 
 
 @event.listens_for(orm.Session, "after_flush")
 def update_shopping_lists(session: orm.Session, _):
-    """Pulls all pending shopping list updates from the buffer and updates their `updated_at` property"""
+    """Pulls all pending item changes from the session buffer and records them with `record_item_changes`"""
 
-    session_buffer = session_buffer_context.get()
-    if not session_buffer.shopping_list_ids:
+    session_buffer: SessionBuffer | None = session.info.get(_SESSION_BUFFER_KEY)
+    if not (session_buffer and session_buffer.changes):
         return
 
     local_session = orm.Session(bind=session.connection())
     try:
         local_session.begin()
-        while True:
-            shopping_list_id = session_buffer.pop()
-            if not shopping_list_id:
-                break
-
-            shopping_list = local_session.query(ShoppingList).filter(ShoppingList.id == shopping_list_id).first()
-            if not shopping_list:
-                continue
-
-            shopping_list.updated_at = datetime.now(UTC)
+        record_item_changes(local_session, session_buffer.pop_all())
         local_session.commit()
     except Exception:
         local_session.rollback()
         raise
+
+
+@event.listens_for(orm.Session, "after_soft_rollback")
+def clear_shopping_list_buffer(session: orm.Session, _):
+    session.info.pop(_SESSION_BUFFER_KEY, None)
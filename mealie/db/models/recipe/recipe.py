@@ -161,6 +161,9 @@ class RecipeModel(SqlAlchemyBase, BaseMixins):
         cascade="all, delete-orphan",
     )
 
+    # Bytes used by the recipe's data directory; kept up to date by `RecipeDataService`, do not write to this manually
+    storage_bytes: Mapped[int] = mapped_column(sa.BigInteger, nullable=False, default=0, server_default="0")
+
     # Automatically updated by sqlalchemy event, do not write to this manually
     name_normalized: Mapped[str] = mapped_column(sa.String, nullable=False, index=True)
     description_normalized: Mapped[str | None] = mapped_column(sa.String, index=True)
@@ -0,0 +1,377 @@
+"""
+Opt-in instrumentation for finding expensive query filters. When installed on an engine, every statement is
+timed and aggregated by its template (the SQL with its values replaced by placeholders) and by the query-filter
+shape of the request that ran it. The plan of each statement slower than the threshold is captured, so the
+report can recommend indexes for the tables those plans scan.
+"""
+
+import re
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar
+from dataclasses import dataclass, field, replace
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import MetaData, UniqueConstraint, event
+from sqlalchemy.engine import Connection, Engine
+
+from mealie.core.config import get_app_settings
+from mealie.core.root_logger import get_logger
+
+logger = get_logger()
+
+MAX_INDEX_COLUMNS = 3
+
+FULL_SCAN = "full table scan"
+UNINDEXED_SORT = "sorted without an index"
+
+_current_shape: ContextVar[str | None] = ContextVar("query_stats_shape", default=None)
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|\?")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\?(?:, \?)+\)")
+
+_VALUE_COLUMN = re.compile(r"\b(\w+)\.(\w+) (?:= \?|IN \(\?|IS (?:NOT )?NULL)")
+_JOIN_COLUMNS = re.compile(r"\b(\w+)\.(\w+) = (\w+)\.(\w+)\b")
+_RANGE_COLUMN = re.compile(r"\b(\w+)\.(\w+) (?:[<>]=? |BETWEEN |LIKE )")
+_ORDER_BY = re.compile(r" ORDER BY (.+?)(?: LIMIT | OFFSET |\)|$)")
+_QUALIFIED_COLUMN = re.compile(r"\b(\w+)\.(\w+)\b")
+_ALIAS_SUFFIX = re.compile(r"_\d+$")
+
+_SQLITE_SCAN = re.compile(r"^SCAN (\w+)(?: AS (\w+))?$")
+_POSTGRES_SEQ_SCAN = re.compile(r"Seq Scan on (\w+)")
+_POSTGRES_SORT_KEY = re.compile(r"Sort Key: (.+)$")
+
+
+def normalize_statement(statement: str) -> str:
+    """Replaces the values in a statement with placeholders, and collapses lists of them, e.g. for `IN`"""
+
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _LITERAL.sub("?", _PLACEHOLDER.sub("?", statement))
+    return _PLACEHOLDER_LIST.sub("(?...)", statement)
+
+
+@dataclass(slots=True)
+class StatementStats:
+    template: str
+    calls: int = 0
+    total_ms: float = 0
+    max_ms: float = 0
+    slow_calls: int = 0
+    rows: int = 0
+    row_counts: int = 0
+    """calls whose row count the driver reported; SQLite doesn't report them for `SELECT`"""
+    plan: list[str] | None = None
+    plan_ms: float = 0
+    """duration of the call the plan was captured for; a slower call replaces it"""
+    query_shapes: set[str] = field(default_factory=set)
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0
+
+    @property
+    def mean_rows(self) -> float | None:
+        return self.rows / self.row_counts if self.row_counts else None
+
+
+@dataclass(slots=True)
+class QueryShapeStats:
+    shape: str
+    requests: int = 0
+    statements: int = 0
+    total_ms: float = 0
+    max_ms: float = 0
+    """duration of the slowest statement"""
+    slow_statements: int = 0
+
+    @property
+    def mean_ms(self) -> float:
+        """database time per request"""
+        return self.total_ms / self.requests if self.requests else 0
+
+
+@dataclass(slots=True)
+class IndexRecommendation:
+    table: str
+    columns: list[str]
+    reason: str
+    statements: int = 0
+    total_ms: float = 0
+    """time spent in the statements the index would help"""
+
+    @property
+    def ddl(self) -> str:
+        return f"CREATE INDEX ix_{self.table}_{'_'.join(self.columns)} ON {self.table} ({', '.join(self.columns)})"
+
+
+class QueryStatsRecorder:
+    """
+    Aggregates the statements run through the engines it's installed on. Statements run inside `query_shape`
+    are also attributed to that shape. Only `max_entries` distinct templates and shapes are tracked; the rest
+    are counted as dropped.
+    """
+
+    def __init__(self, slow_query_ms: float, max_entries: int) -> None:
+        self.slow_query_ms = slow_query_ms
+        self.max_entries = max_entries
+        self.enabled = False
+
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.since = datetime.now(UTC)
+            self.dropped = 0
+            self.statements: dict[str, StatementStats] = {}
+            self.shapes: dict[str, QueryShapeStats] = {}
+
+    def install(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        self.enabled = True
+
+    def uninstall(self, engine: Engine) -> None:
+        event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", self._after_cursor_execute)
+        self.enabled = False
+
+    @contextmanager
+    def query_shape(self, shape: str) -> Iterator[None]:
+        """Attributes the statements run inside the block to a query-filter shape"""
+
+        with self._lock:
+            if stats := self._get_or_add(self.shapes, shape, QueryShapeStats):
+                stats.requests += 1
+
+        token = _current_shape.set(shape)
+        try:
+            yield
+        finally:
+            _current_shape.reset(token)
+
+    def top_statements(self, limit: int | None = None) -> list[StatementStats]:
+        """Copies of the statements that took the most time in total"""
+
+        with self._lock:
+            statements = [replace(stats, query_shapes=set(stats.query_shapes)) for stats in self.statements.values()]
+
+        return sorted(statements, key=lambda stats: stats.total_ms, reverse=True)[:limit]
+
+    def top_shapes(self, limit: int | None = None) -> list[QueryShapeStats]:
+        """Copies of the query-filter shapes that took the most time in total"""
+
+        with self._lock:
+            shapes = [replace(stats) for stats in self.shapes.values()]
+
+        return sorted(shapes, key=lambda stats: stats.total_ms, reverse=True)[:limit]
+
+    def recommend_indexes(self, metadata: MetaData) -> list[IndexRecommendation]:
+        return recommend_indexes(self.top_statements(), metadata)
+
+    def _get_or_add[T](self, entries: dict[str, T], key: str, factory: type[T]) -> T | None:
+        if (entry := entries.get(key)) is None:
+            if len(entries) >= self.max_entries:
+                self.dropped += 1
+                return None
+
+            entry = entries[key] = factory(key)  # type: ignore[call-arg]
+
+        return entry
+
+    def _before_cursor_execute(self, conn: Connection, cursor, statement, parameters, context, executemany) -> None:
+        # kept on the execution context rather than the connection, so a statement that fails leaves nothing behind
+        context._query_stats_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn: Connection, cursor, statement, parameters, context, executemany) -> None:
+        if (start := getattr(context, "_query_stats_start", None)) is None:
+            return
+
+        duration_ms = (time.perf_counter() - start) * 1000
+        template = normalize_statement(statement)
+        shape = _current_shape.get()
+        is_slow = duration_ms >= self.slow_query_ms
+
+        with self._lock:
+            stats = self._get_or_add(self.statements, template, StatementStats)
+            if stats is None:
+                return
+
+            stats.calls += 1
+            stats.total_ms += duration_ms
+            stats.max_ms = max(stats.max_ms, duration_ms)
+            if cursor.rowcount is not None and cursor.rowcount >= 0:
+                stats.rows += cursor.rowcount
+                stats.row_counts += 1
+            if is_slow:
+                stats.slow_calls += 1
+
+            if shape and (shape_stats := self.shapes.get(shape)):
+                stats.query_shapes.add(shape)
+                shape_stats.statements += 1
+                shape_stats.total_ms += duration_ms
+                shape_stats.max_ms = max(shape_stats.max_ms, duration_ms)
+                if is_slow:
+                    shape_stats.slow_statements += 1
+
+            capture_plan = is_slow and not executemany and duration_ms > stats.plan_ms
+
+        if capture_plan and template.upper().startswith(("SELECT", "WITH")):
+            plan = self._explain(conn, statement, parameters)
+            with self._lock:
+                stats.plan = plan
+                stats.plan_ms = duration_ms
+
+    @staticmethod
+    def _explain(conn: Connection, statement: str, parameters: Any) -> list[str] | None:
+        """
+        Returns the plan for a statement that was just run, as lines of text. It's run in the statement's
+        transaction; on Postgres, within a savepoint, so a failure doesn't abort the transaction.
+        """
+
+        is_postgres = conn.dialect.name == "postgresql"
+        cursor = conn.connection.cursor()
+        try:
+            if is_postgres:
+                cursor.execute("SAVEPOINT query_stats_explain")
+                cursor.execute(f"EXPLAIN {statement}", parameters)
+                plan = [row[0] for row in cursor.fetchall()]
+                cursor.execute("RELEASE SAVEPOINT query_stats_explain")
+                return plan
+
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            depths: dict[int, int] = {0: -1}
+            plan = []
+            for node_id, parent_id, _, detail in cursor.fetchall():
+                depths[node_id] = depths.get(parent_id, -1) + 1
+                plan.append("  " * depths[node_id] + detail)
+
+            return plan
+        except Exception as e:
+            if is_postgres:
+                with suppress(Exception):
+                    cursor.execute("ROLLBACK TO SAVEPOINT query_stats_explain")
+
+            logger.debug(f"unable to capture query plan: {e}")
+            return None
+        finally:
+            cursor.close()
+
+
+def _resolve_table(name: str, metadata: MetaData) -> str | None:
+    """Resolves a table name or one of SQLAlchemy's anonymous aliases of it (e.g. `recipes_1`)"""
+
+    if name in metadata.tables:
+        return name
+
+    name = _ALIAS_SUFFIX.sub("", name)
+    return name if name in metadata.tables else None
+
+
+def _plan_problems(plan: list[str], template: str, metadata: MetaData) -> dict[str, str]:
+    """Finds the tables that a plan reads in full, or sorts without an index, with the reason for each"""
+
+    problems: dict[str, str] = {}
+    sorts_without_index = False
+    for line in plan:
+        line = line.strip()
+        if match := _SQLITE_SCAN.match(line) or _POSTGRES_SEQ_SCAN.search(line):
+            if table := _resolve_table(match.group(1), metadata):
+                problems[table] = FULL_SCAN
+
+        elif line.startswith("USE TEMP B-TREE FOR ORDER BY"):
+            sorts_without_index = True
+
+        elif match := _POSTGRES_SORT_KEY.search(line):
+            for name, _ in _QUALIFIED_COLUMN.findall(match.group(1)):
+                if (table := _resolve_table(name, metadata)) and table not in problems:
+                    problems[table] = UNINDEXED_SORT
+
+    if sorts_without_index and (order_by := _ORDER_BY.search(template)):
+        for name, _ in _QUALIFIED_COLUMN.findall(order_by.group(1)):
+            if (table := _resolve_table(name, metadata)) and table not in problems:
+                problems[table] = UNINDEXED_SORT
+
+    return problems
+
+
+def _candidate_columns(template: str, table: str, reason: str, metadata: MetaData) -> list[str]:
+    """
+    Picks the columns of a table an index should cover for a statement. A scanned table is looked up by the
+    columns it's joined on, then the ones compared to values, then the ones it's sorted by, then the ones
+    filtered to a range. A sorted table only needs the columns compared to values, then the sorted ones.
+    """
+
+    order_by = _ORDER_BY.search(template)
+    join_columns = [column for match in _JOIN_COLUMNS.findall(template) for column in (match[:2], match[2:])]
+    value_columns = _VALUE_COLUMN.findall(template)
+    order_columns = _QUALIFIED_COLUMN.findall(order_by.group(1)) if order_by else []
+
+    if reason == FULL_SCAN:
+        groups = [join_columns, value_columns, order_columns, _RANGE_COLUMN.findall(template)]
+    else:
+        groups = [value_columns, order_columns]
+
+    table_columns = metadata.tables[table].columns
+    columns: list[str] = []
+    for group in groups:
+        for name, column in group:
+            if _resolve_table(name, metadata) == table and column in table_columns and column not in columns:
+                columns.append(column)
+
+    return columns[:MAX_INDEX_COLUMNS]
+
+
+def _is_indexed(table: str, columns: list[str], metadata: MetaData) -> bool:
+    """
+    Whether an existing index starts with the columns, or the columns start with a primary key or unique
+    constraint, since the columns after a unique key can't narrow the lookup down any further
+    """
+
+    sa_table = metadata.tables[table]
+    unique = [[column.name for column in sa_table.primary_key.columns]]
+    unique.extend(
+        [column.name for column in constraint.columns]
+        for constraint in sa_table.constraints
+        if isinstance(constraint, UniqueConstraint)
+    )
+    unique.extend([column.name for column in index.columns] for index in sa_table.indexes if index.unique)
+    if any(unique_columns and columns[: len(unique_columns)] == unique_columns for unique_columns in unique):
+        return True
+
+    indexes = [[column.name for column in index.columns] for index in sa_table.indexes]
+    return any(index_columns[: len(columns)] == columns for index_columns in indexes + unique)
+
+
+def recommend_indexes(statements: Iterable[StatementStats], metadata: MetaData) -> list[IndexRecommendation]:
+    """
+    Recommends indexes for the tables that the captured plans scan or sort, on the columns the statements
+    look them up and sort them by. Recommendations are ordered by the time spent in the statements they'd help.
+    """
+
+    recommendations: dict[tuple[str, tuple[str, ...]], IndexRecommendation] = {}
+    for stats in statements:
+        if not stats.plan:
+            continue
+
+        for table, reason in _plan_problems(stats.plan, stats.template, metadata).items():
+            columns = _candidate_columns(stats.template, table, reason, metadata)
+            if not columns or _is_indexed(table, columns, metadata):
+                continue
+
+            key = (table, tuple(columns))
+            if key not in recommendations:
+                recommendations[key] = IndexRecommendation(table=table, columns=columns, reason=reason)
+
+            recommendations[key].statements += 1
+            recommendations[key].total_ms += stats.total_ms
+
+    return sorted(recommendations.values(), key=lambda recommendation: recommendation.total_ms, reverse=True)
+
+
+query_stats_recorder = QueryStatsRecorder(get_app_settings().DB_SLOW_QUERY_MS, get_app_settings().DB_QUERY_STATS_SIZE)
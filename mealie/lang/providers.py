@@ -40,20 +40,20 @@ def _load_factory() -> i18n.ProviderFactory:
     )
 
 
+def _negotiate_locale(accept_language: str | None) -> str:
+    # when called directly, rather than as a dependency, the default is the `Header` itself
+    return _load_factory().negotiate(accept_language if isinstance(accept_language, str) else None)
+
+
 def get_locale_provider(accept_language: str | None = Header(None)) -> Translator:
-    factory = _load_factory()
-    accept_language = accept_language or "en-US"
-    return factory.get(accept_language)
+    """Returns the translator for the best supported match of a locale or Accept-Language header"""
+    return _load_factory().get(_negotiate_locale(accept_language))
 
 
 def get_locale_config(accept_language: str | None = Header(None)) -> LocaleConfig:
-    if accept_language and accept_language in LOCALE_CONFIG:
-        return LOCALE_CONFIG[accept_language]
-    else:
-        return LOCALE_CONFIG["en-US"]
+    return LOCALE_CONFIG.get(_negotiate_locale(accept_language)) or LOCALE_CONFIG["en-US"]
 
 
 @lru_cache
 def get_all_translations(key: str) -> dict[str, str]:
-    factory = _load_factory()
-    return {locale: factory.get(locale).t(key) for locale in factory.supported_locales}
+    return {locale: provider.t(key) for locale, provider in _load_factory().providers.items()}
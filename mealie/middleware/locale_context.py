@@ -1,22 +1,28 @@
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from mealie.lang.providers import get_locale_config, get_locale_provider, set_locale_context
 
 
-class LocaleContextMiddleware(BaseHTTPMiddleware):
+class LocaleContextMiddleware:
     """
     Inject translator and locale config into context var.
     This allows any part of the app to call get_locale_context, as long as it's within an HTTP request context.
+
+    This is a pure ASGI middleware, rather than a `BaseHTTPMiddleware`, so requests aren't run in a separate
+    task and response bodies aren't re-streamed through it.
     """
 
-    async def dispatch(self, request: Request, call_next):
-        accept_language = request.headers.get("accept-language")
-        translator = get_locale_provider(accept_language)
-        locale_config = get_locale_config(accept_language)
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] in ("http", "websocket"):
+            accept_language = Headers(scope=scope).get("accept-language")
+            translator = get_locale_provider(accept_language)
+            locale_config = get_locale_config(accept_language)
 
-        # Set context for this request
-        set_locale_context(translator, locale_config)
+            # Set context for this request
+            set_locale_context(translator, locale_config)
 
-        response = await call_next(request)
-        return response
+        await self.app(scope, receive, send)
@@ -1,18 +1,32 @@
 import json
+from collections.abc import Mapping
 from dataclasses import dataclass
 from pathlib import Path
-from typing import cast
+from types import MappingProxyType
+from typing import Any
+
+
+def flatten_translations(translations: Mapping[str, Any], prefix: str = "") -> dict[str, Any]:
+    """Flattens nested translations into one table keyed by dotted path, e.g. `{"a": {"b": "c"}}` -> `{"a.b": "c"}`"""
+
+    flat: dict[str, Any] = {}
+    for key, value in translations.items():
+        if isinstance(value, Mapping):
+            flat.update(flatten_translations(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+
+    return flat
 
 
 @dataclass(slots=True)
 class JsonProvider:
-    translations: dict
+    translations: Mapping[str, Any]
+    """read-only, flattened table of translations; providers are shared between requests"""
 
     def __init__(self, path: Path | dict):
-        if isinstance(path, Path):
-            self.translations = json.loads(path.read_text())
-        else:
-            self.translations = path
+        data = json.loads(path.read_text()) if isinstance(path, Path) else path
+        self.translations = MappingProxyType(flatten_translations(data))
 
     def _parse_plurals(self, value: str, count: float):
         # based off of: https://kazupon.github.io/vue-i18n/guide/pluralization.html
@@ -31,28 +45,16 @@ class JsonProvider:
             return values[0]
 
     def t(self, key: str, default=None, **kwargs) -> str:
-        keys = key.split(".")
-
-        translation_value: dict | str = self.translations
-        last = len(keys) - 1
-
-        for i, k in enumerate(keys):
-            if k not in translation_value:
-                break
-
-            try:
-                translation_value = translation_value[k]  # type: ignore
-            except Exception:
-                break
-
-            if i == last:
-                for key, value in kwargs.items():
-                    translation_value = cast(str, translation_value)
-                    if value is None:
-                        value = ""
-                    if key == "count":
-                        translation_value = self._parse_plurals(translation_value, float(value))
-                    translation_value = translation_value.replace("{" + key + "}", str(value))  # type: ignore
-                return translation_value  # type: ignore
-
-        return default or key
+        try:
+            translation_value = self.translations[key]
+        except KeyError:
+            return default or key
+
+        for key, value in kwargs.items():
+            if value is None:
+                value = ""
+            if key == "count":
+                translation_value = self._parse_plurals(translation_value, float(value))
+            translation_value = translation_value.replace("{" + key + "}", str(value))
+
+        return translation_value
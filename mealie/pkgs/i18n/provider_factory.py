@@ -1,14 +1,42 @@
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from functools import cached_property
 from pathlib import Path
+from types import MappingProxyType
 
 from .json_provider import JsonProvider
 
 
-@dataclass(slots=True)
-class InUseProvider:
-    provider: JsonProvider
-    locks: int
+def parse_accept_language(accept_language: str | None) -> list[str]:
+    """
+    Parses an Accept-Language header (e.g. `en-US,en;q=0.9,de;q=0.8`) into language tags, ordered by preference.
+    Tags with `q=0` are dropped; tags with the same weight keep their order from the header.
+    """
+
+    if not accept_language:
+        return []
+
+    weighted: list[tuple[float, str]] = []
+    for part in accept_language.split(","):
+        tag, _, params = part.strip().partition(";")
+        tag = tag.strip()
+        if not tag:
+            continue
+
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0
+
+        if q > 0:
+            weighted.append((q, tag))
+
+    weighted.sort(key=lambda item: item[0], reverse=True)  # stable, so ties keep the header order
+    return [tag for _, tag in weighted]
 
 
 @dataclass
@@ -17,7 +45,16 @@ class ProviderFactory:
     fallback_locale: str = "en-US"
     filename_format = "{locale}.{format}"
 
-    _store: dict[str, InUseProvider] = field(default_factory=dict)
+    _store: Mapping[str, JsonProvider] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        # every supported locale is loaded once, up front, so the store never grows after startup
+        self._store = MappingProxyType(
+            {
+                locale: JsonProvider(self.directory / self.filename_format.format(locale=locale, format="json"))
+                for locale in self.supported_locales
+            }
+        )
 
     @property
     def fallback_file(self) -> Path:
@@ -25,24 +62,57 @@ class ProviderFactory:
 
     @cached_property
     def supported_locales(self) -> list[str]:
-        return [path.stem for path in self.directory.glob(self.filename_format.format(locale="*", format="json"))]
+        return sorted(path.stem for path in self.directory.glob(self.filename_format.format(locale="*", format="json")))
+
+    @cached_property
+    def _locales_by_tag(self) -> dict[str, str]:
+        """Maps lowercase language tags, both full (`de-de`) and language-only (`de`), to a supported locale"""
 
-    def _load(self, locale: str) -> JsonProvider:
-        filename = self.filename_format.format(locale=locale, format="json")
-        path = self.directory / filename
+        by_tag: dict[str, str] = {}
+        for locale in self.supported_locales:
+            by_tag[locale.lower()] = locale
 
-        return JsonProvider(path) if path.exists() else JsonProvider(self.fallback_file)
+        def preference(locale: str) -> int:
+            # for a bare language, prefer the fallback locale (en -> en-US), then the locale whose
+            # region matches the language (de -> de-DE), then the first one alphabetically
+            language, _, region = locale.lower().partition("-")
+            if locale == self.fallback_locale:
+                return 0
+            return 1 if region == language else 2
 
-    def release(self, locale) -> None:
-        if locale in self._store:
-            self._store[locale].locks -= 1
-            if self._store[locale].locks == 0:
-                del self._store[locale]
+        for locale in sorted(self.supported_locales, key=preference):
+            by_tag.setdefault(locale.partition("-")[0].lower(), locale)
 
-    def get(self, locale: str) -> JsonProvider:
-        if locale in self._store:
-            self._store[locale].locks += 1
-        else:
-            self._store[locale] = InUseProvider(provider=self._load(locale), locks=1)
+        return by_tag
 
-        return self._store[locale].provider
+    def negotiate(self, accept_language: str | None) -> str:
+        """Returns the supported locale that best matches an Accept-Language header, or the fallback locale"""
+
+        for tag in parse_accept_language(accept_language):
+            tag = tag.replace("_", "-").lower()
+            if tag == "*":
+                return self.fallback_locale
+
+            # try the full tag, then language-region without a script subtag (zh-Hant-TW -> zh-TW), then the language
+            subtags = tag.split("-")
+            for candidate in (tag, f"{subtags[0]}-{subtags[-1]}", subtags[0]):
+                if locale := self._locales_by_tag.get(candidate):
+                    return locale
+
+        return self.fallback_locale
+
+    def get(self, locale: str | None) -> JsonProvider:
+        """
+        Returns the translations for a locale or Accept-Language header. Unsupported locales
+        get the fallback locale's translations.
+        """
+
+        if locale is not None and (provider := self._store.get(locale)) is not None:
+            return provider
+
+        return self._store[self.negotiate(locale)]
+
+    @property
+    def providers(self) -> Mapping[str, JsonProvider]:
+        """All loaded providers, by locale"""
+        return self._store
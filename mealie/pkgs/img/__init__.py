@@ -4,3 +4,4 @@ within the img package should not be tightly coupled to Mealie.
 """
 
 from .minify import *
+from .sniff import *
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from io import BytesIO
 from logging import Logger
 from pathlib import Path
 
@@ -106,6 +107,36 @@ class PillowMinifier(ABCMinifier):
             image_file=image_file_path, image_format=JPG, dest=dest, quality=quality, img=img
         )
 
+    @staticmethod
+    def to_jpg_bytes(image_file_path: Path, max_size: tuple[int, int] | None = None, quality: int = 100) -> bytes:
+        """
+        Encodes an image as a JPEG in memory. If `max_size` is given as `(long side, short side)`, the image
+        is downscaled to fit within it, whichever way round it is; images are never upscaled.
+        """
+
+        def fit(size: tuple[int, int]) -> tuple[int, int]:
+            if not max_size:
+                return size
+
+            scale = min(1.0, max_size[0] / max(size), max_size[1] / min(size))
+            return max(1, round(size[0] * scale)), max(1, round(size[1] * scale))
+
+        with Image.open(image_file_path) as img:
+            # JPEGs can be decoded at a fraction of their size, which is much faster than decoding them in full
+            img.draft(JPG.modes[0], fit(img.size))
+
+            img = ImageOps.exif_transpose(img)
+            if img.mode not in JPG.modes:
+                img = img.convert(JPG.modes[0])
+
+            if (size := fit(img.size)) != img.size:
+                img = img.resize(size, Image.LANCZOS)
+
+            buffer = BytesIO()
+            img.save(buffer, JPG.format, quality=quality, optimize=True)
+
+        return buffer.getvalue()
+
     @staticmethod
     def to_webp(
         image_file_path: Path | None = None,
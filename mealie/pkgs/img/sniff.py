@@ -0,0 +1,35 @@
+SNIFF_LENGTH = 32
+"""Number of leading bytes required to identify an image format"""
+
+_ISO_BMFF_BRANDS = {
+    b"avif": ".avif",
+    b"avis": ".avif",
+    b"heic": ".heic",
+    b"heix": ".heic",
+    b"hevc": ".heic",
+    b"heim": ".heic",
+    b"heis": ".heic",
+    b"mif1": ".heic",
+    b"msf1": ".heic",
+}
+
+
+def sniff_image_extension(header: bytes) -> str | None:
+    """
+    Identifies an image by its leading "magic" bytes, rather than trusting the Content-Type
+    header or file extension. Returns the file extension for the image format (e.g. ".jpg"),
+    or None if the bytes are not a supported image.
+    """
+
+    if header.startswith(b"\xff\xd8\xff"):
+        return ".jpg"
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return ".png"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return ".webp"
+    if header[:6] in (b"GIF87a", b"GIF89a"):
+        return ".gif"
+    if header[4:8] == b"ftyp":
+        return _ISO_BMFF_BRANDS.get(header[8:12])
+
+    return None
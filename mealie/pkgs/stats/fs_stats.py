@@ -24,17 +24,24 @@ def pretty_size(size: int) -> str:
 
 def get_dir_size(path: Path | str) -> int:
     """
-    Get the size of a directory
+    Get the size of a directory, including the size of the directory entries themselves
     """
     try:
-        total_size = os.path.getsize(path)
-    except FileNotFoundError:
+        total_size = os.stat(path).st_size
+        entries = os.scandir(path)
+    except (FileNotFoundError, NotADirectoryError):
         return 0
 
-    for item in os.listdir(path):
-        itempath = os.path.join(path, item)
-        if os.path.isfile(itempath):
-            total_size += os.path.getsize(itempath)
-        elif os.path.isdir(itempath):
-            total_size += get_dir_size(itempath)
+    # scandir returns the entry type with each name, so files only need a single stat call
+    with entries:
+        for entry in entries:
+            try:
+                if entry.is_file():
+                    total_size += entry.stat().st_size
+                elif entry.is_dir():
+                    total_size += get_dir_size(entry.path)
+            except FileNotFoundError:
+                # removed while walking the directory
+                continue
+
     return total_size
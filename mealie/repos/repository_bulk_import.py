@@ -0,0 +1,158 @@
+from collections.abc import Iterable
+from datetime import datetime
+
+import orjson
+from pydantic import UUID4
+from sqlalchemy import ColumnElement, func, insert, or_, select, update
+
+from mealie.db.models._model_utils.datetime import get_utc_now
+from mealie.db.models._model_utils.guid import GUID
+from mealie.db.models.group import BulkImportJobItemModel, BulkImportJobModel
+from mealie.db.models.recipe.recipe import RecipeModel
+from mealie.schema.recipe.recipe import CreateRecipeBulk
+from mealie.schema.recipe.recipe_bulk_import import (
+    BulkImportItemStatus,
+    BulkImportJobItemOut,
+    BulkImportJobOut,
+    BulkImportJobStatus,
+)
+from mealie.schema.user.user import PrivateUser
+
+from .repository_generic import GroupRepositoryGeneric
+
+
+class RepositoryBulkImportJobs(GroupRepositoryGeneric[BulkImportJobOut, BulkImportJobModel]):
+    def create_job(self, report_id: UUID4, user: PrivateUser, imports: Iterable[CreateRecipeBulk]) -> BulkImportJobOut:
+        """
+        Creates a new job and all of its items. Items are inserted in a single statement,
+        since a bulk import can contain thousands of URLs.
+        """
+
+        job = BulkImportJobModel(
+            session=self.session,
+            status=BulkImportJobStatus.in_progress.value,
+            report_id=report_id,
+            group_id=user.group_id,
+            household_id=user.household_id,
+            user_id=user.id,
+        )
+        self.session.add(job)
+        self.session.flush()
+
+        items = [
+            {
+                "id": GUID.generate(),
+                "job_id": job.id,
+                "position": i,
+                "url": data.url,
+                "status": BulkImportItemStatus.pending.value,
+                "tags": orjson.dumps([t.model_dump(mode="json") for t in data.tags]).decode() if data.tags else None,
+                "categories": (
+                    orjson.dumps([c.model_dump(mode="json") for c in data.categories]).decode()
+                    if data.categories
+                    else None
+                ),
+            }
+            for i, data in enumerate(imports)
+        ]
+
+        try:
+            if items:
+                self.session.execute(insert(BulkImportJobItemModel), items)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+        self.session.refresh(job)
+        return self.schema.model_validate(job)
+
+    def _is_claimable(self, lease_expires_before: datetime) -> ColumnElement[bool]:
+        """in progress, and never claimed or its lease has lapsed, i.e. it wasn't renewed in time"""
+
+        return (self.model.status == BulkImportJobStatus.in_progress.value) & or_(
+            self.model.runner_id.is_(None),
+            self.model.heartbeat_at.is_(None),
+            self.model.heartbeat_at < lease_expires_before,
+        )
+
+    def get_claimable(self, lease_expires_before: datetime) -> list[BulkImportJobOut]:
+        """Returns the unfinished jobs that no runner holds a current lease on"""
+
+        stmt = select(self.model).filter_by(**self._filter_builder()).where(self._is_claimable(lease_expires_before))
+        return [self.schema.model_validate(job) for job in self.session.execute(stmt).scalars().all()]
+
+    def claim(self, job_id: UUID4, runner_id: str, lease_expires_before: datetime) -> bool:
+        """
+        Atomically assigns the job to `runner_id` and starts its lease, unless a runner holds a lease renewed
+        since `lease_expires_before`. When several workers try to take a job at once, only one wins.
+        """
+
+        stmt = (
+            update(self.model)
+            .where(self.model.id == job_id, self._is_claimable(lease_expires_before))
+            .values(runner_id=runner_id, heartbeat_at=get_utc_now())
+        )
+
+        result = self.session.execute(stmt)
+        self.session.commit()
+        return bool(result.rowcount)  # type: ignore[attr-defined]
+
+    def renew_lease(self, job_id: UUID4, runner_id: str) -> bool:
+        """Renews `runner_id`'s lease on the job, returning `False` if another runner has taken it over"""
+
+        stmt = (
+            update(self.model)
+            .where(self.model.id == job_id, self.model.runner_id == runner_id)
+            .values(heartbeat_at=get_utc_now())
+        )
+
+        result = self.session.execute(stmt)
+        self.session.commit()
+        return bool(result.rowcount)  # type: ignore[attr-defined]
+
+    def complete(self, job_id: UUID4) -> None:
+        stmt = update(self.model).where(self.model.id == job_id).values(status=BulkImportJobStatus.complete.value)
+        self.session.execute(stmt)
+        self.session.commit()
+
+    def get_items(self, job_id: UUID4, statuses: Iterable[BulkImportItemStatus]) -> list[BulkImportJobItemOut]:
+        stmt = (
+            select(BulkImportJobItemModel)
+            .where(
+                BulkImportJobItemModel.job_id == job_id,
+                BulkImportJobItemModel.status.in_([s.value for s in statuses]),
+            )
+            .order_by(BulkImportJobItemModel.position)
+        )
+        return [BulkImportJobItemOut.model_validate(item) for item in self.session.execute(stmt).scalars().all()]
+
+    def set_item_status(self, item_id: UUID4, status: BulkImportItemStatus, **values) -> None:
+        stmt = (
+            update(BulkImportJobItemModel)
+            .where(BulkImportJobItemModel.id == item_id)
+            .values(status=status.value, **values)
+        )
+        self.session.execute(stmt)
+        self.session.commit()
+
+    def count_item_statuses(self, job_id: UUID4) -> dict[BulkImportItemStatus, int]:
+        stmt = (
+            select(BulkImportJobItemModel.status, func.count())
+            .where(BulkImportJobItemModel.job_id == job_id)
+            .group_by(BulkImportJobItemModel.status)
+        )
+        return {BulkImportItemStatus(status): count for status, count in self.session.execute(stmt).all()}
+
+    def get_imported_urls(self, urls: Iterable[str]) -> set[str]:
+        """Returns the subset of `urls` which have already been imported as recipes into the group"""
+
+        urls = list(set(urls))
+        if not urls:
+            return set()
+
+        stmt = select(RecipeModel.org_url).where(RecipeModel.org_url.in_(urls))
+        if self.group_id:
+            stmt = stmt.where(RecipeModel.group_id == self.group_id)
+
+        return {url for url in self.session.execute(stmt).scalars().all() if url}
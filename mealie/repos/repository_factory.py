@@ -6,7 +6,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from mealie.db.models._model_utils.guid import GUID
-from mealie.db.models.group import Group, ReportEntryModel, ReportModel
+from mealie.db.models.group import BulkImportJobModel, Group, ReportEntryModel, ReportModel
 from mealie.db.models.group.exports import GroupDataExportsModel
 from mealie.db.models.group.preferences import GroupPreferencesModel
 from mealie.db.models.household.cookbook import CookBook
@@ -37,6 +37,7 @@ from mealie.db.models.recipe.tool import Tool
 from mealie.db.models.users import LongLiveToken, User
 from mealie.db.models.users.password_reset import PasswordResetModel
 from mealie.db.models.users.user_to_recipe import UserToRecipe
+from mealie.repos.repository_bulk_import import RepositoryBulkImportJobs
 from mealie.repos.repository_cookbooks import RepositoryCookbooks
 from mealie.repos.repository_foods import RepositoryFood
 from mealie.repos.repository_household import RepositoryHousehold, RepositoryHouseholdRecipes
@@ -62,6 +63,7 @@ from mealie.schema.labels import MultiPurposeLabelOut
 from mealie.schema.meal_plan.new_meal import ReadPlanEntry
 from mealie.schema.meal_plan.plan_rules import PlanRulesOut
 from mealie.schema.recipe import Recipe, RecipeCommentOut, RecipeToolOut
+from mealie.schema.recipe.recipe_bulk_import import BulkImportJobOut
 from mealie.schema.recipe.recipe_category import CategoryOut, TagOut
 from mealie.schema.recipe.recipe_ingredient import IngredientFood, IngredientUnit
 from mealie.schema.recipe.recipe_share_token import RecipeShareToken
@@ -221,6 +223,12 @@ class AllRepositories:
     def group_report_entries(self) -> GroupRepositoryGeneric[ReportEntryOut, ReportEntryModel]:
         return GroupRepositoryGeneric(self.session, PK_ID, ReportEntryModel, ReportEntryOut, group_id=self.group_id)
 
+    @cached_property
+    def bulk_import_jobs(self) -> RepositoryBulkImportJobs:
+        return RepositoryBulkImportJobs(
+            self.session, PK_ID, BulkImportJobModel, BulkImportJobOut, group_id=self.group_id
+        )
+
     # ================================================================
     # Household
 
@@ -1,8 +1,18 @@
 from pydantic import UUID4
-from sqlalchemy import select
+from sqlalchemy import delete, insert, literal, select, update
+from sqlalchemy.exc import NoResultFound
 
-from mealie.db.models.recipe.ingredient import IngredientFoodModel
+from mealie.db.models._model_utils.guid import GUID
+from mealie.db.models.household.shopping_list import ShoppingListItem, record_item_updates
+from mealie.db.models.recipe.api_extras import IngredientFoodExtras
+from mealie.db.models.recipe.ingredient import (
+    IngredientFoodAliasModel,
+    IngredientFoodModel,
+    RecipeIngredientModel,
+    households_to_ingredient_foods,
+)
 from mealie.schema.recipe.recipe_ingredient import IngredientFood
+from mealie.services.recipe.recipe_read_cache import clear_on_commit
 
 from .repository_generic import GroupRepositoryGeneric
 
@@ -13,14 +23,91 @@ class RepositoryFood(GroupRepositoryGeneric[IngredientFood, IngredientFoodModel]
         return self.session.execute(stmt).scalars().one()
 
     def merge(self, from_food: UUID4, to_food: UUID4) -> IngredientFood | None:
-        from_model = self._get_food(from_food)
+        return self.merge_many([from_food], to_food)
+
+    def merge_many(self, from_foods: list[UUID4], to_food: UUID4, commit: bool = True) -> IngredientFood | None:
+        """
+        Merges `from_foods` into `to_food` and deletes them. Everything referencing them is moved over with a
+        handful of set-based statements in a single transaction, so the merged foods' rows are never loaded:
+        recipe ingredients, shopping list items, aliases, extras (unless `to_food` has the same key), and the
+        households that have them on hand. `to_food` takes the first merged food's label if it has none.
+
+        Pass `commit=False` to merge several groups of foods in one transaction; the caller commits it.
+        On failure the whole transaction is rolled back.
+        """
+
         to_model = self._get_food(to_food)
+        from_ids = set(from_foods) - {to_model.id}
 
-        to_model.ingredients += from_model.ingredients
+        stmt = (
+            select(self.model.id, self.model.label_id)
+            .filter_by(**self._filter_builder())
+            .where(self.model.id.in_(from_ids))
+        )
+        label_ids = {row.id: row.label_id for row in self.session.execute(stmt)}
+        if missing := from_ids - label_ids.keys():
+            raise NoResultFound(f"Foods not found: {', '.join(map(str, missing))}")
 
+        # the merged rows are deleted at the end, so there's nothing in the session to keep in sync
+        no_sync = {"synchronize_session": False}
+        on_hand = households_to_ingredient_foods.c
+        extras = IngredientFoodExtras
         try:
-            self.session.delete(from_model)
-            self.session.commit()
+            if to_model.label_id is None:
+                to_model.label_id = next((label_ids[id] for id in from_foods if label_ids.get(id)), None)
+
+            self.session.execute(
+                update(RecipeIngredientModel)
+                .where(RecipeIngredientModel.food_id.in_(from_ids))
+                .values(food_id=to_model.id),
+                execution_options=no_sync,
+            )
+
+            # bulk updates skip the events that record shopping list changes, so clients are told here
+            items = self.session.execute(
+                update(ShoppingListItem)
+                .where(ShoppingListItem.food_id.in_(from_ids))
+                .values(food_id=to_model.id)
+                .returning(ShoppingListItem.shopping_list_id, ShoppingListItem.id),
+                execution_options=no_sync,
+            )
+            record_item_updates(self.session, items.tuples().all())
+
+            self.session.execute(
+                update(IngredientFoodAliasModel)
+                .where(IngredientFoodAliasModel.food_id.in_(from_ids))
+                .values(food_id=to_model.id),
+                execution_options=no_sync,
+            )
+
+            to_keys = select(extras.key_name).where(
+                extras.ingredient_food_id == to_model.id, extras.key_name.is_not(None)
+            )
+            self.session.execute(
+                update(extras)
+                .where(extras.ingredient_food_id.in_(from_ids), extras.key_name.not_in(to_keys))
+                .values(ingredient_food_id=to_model.id),
+                execution_options=no_sync,
+            )
+            self.session.execute(
+                delete(extras).where(extras.ingredient_food_id.in_(from_ids)), execution_options=no_sync
+            )
+
+            households_with_to_food = select(on_hand.household_id).where(on_hand.food_id == to_model.id)
+            self.session.execute(
+                insert(households_to_ingredient_foods).from_select(
+                    ["household_id", "food_id"],
+                    select(on_hand.household_id, literal(to_model.id, GUID))
+                    .where(on_hand.food_id.in_(from_ids), on_hand.household_id.not_in(households_with_to_food))
+                    .distinct(),
+                )
+            )
+            self.session.execute(delete(households_to_ingredient_foods).where(on_hand.food_id.in_(from_ids)))
+
+            self.session.execute(delete(self.model).where(self.model.id.in_(from_ids)), execution_options=no_sync)
+            clear_on_commit(self.session)
+            if commit:
+                self.session.commit()
         except Exception as e:
             self.session.rollback()
             raise e
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import random
 from collections.abc import Iterable
+from contextlib import AbstractContextManager, nullcontext
 from datetime import UTC, datetime
 from math import ceil
 from typing import Any
@@ -16,6 +17,7 @@ from sqlalchemy.sql import sqltypes
 
 from mealie.core.root_logger import get_logger
 from mealie.db.models._model_base import SqlAlchemyBase
+from mealie.db.query_stats import query_stats_recorder
 from mealie.schema._mealie import MealieModel
 from mealie.schema.response.pagination import (
     OrderByNullPosition,
@@ -76,6 +78,28 @@ class RepositoryGeneric[Schema: MealieModel, Model: SqlAlchemyBase]:
         self.logger.error(f"Error processing query for Repo model={self.model.__name__} schema={self.schema.__name__}")
         self.logger.error(e)
 
+    def _record_query_shape(self, pagination: RequestQuery, search: str | None) -> AbstractContextManager:
+        """
+        Attributes the statements run for a page to the shape of its query filter, order, and search, for the
+        admin query report. Does nothing unless query stats are enabled.
+        """
+
+        if not query_stats_recorder.enabled:
+            return nullcontext()
+
+        shape = self.model.__name__
+        if pagination.query_filter:
+            try:
+                shape += f" | filter: {QueryFilterBuilder(pagination.query_filter).shape}"
+            except ValueError:
+                shape += " | filter: (invalid)"
+        if pagination.order_by:
+            shape += f" | order by: {pagination.order_by.replace(' ', '')}"
+        if search:
+            shape += " | search"
+
+        return query_stats_recorder.query_shape(shape)
+
     def _query(self, override_schema: type[MealieModel] | None = None, with_options=True):
         q = select(self.model)
 
@@ -336,16 +360,17 @@ class RepositoryGeneric[Schema: MealieModel, Model: SqlAlchemyBase]:
             # default ordering if not searching
             pagination_result.order_by = "created_at"
 
-        q, count, total_pages = self.add_pagination_to_query(q, pagination_result)
+        with self._record_query_shape(pagination_result, search):
+            q, count, total_pages = self.add_pagination_to_query(q, pagination_result)
 
-        # Apply options late, so they do not get used for counting
-        q = q.options(*eff_schema.loader_options())
-        try:
-            data = self.session.execute(q).unique().scalars().all()
-        except Exception as e:
-            self._log_exception(e)
-            self.session.rollback()
-            raise e
+            # Apply options late, so they do not get used for counting
+            q = q.options(*eff_schema.loader_options())
+            try:
+                data = self.session.execute(q).unique().scalars().all()
+            except Exception as e:
+                self._log_exception(e)
+                self.session.rollback()
+                raise e
         return PaginationBase(
             page=pagination_result.page,
             per_page=pagination_result.per_page,
@@ -91,21 +91,23 @@ class RepositoryHousehold(GroupRepositoryGeneric[HouseholdInDB, Household]):
             return self.get_one(slug_or_id, key="slug")
 
     def statistics(self, group_id: UUID4, household_id: UUID4) -> HouseholdStatistics:
-        def model_count(model: type[SqlAlchemyBase], *, filter_household: bool = True) -> int:
+        def model_count(model: type[SqlAlchemyBase], *, filter_household: bool = True):
             stmt = select(func.count(model.id)).filter_by(group_id=group_id)
             if filter_household:
                 stmt = stmt.filter_by(household_id=household_id)
-            return self.session.scalar(stmt)
+            return stmt.scalar_subquery()
 
-        return HouseholdStatistics(
+        # all counts are fetched in a single round trip
+        stmt = select(
             # household-level statistics
-            total_recipes=model_count(RecipeModel),
-            total_users=model_count(User),
+            model_count(RecipeModel).label("total_recipes"),
+            model_count(User).label("total_users"),
             # group-level statistics
-            total_categories=model_count(Category, filter_household=False),
-            total_tags=model_count(Tag, filter_household=False),
-            total_tools=model_count(Tool, filter_household=False),
+            model_count(Category, filter_household=False).label("total_categories"),
+            model_count(Tag, filter_household=False).label("total_tags"),
+            model_count(Tool, filter_household=False).label("total_tools"),
         )
+        return HouseholdStatistics.model_validate(self.session.execute(stmt).one()._asdict())
 
 
 class RepositoryHouseholdRecipes(HouseholdRepositoryGeneric[HouseholdRecipeOut, HouseholdToRecipe]):
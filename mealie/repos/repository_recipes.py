@@ -1,7 +1,10 @@
 import re as re
-from collections.abc import Iterable, Sequence
+from collections import defaultdict
+from collections.abc import Collection, Iterable, Sequence
+from datetime import UTC, datetime
+from itertools import batched
 from random import randint
-from typing import Self, cast
+from typing import Any, NamedTuple, Self, cast
 from uuid import UUID
 
 import sqlalchemy as sa
@@ -11,18 +14,29 @@ from sqlalchemy import orm
 from sqlalchemy.exc import IntegrityError
 
 from mealie.db.models.household import Household, HouseholdToRecipe
-from mealie.db.models.recipe.category import Category
-from mealie.db.models.recipe.ingredient import RecipeIngredientModel, households_to_ingredient_foods
+from mealie.db.models.recipe.category import Category, recipes_to_categories
+from mealie.db.models.recipe.ingredient import (
+    IngredientFoodModel,
+    RecipeIngredientModel,
+    households_to_ingredient_foods,
+)
 from mealie.db.models.recipe.recipe import RecipeModel
 from mealie.db.models.recipe.settings import RecipeSettings
-from mealie.db.models.recipe.tag import Tag
+from mealie.db.models.recipe.tag import Tag, recipes_to_tags
 from mealie.db.models.recipe.tool import Tool, households_to_tools, recipes_to_tools
 from mealie.db.models.users.user_to_recipe import UserToRecipe
 from mealie.db.models.users.users import User
 from mealie.schema.cookbook.cookbook import ReadCookBook
 from mealie.schema.recipe import Recipe
-from mealie.schema.recipe.recipe import RecipePagination, RecipeSummary, create_recipe_slug
-from mealie.schema.recipe.recipe_ingredient import IngredientFood
+from mealie.schema.recipe.recipe import (
+    RecipeCategory,
+    RecipePagination,
+    RecipeSummary,
+    RecipeTag,
+    RecipeTool,
+    create_recipe_slug,
+)
+from mealie.schema.recipe.recipe_ingredient import INGREDIENT_QTY_PRECISION, IngredientFood
 from mealie.schema.recipe.recipe_suggestion import RecipeSuggestionQuery, RecipeSuggestionResponseItem
 from mealie.schema.recipe.recipe_tool import RecipeToolOut
 from mealie.schema.response.pagination import PaginationQuery
@@ -31,6 +45,54 @@ from mealie.services.query_filter.builder import QueryFilterBuilder
 from ..db.models._model_base import SqlAlchemyBase
 from .repository_generic import HouseholdRepositoryGeneric
 
+_SUMMARY_COLUMNS = (
+    RecipeModel.id,
+    RecipeModel.user_id,
+    RecipeModel.group_id,
+    RecipeModel.name,
+    RecipeModel.slug,
+    RecipeModel.image,
+    RecipeModel.recipe_servings,
+    RecipeModel.recipe_yield_quantity,
+    RecipeModel.recipe_yield,
+    RecipeModel.total_time,
+    RecipeModel.prep_time,
+    RecipeModel.cook_time,
+    RecipeModel.perform_time,
+    RecipeModel.description,
+    RecipeModel.rating,
+    RecipeModel.org_url,
+    RecipeModel.date_added,
+    RecipeModel.date_updated,
+    RecipeModel.created_at,
+    RecipeModel.update_at.label("updated_at"),
+    RecipeModel.last_made,
+)
+"""the columns selected for a `RecipeSummary`; `household_id` is selected separately"""
+
+_IN_CLAUSE_BATCH_SIZE = 1000
+"""keeps `IN (...)` lists well under the database's bound parameter limit"""
+
+
+class RecipeIngredientProjection(NamedTuple):
+    """The parts of a recipe ingredient needed to add it to a shopping list"""
+
+    recipe_id: UUID4
+    quantity: float | None
+    note: str | None
+    food_id: UUID4 | None
+    label_id: UUID4 | None
+    unit_id: UUID4 | None
+    referenced_recipe_id: UUID4 | None
+
+
+class RecipeLink(NamedTuple):
+    """An ingredient that references a sub-recipe, as the ids of both recipes and the ingredient's quantity"""
+
+    recipe_id: UUID4
+    referenced_recipe_id: UUID4
+    quantity: float | None
+
 
 class RepositoryRecipes(HouseholdRepositoryGeneric[Recipe, RecipeModel]):
     user_id: UUID4 | None = None
@@ -87,6 +149,116 @@ class RepositoryRecipes(HouseholdRepositoryGeneric[Recipe, RecipeModel]):
         )
         return sa.cast(effective_rating, sa.Float)
 
+    def get_version(self, value: str | UUID4, key: str = "id") -> tuple[UUID4, datetime | None, datetime | None] | None:
+        """
+        Returns a recipe's id, `date_updated` and `updated_at`, without loading the recipe. Together they change
+        whenever the recipe row is written, so they can be used to check whether a cached copy is still current.
+        """
+
+        stmt = sa.select(self.model.id, self.model.date_updated, self.model.update_at).filter_by(
+            **self._filter_builder(**{key: value})
+        )
+        row = self.session.execute(stmt).one_or_none()
+        return None if row is None else (row.id, row.date_updated, row.update_at)
+
+    def get_ingredient_projections(self, recipe_ids: Iterable[UUID4]) -> dict[UUID4, list[RecipeIngredientProjection]]:
+        """
+        Returns the ingredients of each recipe, in order, without loading the recipes. Recipes that don't
+        exist are left out, and recipes without ingredients map to an empty list.
+        """
+
+        stmt = (
+            sa.select(
+                RecipeModel.id,
+                RecipeIngredientModel.id.label("ingredient_id"),
+                RecipeIngredientModel.quantity,
+                RecipeIngredientModel.note,
+                RecipeIngredientModel.food_id,
+                IngredientFoodModel.label_id,
+                RecipeIngredientModel.unit_id,
+                RecipeIngredientModel.referenced_recipe_id,
+            )
+            .outerjoin(RecipeIngredientModel, RecipeIngredientModel.recipe_id == RecipeModel.id)
+            .outerjoin(IngredientFoodModel, IngredientFoodModel.id == RecipeIngredientModel.food_id)
+            .order_by(RecipeModel.id, RecipeIngredientModel.position, RecipeIngredientModel.id)
+        )
+        if self.group_id:
+            stmt = stmt.where(RecipeModel.group_id == self.group_id)
+        if self.household_id:
+            stmt = stmt.where(RecipeModel.household_id == self.household_id)
+
+        ingredients: dict[UUID4, list[RecipeIngredientProjection]] = {}
+        for batch in batched(set(recipe_ids), _IN_CLAUSE_BATCH_SIZE):
+            for row in self.session.execute(stmt.where(RecipeModel.id.in_(batch))):
+                recipe_ingredients = ingredients.setdefault(row.id, [])
+                if row.ingredient_id is None:
+                    continue
+
+                recipe_ingredients.append(
+                    RecipeIngredientProjection(
+                        recipe_id=row.id,
+                        # rounded the same way as `RecipeIngredient.quantity`
+                        quantity=None if row.quantity is None else round(row.quantity, INGREDIENT_QTY_PRECISION),
+                        note=row.note,
+                        food_id=row.food_id,
+                        label_id=row.label_id,
+                        unit_id=row.unit_id,
+                        referenced_recipe_id=row.referenced_recipe_id,
+                    )
+                )
+
+        return ingredients
+
+    def _select_recipe_links(self) -> sa.Select:
+        ingredient = RecipeIngredientModel
+        stmt = sa.select(ingredient.recipe_id, ingredient.referenced_recipe_id, ingredient.quantity).where(
+            ingredient.referenced_recipe_id.is_not(None)
+        )
+        if self.group_id or self.household_id:
+            stmt = stmt.join(RecipeModel, RecipeModel.id == ingredient.recipe_id)
+        if self.group_id:
+            stmt = stmt.where(RecipeModel.group_id == self.group_id)
+        if self.household_id:
+            stmt = stmt.where(RecipeModel.household_id == self.household_id)
+
+        return stmt
+
+    def get_recipe_links(self, recipe_ids: Iterable[UUID4]) -> list[RecipeLink]:
+        """
+        Returns the sub-recipe links of the recipes, and of every recipe they reference, directly or through
+        other sub-recipes. The links are followed by a single recursive query that selects only ids and
+        quantities, and it stops on links it has already returned, so it finishes even if they form a cycle.
+        """
+
+        links: dict[RecipeLink, None] = {}
+        for batch in batched(set(recipe_ids), _IN_CLAUSE_BATCH_SIZE):
+            recipe_links = (
+                self._select_recipe_links()
+                .where(RecipeIngredientModel.recipe_id.in_(batch))
+                .cte("recipe_links", recursive=True)
+            )
+            recipe_links = recipe_links.union(
+                self._select_recipe_links().join(
+                    recipe_links, RecipeIngredientModel.recipe_id == recipe_links.c.referenced_recipe_id
+                )
+            )
+
+            for row in self.session.execute(sa.select(recipe_links)):
+                links[RecipeLink(*row)] = None
+
+        return list(links)
+
+    def get_flattened_ingredient_projections(
+        self, recipe_ids: Collection[UUID4]
+    ) -> dict[UUID4, list[RecipeIngredientProjection]]:
+        """
+        Like `get_ingredient_projections`, but also returns the ingredients of every recipe the recipes reference,
+        directly or through other sub-recipes, with two queries no matter how deeply the recipes are nested
+        """
+
+        sub_recipe_ids = {link.referenced_recipe_id for link in self.get_recipe_links(recipe_ids)}
+        return self.get_ingredient_projections({*recipe_ids, *sub_recipe_ids})
+
     def create(self, document: Recipe) -> Recipe:  # type: ignore
         max_retries = 10
         original_name: str = document.name  # type: ignore
@@ -147,8 +319,8 @@ class RepositoryRecipes(HouseholdRepositoryGeneric[Recipe, RecipeModel]):
 
         return results
 
-    def update_image(self, slug: str, _: str | None = None) -> int:
-        entry: RecipeModel = self._query_one(match_value=slug)
+    def update_image(self, slug: str, _: str | None = None, match_key: str | None = None) -> int:
+        entry: RecipeModel = self._query_one(match_value=slug, match_key=match_key)
         entry.image = randint(0, 255)
         self.session.commit()
 
@@ -250,19 +422,17 @@ class RepositoryRecipes(HouseholdRepositoryGeneric[Recipe, RecipeModel]):
             # default ordering if not searching
             pagination_result.order_by = "created_at"
 
-        q, count, total_pages = self.add_pagination_to_query(q, pagination_result)
+        with self._record_query_shape(pagination_result, search):
+            q, count, total_pages = self.add_pagination_to_query(q, pagination_result)
 
-        # Apply options late, so they do not get used for counting
-        q = q.options(*RecipeSummary.loader_options())
-        try:
-            self.logger.debug(f"Recipe Pagination Query: {pagination_result}")
-            data = self.session.execute(q).scalars().unique().all()
-        except Exception as e:
-            self._log_exception(e)
-            self.session.rollback()
-            raise e
+            try:
+                self.logger.debug(f"Recipe Pagination Query: {pagination_result}")
+                items = self._load_summaries(q)
+            except Exception as e:
+                self._log_exception(e)
+                self.session.rollback()
+                raise e
 
-        items = [RecipeSummary.model_validate(item) for item in data]
         return RecipePagination(
             page=pagination_result.page,
             per_page=pagination_result.per_page,
@@ -271,6 +441,88 @@ class RepositoryRecipes(HouseholdRepositoryGeneric[Recipe, RecipeModel]):
             items=items,
         )
 
+    def _load_summaries(self, q: sa.Select) -> list[RecipeSummary]:
+        """
+        Loads the summaries for a filtered, sorted and paginated recipe query. Rather than loading full ORM
+        objects, only the summary columns are selected, and each organizer type is loaded with one query for the
+        whole page. Rows come straight from the database, so summaries are built without re-validating them.
+        """
+
+        # aliased, since filters may already join the users table
+        owner = orm.aliased(User)
+        household_id = (
+            sa.select(owner.household_id)
+            .where(owner.id == RecipeModel.user_id)
+            .correlate(RecipeModel)
+            .scalar_subquery()
+        )
+        rows = self.session.execute(q.with_only_columns(*_SUMMARY_COLUMNS, household_id.label("household_id")))
+
+        datetime_fields = RecipeSummary.datetime_fields()
+        summaries: dict[UUID, dict[str, Any]] = {}
+        for row in rows:
+            if row.id in summaries:
+                # filters can join to more than one row per recipe
+                continue
+
+            summary = row._asdict()
+            for field in datetime_fields:
+                if isinstance(val := summary.get(field), datetime) and not val.tzinfo:
+                    summary[field] = val.replace(tzinfo=UTC)
+
+            summary["recipe_servings"] = summary["recipe_servings"] or 0
+            summary["recipe_yield_quantity"] = summary["recipe_yield_quantity"] or 0
+            summary["recipe_category"] = []
+            summary["tags"] = []
+            summary["tools"] = []
+            summaries[row.id] = summary
+
+        recipe_ids = list(summaries)
+        for recipe_id, category in self._load_organizers(recipe_ids, recipes_to_categories, Category, RecipeCategory):
+            summaries[recipe_id]["recipe_category"].append(category)
+        for recipe_id, tag in self._load_organizers(recipe_ids, recipes_to_tags, Tag, RecipeTag):
+            summaries[recipe_id]["tags"].append(tag)
+
+        tools = self._load_organizers(recipe_ids, recipes_to_tools, Tool, RecipeTool)
+        households_by_tool: dict[UUID, list[str]] = defaultdict(list)
+        tool_ids = list({tool.id for _, tool in tools})
+        for batch in batched(tool_ids, _IN_CLAUSE_BATCH_SIZE):
+            stmt = (
+                sa.select(households_to_tools.c.tool_id, Household.slug)
+                .join(Household, Household.id == households_to_tools.c.household_id)
+                .where(households_to_tools.c.tool_id.in_(batch))
+            )
+            for tool_id, household_slug in self.session.execute(stmt):
+                households_by_tool[tool_id].append(household_slug)
+
+        for recipe_id, tool in tools:
+            tool.households_with_tool = households_by_tool.get(tool.id, [])
+            summaries[recipe_id]["tools"].append(tool)
+
+        return [RecipeSummary.model_construct(**summary) for summary in summaries.values()]
+
+    def _load_organizers[T: RecipeTag](
+        self,
+        recipe_ids: list[UUID],
+        table: sa.Table,
+        model: type[Category | Tag | Tool],
+        schema: type[T],
+    ) -> list[tuple[UUID, T]]:
+        """Loads the organizers of a type (categories, tags, or tools) for a list of recipes"""
+
+        organizer_id = next(col for col in table.c if col.name != "recipe_id")
+        organizers: list[tuple[UUID, T]] = []
+        for batch in batched(recipe_ids, _IN_CLAUSE_BATCH_SIZE):
+            stmt = (
+                sa.select(table.c.recipe_id, model.id, model.group_id, model.name, model.slug)
+                .join(model, model.id == organizer_id)
+                .where(table.c.recipe_id.in_(batch))
+            )
+            for recipe_id, id_, group_id, name, slug in self.session.execute(stmt):
+                organizers.append((recipe_id, schema.model_construct(id=id_, group_id=group_id, name=name, slug=slug)))
+
+        return organizers
+
     def _build_recipe_filter(
         self,
         categories: list[UUID4] | None = None,
@@ -326,6 +578,27 @@ class RepositoryRecipes(HouseholdRepositoryGeneric[Recipe, RecipeModel]):
 
         return [self.schema.model_validate(x) for x in self.session.execute(stmt).scalars().all()]
 
+    def get_ids_with_last_made(self, query_filter: str | None = None) -> dict[UUID4, datetime | None]:
+        """
+        Selects only the ids of the recipes matching `query_filter`, with when each was last made (by the user's
+        household, when the repo is `by_user`), for callers that choose between recipes themselves rather than
+        paging through their summaries
+        """
+
+        last_made = self.column_aliases.get("last_made", self.model.last_made)
+        q = sa.select(self.model.id, last_made).filter(self.model.household_id.is_not(None))
+        q = q.filter_by(**self._filter_builder())
+        if query_filter:
+            try:
+                query_filter_builder = QueryFilterBuilder(query_filter)
+                q = query_filter_builder.filter_query(q, model=self.model, column_aliases=self.column_aliases)
+
+            except ValueError as e:
+                self.logger.error(e)
+                raise HTTPException(status_code=400, detail=str(e)) from e
+
+        return dict(self.session.execute(q).tuples().all())
+
     def get_by_slug(self, group_id: UUID4, slug: str) -> Recipe | None:
         stmt = sa.select(RecipeModel).filter(RecipeModel.group_id == group_id, RecipeModel.slug == slug)
         dbrecipe = self.session.execute(stmt).scalars().one_or_none()
@@ -337,6 +610,40 @@ class RepositoryRecipes(HouseholdRepositoryGeneric[Recipe, RecipeModel]):
         stmt = sa.select(RecipeModel.id).filter(RecipeModel.group_id == group_id)
         return self.session.execute(stmt).scalars().all()
 
+    def get_storage_size(self, group_id: UUID4) -> int:
+        """Returns the total bytes used by the data directories of all recipes in a group"""
+
+        stmt = sa.select(sa.func.coalesce(sa.func.sum(RecipeModel.storage_bytes), 0)).filter(
+            RecipeModel.group_id == group_id
+        )
+        return int(self.session.execute(stmt).scalar_one())
+
+    def get_all_storage_bytes(self) -> dict[UUID4, int]:
+        """Returns the recorded storage bytes of every recipe, across all groups"""
+
+        stmt = sa.select(RecipeModel.id, RecipeModel.storage_bytes)
+        return dict(self.session.execute(stmt).tuples().all())
+
+    def set_storage_bytes(self, storage_bytes: dict[UUID4, int]) -> None:
+        """
+        Records the bytes used by each recipe's data directory. This is bookkeeping rather than an edit,
+        so the recipes' `updated_at` is left as is.
+        """
+
+        if not storage_bytes:
+            return
+
+        table = RecipeModel.__table__
+        stmt = (
+            sa.update(table)
+            .where(table.c.id == sa.bindparam("recipe_id"))
+            .values(storage_bytes=sa.bindparam("size"), update_at=table.c.update_at)
+        )
+        for batch in batched(storage_bytes.items(), _IN_CLAUSE_BATCH_SIZE):
+            self.session.execute(stmt, [{"recipe_id": recipe_id, "size": size} for recipe_id, size in batch])
+
+        self.session.commit()
+
     def find_suggested_recipes(
         self,
         params: RecipeSuggestionQuery,
@@ -1,6 +1,16 @@
+from collections.abc import Collection
+
 from pydantic import UUID4
+from sqlalchemy import delete, exists, insert, select, update
 
-from mealie.db.models.household.shopping_list import ShoppingList
+from mealie.db.models._model_utils.guid import GUID
+from mealie.db.models.household.shopping_list import (
+    ShoppingList,
+    ShoppingListItem,
+    ShoppingListItemChange,
+    ShoppingListItemRecipeReference,
+    ShoppingListRecipeReference,
+)
 from mealie.schema.household.group_shopping_list import ShoppingListOut, ShoppingListUpdate
 
 from .repository_generic import HouseholdRepositoryGeneric
@@ -9,3 +19,121 @@ from .repository_generic import HouseholdRepositoryGeneric
 class RepositoryShoppingList(HouseholdRepositoryGeneric[ShoppingListOut, ShoppingList]):
     def update(self, item_id: UUID4, data: ShoppingListUpdate) -> ShoppingListOut:  # type: ignore
         return super().update(item_id, data)
+
+    def get_revision(self, list_id: UUID4) -> int | None:
+        """Returns the list's current revision, without loading the list, or `None` if it doesn't exist"""
+
+        stmt = select(ShoppingList.revision).filter_by(**self._filter_builder(id=list_id))
+        return self.session.execute(stmt).scalar_one_or_none()
+
+    def get_revisions(self, list_id: UUID4) -> tuple[int, int] | None:
+        """Returns the list's current and pruned revisions, or `None` if it doesn't exist"""
+
+        stmt = select(ShoppingList.revision, ShoppingList.pruned_revision).filter_by(**self._filter_builder(id=list_id))
+        row = self.session.execute(stmt).one_or_none()
+        return (row.revision, row.pruned_revision) if row else None
+
+    def get_item_changes(self, list_id: UUID4, since: int) -> list[ShoppingListItemChange]:
+        """Returns the latest change to each of the list's items that changed after the `since` revision"""
+
+        stmt = (
+            select(ShoppingListItemChange)
+            .where(ShoppingListItemChange.shopping_list_id == list_id, ShoppingListItemChange.revision > since)
+            .order_by(ShoppingListItemChange.revision)
+        )
+        return list(self.session.scalars(stmt))
+
+    def add_recipe_references(self, list_id: UUID4, recipe_quantities: dict[UUID4, float]) -> None:
+        """
+        Adds to the quantity of the list's reference to each recipe, creating the references that don't exist.
+        Only the references to these recipes are written; the rest of the list isn't loaded.
+        """
+
+        if not recipe_quantities:
+            return
+
+        existing_recipe_ids = set(
+            self.session.scalars(
+                select(ShoppingListRecipeReference.recipe_id).where(
+                    ShoppingListRecipeReference.shopping_list_id == list_id,
+                    ShoppingListRecipeReference.recipe_id.in_(recipe_quantities),
+                )
+            )
+        )
+
+        for recipe_id in existing_recipe_ids:
+            self.session.execute(
+                update(ShoppingListRecipeReference)
+                .where(
+                    ShoppingListRecipeReference.shopping_list_id == list_id,
+                    ShoppingListRecipeReference.recipe_id == recipe_id,
+                )
+                .values(recipe_quantity=ShoppingListRecipeReference.recipe_quantity + recipe_quantities[recipe_id]),
+                execution_options={"synchronize_session": False},
+            )
+
+        new_references = [
+            {"id": GUID.generate(), "shopping_list_id": list_id, "recipe_id": recipe_id, "recipe_quantity": quantity}
+            for recipe_id, quantity in recipe_quantities.items()
+            if recipe_id not in existing_recipe_ids
+        ]
+        if new_references:
+            self.session.execute(insert(ShoppingListRecipeReference), new_references)
+
+        self.session.commit()
+
+    def remove_recipe_reference(self, list_id: UUID4, recipe_id: UUID4, decrement: float) -> list[UUID4]:
+        """
+        Subtracts from the quantity of the list's reference to the recipe, deleting it once nothing is left.
+        Returns the ids of the deleted references.
+        """
+
+        reference_filter = (
+            ShoppingListRecipeReference.shopping_list_id == list_id,
+            ShoppingListRecipeReference.recipe_id == recipe_id,
+        )
+        self.session.execute(
+            update(ShoppingListRecipeReference)
+            .where(*reference_filter)
+            .values(recipe_quantity=ShoppingListRecipeReference.recipe_quantity - decrement),
+            execution_options={"synchronize_session": False},
+        )
+        deleted_ids = self.session.scalars(
+            delete(ShoppingListRecipeReference)
+            .where(*reference_filter, ShoppingListRecipeReference.recipe_quantity <= 0)
+            .returning(ShoppingListRecipeReference.id),
+            execution_options={"synchronize_session": False},
+        ).all()
+
+        self.session.commit()
+        return list(deleted_ids)
+
+    def delete_unused_recipe_references(self, list_ids: Collection[UUID4], commit: bool = True) -> list[UUID4]:
+        """
+        Deletes the lists' recipe references that none of their remaining items refer to.
+        Returns the ids of the deleted references.
+        """
+
+        if not list_ids:
+            return []
+
+        still_referenced = (
+            exists()
+            .where(
+                ShoppingListItem.shopping_list_id == ShoppingListRecipeReference.shopping_list_id,
+                ShoppingListItemRecipeReference.shopping_list_item_id == ShoppingListItem.id,
+                ShoppingListItemRecipeReference.recipe_id == ShoppingListRecipeReference.recipe_id,
+            )
+            .correlate(ShoppingListRecipeReference)
+        )
+        deleted_ids = self.session.scalars(
+            delete(ShoppingListRecipeReference)
+            .where(ShoppingListRecipeReference.shopping_list_id.in_(list_ids), ~still_referenced)
+            .returning(ShoppingListRecipeReference.id),
+            execution_options={"synchronize_session": False},
+        ).all()
+
+        if commit:
+            self.session.commit()
+
+        return list(deleted_ids)
@@ -1,8 +1,11 @@
 from pydantic import UUID4
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import NoResultFound
 
-from mealie.db.models.recipe.ingredient import IngredientUnitModel
+from mealie.db.models.household.shopping_list import ShoppingListItem, record_item_updates
+from mealie.db.models.recipe.ingredient import IngredientUnitAliasModel, IngredientUnitModel, RecipeIngredientModel
 from mealie.schema.recipe.recipe_ingredient import IngredientUnit
+from mealie.services.recipe.recipe_read_cache import clear_on_commit
 
 from .repository_generic import GroupRepositoryGeneric
 
@@ -13,14 +16,56 @@ class RepositoryUnit(GroupRepositoryGeneric[IngredientUnit, IngredientUnitModel]
         return self.session.execute(stmt).scalars().one()
 
     def merge(self, from_unit: UUID4, to_unit: UUID4) -> IngredientUnit | None:
-        from_model = self._get_unit(from_unit)
+        return self.merge_many([from_unit], to_unit)
+
+    def merge_many(self, from_units: list[UUID4], to_unit: UUID4, commit: bool = True) -> IngredientUnit | None:
+        """
+        Merges `from_units` into `to_unit` and deletes them. Recipe ingredients, shopping list items, and
+        aliases are moved over with set-based statements in a single transaction, so the merged units' rows
+        are never loaded.
+
+        Pass `commit=False` to merge several groups of units in one transaction; the caller commits it.
+        On failure the whole transaction is rolled back.
+        """
+
         to_model = self._get_unit(to_unit)
+        from_ids = set(from_units) - {to_model.id}
 
-        to_model.ingredients += from_model.ingredients
+        stmt = select(self.model.id).filter_by(**self._filter_builder()).where(self.model.id.in_(from_ids))
+        if missing := from_ids - set(self.session.execute(stmt).scalars()):
+            raise NoResultFound(f"Units not found: {', '.join(map(str, missing))}")
 
+        # the merged rows are deleted at the end, so there's nothing in the session to keep in sync
+        no_sync = {"synchronize_session": False}
         try:
-            self.session.delete(from_model)
-            self.session.commit()
+            self.session.execute(
+                update(RecipeIngredientModel)
+                .where(RecipeIngredientModel.unit_id.in_(from_ids))
+                .values(unit_id=to_model.id),
+                execution_options=no_sync,
+            )
+
+            # bulk updates skip the events that record shopping list changes, so clients are told here
+            items = self.session.execute(
+                update(ShoppingListItem)
+                .where(ShoppingListItem.unit_id.in_(from_ids))
+                .values(unit_id=to_model.id)
+                .returning(ShoppingListItem.shopping_list_id, ShoppingListItem.id),
+                execution_options=no_sync,
+            )
+            record_item_updates(self.session, items.tuples().all())
+
+            self.session.execute(
+                update(IngredientUnitAliasModel)
+                .where(IngredientUnitAliasModel.unit_id.in_(from_ids))
+                .values(unit_id=to_model.id),
+                execution_options=no_sync,
+            )
+
+            self.session.execute(delete(self.model).where(self.model.id.in_(from_ids)), execution_options=no_sync)
+            clear_on_commit(self.session)
+            if commit:
+                self.session.commit()
         except Exception as e:
             self.session.rollback()
             raise e
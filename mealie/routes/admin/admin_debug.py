@@ -1,12 +1,21 @@
 import os
 import shutil
 
-from fastapi import APIRouter, File, UploadFile
+from fastapi import APIRouter, File, Query, UploadFile
 
 from mealie.core.dependencies.dependencies import get_temporary_path
+from mealie.db.models._model_base import SqlAlchemyBase
+from mealie.db.query_stats import query_stats_recorder
 from mealie.routes._base import BaseAdminController, controller
 from mealie.schema.admin.debug import DebugResponse
+from mealie.schema.admin.query_stats import (
+    IndexRecommendationReport,
+    QueryShapeReport,
+    QueryStatementReport,
+    QueryStatsReport,
+)
 from mealie.schema.openai.general import OpenAIText
+from mealie.schema.response import SuccessResponse
 from mealie.services.openai import OpenAILocalImage, OpenAIService
 
 router = APIRouter(prefix="/debug")
@@ -40,8 +49,9 @@ class AdminDebugController(BaseAdminController):
                 if local_images:
                     message = f"{message} Here is an image to test with:"
 
+                # a cached response wouldn't show whether OpenAI can be reached
                 response = await openai_service.get_response(
-                    prompt, message, response_schema=OpenAIText, images=local_images
+                    prompt, message, response_schema=OpenAIText, images=local_images, use_cache=False
                 )
 
                 if not response:
@@ -55,3 +65,35 @@ class AdminDebugController(BaseAdminController):
                     success=False,
                     response=f'OpenAI request failed. Full error has been logged. {e.__class__.__name__}: "{e}"',
                 )
+
+    @router.get("/query-stats", response_model=QueryStatsReport)
+    def get_query_stats(self, limit: int = Query(50, ge=1)):
+        """
+        Reports the query filters and statements that took the most database time since the stats were reset,
+        and recommends indexes for the tables that the plans of slow statements scan. Stats are only recorded
+        when `DB_QUERY_STATS` is enabled, and each worker records its own.
+        """
+
+        recorder = query_stats_recorder
+        return QueryStatsReport(
+            enabled=recorder.enabled,
+            slow_query_ms=recorder.slow_query_ms,
+            since=recorder.since,
+            dropped=recorder.dropped,
+            shapes=[
+                QueryShapeReport.model_validate(stats, from_attributes=True) for stats in recorder.top_shapes(limit)
+            ],
+            statements=[
+                QueryStatementReport.model_validate(stats, from_attributes=True)
+                for stats in recorder.top_statements(limit)
+            ],
+            index_recommendations=[
+                IndexRecommendationReport.model_validate(recommendation, from_attributes=True)
+                for recommendation in recorder.recommend_indexes(SqlAlchemyBase.metadata)
+            ],
+        )
+
+    @router.delete("/query-stats", response_model=SuccessResponse)
+    def reset_query_stats(self):
+        query_stats_recorder.reset()
+        return SuccessResponse.respond("Query stats reset")
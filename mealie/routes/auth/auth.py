@@ -6,6 +6,7 @@ from fastapi.exceptions import HTTPException
 from fastapi.responses import RedirectResponse
 from pydantic import BaseModel
 from sqlalchemy.orm.session import Session
+from starlette.concurrency import run_in_threadpool
 from starlette.datastructures import URLPath
 
 from mealie.core import root_logger, security
@@ -124,13 +125,13 @@ async def oauth_callback(request: Request, session: Session = Depends(generate_s
     auth = None
     try:
         auth_provider = OpenIDProvider(session, token["userinfo"])
-        auth = auth_provider.authenticate()
+        auth = await run_in_threadpool(auth_provider.authenticate)
     except MissingClaimException:
         try:
             logger.debug("[OIDC] Claims not present in the ID token, pulling user info")
             userinfo = await client.userinfo(token=token)
             auth_provider = OpenIDProvider(session, userinfo, use_default_groups=True)
-            auth = auth_provider.authenticate()
+            auth = await run_in_threadpool(auth_provider.authenticate)
         except MissingClaimException:
             auth = None
 
@@ -0,0 +1,26 @@
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from mealie.routes._base.base_controllers import BaseUserController
+from mealie.routes._base.controller import controller
+from mealie.services.event_bus_service.event_stream import event_stream_broker
+
+router = APIRouter(prefix="/households/events/stream", tags=["Households: Event Stream"])
+
+
+@controller(router)
+class EventStreamController(BaseUserController):
+    @router.get("", response_class=StreamingResponse)
+    async def stream(self):
+        """
+        Streams the household's events, such as shopping list, meal plan, and recipe changes, as
+        server-sent events. Each event's data is the same payload webhooks receive. A `resync` event
+        means the client fell behind and events were dropped, so it should refetch what it's displaying.
+        """
+
+        return StreamingResponse(
+            event_stream_broker.stream(self.group_id, self.household_id),
+            media_type="text/event-stream",
+            # keep reverse proxies from buffering the stream
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
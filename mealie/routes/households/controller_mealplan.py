@@ -12,12 +12,18 @@ from mealie.routes._base.base_controllers import BaseCrudController
 from mealie.routes._base.mixins import HttpRepo
 from mealie.schema import mapper
 from mealie.schema.meal_plan import CreatePlanEntry, ReadPlanEntry, SavePlanEntry, UpdatePlanEntry
-from mealie.schema.meal_plan.new_meal import CreateRandomEntry, PlanEntryPagination, PlanEntryType
+from mealie.schema.meal_plan.new_meal import (
+    CreateRandomEntries,
+    CreateRandomEntry,
+    PlanEntryPagination,
+    PlanEntryType,
+)
 from mealie.schema.meal_plan.plan_rules import PlanRulesDay
 from mealie.schema.recipe.recipe import Recipe
 from mealie.schema.response.pagination import PaginationQuery
 from mealie.schema.response.responses import ErrorResponse
 from mealie.services.event_bus_service.event_types import EventMealplanCreatedData, EventTypes
+from mealie.services.household_services.meal_plan_generator import MealPlanGenerator
 
 router = APIRouter(prefix="/households/mealplans", tags=["Households: Mealplans"])
 
@@ -148,6 +154,22 @@ class GroupMealplanController(BaseCrudController):
             )
         )
 
+    @router.post("/random/bulk", response_model=list[ReadPlanEntry], status_code=201)
+    def create_random_meals(self, data: CreateRandomEntries):
+        """
+        Plans a random meal for each entry type on each day from `startDate` to `endDate`, following the
+        household's mealplan rules like `create_random_meal`. Recipes aren't repeated within the range until
+        every recipe matching the rules has been planned, and recipes made within the last `recentlyMadeDays`
+        are planned last. Meals that no recipe matches are skipped, and every entry is saved at once.
+        """
+        entries = MealPlanGenerator(self.repos, self.user.id).generate(data)
+        if not entries:
+            raise HTTPException(
+                status_code=404, detail=ErrorResponse.respond(message=self.t("mealplan.no-recipes-match-your-rules"))
+            )
+
+        return self.repo.create_many(entries)
+
     @router.get("/{item_id}", response_model=ReadPlanEntry)
     def get_one(self, item_id: int):
         return self.mixins.get_one(item_id)
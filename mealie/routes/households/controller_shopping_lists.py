@@ -10,6 +10,7 @@ from mealie.routes._base.mixins import HttpRepo
 from mealie.schema.household.group_shopping_list import (
     ShoppingListAddRecipeParams,
     ShoppingListAddRecipeParamsBulk,
+    ShoppingListChangesOut,
     ShoppingListCreate,
     ShoppingListItemCreate,
     ShoppingListItemOut,
@@ -20,13 +21,14 @@ from mealie.schema.household.group_shopping_list import (
     ShoppingListMultiPurposeLabelUpdate,
     ShoppingListOut,
     ShoppingListPagination,
+    ShoppingListRecipeChangesOut,
     ShoppingListRemoveRecipeParams,
     ShoppingListSave,
     ShoppingListSummary,
     ShoppingListUpdate,
 )
 from mealie.schema.response.pagination import PaginationQuery
-from mealie.schema.response.responses import SuccessResponse
+from mealie.schema.response.responses import ErrorResponse, SuccessResponse
 from mealie.services.event_bus_service.event_types import (
     EventOperation,
     EventShoppingListData,
@@ -231,6 +233,20 @@ class ShoppingListController(BaseCrudController):
     # =======================================================================
     # Other Operations
 
+    @router.get("/{item_id}/changes", response_model=ShoppingListChangesOut)
+    def get_changes(self, item_id: UUID4, since: int = Query(0, ge=0)):
+        """
+        Returns the list items created, updated, or deleted since the `since` revision, along with the list's
+        current revision. Clients can fetch the whole list once, then poll this with the last revision they saw.
+        If `fullResync` is set, the client's revision is too old and the whole list has to be fetched again.
+        """
+
+        changes = self.service.get_changes(item_id, since)
+        if changes is None:
+            raise HTTPException(status.HTTP_404_NOT_FOUND, detail=ErrorResponse.respond(message="Not found."))
+
+        return changes
+
     @router.put("/{item_id}/label-settings", response_model=ShoppingListOut)
     def update_label_settings(self, item_id: UUID4, data: list[ShoppingListMultiPurposeLabelUpdate]):
         for setting in data:
@@ -253,12 +269,24 @@ class ShoppingListController(BaseCrudController):
 
         return updated_list
 
+    @router.post("/{item_id}/recipe/delta", response_model=ShoppingListRecipeChangesOut)
+    def add_recipe_ingredients_to_list_delta(self, item_id: UUID4, data: list[ShoppingListAddRecipeParamsBulk]):
+        """
+        Adds recipe ingredients to the list, returning only the items and recipe references that changed
+        and the list's new revision, rather than the whole list
+        """
+
+        changes = self.service.add_recipe_ingredients_to_list(item_id, data)
+        if changes is None:
+            raise HTTPException(status.HTTP_404_NOT_FOUND, detail=ErrorResponse.respond(message="Not found."))
+
+        publish_list_item_events(self.publish_event, changes)
+        return changes
+
     @router.post("/{item_id}/recipe", response_model=ShoppingListOut)
     def add_recipe_ingredients_to_list(self, item_id: UUID4, data: list[ShoppingListAddRecipeParamsBulk]):
-        shopping_list, items = self.service.add_recipe_ingredients_to_list(item_id, data)
-
-        publish_list_item_events(self.publish_event, items)
-        return shopping_list
+        self.add_recipe_ingredients_to_list_delta(item_id, data)
+        return self.get_one(item_id)
 
     @router.post("/{item_id}/recipe/{recipe_id}", response_model=ShoppingListOut, deprecated=True)
     def add_single_recipe_ingredients_to_list(
@@ -271,13 +299,27 @@ class ShoppingListController(BaseCrudController):
         bulk_data = [data.cast(ShoppingListAddRecipeParamsBulk, recipe_id=recipe_id)]
         return self.add_recipe_ingredients_to_list(item_id, bulk_data)
 
-    @router.post("/{item_id}/recipe/{recipe_id}/delete", response_model=ShoppingListOut)
-    def remove_recipe_ingredients_from_list(
+    @router.post("/{item_id}/recipe/{recipe_id}/delete/delta", response_model=ShoppingListRecipeChangesOut)
+    def remove_recipe_ingredients_from_list_delta(
         self, item_id: UUID4, recipe_id: UUID4, data: ShoppingListRemoveRecipeParams | None = None
     ):
-        shopping_list, items = self.service.remove_recipe_ingredients_from_list(
+        """
+        Removes a recipe's ingredients from the list, returning only the items and recipe references that changed
+        and the list's new revision, rather than the whole list
+        """
+
+        changes = self.service.remove_recipe_ingredients_from_list(
             item_id, recipe_id, data.recipe_decrement_quantity if data else 1
         )
+        if changes is None:
+            raise HTTPException(status.HTTP_404_NOT_FOUND, detail=ErrorResponse.respond(message="Not found."))
 
-        publish_list_item_events(self.publish_event, items)
-        return shopping_list
+        publish_list_item_events(self.publish_event, changes)
+        return changes
+
+    @router.post("/{item_id}/recipe/{recipe_id}/delete", response_model=ShoppingListOut)
+    def remove_recipe_ingredients_from_list(
+        self, item_id: UUID4, recipe_id: UUID4, data: ShoppingListRemoveRecipeParams | None = None
+    ):
+        self.remove_recipe_ingredients_from_list_delta(item_id, recipe_id, data)
+        return self.get_one(item_id)
@@ -1,9 +1,14 @@
+from collections.abc import AsyncGenerator
+
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
+from mealie.db.db_setup import session_context
 from mealie.routes._base import BaseUserController, controller
 from mealie.schema.recipe import ParsedIngredient
-from mealie.schema.recipe.recipe_ingredient import IngredientRequest, IngredientsRequest
-from mealie.services.parser_services import get_parser
+from mealie.schema.recipe.recipe_ingredient import IngredientRequest, IngredientsBatchRequest, IngredientsRequest
+from mealie.services.parser_services import ABCIngredientParser, get_parser
 
 router = APIRouter(prefix="/parser")
 
@@ -20,3 +25,32 @@ class IngredientParserController(BaseUserController):
     async def parse_ingredients(self, ingredients: IngredientsRequest):
         parser = get_parser(ingredients.parser, self.group_id, self.session)
         return await parser.parse(ingredients.ingredients)
+
+    @router.post("/ingredients/batch", response_class=StreamingResponse)
+    async def parse_ingredients_batch(self, batch: IngredientsBatchRequest):
+        """
+        Parses the ingredients of many recipes, streaming one `ParsedIngredientsBatchItem` per recipe as
+        newline-delimited JSON, in the order the recipes were sent. A recipe that fails to parse is streamed
+        with an error instead of failing the whole batch.
+        """
+
+        group_id = self.group_id
+
+        def load_parser() -> ABCIngredientParser:
+            # the group's foods and units are loaded up front, so no database connection is held while streaming
+            with session_context() as session:
+                parser = get_parser(batch.parser, group_id, session)
+                parser.data_matcher.load()
+
+            return parser
+
+        async def stream() -> AsyncGenerator[str, None]:
+            parser = await run_in_threadpool(load_parser)
+            async for item in parser.parse_batch(batch.recipes):
+                yield item.model_dump_json(by_alias=True) + "\n"
+
+        return StreamingResponse(
+            stream(),
+            media_type="application/x-ndjson",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
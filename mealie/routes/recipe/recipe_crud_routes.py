@@ -10,15 +10,18 @@ from fastapi import (
     Depends,
     File,
     Form,
+    Header,
     HTTPException,
     Path,
     Query,
     Request,
+    Response,
     status,
 )
 from fastapi.datastructures import UploadFile
 from pydantic import UUID4
 from slugify import slugify
+from starlette.concurrency import run_in_threadpool
 
 from mealie.core import exceptions
 from mealie.core.dependencies import (
@@ -60,8 +63,8 @@ from mealie.services.recipe.recipe_data_service import (
     NotAnImageError,
     RecipeDataService,
 )
-from mealie.services.scraper.recipe_bulk_scraper import RecipeBulkScraperService
-from mealie.services.scraper.scraped_extras import ScraperContext
+from mealie.services.scraper.recipe_bulk_scraper import RecipeBulkScraperService, run_bulk_import_job
+from mealie.services.scraper.scraped_extras import ScrapedExtras, ScraperContext
 from mealie.services.scraper.scraper import create_from_html
 from mealie.services.scraper.scraper_strategies import (
     ForceTimeoutException,
@@ -160,6 +163,12 @@ class RecipeController(BaseRecipeController):
                 status_code=408, detail=ErrorResponse.respond(message="Recipe Scraping Timed Out")
             ) from e
 
+        # only the scrape itself is async; saving the recipe uses the sync session, so keep it off the event loop
+        return await run_in_threadpool(self._save_scraped_recipe, req, recipe, extras)
+
+    def _save_scraped_recipe(
+        self, req: ScrapeRecipe | ScrapeRecipeData, recipe: Recipe, extras: ScrapedExtras | None
+    ) -> str:
         if req.include_tags:
             ctx = ScraperContext(self.repos)
 
@@ -192,7 +201,8 @@ class RecipeController(BaseRecipeController):
         """Takes in a URL and attempts to scrape data and load it into the database"""
         bulk_scraper = RecipeBulkScraperService(self.service, self.repos, self.group, self.translator)
         report_id = bulk_scraper.get_report_id()
-        bg_tasks.add_task(bulk_scraper.scrape, bulk)
+        job_id = bulk_scraper.create_job(bulk)
+        bg_tasks.add_task(run_bulk_import_job, job_id, self.translator)
 
         self.publish_event(
             event_type=EventTypes.recipe_created,
@@ -326,15 +336,24 @@ class RecipeController(BaseRecipeController):
         return JSONBytes(content=json_compatible_response)
 
     @router.get("/{slug}", response_model=Recipe)
-    def get_one(self, slug: str = Path(..., description="A recipe's slug or id")):
+    def get_one(
+        self,
+        slug: str = Path(..., description="A recipe's slug or id"),
+        if_none_match: str | None = Header(None),
+    ):
         """Takes in a recipe's slug or id and returns all data for a recipe"""
         try:
-            recipe = self.service.get_one(slug)
+            recipe = self.service.get_one_serialized(slug)
         except Exception as e:
             self.handle_exceptions(e)
             return None
 
-        return recipe
+        headers = {"ETag": recipe.etag, "Cache-Control": "private, no-cache"}
+        if recipe.matches(if_none_match):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        # Response is returned directly, to avoid validation and improve performance
+        return JSONBytes(content=recipe.body, headers=headers)
 
     @router.post("", status_code=201, response_model=str)
     def create_one(self, data: CreateRecipe) -> str | None:
@@ -526,11 +545,11 @@ class RecipeController(BaseRecipeController):
 
     @router.post("/{slug}/image", tags=["Recipe: Images and Assets"])
     async def scrape_image_url(self, slug: str, url: ScrapeRecipe):
-        recipe = self.mixins.get_one(slug)
+        recipe = await run_in_threadpool(self.mixins.get_one, slug)
         data_service = RecipeDataService(recipe.id)
 
         try:
-            await data_service.scrape_image(url.url)
+            await data_service.scrape_image(url.url, session=self.repos.session)
         except NotAnImageError as e:
             raise HTTPException(
                 status_code=400,
@@ -543,7 +562,7 @@ class RecipeController(BaseRecipeController):
             ) from e
 
         recipe.image = cache.cache_key.new_key()
-        self.service.update_one(recipe.slug, recipe)
+        await run_in_threadpool(self.service.update_one, recipe.slug, recipe)
 
     @router.put("/{slug}/image", response_model=UpdateImageResponse, tags=["Recipe: Images and Assets"])
     def update_recipe_image(self, slug: str, image: bytes = File(...), extension: str = Form(...)):
@@ -604,5 +623,6 @@ class RecipeController(BaseRecipeController):
             recipe.assets.append(asset_in)
 
         self.service.update_one(slug, recipe)
+        RecipeDataService(recipe.id).record_storage(self.repos.session)
 
         return asset_in
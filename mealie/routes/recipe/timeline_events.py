@@ -115,6 +115,8 @@ class RecipeTimelineEventsController(BaseCrudController):
             except FileNotFoundError:
                 pass
 
+            RecipeDataService(event.recipe_id).record_storage(self.repos.session)
+
         recipe = self.group_recipes.get_one(event.recipe_id, "id")
         if recipe:
             self.publish_event(
@@ -140,7 +142,7 @@ class RecipeTimelineEventsController(BaseCrudController):
     def update_event_image(self, item_id: UUID4, image: bytes = File(...), extension: str = Form(...)):
         event = self.mixins.get_one(item_id)
         data_service = RecipeDataService(event.recipe_id)
-        data_service.write_image(image, extension, event.image_dir)
+        data_service.write_image(image, extension, event.image_dir, session=self.repos.session)
 
         if event.image != TimelineEventImage.has_image.value:
             event.image = TimelineEventImage.has_image
@@ -1,7 +1,9 @@
 import html
 import json
+import mimetypes
 import pathlib
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
 from bs4 import BeautifulSoup
@@ -9,7 +11,11 @@ from fastapi import Depends, FastAPI, Response
 from fastapi.encoders import jsonable_encoder
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy.orm.session import Session
+from starlette.datastructures import Headers
 from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse, PathLike
+from starlette.types import Scope
 from text_unidecode import os
 
 from mealie.core.config import get_app_settings
@@ -30,7 +36,101 @@ class MetaTag:
         self.content = escape(self.content)  # escape HTML to prevent XSS attacks
 
 
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+_PRECOMPRESSED_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+"""Supported precompressed siblings of static files, in order of preference"""
+
+
+def accepted_encodings(accept_encoding: str | None) -> set[str]:
+    """Parses an Accept-Encoding header into the set of encodings the client accepts (q > 0)"""
+
+    if not accept_encoding:
+        return set()
+
+    accepted: set[str] = set()
+    for part in accept_encoding.split(","):
+        encoding, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0
+
+        if encoding and q > 0:
+            accepted.add(encoding.strip().lower())
+
+    return accepted
+
+
+@lru_cache(maxsize=1024)
+def _find_precompressed(full_path: str) -> tuple[tuple[str, str, os.stat_result], ...]:
+    """Returns the precompressed siblings of a static file as (encoding, path, stat) tuples"""
+
+    siblings = []
+    for encoding, suffix in _PRECOMPRESSED_SUFFIXES.items():
+        path = full_path + suffix
+        try:
+            siblings.append((encoding, path, os.stat(path)))
+        except OSError:
+            continue
+
+    return tuple(siblings)
+
+
 class SPAStaticFiles(StaticFiles):
+    """
+    Serves the frontend, falling back to index.html so client-side routes can be loaded directly.
+
+    When the build wrote precompressed `.br`/`.gz` siblings of a file, the best one the client accepts is sent
+    as-is, so assets aren't compressed again on every request. Nuxt's build assets have content-hashed names,
+    so they are cached forever; everything else is revalidated with its ETag.
+    """
+
+    def file_response(
+        self,
+        full_path: PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        full_path = str(full_path)
+
+        response: Response | None = None
+        siblings = _find_precompressed(full_path)
+        if siblings:
+            accepted = accepted_encodings(request_headers.get("accept-encoding"))
+            for encoding, path, encoded_stat in siblings:
+                if encoding not in accepted:
+                    continue
+
+                response = FileResponse(
+                    path,
+                    status_code=status_code,
+                    stat_result=encoded_stat,
+                    media_type=mimetypes.guess_type(full_path)[0] or "text/plain",
+                    headers={"Content-Encoding": encoding},
+                )
+                break
+
+        if response is None:
+            response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+
+        if siblings:
+            response.headers["Vary"] = "Accept-Encoding"
+
+        is_build_asset = f"{os.sep}_nuxt{os.sep}" in full_path
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL if is_build_asset else REVALIDATE_CACHE_CONTROL
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
     async def get_response(self, path: str, scope):
         try:
             return await super().get_response(path, scope)
@@ -199,7 +299,7 @@ def serve_recipe_with_meta_public(
         return response_404()
 
 
-async def serve_recipe_with_meta(
+def serve_recipe_with_meta(
     group_slug: str,
     recipe_slug: str,
     user: PrivateUser | None = Depends(try_get_current_user),
@@ -221,7 +321,7 @@ async def serve_recipe_with_meta(
         return response_404()
 
 
-async def serve_shared_recipe_with_meta(group_slug: str, token_id: str, session: Session = Depends(generate_session)):
+def serve_shared_recipe_with_meta(group_slug: str, token_id: str, session: Session = Depends(generate_session)):
     try:
         public_repos = AllRepositories(session, group_id=None)
         token_summary = public_repos.recipe_share_tokens.get_one(token_id)
@@ -1,6 +1,6 @@
 from functools import cached_property
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import UUID4
 
 from mealie.routes._base.base_controllers import BaseUserController
@@ -10,13 +10,17 @@ from mealie.routes._base.routers import MealieCrudRoute
 from mealie.schema import mapper
 from mealie.schema.recipe.recipe_ingredient import (
     CreateIngredientFood,
+    DuplicateIngredientCluster,
     IngredientFood,
     IngredientFoodPagination,
     MergeFood,
+    MergeFoodClusters,
+    MergeFoods,
     SaveIngredientFood,
 )
 from mealie.schema.response.pagination import PaginationQuery
 from mealie.schema.response.responses import SuccessResponse
+from mealie.services.group_services.ingredient_duplicates import IngredientDuplicatesService
 
 router = APIRouter(prefix="/foods", tags=["Recipes: Foods"], route_class=MealieCrudRoute)
 
@@ -46,6 +50,39 @@ class IngredientFoodsController(BaseUserController):
         response.set_pagination_guides(router.url_path_for("get_all"), q.model_dump())
         return response
 
+    @router.get("/duplicates", response_model=list[DuplicateIngredientCluster])
+    def get_duplicates(self, threshold: float = Query(85, ge=50, le=100)):
+        """
+        Suggests clusters of foods that are likely duplicates of each other, ranked from the most to the least
+        confident. Each cluster's `targetId` is the food the rest of the cluster should be merged into.
+        """
+
+        return IngredientDuplicatesService(self.repos).find_duplicate_foods(threshold)
+
+    @router.put("/duplicates/merge", response_model=SuccessResponse)
+    def merge_duplicates(self, data: MergeFoodClusters):
+        """
+        Merges each accepted cluster of duplicates into its target. The clusters are merged in a single
+        transaction, so if any of them fails none are merged.
+        """
+
+        seen: set[UUID4] = set()
+        for cluster in data.clusters:
+            ids = {*cluster.from_foods, cluster.to_food}
+            if not seen.isdisjoint(ids):
+                raise HTTPException(400, "Each food can only be in one cluster")
+            seen |= ids
+
+        try:
+            for cluster in data.clusters:
+                self.repo.merge_many(cluster.from_foods, cluster.to_food, commit=False)
+            self.repos.session.commit()
+            return SuccessResponse.respond(f"Successfully merged {len(data.clusters)} clusters of foods")
+        except Exception as e:
+            self.repos.session.rollback()
+            self.logger.error(e)
+            raise HTTPException(500, "Failed to merge foods") from e
+
     @router.post("", response_model=IngredientFood, status_code=201)
     def create_one(self, data: CreateIngredientFood):
         save_data = mapper.cast(data, SaveIngredientFood, group_id=self.group_id)
@@ -60,6 +97,15 @@ class IngredientFoodsController(BaseUserController):
             self.logger.error(e)
             raise HTTPException(500, "Failed to merge foods") from e
 
+    @router.put("/merge/bulk", response_model=SuccessResponse)
+    def merge_many(self, data: MergeFoods):
+        try:
+            self.repo.merge_many(data.from_foods, data.to_food)
+            return SuccessResponse.respond(f"Successfully merged {len(data.from_foods)} foods")
+        except Exception as e:
+            self.logger.error(e)
+            raise HTTPException(500, "Failed to merge foods") from e
+
     @router.get("/{item_id}", response_model=IngredientFood)
     def get_one(self, item_id: UUID4):
         return self.mixins.get_one(item_id)
@@ -42,12 +42,12 @@ class UserRatingsController(BaseUserController):
         return recipe
 
     @router.get("/{id}/ratings", response_model=UserRatings[UserRatingOut])
-    async def get_ratings(self, id: UUID4):
+    def get_ratings(self, id: UUID4):
         """Get user's rated recipes"""
         return UserRatings(ratings=self.repos.user_ratings.get_by_user(id))
 
     @router.get("/{id}/favorites", response_model=UserRatings[UserRatingOut])
-    async def get_favorites(self, id: UUID4):
+    def get_favorites(self, id: UUID4):
         """Get user's favorited recipes"""
         return UserRatings(ratings=self.repos.user_ratings.get_by_user(id, favorites_only=True))
 
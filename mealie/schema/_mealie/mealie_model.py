@@ -4,7 +4,8 @@ import re
 from collections.abc import Sequence
 from datetime import UTC, datetime
 from enum import Enum
-from typing import ClassVar, Protocol, Self
+from functools import cache
+from typing import Any, ClassVar, Protocol, Self, get_args
 
 from humps.main import camelize
 from pydantic import UUID4, AliasChoices, BaseModel, ConfigDict, Field, model_validator
@@ -37,6 +38,16 @@ def UpdatedAtField(*args, **kwargs):
     return Field(*args, **kwargs)
 
 
+def _may_be_datetime(annotation: Any) -> bool:
+    if annotation is Any or annotation is object:
+        return True
+    if isinstance(annotation, type):
+        return issubclass(annotation, datetime)
+
+    # unions, Annotated, etc.
+    return any(_may_be_datetime(arg) for arg in get_args(annotation))
+
+
 class SearchType(Enum):
     fuzzy = "fuzzy"
     tokenized = "tokenized"
@@ -52,6 +63,18 @@ class MealieModel(BaseModel):
     """
     model_config = ConfigDict(alias_generator=camelize, populate_by_name=True)
 
+    @classmethod
+    @cache
+    def _hour_only_tz_fields(cls) -> tuple[str, ...]:
+        """Fields annotated as `datetime`; cached per class, since the validators below run for every instance"""
+        return tuple(field for field, field_info in cls.model_fields.items() if field_info.annotation == datetime)
+
+    @classmethod
+    @cache
+    def datetime_fields(cls) -> tuple[str, ...]:
+        """Fields that may hold a datetime, e.g. `datetime | None` or `Any`; cached per class"""
+        return tuple(field for field, field_info in cls.model_fields.items() if _may_be_datetime(field_info.annotation))
+
     @model_validator(mode="before")
     @classmethod
     def fix_hour_only_tz[T: BaseModel](cls, data: T) -> T:
@@ -61,9 +84,7 @@ class MealieModel(BaseModel):
         Pydantic assumes timezones are in the format +HH:MM, but postgres returns +HH.
         https://github.com/pydantic/pydantic/issues/8609
         """
-        for field, field_info in cls.model_fields.items():
-            if field_info.annotation != datetime:
-                continue
+        for field in cls._hour_only_tz_fields():
             try:
                 if not isinstance(val := getattr(data, field), str):
                     continue
@@ -80,7 +101,7 @@ class MealieModel(BaseModel):
         Adds UTC timezone information to all datetimes in the model.
         The server stores everything in UTC without timezone info.
         """
-        for field in self.__class__.model_fields:
+        for field in self.datetime_fields():
             val = getattr(self, field)
             if not isinstance(val, datetime):
                 continue
@@ -5,6 +5,7 @@ from .debug import DebugResponse
 from .email import EmailReady, EmailSuccess, EmailTest
 from .maintenance import MaintenanceLogs, MaintenanceStorageDetails, MaintenanceSummary
 from .migration import ChowdownURL, MigrationFile, MigrationImport, Migrations
+from .query_stats import IndexRecommendationReport, QueryShapeReport, QueryStatementReport, QueryStatsReport
 from .restore import CommentImport, GroupImport, ImportBase, RecipeImport, SettingsImport, UserImport
 
 __all__ = [
@@ -30,6 +31,10 @@ __all__ = [
     "MigrationFile",
     "MigrationImport",
     "Migrations",
+    "IndexRecommendationReport",
+    "QueryShapeReport",
+    "QueryStatementReport",
+    "QueryStatsReport",
     "CommentImport",
     "GroupImport",
     "ImportBase",
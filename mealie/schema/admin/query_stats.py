@@ -0,0 +1,44 @@
+from datetime import datetime
+
+from mealie.schema._mealie import MealieModel
+
+
+class QueryShapeReport(MealieModel):
+    shape: str
+    requests: int
+    statements: int
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    slow_statements: int
+
+
+class QueryStatementReport(MealieModel):
+    template: str
+    calls: int
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    slow_calls: int
+    mean_rows: float | None = None
+    plan: list[str] | None = None
+    query_shapes: list[str] = []
+
+
+class IndexRecommendationReport(MealieModel):
+    table: str
+    columns: list[str]
+    reason: str
+    statements: int
+    total_ms: float
+    ddl: str
+
+
+class QueryStatsReport(MealieModel):
+    enabled: bool
+    slow_query_ms: float
+    since: datetime
+    dropped: int
+    shapes: list[QueryShapeReport] = []
+    statements: list[QueryStatementReport] = []
+    index_recommendations: list[IndexRecommendationReport] = []
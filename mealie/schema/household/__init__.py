@@ -21,6 +21,7 @@ from .group_recipe_action import (
 from .group_shopping_list import (
     ShoppingListAddRecipeParams,
     ShoppingListAddRecipeParamsBulk,
+    ShoppingListChangesOut,
     ShoppingListCreate,
     ShoppingListItemBase,
     ShoppingListItemCreate,
@@ -37,6 +38,7 @@ from .group_shopping_list import (
     ShoppingListMultiPurposeLabelUpdate,
     ShoppingListOut,
     ShoppingListPagination,
+    ShoppingListRecipeChangesOut,
     ShoppingListRecipeRefOut,
     ShoppingListRemoveRecipeParams,
     ShoppingListSave,
@@ -91,6 +93,7 @@ __all__ = [
     "HouseholdStatistics",
     "ShoppingListAddRecipeParams",
     "ShoppingListAddRecipeParamsBulk",
+    "ShoppingListChangesOut",
     "ShoppingListCreate",
     "ShoppingListItemBase",
     "ShoppingListItemCreate",
@@ -107,6 +110,7 @@ __all__ = [
     "ShoppingListMultiPurposeLabelUpdate",
     "ShoppingListOut",
     "ShoppingListPagination",
+    "ShoppingListRecipeChangesOut",
     "ShoppingListRecipeRefOut",
     "ShoppingListRemoveRecipeParams",
     "ShoppingListSave",
@@ -151,6 +151,18 @@ class ShoppingListItemsCollectionOut(MealieModel):
     deleted_items: list[ShoppingListItemOut] = []
 
 
+class ShoppingListChangesOut(MealieModel):
+    """The shopping list items changed since a list revision"""
+
+    revision: int
+    """the list's current revision; pass it as `since` to fetch the next changes"""
+    full_resync: bool = False
+    """the changes since `since` are no longer retained, so the whole list has to be fetched again"""
+    created_items: list[ShoppingListItemOut] = []
+    updated_items: list[ShoppingListItemOut] = []
+    deleted_item_ids: list[UUID4] = []
+
+
 class ShoppingListMultiPurposeLabelCreate(MealieModel):
     shopping_list_id: UUID4
     label_id: UUID4
@@ -208,6 +220,16 @@ class ShoppingListRecipeRefOut(MealieModel):
         ]
 
 
+class ShoppingListRecipeChangesOut(ShoppingListItemsCollectionOut):
+    """The items and recipe references changed by adding recipes to, or removing them from, a shopping list"""
+
+    revision: int
+    """the list's revision after the change"""
+    recipe_references: list[ShoppingListRecipeRefOut] = []
+    """the list's current references to the recipes that were added or removed"""
+    deleted_recipe_reference_ids: list[UUID4] = []
+
+
 class ShoppingListSave(ShoppingListCreate):
     group_id: UUID4
     user_id: UUID4
@@ -216,6 +238,7 @@ class ShoppingListSave(ShoppingListCreate):
 class ShoppingListSummary(ShoppingListSave):
     id: UUID4
     household_id: UUID4
+    revision: int = 0
     recipe_references: list[ShoppingListRecipeRefOut]
     label_settings: list[ShoppingListMultiPurposeLabelOut]
     model_config = ConfigDict(from_attributes=True)
@@ -249,6 +272,7 @@ class ShoppingListUpdate(ShoppingListSave):
 
 class ShoppingListOut(ShoppingListUpdate):
     household_id: UUID4
+    revision: int = 0
     recipe_references: list[ShoppingListRecipeRefOut] = []
     label_settings: list[ShoppingListMultiPurposeLabelOut] = []
     model_config = ConfigDict(from_attributes=True)
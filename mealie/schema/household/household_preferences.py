@@ -1,4 +1,4 @@
-from pydantic import UUID4, ConfigDict
+from pydantic import UUID4, ConfigDict, Field
 from sqlalchemy.orm import joinedload
 from sqlalchemy.orm.interfaces import LoaderOption
 
@@ -19,6 +19,10 @@ class UpdateHouseholdPreferences(MealieModel):
     recipe_landscape_view: bool = False
     recipe_disable_comments: bool = False
 
+    # Shopping Lists
+    shopping_list_max_checked_items: int = Field(100, ge=1)
+    """checked items kept on each shopping list; older ones are deleted daily"""
+
 
 class CreateHouseholdPreferences(UpdateHouseholdPreferences): ...
 
@@ -1,6 +1,7 @@
 # This file is auto-generated by gen_schema_exports.py
 from .new_meal import (
     CreatePlanEntry,
+    CreateRandomEntries,
     CreateRandomEntry,
     PlanEntryPagination,
     PlanEntryType,
@@ -13,6 +14,7 @@ from .shopping_list import ListItem, ShoppingListIn, ShoppingListOut
 
 __all__ = [
     "CreatePlanEntry",
+    "CreateRandomEntries",
     "CreateRandomEntry",
     "PlanEntryPagination",
     "PlanEntryType",
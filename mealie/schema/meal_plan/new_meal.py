@@ -3,7 +3,7 @@ from enum import StrEnum
 from typing import Annotated
 from uuid import UUID
 
-from pydantic import ConfigDict, Field, field_validator
+from pydantic import ConfigDict, Field, field_validator, model_validator
 from pydantic_core.core_schema import ValidationInfo
 from sqlalchemy.orm import selectinload
 from sqlalchemy.orm.interfaces import LoaderOption
@@ -31,6 +31,31 @@ class CreateRandomEntry(MealieModel):
     entry_type: PlanEntryType = PlanEntryType.dinner
 
 
+RANDOM_ENTRIES_MAX_DAYS = 62
+
+
+class CreateRandomEntries(MealieModel):
+    start_date: date
+    end_date: date
+    entry_types: list[PlanEntryType] = Field(default_factory=lambda: [PlanEntryType.dinner], min_length=1)
+    recently_made_days: int = Field(14, ge=0)
+    """recipes made within this many days are only planned once every other matching recipe has been"""
+
+    @field_validator("entry_types")
+    @classmethod
+    def unique_entry_types(cls, value: list[PlanEntryType]) -> list[PlanEntryType]:
+        return list(dict.fromkeys(value))
+
+    @model_validator(mode="after")
+    def validate_date_range(self):
+        if self.end_date < self.start_date:
+            raise ValueError("`end_date` must not be before `start_date`")
+        if (self.end_date - self.start_date).days >= RANDOM_ENTRIES_MAX_DAYS:
+            raise ValueError(f"at most {RANDOM_ENTRIES_MAX_DAYS} days can be planned at once")
+
+        return self
+
+
 class CreatePlanEntry(MealieModel):
     date: date
     entry_type: PlanEntryType = PlanEntryType.breakfast
@@ -24,6 +24,12 @@ from .recipe_bulk_actions import (
     ExportRecipes,
     ExportTypes,
 )
+from .recipe_bulk_import import (
+    BulkImportItemStatus,
+    BulkImportJobItemOut,
+    BulkImportJobOut,
+    BulkImportJobStatus,
+)
 from .recipe_category import (
     CategoryBase,
     CategoryIn,
@@ -50,18 +56,27 @@ from .recipe_ingredient import (
     CreateIngredientFoodAlias,
     CreateIngredientUnit,
     CreateIngredientUnitAlias,
+    DuplicateIngredient,
+    DuplicateIngredientCluster,
     IngredientConfidence,
     IngredientFood,
     IngredientFoodAlias,
     IngredientFoodPagination,
+    IngredientParserChunkStats,
     IngredientRequest,
+    IngredientsBatchRequest,
     IngredientsRequest,
     IngredientUnit,
     IngredientUnitAlias,
     IngredientUnitPagination,
     MergeFood,
+    MergeFoodClusters,
+    MergeFoods,
     MergeUnit,
+    MergeUnitClusters,
+    MergeUnits,
     ParsedIngredient,
+    ParsedIngredientsBatchItem,
     RecipeIngredient,
     RecipeIngredientBase,
     RegisteredParser,
@@ -127,6 +142,10 @@ __all__ = [
     "RecipeCommentSave",
     "RecipeCommentUpdate",
     "UserBase",
+    "BulkImportItemStatus",
+    "BulkImportJobItemOut",
+    "BulkImportJobOut",
+    "BulkImportJobStatus",
     "AssignCategories",
     "AssignSettings",
     "AssignTags",
@@ -142,18 +161,27 @@ __all__ = [
     "CreateIngredientFoodAlias",
     "CreateIngredientUnit",
     "CreateIngredientUnitAlias",
+    "DuplicateIngredient",
+    "DuplicateIngredientCluster",
     "IngredientConfidence",
     "IngredientFood",
     "IngredientFoodAlias",
     "IngredientFoodPagination",
+    "IngredientParserChunkStats",
     "IngredientRequest",
     "IngredientUnit",
     "IngredientUnitAlias",
     "IngredientUnitPagination",
+    "IngredientsBatchRequest",
     "IngredientsRequest",
     "MergeFood",
+    "MergeFoodClusters",
+    "MergeFoods",
     "MergeUnit",
+    "MergeUnitClusters",
+    "MergeUnits",
     "ParsedIngredient",
+    "ParsedIngredientsBatchItem",
     "RecipeIngredient",
     "RecipeIngredientBase",
     "RegisteredParser",
@@ -0,0 +1,46 @@
+import enum
+from datetime import datetime
+
+from pydantic import UUID4, ConfigDict
+
+from mealie.schema._mealie import MealieModel
+
+
+class BulkImportJobStatus(enum.StrEnum):
+    in_progress = "in-progress"
+    complete = "complete"
+
+
+class BulkImportItemStatus(enum.StrEnum):
+    pending = "pending"
+    """the page has not been fetched, or was fetched but the recipe was never saved"""
+    persisted = "persisted"
+    """the recipe has been saved, but its image has not been downloaded yet"""
+    success = "success"
+    failure = "failure"
+    duplicate = "duplicate"
+
+
+class BulkImportJobItemOut(MealieModel):
+    id: UUID4
+    job_id: UUID4
+    position: int
+    url: str
+    status: BulkImportItemStatus
+    tags: str | None = None
+    categories: str | None = None
+    recipe_id: UUID4 | None = None
+    image_url: str | None = None
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BulkImportJobOut(MealieModel):
+    id: UUID4
+    status: BulkImportJobStatus
+    runner_id: str | None = None
+    heartbeat_at: datetime | None = None
+    report_id: UUID4
+    group_id: UUID4
+    household_id: UUID4
+    user_id: UUID4
+    model_config = ConfigDict(from_attributes=True)
@@ -358,16 +358,76 @@ class IngredientRequest(MealieModel):
     ingredient: str
 
 
+class IngredientsBatchRequest(MealieModel):
+    parser: RegisteredParser = RegisteredParser.nlp
+    recipes: list[list[str]]
+    """the ingredients of each recipe to parse"""
+
+
+class IngredientParserChunkStats(MealieModel):
+    """A single request sent to the parser's backend, which may contain ingredients from several recipes"""
+
+    ingredients: int
+    attempt: int = 1
+    succeeded: bool = True
+    cached: bool = False
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency_ms: float = 0
+
+
+class ParsedIngredientsBatchItem(MealieModel):
+    index: int
+    """the position of the recipe in the request"""
+    ingredients: list[ParsedIngredient] = []
+    error: str | None = None
+    chunks: list[IngredientParserChunkStats] = []
+    """the requests that finished this recipe; each request is reported with the last recipe it contains"""
+
+
 class MergeFood(MealieModel):
     from_food: UUID4
     to_food: UUID4
 
 
+class MergeFoods(MealieModel):
+    from_foods: list[UUID4]
+    to_food: UUID4
+
+
 class MergeUnit(MealieModel):
     from_unit: UUID4
     to_unit: UUID4
 
 
+class MergeUnits(MealieModel):
+    from_units: list[UUID4]
+    to_unit: UUID4
+
+
+class MergeFoodClusters(MealieModel):
+    clusters: list[MergeFoods]
+
+
+class MergeUnitClusters(MealieModel):
+    clusters: list[MergeUnits]
+
+
+class DuplicateIngredient(MealieModel):
+    id: UUID4
+    name: str
+    usage_count: int = 0
+    """the number of recipe ingredients that use it"""
+
+
+class DuplicateIngredientCluster(MealieModel):
+    score: float
+    """how closely the names in the cluster match, from 0 to 100"""
+    target_id: UUID4
+    """the suggested food or unit to merge the rest of the cluster into"""
+    items: list[DuplicateIngredient]
+
+
 from mealie.schema.labels.multi_purpose_label import MultiPurposeLabelSummary  # noqa: E402
 
 IngredientFood.model_rebuild()
@@ -16,6 +16,7 @@ from mealie.repos.repository_factory import AllRepositories
 from mealie.schema.household.group_events import GroupEventNotifierPrivate
 from mealie.schema.household.webhook import ReadWebhook
 
+from .event_stream import event_stream_broker
 from .event_types import Event, EventDocumentType, EventTypes, EventWebhookData
 from .publisher import ApprisePublisher, PublisherLike, WebhookPublisher
 
@@ -177,3 +178,22 @@ class WebhookEventListener(EventListenerBase):
                 GroupWebhooksModel.household_id == self.household_id,
             )
             return session.execute(stmt).scalars().all()
+
+
+class EventStreamListener(EventListenerBase):
+    """Pushes events to the household's open event streams"""
+
+    _internal_event_types = {EventTypes.test_message, EventTypes.webhook_task}
+
+    def __init__(self, group_id: UUID4, household_id: UUID4) -> None:
+        super().__init__(group_id, household_id, event_stream_broker)
+
+    def get_subscribers(self, event: Event) -> list[str]:
+        if event.event_type in self._internal_event_types:
+            return []
+
+        channel = event_stream_broker.channel(self.group_id, self.household_id)
+        return [channel] if event_stream_broker.is_listening(channel) else []
+
+    def publish_to_subscribers(self, event: Event, subscribers: list[str]) -> None:
+        self.publisher.publish(event, subscribers)
@@ -9,6 +9,7 @@ from mealie.schema.response.pagination import PaginationQuery
 from mealie.services.event_bus_service.event_bus_listeners import (
     AppriseEventListener,
     EventListenerBase,
+    EventStreamListener,
     WebhookEventListener,
 )
 
@@ -55,6 +56,7 @@ class EventBusService:
         return [
             AppriseEventListener(group_id, household_id),
             WebhookEventListener(group_id, household_id),
+            EventStreamListener(group_id, household_id),
         ]
 
     def _publish_event(self, event: Event, group_id: UUID4, household_id: UUID4) -> None:
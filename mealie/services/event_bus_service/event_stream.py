@@ -0,0 +1,239 @@
+import asyncio
+import json
+import threading
+import uuid
+from collections.abc import AsyncGenerator
+
+import sqlalchemy as sa
+from fastapi.encoders import jsonable_encoder
+from pydantic import UUID4
+from sqlalchemy.engine import Engine
+
+from mealie.core import root_logger
+from mealie.core.config import get_app_settings
+
+from .event_types import Event
+
+logger = root_logger.get_logger()
+
+KEEPALIVE_SECONDS = 15
+"""how often an idle stream sends a comment, so proxies don't close the connection"""
+RETRY_MS = 5000
+"""how long clients wait before reconnecting a dropped stream"""
+
+RESYNC_MESSAGE = "event: resync\ndata: {}\n\n"
+"""sent instead of the events a client fell behind on; it should refetch whatever it's displaying"""
+
+
+def format_message(event: Event) -> str:
+    """Formats an event as a server-sent event; the payload is the same as a webhook's"""
+
+    data = json.dumps(jsonable_encoder(event))
+    return f"id: {event.event_id}\nevent: {event.event_type.name}\ndata: {data}\n\n"
+
+
+class EventStreamSubscription:
+    """A single event stream connection, with a bounded queue of the messages waiting to be sent to it"""
+
+    def __init__(self, channel: str, max_size: int) -> None:
+        self.channel = channel
+        self.dropped = 0
+
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue[str] = asyncio.Queue(max_size)
+
+    def put(self, message: str) -> None:
+        """Queues a message for the connection; safe to call from any thread"""
+
+        try:
+            self._loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            # the connection's event loop has shut down
+            pass
+
+    def _put(self, message: str) -> None:
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # the client isn't keeping up, so drop its backlog and tell it to resync instead;
+            # a slow client never blocks publishers and never holds more than `max_size` messages
+            self.dropped += self._queue.qsize() + 1
+            while not self._queue.empty():
+                self._queue.get_nowait()
+
+            self._queue.put_nowait(RESYNC_MESSAGE)
+
+    async def get(self) -> str:
+        return await self._queue.get()
+
+
+class EventStreamBroker:
+    """
+    Fans events out to the event streams open in this process, by group and household. With a relay, events
+    are published through the relay instead, which hands them back to the broker of every worker.
+    """
+
+    def __init__(self, queue_size: int) -> None:
+        self.queue_size = queue_size
+        self.relay: PostgresEventStreamRelay | None = None
+
+        self._lock = threading.Lock()
+        self._subscriptions: dict[str, set[EventStreamSubscription]] = {}
+
+    @staticmethod
+    def channel(group_id: UUID4, household_id: UUID4) -> str:
+        return f"{group_id}.{household_id}"
+
+    def is_listening(self, channel: str) -> bool:
+        """Whether events for the channel could reach a stream, in this worker or, with a relay, in another"""
+
+        return self.relay is not None or channel in self._subscriptions
+
+    def subscribe(self, group_id: UUID4, household_id: UUID4) -> EventStreamSubscription:
+        subscription = EventStreamSubscription(self.channel(group_id, household_id), self.queue_size)
+        with self._lock:
+            self._subscriptions.setdefault(subscription.channel, set()).add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription: EventStreamSubscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(subscription.channel, None)
+
+        if subscription.dropped:
+            logger.warning(f"event stream dropped {subscription.dropped} events for a client that fell behind")
+
+    def publish(self, event: Event, notification_urls: list[str]) -> None:
+        """Publishes the event to the given channels; matches `PublisherLike` so listeners can use the broker"""
+
+        message = format_message(event)
+        for channel in notification_urls:
+            if self.relay:
+                self.relay.send(channel, message)
+            else:
+                self.fan_out(channel, message)
+
+    def fan_out(self, channel: str, message: str) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+
+        for subscription in subscriptions:
+            subscription.put(message)
+
+    async def stream(self, group_id: UUID4, household_id: UUID4) -> AsyncGenerator[str, None]:
+        """Yields server-sent events for the household until the client disconnects"""
+
+        subscription = self.subscribe(group_id, household_id)
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+            while True:
+                try:
+                    yield await asyncio.wait_for(subscription.get(), KEEPALIVE_SECONDS)
+                except TimeoutError:
+                    yield ": keepalive\n\n"
+        finally:
+            self.unsubscribe(subscription)
+
+
+class PostgresEventStreamRelay:
+    """
+    Relays events between workers with Postgres LISTEN/NOTIFY, so a stream receives events published by any
+    worker. Every worker, including the one that published an event, fans out the events it's notified of.
+    """
+
+    CHANNEL = "mealie_event_stream"
+    MAX_PAYLOAD_BYTES = 7999
+    """Postgres rejects NOTIFY payloads of 8000 bytes or more"""
+    RECONNECT_SECONDS = 5
+
+    def __init__(self, broker: EventStreamBroker, engine: Engine) -> None:
+        self.broker = broker
+        self.engine = engine
+        self.worker_id = str(uuid.uuid4())
+
+    def send(self, channel: str, message: str) -> None:
+        payload = json.dumps({"channel": channel, "message": message})
+        if len(payload.encode()) > self.MAX_PAYLOAD_BYTES:
+            # too large to relay: streams in this worker still get the event, and the others are told to resync
+            self.broker.fan_out(channel, message)
+            payload = json.dumps({"channel": channel, "message": RESYNC_MESSAGE, "skip": self.worker_id})
+
+        with self.engine.connect() as connection:
+            connection.execute(sa.select(sa.func.pg_notify(self.CHANNEL, payload)))
+            connection.commit()
+
+    def _receive(self, payload: str) -> None:
+        try:
+            notification = json.loads(payload)
+        except ValueError:
+            logger.warning("ignoring malformed event stream notification")
+            return
+
+        if notification.get("skip") == self.worker_id:
+            return
+
+        self.broker.fan_out(notification["channel"], notification["message"])
+
+    async def _listen(self) -> None:
+        loop = asyncio.get_running_loop()
+        connection = await asyncio.to_thread(self.engine.raw_connection)
+        connection.detach()  # this connection is held for as long as the worker runs, so keep it out of the pool
+
+        dbapi_connection = connection.dbapi_connection
+        dbapi_connection.autocommit = True  # type: ignore[union-attr]
+        with dbapi_connection.cursor() as cursor:  # type: ignore[union-attr]
+            cursor.execute(f"LISTEN {self.CHANNEL}")
+
+        disconnected: asyncio.Future[None] = loop.create_future()
+
+        def on_readable() -> None:
+            try:
+                dbapi_connection.poll()  # type: ignore[union-attr]
+            except Exception as e:
+                if not disconnected.done():
+                    disconnected.set_exception(e)
+                return
+
+            while dbapi_connection.notifies:  # type: ignore[union-attr]
+                self._receive(dbapi_connection.notifies.pop(0).payload)  # type: ignore[union-attr]
+
+        fileno = dbapi_connection.fileno()  # type: ignore[union-attr]
+        loop.add_reader(fileno, on_readable)
+        try:
+            await disconnected
+        finally:
+            loop.remove_reader(fileno)
+            connection.close()
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self._listen()
+            except Exception:
+                logger.exception(f"event stream relay lost its connection, reconnecting in {self.RECONNECT_SECONDS}s")
+
+            await asyncio.sleep(self.RECONNECT_SECONDS)
+
+
+event_stream_broker = EventStreamBroker(get_app_settings().EVENT_STREAM_QUEUE_SIZE)
+
+
+def start_event_stream_relay(engine: Engine) -> PostgresEventStreamRelay | None:
+    """Configures the relay chosen by `EVENT_STREAM_BROKER`; the caller is responsible for running it"""
+
+    settings = get_app_settings()
+    if settings.EVENT_STREAM_BROKER == "memory":
+        return None
+
+    if settings.EVENT_STREAM_BROKER != "postgres" or settings.DB_ENGINE != "postgres":
+        logger.warning(
+            f"EVENT_STREAM_BROKER={settings.EVENT_STREAM_BROKER!r} isn't supported with DB_ENGINE="
+            f"{settings.DB_ENGINE!r}; event streams only receive events published by their own worker"
+        )
+        return None
+
+    event_stream_broker.relay = PostgresEventStreamRelay(event_stream_broker, engine)
+    return event_stream_broker.relay
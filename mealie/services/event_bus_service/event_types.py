@@ -164,6 +164,12 @@ class EventRecipeTimelineEventData(EventDocumentDataBase):
     recipe_timeline_event_id: UUID4
 
 
+class EventRecipeTimelineEventBulkData(EventDocumentDataBase):
+    document_type: EventDocumentType = EventDocumentType.recipe_timeline_event
+    recipe_slugs: list[str]
+    recipe_timeline_event_ids: list[UUID4]
+
+
 class EventTagData(EventDocumentDataBase):
     document_type: EventDocumentType = EventDocumentType.tag
     tag_id: UUID4
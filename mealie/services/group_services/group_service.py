@@ -55,18 +55,14 @@ class GroupService(BaseService):
     def calculate_group_storage(self, group_id: None | UUID4 = None) -> GroupStorage:
         """
         calculate_group_storage calculates the storage used by the group and returns
-        a GroupStorage object.
+        a GroupStorage object. Recipes record their own storage as their files change,
+        so this is a single query rather than a walk of every recipe directory.
         """
 
         # we need all recipes from all households, not just our household
         group_repos = get_repositories(self.repos.session, group_id=group_id, household_id=None)
 
         target_id = group_id or self.group_id
-
-        all_ids = group_repos.recipes.all_ids(target_id)
-
-        used_size = sum(
-            fs_stats.get_dir_size(f"{self.directories.RECIPE_DATA_DIR}/{recipe_id!s}") for recipe_id in all_ids
-        )
+        used_size = group_repos.recipes.get_storage_size(target_id)
 
         return GroupStorage.bytes(used_size, ALLOWED_SIZE)
@@ -0,0 +1,267 @@
+import re
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from pydantic import UUID4
+from rapidfuzz import fuzz, process
+from sqlalchemy import ColumnElement, func, select
+
+from mealie.db.models.recipe.ingredient import (
+    IngredientFoodAliasModel,
+    IngredientFoodModel,
+    IngredientUnitAliasModel,
+    IngredientUnitModel,
+    RecipeIngredientModel,
+)
+from mealie.repos.repository_factory import AllRepositories
+from mealie.schema.recipe.recipe_ingredient import DuplicateIngredient, DuplicateIngredientCluster
+from mealie.services._base_service import BaseService
+
+_WORD_PATTERN = re.compile(r"[^\W_]+")
+
+MIN_FUZZY_LENGTH = 4
+"""names shorter than this are only matched exactly; one edit is too big a change to them"""
+BLOCK_AFFIX_LENGTH = 3
+"""names are only compared when one of their words starts, or ends, with the same this many characters"""
+MAX_BLOCK_SIZE = 2000
+"""affixes shared by more names than this say too little about whether the names match, so aren't compared on"""
+
+
+def _singular(word: str) -> str:
+    if len(word) <= 3:
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("oes", "ches", "shes", "sses", "xes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def canonical_name(normalized_name: str) -> str:
+    """
+    Reduces a name, normalized with `normalize` like the database does, to its words in singular form and
+    sorted order, so "Tomatoes, Diced" and "diced tomato" compare equal
+    """
+
+    return " ".join(sorted(_singular(word) for word in _WORD_PATTERN.findall(normalized_name)))
+
+
+@dataclass(slots=True)
+class DuplicateCandidate:
+    id: UUID4
+    names: list[str]
+    """normalized names, plural names, and aliases, which are matched fuzzily"""
+    abbreviations: set[str] = field(default_factory=set)
+    """
+    unit abbreviations, compared case-sensitively since "T" and "t" are different units; they never match on their
+    own, but candidates whose abbreviations disagree aren't matched by their names either
+    """
+
+
+def _abbreviations_agree(a: DuplicateCandidate, b: DuplicateCandidate) -> bool:
+    return not (a.abbreviations and b.abbreviations) or not a.abbreviations.isdisjoint(b.abbreviations)
+
+
+@dataclass(slots=True)
+class CandidateCluster:
+    members: list[int]
+    """the indexes of the clustered candidates"""
+    score: float
+    """the mean score of the matches that formed the cluster"""
+
+
+def _cluster_pairs(count: int, scores: dict[tuple[int, int], float]) -> list[CandidateCluster]:
+    """Single-linkage clustering of the matched pairs of `count` candidates, with a union-find"""
+
+    parents = list(range(count))
+
+    def find(i: int) -> int:
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    for a, b in scores:
+        parents[find(a)] = find(b)
+
+    members: defaultdict[int, list[int]] = defaultdict(list)
+    pair_scores: defaultdict[int, list[float]] = defaultdict(list)
+    for i in range(count):
+        members[find(i)].append(i)
+    for (a, _), score in scores.items():
+        pair_scores[find(a)].append(score)
+
+    return [
+        CandidateCluster(members=cluster, score=sum(pair_scores[root]) / len(pair_scores[root]))
+        for root, cluster in members.items()
+        if len(cluster) > 1
+    ]
+
+
+def find_duplicate_clusters(candidates: list[DuplicateCandidate], threshold: float) -> list[CandidateCluster]:
+    """
+    Clusters candidates whose names score at least `threshold` (0-100) against each other. Names are blocked
+    on the first and last few characters of their words, so a typo only hides a match when it's at both ends,
+    and each block is scored in one vectorized `cdist` call, so the number of comparisons grows with the size
+    of the blocks rather than the square of the number of candidates. Candidates whose abbreviations disagree
+    are never paired.
+
+    Clusters are ranked from the most to the least confident.
+    """
+
+    owners_by_name: defaultdict[str, set[int]] = defaultdict(set)
+    fuzzy_names: set[str] = set()
+    for i, candidate in enumerate(candidates):
+        for normalized_name in candidate.names:
+            if name := canonical_name(normalized_name):
+                owners_by_name[name].add(i)
+                if len(name) >= MIN_FUZZY_LENGTH:
+                    fuzzy_names.add(name)
+
+    scores: dict[tuple[int, int], float] = {}
+
+    def add_match(owners_a: Iterable[int], owners_b: Iterable[int], score: float) -> None:
+        for a in owners_a:
+            for b in owners_b:
+                if a == b:
+                    continue
+
+                pair = (a, b) if a < b else (b, a)
+                if score > scores.get(pair, 0) and _abbreviations_agree(candidates[a], candidates[b]):
+                    scores[pair] = score
+
+    # candidates sharing a name are exact matches; pairing each with the first is enough to cluster them
+    for owners in owners_by_name.values():
+        if len(owners) > 1:
+            first, *rest = sorted(owners)
+            add_match([first], rest, 100)
+
+    names = sorted(fuzzy_names)
+    blocks: defaultdict[str, list[int]] = defaultdict(list)
+    for i, name in enumerate(names):
+        for word in name.split():
+            blocks["^" + word[:BLOCK_AFFIX_LENGTH]].append(i)
+            blocks[word[-BLOCK_AFFIX_LENGTH:] + "$"].append(i)
+
+    for block in blocks.values():
+        block = sorted(set(block))
+        if not 1 < len(block) <= MAX_BLOCK_SIZE:
+            continue
+
+        block_names = [names[i] for i in block]
+        matrix = process.cdist(block_names, block_names, scorer=fuzz.ratio, score_cutoff=threshold, workers=-1)
+        for row, col in zip(*matrix.nonzero(), strict=True):
+            if row < col:
+                add_match(owners_by_name[block_names[row]], owners_by_name[block_names[col]], float(matrix[row, col]))
+
+    clusters = _cluster_pairs(len(candidates), scores)
+    clusters.sort(key=lambda cluster: (-cluster.score, -len(cluster.members)))
+    return clusters
+
+
+class IngredientDuplicatesService(BaseService):
+    """Suggests which of a group's foods, or units, should be merged"""
+
+    def __init__(self, repos: AllRepositories):
+        self.repos = repos
+        super().__init__()
+
+    @property
+    def _group_id(self) -> UUID4:
+        return self.repos.group_id  # type: ignore
+
+    def _build_clusters(
+        self,
+        candidates: list[DuplicateCandidate],
+        display_names: dict[UUID4, str],
+        usage_counts: dict[UUID4, int],
+        threshold: float,
+    ) -> list[DuplicateIngredientCluster]:
+        results: list[DuplicateIngredientCluster] = []
+        for cluster in find_duplicate_clusters(candidates, threshold):
+            duplicates = [
+                DuplicateIngredient(
+                    id=candidates[i].id,
+                    name=display_names[candidates[i].id],
+                    usage_count=usage_counts.get(candidates[i].id, 0),
+                )
+                for i in cluster.members
+            ]
+            # suggest keeping the most used item, since merging it into another would change the most recipes
+            duplicates.sort(key=lambda duplicate: (-duplicate.usage_count, len(duplicate.name), duplicate.name))
+            results.append(
+                DuplicateIngredientCluster(score=round(cluster.score, 2), target_id=duplicates[0].id, items=duplicates)
+            )
+
+        return results
+
+    def _usage_counts(
+        self, column: ColumnElement, model: type[IngredientFoodModel] | type[IngredientUnitModel]
+    ) -> dict[UUID4, int]:
+        stmt = (
+            select(column, func.count())
+            .join(model, column == model.id)
+            .where(model.group_id == self._group_id)
+            .group_by(column)
+        )
+        return dict(self.repos.session.execute(stmt).tuples().all())
+
+    def find_duplicate_foods(self, threshold: float = 85) -> list[DuplicateIngredientCluster]:
+        session = self.repos.session
+        food = IngredientFoodModel
+        candidates: dict[UUID4, DuplicateCandidate] = {}
+        display_names: dict[UUID4, str] = {}
+
+        stmt = select(food.id, food.name, food.plural_name).where(food.group_id == self._group_id)
+        for id, name, plural_name in session.execute(stmt):
+            names = [food.normalize(value) for value in (name, plural_name) if value]
+            candidates[id] = DuplicateCandidate(id=id, names=names)
+            display_names[id] = name or plural_name or ""
+
+        alias = IngredientFoodAliasModel
+        stmt = (
+            select(alias.food_id, alias.name)
+            .join(food, alias.food_id == food.id)
+            .where(food.group_id == self._group_id)
+        )
+        for food_id, name in session.execute(stmt):
+            if name and food_id in candidates:
+                candidates[food_id].names.append(alias.normalize(name))
+
+        usage_counts = self._usage_counts(RecipeIngredientModel.food_id, food)
+        return self._build_clusters(list(candidates.values()), display_names, usage_counts, threshold)
+
+    def find_duplicate_units(self, threshold: float = 85) -> list[DuplicateIngredientCluster]:
+        session = self.repos.session
+        unit = IngredientUnitModel
+        candidates: dict[UUID4, DuplicateCandidate] = {}
+        display_names: dict[UUID4, str] = {}
+
+        stmt = select(unit.id, unit.name, unit.plural_name, unit.abbreviation, unit.plural_abbreviation).where(
+            unit.group_id == self._group_id
+        )
+        for id, name, plural_name, abbreviation, plural_abbreviation in session.execute(stmt):
+            candidates[id] = DuplicateCandidate(
+                id=id,
+                names=[unit.normalize(value) for value in (name, plural_name) if value],
+                abbreviations={
+                    value.strip() for value in (abbreviation, plural_abbreviation) if value and value.strip()
+                },
+            )
+            display_names[id] = name or abbreviation or ""
+
+        alias = IngredientUnitAliasModel
+        stmt = (
+            select(alias.unit_id, alias.name)
+            .join(unit, alias.unit_id == unit.id)
+            .where(unit.group_id == self._group_id)
+        )
+        for unit_id, name in session.execute(stmt):
+            if name and unit_id in candidates:
+                candidates[unit_id].names.append(alias.normalize(name))
+
+        usage_counts = self._usage_counts(RecipeIngredientModel.unit_id, unit)
+        return self._build_clusters(list(candidates.values()), display_names, usage_counts, threshold)
@@ -11,6 +11,7 @@ from mealie.schema.household.household_preferences import CreateHouseholdPrefere
 from mealie.schema.household.household_statistics import HouseholdStatistics
 from mealie.schema.recipe.recipe import Recipe
 from mealie.services._base_service import BaseService
+from mealie.services.household_services.household_statistics_cache import household_statistics_cache
 
 
 class HouseholdService(BaseService):
@@ -65,7 +66,13 @@ class HouseholdService(BaseService):
         group_id = group_id or self.group_id
         household_id = household_id or self.household_id
 
-        return self.repos.households.statistics(group_id, household_id)
+        if statistics := household_statistics_cache.get((group_id, household_id)):
+            return statistics
+
+        generation = household_statistics_cache.generation
+        statistics = self.repos.households.statistics(group_id, household_id)
+        household_statistics_cache.set((group_id, household_id), statistics, generation)
+        return statistics
 
     def get_household_recipe(self, recipe_slug: str) -> HouseholdRecipeSummary | None:
         """Returns recipe data for the current household"""
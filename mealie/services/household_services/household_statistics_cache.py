@@ -0,0 +1,64 @@
+from pydantic import UUID4
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+from mealie.core.cache import CLEAR_ALL, GenerationTTLCache, register_invalidation_hooks
+from mealie.core.config import get_app_settings
+from mealie.db.models.recipe import Category, RecipeModel, Tag, Tool
+from mealie.db.models.users import User
+from mealie.schema.household.household_statistics import HouseholdStatistics
+
+MAX_SIZE = 1024
+"""maximum number of households whose statistics are cached"""
+
+_COUNTED_MODELS = (RecipeModel, User, Category, Tag, Tool)
+
+
+class HouseholdStatisticsCache(GenerationTTLCache[tuple[UUID4, UUID4], HouseholdStatistics]):
+    """
+    In-process cache of household statistics, keyed by `(group_id, household_id)`, so dashboards and API
+    polling don't count the same tables over and over. Counts only change when one of the counted models is
+    created or deleted, so entries are invalidated for the whole group whenever that happens.
+
+    The cache is per-process, so with several workers a change made through another worker can take up
+    to `ttl` seconds to apply.
+    """
+
+    def get(self, key: tuple[UUID4, UUID4]) -> HouseholdStatistics | None:
+        statistics = super().get(key)
+        return statistics.model_copy() if statistics else None
+
+    def set(self, key: tuple[UUID4, UUID4], value: HouseholdStatistics, generation: int | None = None) -> None:
+        super().set(key, value.model_copy(), generation)
+
+    def invalidate_group(self, group_id: UUID4) -> None:
+        self.invalidate_where(lambda key, _: key[0] == group_id)
+
+
+household_statistics_cache = HouseholdStatisticsCache(get_app_settings().STATISTICS_CACHE_TTL, MAX_SIZE)
+
+
+def _household_changed(user: User) -> bool:
+    state = inspect(user)
+    return state.attrs.household_id.history.has_changes() or state.attrs.group_id.history.has_changes()
+
+
+def _collect_invalidations(session: Session, pending: set[UUID4 | str]) -> None:
+    """Records which groups' statistics are affected by the flushed changes"""
+
+    for obj in (*session.new, *session.deleted):
+        if isinstance(obj, _COUNTED_MODELS) and obj.group_id is not None:
+            pending.add(obj.group_id)
+
+    for obj in session.dirty:
+        if isinstance(obj, User) and _household_changed(obj):
+            # the user, and their recipes, moved to another household; that's rare enough to start over
+            pending.add(CLEAR_ALL)
+
+
+register_invalidation_hooks(
+    "household_statistics_cache",
+    _collect_invalidations,
+    household_statistics_cache.invalidate_group,
+    household_statistics_cache.clear,
+)
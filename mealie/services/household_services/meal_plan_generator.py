@@ -0,0 +1,109 @@
+import random
+from datetime import UTC, datetime, timedelta
+from functools import cached_property
+
+from pydantic import UUID4
+
+from mealie.repos.all_repositories import get_repositories
+from mealie.repos.repository_factory import AllRepositories
+from mealie.repos.repository_recipes import RepositoryRecipes
+from mealie.schema.meal_plan.new_meal import CreateRandomEntries, PlanEntryType, SavePlanEntry
+from mealie.schema.meal_plan.plan_rules import PlanRulesDay, PlanRulesType
+from mealie.services._base_service import BaseService
+
+
+class _RecipePool:
+    """
+    The shuffled recipes matching one set of rules. Recently made recipes are drawn only once the rest have
+    been, and a recipe is only drawn again once every recipe in the pool has been planned.
+    """
+
+    def __init__(self, fresh: list[UUID4], recent: list[UUID4]) -> None:
+        random.shuffle(fresh)
+        random.shuffle(recent)
+        self._queue = fresh + recent
+        self._next = 0
+
+    def draw(self, planned: set[UUID4]) -> UUID4 | None:
+        while self._next < len(self._queue):
+            recipe_id = self._queue[self._next]
+            self._next += 1
+            if recipe_id not in planned:
+                return recipe_id
+
+        # every matching recipe is already planned, so repeat one rather than leave the meal empty
+        return random.choice(self._queue) if self._queue else None
+
+
+class MealPlanGenerator(BaseService):
+    """Plans random recipes for a range of days and entry types, following the household's mealplan rules"""
+
+    def __init__(self, repos: AllRepositories, user_id: UUID4) -> None:
+        self.repos = repos
+        self.user_id = user_id
+        super().__init__()
+
+    @cached_property
+    def _recipes(self) -> RepositoryRecipes:
+        """recipes from all households are included unless the rules specify a household filter"""
+
+        return get_repositories(self.repos.session, group_id=self.repos.group_id, household_id=None).recipes.by_user(
+            self.user_id
+        )
+
+    def _query_filter(self, day: PlanRulesDay, entry_type: PlanEntryType) -> str:
+        rules = self.repos.group_meal_plan_rules.get_rules(day, PlanRulesType(entry_type.value))
+        return " AND ".join([f"({rule.query_filter_string})" for rule in rules if rule.query_filter_string])
+
+    def _build_pool(self, query_filter: str, recently_made_after: datetime) -> _RecipePool:
+        fresh: list[UUID4] = []
+        recent: list[UUID4] = []
+        for recipe_id, last_made in self._recipes.get_ids_with_last_made(query_filter).items():
+            if last_made and last_made.tzinfo is None:
+                last_made = last_made.replace(tzinfo=UTC)
+
+            (recent if last_made and last_made > recently_made_after else fresh).append(recipe_id)
+
+        return _RecipePool(fresh, recent)
+
+    def generate(self, data: CreateRandomEntries) -> list[SavePlanEntry]:
+        """
+        Picks a recipe for each entry type on each day in the range, without saving them. The recipes matching
+        each distinct set of rules are selected once for the whole range, and recipes are picked without
+        replacement across it, skipping any already planned in the range. Meals no recipe matches are skipped.
+        """
+
+        recently_made_after = datetime.now(UTC) - timedelta(days=data.recently_made_days)
+        start = datetime.combine(data.start_date, datetime.min.time())
+        end = datetime.combine(data.end_date, datetime.min.time())
+        planned = {entry.recipe_id for entry in self.repos.meals.get_meals_by_date_range(start, end) if entry.recipe_id}
+
+        query_filters: dict[tuple[PlanRulesDay, PlanEntryType], str] = {}
+        pools: dict[str, _RecipePool] = {}
+        entries: list[SavePlanEntry] = []
+        for offset in range((data.end_date - data.start_date).days + 1):
+            plan_date = data.start_date + timedelta(days=offset)
+            day = PlanRulesDay.from_date(plan_date)
+            for entry_type in data.entry_types:
+                if (day, entry_type) not in query_filters:
+                    query_filters[day, entry_type] = self._query_filter(day, entry_type)
+
+                query_filter = query_filters[day, entry_type]
+                if query_filter not in pools:
+                    pools[query_filter] = self._build_pool(query_filter, recently_made_after)
+
+                if not (recipe_id := pools[query_filter].draw(planned)):
+                    continue
+
+                planned.add(recipe_id)
+                entries.append(
+                    SavePlanEntry(
+                        date=plan_date,
+                        entry_type=entry_type,
+                        recipe_id=recipe_id,
+                        group_id=self.repos.group_id,
+                        user_id=self.user_id,
+                    )
+                )
+
+        return entries
@@ -1,3 +1,5 @@
+from collections import defaultdict
+from collections.abc import Collection, Sequence
 from typing import cast
 
 from pydantic import UUID4
@@ -5,8 +7,10 @@ from pydantic import UUID4
 from mealie.core.exceptions import UnexpectedNone
 from mealie.repos.all_repositories import get_repositories
 from mealie.repos.repository_factory import AllRepositories
+from mealie.repos.repository_recipes import RecipeIngredientProjection
 from mealie.schema.household.group_shopping_list import (
     ShoppingListAddRecipeParamsBulk,
+    ShoppingListChangesOut,
     ShoppingListCreate,
     ShoppingListItemBase,
     ShoppingListItemCreate,
@@ -17,7 +21,8 @@ from mealie.schema.household.group_shopping_list import (
     ShoppingListItemUpdate,
     ShoppingListItemUpdateBulk,
     ShoppingListMultiPurposeLabelCreate,
-    ShoppingListOut,
+    ShoppingListRecipeChangesOut,
+    ShoppingListRecipeRefOut,
     ShoppingListSave,
 )
 from mealie.schema.recipe.recipe import Recipe
@@ -102,20 +107,30 @@ class ShoppingListService:
 
         return to_item.cast(ShoppingListItemUpdate, recipe_references=list(updated_refs.values()))
 
-    def remove_unused_recipe_references(self, shopping_list_id: UUID4) -> None:
-        shopping_list = cast(ShoppingListOut, self.shopping_lists.get_one(shopping_list_id))
+    def remove_unused_recipe_references(self, shopping_list_id: UUID4) -> list[UUID4]:
+        """Deletes the list's recipe references that none of its items refer to, returning their ids"""
 
-        recipe_ids_to_keep: set[UUID4] = set()
-        for item in shopping_list.list_items:
-            recipe_ids_to_keep.update([ref.recipe_id for ref in item.recipe_references])
+        return self.shopping_lists.delete_unused_recipe_references([shopping_list_id])
 
-        list_refs_to_delete: set[UUID4] = set()
-        for list_ref in shopping_list.recipe_references:
-            if list_ref.recipe_id not in recipe_ids_to_keep:
-                list_refs_to_delete.add(list_ref.id)
+    def get_merge_candidates(self, list_id: UUID4, items: Sequence[ShoppingListItemBase]) -> list[ShoppingListItemOut]:
+        """
+        Loads the list's unchecked items that any of the items could be merged into. Items only merge when
+        their foods match, so the rest of the list isn't loaded.
+        """
 
-        if list_refs_to_delete:
-            self.list_refs.delete_many(list_refs_to_delete)
+        conditions: list[str] = []
+        if food_ids := {item.food_id for item in items if item.food_id}:
+            conditions.append(f"food_id IN [{','.join(map(str, food_ids))}]")
+        if any(not item.food_id for item in items):
+            conditions.append("food_id IS NULL")
+        if not conditions:
+            return []
+
+        query = PaginationQuery(
+            per_page=-1,
+            query_filter=f'shopping_list_id="{list_id}" AND checked=false AND ({" OR ".join(conditions)})',
+        )
+        return self.list_items.page_all(query).items
 
     def find_matching_label(self, item: ShoppingListItemBase) -> UUID4 | None:
         if item.label_id:
@@ -157,11 +172,10 @@ class ShoppingListService:
         existing_items_map: dict[UUID4, list[ShoppingListItemOut]] = {}
         for create_item in create_items:
             if create_item.shopping_list_id not in existing_items_map:
-                query = PaginationQuery(
-                    per_page=-1, query_filter=f"shopping_list_id={create_item.shopping_list_id} AND checked=false"
+                existing_items_map[create_item.shopping_list_id] = self.get_merge_candidates(
+                    create_item.shopping_list_id,
+                    [item for item in create_items if item.shopping_list_id == create_item.shopping_list_id],
                 )
-                items_data = self.list_items.page_all(query)
-                existing_items_map[create_item.shopping_list_id] = items_data.items
 
             merged = False
             for existing_item in existing_items_map[create_item.shopping_list_id]:
@@ -231,11 +245,10 @@ class ShoppingListService:
         existing_items_map: dict[UUID4, list[ShoppingListItemOut]] = {}
         for update_item in update_items:
             if update_item.shopping_list_id not in existing_items_map:
-                query = PaginationQuery(
-                    per_page=-1, query_filter=f"shopping_list_id={update_item.shopping_list_id} AND checked=false"
+                existing_items_map[update_item.shopping_list_id] = self.get_merge_candidates(
+                    update_item.shopping_list_id,
+                    [item for item in update_items if item.shopping_list_id == update_item.shopping_list_id],
                 )
-                items_data = self.list_items.page_all(query)
-                existing_items_map[update_item.shopping_list_id] = items_data.items
 
             merged = False
             for existing_item in existing_items_map[update_item.shopping_list_id]:
@@ -295,6 +308,102 @@ class ShoppingListService:
 
         return ShoppingListItemsCollectionOut(created_items=[], updated_items=[], deleted_items=deleted_items)
 
+    def get_changes(self, list_id: UUID4, since: int) -> ShoppingListChangesOut | None:
+        """
+        Returns the items created, updated, or deleted since the `since` revision, or `None` if the list doesn't exist.
+        Items created and then deleted since that revision are left out entirely.
+
+        A `since` ahead of the list's revision (e.g. after restoring a backup) is treated as 0. If items deleted
+        after `since` have since been pruned from the change log, the client is told to fetch the whole list again.
+        """
+
+        revisions = self.shopping_lists.get_revisions(list_id)
+        if revisions is None:
+            return None
+
+        revision, pruned_revision = revisions
+        if since == revision:
+            return ShoppingListChangesOut(revision=revision)
+        if since > revision:
+            since = 0
+        if 0 < since < pruned_revision:
+            return ShoppingListChangesOut(revision=revision, full_resync=True)
+
+        changes = self.shopping_lists.get_item_changes(list_id, since)
+        changed_item_ids = [change.item_id for change in changes if not change.deleted]
+        items_by_id: dict[UUID4, ShoppingListItemOut] = {}
+        if changed_item_ids:
+            query = PaginationQuery(
+                per_page=-1,
+                query_filter=f'shopping_list_id="{list_id}" AND id IN [{",".join(map(str, changed_item_ids))}]',
+            )
+            items_by_id = {item.id: item for item in self.list_items.page_all(query).items}
+
+        response = ShoppingListChangesOut(revision=revision)
+        for change in changes:
+            created_since = change.created_revision is not None and change.created_revision > since
+            item = None if change.deleted else items_by_id.get(change.item_id)
+            if item is None:
+                if not created_since:
+                    response.deleted_item_ids.append(change.item_id)
+            elif created_since:
+                response.created_items.append(item)
+            else:
+                response.updated_items.append(item)
+
+        return response
+
+    def get_recipe_ingredients(self, recipe_ids: Collection[UUID4]) -> dict[UUID4, list[RecipeIngredientProjection]]:
+        """
+        Loads the ingredients of the recipes, and of every recipe they reference, by recipe id.
+        Only the columns needed to create list items are loaded, rather than the recipes themselves.
+        """
+
+        if not recipe_ids:
+            return {}
+
+        group_recipes_repo = get_repositories(
+            self.repos.session, group_id=self.repos.group_id, household_id=None
+        ).recipes
+        ingredients = group_recipes_repo.get_flattened_ingredient_projections(recipe_ids)
+        if any(recipe_id not in ingredients for recipe_id in recipe_ids):
+            raise UnexpectedNone("Recipe not found")
+
+        return ingredients
+
+    @classmethod
+    def project_recipe_ingredients(
+        cls,
+        recipe_id: UUID4,
+        recipe_ingredients: list[RecipeIngredient],
+        ingredients: dict[UUID4, list[RecipeIngredientProjection]] | None = None,
+    ) -> dict[UUID4, list[RecipeIngredientProjection]]:
+        """Converts the ingredients of a recipe, and of every recipe they reference, to ingredient projections"""
+
+        ingredients = {} if ingredients is None else ingredients
+        projections: list[RecipeIngredientProjection] = []
+        for ingredient in recipe_ingredients:
+            sub_recipe = ingredient.referenced_recipe if isinstance(ingredient.referenced_recipe, Recipe) else None
+            if sub_recipe and sub_recipe.id not in ingredients:
+                cls.project_recipe_ingredients(sub_recipe.id, sub_recipe.recipe_ingredient, ingredients)
+
+            food = ingredient.food if isinstance(ingredient.food, IngredientFood) else None
+            unit = ingredient.unit if isinstance(ingredient.unit, IngredientUnit) else None
+            projections.append(
+                RecipeIngredientProjection(
+                    recipe_id=recipe_id,
+                    quantity=ingredient.quantity,
+                    note=ingredient.note,
+                    food_id=food.id if food else None,
+                    label_id=food.label_id if food else None,
+                    unit_id=unit.id if unit else None,
+                    referenced_recipe_id=sub_recipe.id if sub_recipe else None,
+                )
+            )
+
+        ingredients[recipe_id] = projections
+        return ingredients
+
     def get_shopping_list_items_from_recipe(
         self,
         list_id: UUID4,
@@ -305,50 +414,45 @@ class ShoppingListService:
         """Generates a list of new list items based on a recipe"""
 
         if recipe_ingredients is None:
-            group_recipes_repo = get_repositories(
-                self.repos.session, group_id=self.repos.group_id, household_id=None
-            ).recipes
-            recipe = group_recipes_repo.get_one(recipe_id, "id")
-            if not recipe:
-                raise UnexpectedNone("Recipe not found")
+            ingredients = self.get_recipe_ingredients([recipe_id])
+        else:
+            ingredients = self.project_recipe_ingredients(recipe_id, recipe_ingredients)
 
-            recipe_ingredients = recipe.recipe_ingredient
+        return self.get_shopping_list_items_from_ingredients(list_id, recipe_id, scale, ingredients)
+
+    def get_shopping_list_items_from_ingredients(
+        self,
+        list_id: UUID4,
+        recipe_id: UUID4,
+        scale: float,
+        ingredients: dict[UUID4, list[RecipeIngredientProjection]],
+        _parent_recipe_ids: frozenset[UUID4] = frozenset(),
+    ) -> list[ShoppingListItemCreate]:
+        """Generates a list of new list items from a recipe's ingredients, as loaded by `get_recipe_ingredients`"""
 
         list_items: list[ShoppingListItemCreate] = []
-        for ingredient in recipe_ingredients:
-            if isinstance(ingredient.referenced_recipe, Recipe):
+        for ingredient in ingredients.get(recipe_id, []):
+            sub_recipe_id = ingredient.referenced_recipe_id
+            if sub_recipe_id in ingredients and sub_recipe_id not in _parent_recipe_ids | {recipe_id}:
                 # Recursively process sub-recipe ingredients
-                sub_recipe = ingredient.referenced_recipe
                 sub_scale = (ingredient.quantity or 1) * scale
-                sub_items = self.get_shopping_list_items_from_recipe(
+                sub_items = self.get_shopping_list_items_from_ingredients(
                     list_id,
-                    sub_recipe.id,
+                    sub_recipe_id,
                     sub_scale,
-                    sub_recipe.recipe_ingredient,
+                    ingredients,
+                    _parent_recipe_ids | {recipe_id},
                 )
                 list_items.extend(sub_items)
                 continue
 
-            if isinstance(ingredient.food, IngredientFood):
-                food_id = ingredient.food.id
-                label_id = ingredient.food.label_id
-            else:
-                food_id = None
-                label_id = None
-
-            if isinstance(ingredient.unit, IngredientUnit):
-                unit_id = ingredient.unit.id
-
-            else:
-                unit_id = None
-
             new_item = ShoppingListItemCreate(
                 shopping_list_id=list_id,
                 note=ingredient.note,
                 quantity=ingredient.quantity * scale if ingredient.quantity else 0,
-                food_id=food_id,
-                label_id=label_id,
-                unit_id=unit_id,
+                food_id=ingredient.food_id,
+                label_id=ingredient.label_id,
+                unit_id=ingredient.unit_id,
                 recipe_references=[
                     ShoppingListItemRecipeRefCreate(
                         recipe_id=recipe_id,
@@ -385,68 +489,80 @@ class ShoppingListService:
 
         return list_items
 
+    def get_recipe_references(self, list_id: UUID4, recipe_ids: Collection[UUID4]) -> list[ShoppingListRecipeRefOut]:
+        """Loads the list's references to the recipes, without loading the rest of the list"""
+
+        query = PaginationQuery(
+            per_page=-1,
+            query_filter=f'shopping_list_id="{list_id}" AND recipe_id IN [{",".join(map(str, recipe_ids))}]',
+        )
+        return self.list_refs.page_all(query).items
+
     def add_recipe_ingredients_to_list(
         self,
         list_id: UUID4,
         recipe_items: list[ShoppingListAddRecipeParamsBulk],
-    ) -> tuple[ShoppingListOut, ShoppingListItemsCollectionOut]:
+    ) -> ShoppingListRecipeChangesOut | None:
         """
-        Adds recipe ingredients to a list
+        Adds recipe ingredients to a list, returning the items and recipe references that changed,
+        or `None` if the list doesn't exist
 
-        Returns a tuple of:
-        - Updated Shopping List
-        - Impacted Shopping List Items
+        Only the recipes' ingredients are loaded, and only the affected items and references are written.
         """
 
-        items_to_create = [
-            item
-            for recipe in recipe_items
-            for item in self.get_shopping_list_items_from_recipe(
-                list_id, recipe.recipe_id, recipe.recipe_increment_quantity, recipe.recipe_ingredients
-            )
-        ]
-        item_changes = self.bulk_create_items(items_to_create)
-        updated_list = cast(ShoppingListOut, self.shopping_lists.get_one(list_id))
+        if self.shopping_lists.get_revision(list_id) is None:
+            return None
 
-        # update list-level recipe references
-        for recipe in recipe_items:
-            ref_merged = False
-            for ref in updated_list.recipe_references:
-                if ref.recipe_id != recipe.recipe_id:
-                    continue
-
-                ref.recipe_quantity += recipe.recipe_increment_quantity
-                ref_merged = True
-                break
+        ingredients = self.get_recipe_ingredients(
+            {recipe.recipe_id for recipe in recipe_items if recipe.recipe_ingredients is None}
+        )
 
-            if not ref_merged:
-                updated_list.recipe_references.append(
-                    ShoppingListItemRecipeRefCreate(
-                        recipe_id=recipe.recipe_id, recipe_quantity=recipe.recipe_increment_quantity
-                    )
+        items_to_create: list[ShoppingListItemCreate] = []
+        recipe_quantities: dict[UUID4, float] = defaultdict(float)
+        for recipe in recipe_items:
+            recipe_ingredients = (
+                ingredients
+                if recipe.recipe_ingredients is None
+                else self.project_recipe_ingredients(recipe.recipe_id, recipe.recipe_ingredients)
+            )
+            items_to_create.extend(
+                self.get_shopping_list_items_from_ingredients(
+                    list_id, recipe.recipe_id, recipe.recipe_increment_quantity, recipe_ingredients
                 )
+            )
+            recipe_quantities[recipe.recipe_id] += recipe.recipe_increment_quantity
 
-        updated_list = self.shopping_lists.update(updated_list.id, updated_list)
-        return updated_list, item_changes
+        item_changes = self.bulk_create_items(items_to_create)
+        self.shopping_lists.add_recipe_references(list_id, recipe_quantities)
+
+        return item_changes.cast(
+            ShoppingListRecipeChangesOut,
+            revision=self.shopping_lists.get_revision(list_id),
+            recipe_references=self.get_recipe_references(list_id, recipe_quantities),
+        )
 
     def remove_recipe_ingredients_from_list(
         self, list_id: UUID4, recipe_id: UUID4, recipe_decrement: float = 1
-    ) -> tuple[ShoppingListOut, ShoppingListItemsCollectionOut]:
+    ) -> ShoppingListRecipeChangesOut | None:
         """
-        Removes a recipe's ingredients from a list
+        Removes a recipe's ingredients from a list, returning the items and recipe references that changed,
+        or `None` if the list doesn't exist
 
-        Returns a tuple of:
-        - Updated Shopping List
-        - Impacted Shopping List Items
+        Only the items that refer to the recipe are loaded.
         """
 
-        shopping_list = self.shopping_lists.get_one(list_id)
-        if shopping_list is None:
-            raise UnexpectedNone("Shopping list not found, cannot remove recipe ingredients")
+        if self.shopping_lists.get_revision(list_id) is None:
+            return None
+
+        previous_references = self.get_recipe_references(list_id, [recipe_id])
+        query = PaginationQuery(
+            per_page=-1,
+            query_filter=f'shopping_list_id="{list_id}" AND recipe_references.recipe_id="{recipe_id}"',
+        )
 
         update_items: list[ShoppingListItemUpdateBulk] = []
         delete_items: list[UUID4] = []
-        for item in shopping_list.list_items:
+        for item in self.list_items.page_all(query).items:
             found = False
 
             refs = cast(list[ShoppingListItemRecipeRefOut], item.recipe_references)
@@ -489,30 +605,22 @@ class ShoppingListService:
         deleted_item_ids = [item.id for item in response_update.deleted_items]
         response_delete = self.bulk_delete_items([id for id in delete_items if id not in deleted_item_ids])
 
-        items = ShoppingListItemsCollectionOut(
+        # Decrement the list recipe reference count
+        self.shopping_lists.remove_recipe_reference(list_id, recipe_id, recipe_decrement)
+        recipe_references = self.get_recipe_references(list_id, [recipe_id])
+        remaining_reference_ids = {ref.id for ref in recipe_references}
+
+        return ShoppingListRecipeChangesOut(
             created_items=response_update.created_items + response_delete.created_items,
             updated_items=response_update.updated_items + response_delete.updated_items,
             deleted_items=response_update.deleted_items + response_delete.deleted_items,
+            revision=self.shopping_lists.get_revision(list_id),
+            recipe_references=recipe_references,
+            deleted_recipe_reference_ids=[
+                ref.id for ref in previous_references if ref.id not in remaining_reference_ids
+            ],
         )
 
-        # Decrement the list recipe reference count
-        updated_list = self.shopping_lists.get_one(shopping_list.id)
-        for recipe_ref in updated_list.recipe_references:  # type: ignore
-            if recipe_ref.recipe_id != recipe_id or recipe_ref.recipe_quantity is None:
-                continue
-
-            recipe_ref.recipe_quantity -= recipe_decrement
-
-            if recipe_ref.recipe_quantity <= 0.0:
-                self.list_refs.delete(recipe_ref.id)
-
-            else:
-                self.list_refs.update(recipe_ref.id, recipe_ref)
-
-            break
-
-        return self.shopping_lists.get_one(shopping_list.id), items  # type: ignore
-
     def create_one_list(self, data: ShoppingListCreate, owner_id: UUID4):
         create_data = data.cast(ShoppingListSave, group_id=self.repos.group_id, user_id=owner_id)
         new_list = self.shopping_lists.create(create_data)  # type: ignore
@@ -274,6 +274,6 @@ class BaseMigrator(BaseService):
 
     def import_image(self, slug: str, src: str | Path, recipe_id: UUID4):
         try:
-            import_image(src, recipe_id)
+            import_image(src, recipe_id, self.session)
         except UnidentifiedImageError as e:
             self.logger.error(f"Failed to import image for {slug}: {e}")
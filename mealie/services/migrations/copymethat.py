@@ -120,4 +120,4 @@ class CopyMeThatMigrator(BaseMigrator):
                     except StopIteration:
                         continue
 
-                    import_image(r.image, recipe_id)
+                    import_image(r.image, recipe_id, self.session)
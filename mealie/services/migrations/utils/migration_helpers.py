@@ -7,6 +7,7 @@ import isodate
 import yaml
 from PIL import UnidentifiedImageError
 from pydantic import UUID4
+from sqlalchemy.orm import Session
 
 from mealie.services.recipe.recipe_data_service import RecipeDataService
 
@@ -100,7 +101,7 @@ def glob_walker(directory: Path, glob_str: str, return_parent=True) -> list[Path
     return matches
 
 
-def import_image(src: str | Path, recipe_id: UUID4):
+def import_image(src: str | Path, recipe_id: UUID4, session: Session | None = None):
     """Read the successful migrations attribute and for each import the image
     appropriately into the image directory. Minification is done in mass
     after the migration occurs.
@@ -114,7 +115,7 @@ def import_image(src: str | Path, recipe_id: UUID4):
         return
 
     data_service = RecipeDataService(recipe_id=recipe_id)
-    data_service.write_image(src, src.suffix)
+    data_service.write_image(src, src.suffix, session=session)
 
 
 async def scrape_image(image_url: str, recipe_id: UUID4):
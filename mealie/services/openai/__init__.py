@@ -1,8 +1,9 @@
-from .openai import OpenAIDataInjection, OpenAIImageExternal, OpenAILocalImage, OpenAIService
+from .openai import OpenAIDataInjection, OpenAIImageExternal, OpenAILocalImage, OpenAIService, OpenAIUsage
 
 __all__ = [
     "OpenAIDataInjection",
     "OpenAIImageExternal",
     "OpenAILocalImage",
     "OpenAIService",
+    "OpenAIUsage",
 ]
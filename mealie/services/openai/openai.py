@@ -1,8 +1,11 @@
+import asyncio
 import base64
 import inspect
 import json
 import os
+import time
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from pathlib import Path
 from textwrap import dedent
 from typing import TypeVar
@@ -10,17 +13,28 @@ from typing import TypeVar
 from openai import AsyncOpenAI
 from openai.types.chat import ChatCompletion
 from pydantic import BaseModel, field_validator
+from starlette.concurrency import run_in_threadpool
 
 from mealie.core import root_logger
 from mealie.core.config import get_app_settings
+from mealie.core.loop_clients import LoopClientPool
 from mealie.pkgs import img
 from mealie.schema.openai._base import OpenAIBase
 
 from .._base_service import BaseService
+from .request_limiter import openai_request_limiter
+from .response_cache import openai_response_cache, response_cache_key
 
 T = TypeVar("T", bound=OpenAIBase)
 logger = root_logger.get_logger(__name__)
 
+OPENAI_IMAGE_MAX_SIZE = (2048, 768)
+"""
+The largest image, as `(long side, short side)`, that OpenAI models read at full detail; larger images
+are scaled down to this size by OpenAI anyway, so sending more only costs upload time and bandwidth
+"""
+OPENAI_IMAGE_QUALITY = 80
+
 
 class OpenAIDataInjection(BaseModel):
     description: str
@@ -48,15 +62,19 @@ class OpenAIDataInjection(BaseModel):
             return value
 
 
+def _image_message(url: str) -> dict:
+    return {
+        "type": "image_url",
+        "image_url": {"url": url},
+    }
+
+
 class OpenAIImageBase(BaseModel, ABC):
     @abstractmethod
     def get_image_url(self) -> str: ...
 
     def build_message(self) -> dict:
-        return {
-            "type": "image_url",
-            "image_url": {"url": self.get_image_url()},
-        }
+        return _image_message(self.get_image_url())
 
 
 class OpenAIImageExternal(OpenAIImageBase):
@@ -71,14 +89,47 @@ class OpenAILocalImage(OpenAIImageBase):
     path: Path
 
     def get_image_url(self) -> str:
-        image = img.PillowMinifier.to_jpg(
-            self.path, dest=self.path.parent.joinpath(f"{self.filename}-min-original.jpg")
+        content = img.PillowMinifier.to_jpg_bytes(
+            self.path, max_size=OPENAI_IMAGE_MAX_SIZE, quality=OPENAI_IMAGE_QUALITY
         )
-        with open(image, "rb") as f:
-            b64content = base64.b64encode(f.read()).decode("utf-8")
+        logger.debug(f"Encoded {self.filename} for OpenAI: {img.sizeof_fmt(self.path)} -> {len(content) / 1024:.2f} kB")
+
+        b64content = base64.b64encode(content).decode("utf-8")
         return f"data:image/jpeg;base64,{b64content}"
 
 
+@dataclass(slots=True)
+class OpenAIUsage:
+    """What a single call to `OpenAIService.get_response_with_usage` cost"""
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency_ms: float = 0
+    """time spent waiting for the response, excluding time queued for the request limiter"""
+    cached: bool = False
+
+
+@dataclass(slots=True)
+class _CachedPrompt:
+    file_versions: dict[Path, tuple[int, int] | None]
+    """the mtime and size of each file the prompt can be loaded from, or `None` if it doesn't exist"""
+    content: str
+
+
+def _file_version(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+
+    return stat.st_mtime_ns, stat.st_size
+
+
+_client_pool = LoopClientPool(AsyncOpenAI, close=AsyncOpenAI.close, is_closed=lambda c: c.is_closed())
+"""OpenAI clients, one per event loop and set of client options"""
+_prompt_cache: dict[tuple[Path, ...], _CachedPrompt] = {}
+
+
 class OpenAIService(BaseService):
     PROMPTS_DIR = Path(os.path.dirname(os.path.abspath(__file__))) / "prompts"
 
@@ -93,24 +144,33 @@ class OpenAIService(BaseService):
         self.enable_image_services = settings.OPENAI_ENABLE_IMAGE_SERVICES
         self.custom_prompt_dir = settings.OPENAI_CUSTOM_PROMPT_DIR
 
-        self.get_client = lambda: AsyncOpenAI(
-            base_url=settings.OPENAI_BASE_URL,
-            api_key=settings.OPENAI_API_KEY,
-            timeout=settings.OPENAI_REQUEST_TIMEOUT,
-            default_headers=settings.OPENAI_CUSTOM_HEADERS,
-            default_query=settings.OPENAI_CUSTOM_PARAMS,
-        )
+        self._client_options = {
+            "base_url": settings.OPENAI_BASE_URL,
+            "api_key": settings.OPENAI_API_KEY,
+            "timeout": settings.OPENAI_REQUEST_TIMEOUT,
+            "default_headers": settings.OPENAI_CUSTOM_HEADERS,
+            "default_query": settings.OPENAI_CUSTOM_PARAMS,
+        }
 
         super().__init__()
 
+    def get_client(self) -> AsyncOpenAI:
+        """Returns this worker's client for the running event loop, which is shared by every request"""
+        options = self._client_options
+        return _client_pool.get(json.dumps(options, sort_keys=True, default=str), **options)
+
+    @staticmethod
+    def _get_prompt_relative_path(name: str) -> Path:
+        tree = name.split(".")
+        return Path(*tree[:-1], tree[-1] + ".txt")
+
     def _get_prompt_file_candidates(self, name: str) -> list[Path]:
         """
         Returns a list of prompt file path candidates.
         First optional entry is the users custom prompt file, if configured and existing,
         second one (or only one) is the systems default prompt file
         """
-        tree = name.split(".")
-        relative_path = Path(*tree[:-1], tree[-1] + ".txt")
+        relative_path = self._get_prompt_relative_path(name)
         default_prompt_file = Path(self.PROMPTS_DIR, relative_path)
 
         try:
@@ -135,6 +195,27 @@ class OpenAIService(BaseService):
         return [default_prompt_file]
 
     def _load_prompt_from_file(self, name: str) -> str:
+        """
+        Loads the prompt from the cache, as long as none of the files it can be loaded from have been created,
+        changed, or deleted since it was cached
+        """
+
+        relative_path = self._get_prompt_relative_path(name)
+        watched_files = [Path(self.PROMPTS_DIR, relative_path)]
+        if self.custom_prompt_dir:
+            watched_files.insert(0, Path(self.custom_prompt_dir, relative_path))
+
+        key = tuple(watched_files)
+        # versions are read before the files are, so a file changed while loading is reloaded next time
+        file_versions = {path: _file_version(path) for path in watched_files}
+        if (cached := _prompt_cache.get(key)) and cached.file_versions == file_versions:
+            return cached.content
+
+        content = self._read_prompt_file(name)
+        _prompt_cache[key] = _CachedPrompt(file_versions, content)
+        return content
+
+    def _read_prompt_file(self, name: str) -> str:
         """Attempts to load custom prompt, otherwise falling back to the default"""
         prompt_file_candidates = self._get_prompt_file_candidates(name)
         content = None
@@ -216,22 +297,77 @@ class OpenAIService(BaseService):
         *,
         response_schema: type[T],
         images: list[OpenAIImageBase] | None = None,
+        use_cache: bool = True,
     ) -> T | None:
-        """Send data to OpenAI and return the response message content"""
+        """
+        Send data to OpenAI and return the response message content. The response to an identical request
+        is reused from the response cache, unless `use_cache` is False.
+        """
+
+        response, _ = await self.get_response_with_usage(
+            prompt, message, response_schema=response_schema, images=images, use_cache=use_cache
+        )
+        return response
+
+    async def get_response_with_usage(
+        self,
+        prompt: str,
+        message: str,
+        *,
+        response_schema: type[T],
+        images: list[OpenAIImageBase] | None = None,
+        use_cache: bool = True,
+    ) -> tuple[T | None, OpenAIUsage]:
+        """Same as `get_response`, but also returns the tokens and time the request used"""
+
         if images and not self.enable_image_services:
             self.logger.warning("OpenAI image services are disabled, ignoring images")
             images = None
 
         try:
             user_messages = [{"type": "text", "text": message}]
-            for image in images or []:
-                user_messages.append(image.build_message())
+            prepare_ms = 0.0
+            payload_size = 0
+            if images:
+                # images are decoded and encoded in worker threads, so they're prepared concurrently
+                start = time.perf_counter()
+                image_urls = await asyncio.gather(*(run_in_threadpool(i.get_image_url) for i in images))
+                prepare_ms = (time.perf_counter() - start) * 1000
+
+                payload_size = sum(len(url) for url in image_urls)
+                user_messages.extend(_image_message(url) for url in image_urls)
+
+            cache_key = None
+            if use_cache and openai_response_cache.enabled:
+                cache_key = response_cache_key(self.model, prompt, user_messages, response_schema)
+                if (cached_text := openai_response_cache.get(cache_key)) is not None:
+                    self.logger.debug("Reusing cached OpenAI response")
+                    return response_schema.parse_openai_response(cached_text), OpenAIUsage(cached=True)
+
+            async with openai_request_limiter.slot():
+                start = time.perf_counter()
+                response = await self._get_raw_response(prompt, user_messages, response_schema)
+                response_ms = (time.perf_counter() - start) * 1000
+
+            usage = OpenAIUsage(latency_ms=response_ms)
+            if response.usage:
+                usage.prompt_tokens = response.usage.prompt_tokens
+                usage.completion_tokens = response.usage.completion_tokens
+
+            if images:
+                self.logger.info(
+                    f"Sent {len(images)} image(s) to OpenAI ({payload_size / 1024:.2f} kB); "
+                    f"prepared in {prepare_ms:.0f} ms, response received in {response_ms:.0f} ms"
+                )
 
-            response = await self._get_raw_response(prompt, user_messages, response_schema)
             if not response.choices:
-                return None
+                return None, usage
 
             response_text = response.choices[0].message.content
-            return response_schema.parse_openai_response(response_text)
+            parsed = response_schema.parse_openai_response(response_text)
+            if cache_key and response_text:
+                openai_response_cache.set(cache_key, response_text)
+
+            return parsed, usage
         except Exception as e:
             raise Exception(f"OpenAI Request Failed. {e.__class__.__name__}: {e}") from e
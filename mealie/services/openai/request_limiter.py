@@ -0,0 +1,65 @@
+import asyncio
+import threading
+import time
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from weakref import WeakKeyDictionary
+
+from mealie.core.config import get_app_settings
+
+
+class OpenAIRequestLimiter:
+    """
+    Limits the OpenAI requests a worker sends across everything it's serving, so a bulk job can't exhaust
+    the account's rate limits for everyone else. At most `max_concurrent` requests are in flight at once,
+    and at most `requests_per_minute` are started each minute; either limit is disabled when it's 0.
+
+    Requests wait for a slot in the order they asked for one, so a batch's earliest chunks are sent first.
+    """
+
+    def __init__(self, max_concurrent: int, requests_per_minute: int) -> None:
+        self.max_concurrent = max_concurrent
+        self.requests_per_minute = requests_per_minute
+
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+        # asyncio primitives can only be used on the loop they were first used on
+        self._semaphores: WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = WeakKeyDictionary()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if (semaphore := self._semaphores.get(loop)) is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrent)
+
+            return semaphore
+
+    async def _wait_for_rate_limit(self) -> None:
+        if self.requests_per_minute <= 0:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + 60 / self.requests_per_minute
+
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncGenerator[None, None]:
+        """Waits until a request may be sent, and holds its slot until the context exits"""
+
+        if self.max_concurrent <= 0:
+            await self._wait_for_rate_limit()
+            yield
+            return
+
+        async with self._get_semaphore():
+            await self._wait_for_rate_limit()
+            yield
+
+
+openai_request_limiter = OpenAIRequestLimiter(
+    get_app_settings().OPENAI_MAX_CONCURRENT_REQUESTS, get_app_settings().OPENAI_REQUESTS_PER_MINUTE
+)
@@ -0,0 +1,33 @@
+import hashlib
+import json
+
+from pydantic import BaseModel
+
+from mealie.core.cache import GenerationTTLCache
+from mealie.core.config import get_app_settings
+
+
+def response_cache_key(model: str, prompt: str, content: list[dict], response_schema: type[BaseModel]) -> str:
+    """
+    Addresses a response by everything that determines it: the model, a hash of the prompt, a hash of the
+    message content (including any images), and the response schema
+    """
+
+    prompt_hash = hashlib.sha256(prompt.encode()).hexdigest()
+    content_hash = hashlib.sha256(json.dumps(content, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+    return f"{model}:{prompt_hash}:{content_hash}:{response_schema.__module__}.{response_schema.__qualname__}"
+
+
+class OpenAIResponseCache(GenerationTTLCache[str, str]):
+    """
+    In-process cache of OpenAI response text, so sending the same content with the same prompt again (e.g.
+    re-parsing a recipe's ingredients, or re-scraping a page) doesn't pay for another request. Responses are
+    cached as text and parsed again on every hit, so callers never share a response object.
+
+    The cache is per-process, so each worker makes its own first request.
+    """
+
+
+openai_response_cache = OpenAIResponseCache(
+    get_app_settings().OPENAI_RESPONSE_CACHE_TTL, get_app_settings().OPENAI_RESPONSE_CACHE_SIZE
+)
@@ -1,9 +1,11 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncGenerator
 
 from pydantic import UUID4, BaseModel
 from rapidfuzz import fuzz, process
 from sqlalchemy.orm import Session
 
+from mealie.core.root_logger import get_logger
 from mealie.db.models.recipe.ingredient import IngredientFoodModel, IngredientUnitModel
 from mealie.repos.all_repositories import get_repositories
 from mealie.repos.repository_factory import AllRepositories
@@ -13,9 +15,12 @@ from mealie.schema.recipe.recipe_ingredient import (
     IngredientFood,
     IngredientUnit,
     ParsedIngredient,
+    ParsedIngredientsBatchItem,
 )
 from mealie.schema.response.pagination import PaginationQuery
 
+logger = get_logger(__name__)
+
 
 class DataMatcher:
     def __init__(
@@ -79,6 +84,11 @@ class DataMatcher:
 
         return self._units_by_alias
 
+    def load(self) -> None:
+        """Loads the group's foods and units now, so matching won't have to query the database"""
+
+        _ = self.foods_by_alias, self.units_by_alias
+
     @classmethod
     def find_match[T: BaseModel](
         cls, match_value: str, *, store_map: dict[str, T], fuzzy_match_threshold: int = 0
@@ -153,6 +163,22 @@ class ABCIngredientParser(ABC):
     @abstractmethod
     async def parse(self, ingredients: list[str]) -> list[ParsedIngredient]: ...
 
+    async def parse_batch(self, recipes: list[list[str]]) -> AsyncGenerator[ParsedIngredientsBatchItem, None]:
+        """
+        Parses the ingredients of many recipes, yielding each recipe's ingredients in order. A recipe that
+        fails to parse is yielded with an error, and doesn't stop the rest of the batch.
+        """
+
+        for index, ingredients in enumerate(recipes):
+            try:
+                parsed = await self.parse(ingredients) if ingredients else []
+            except Exception:
+                logger.exception(f"Failed to parse ingredients of recipe {index} in batch")
+                yield ParsedIngredientsBatchItem(index=index, error="Failed to parse ingredients")
+                continue
+
+            yield ParsedIngredientsBatchItem(index=index, ingredients=parsed)
+
     def find_ingredient_match(self, ingredient: ParsedIngredient) -> ParsedIngredient:
         if ingredient.ingredient.food and (food_match := self.data_matcher.find_food_match(ingredient.ingredient.food)):
             ingredient.ingredient.food = food_match
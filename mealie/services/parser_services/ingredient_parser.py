@@ -1,3 +1,4 @@
+from abc import abstractmethod
 from fractions import Fraction
 
 from ingredient_parser import parse_ingredient
@@ -5,6 +6,7 @@ from ingredient_parser.dataclasses import CompositeIngredientAmount, IngredientA
 from ingredient_parser.dataclasses import ParsedIngredient as IngredientParserParsedIngredient
 from pydantic import UUID4
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from mealie.core.root_logger import get_logger
 from mealie.schema.recipe import RecipeIngredient
@@ -25,12 +27,28 @@ from .parser_utils import extract_quantity_from_string
 logger = get_logger(__name__)
 
 
-class BruteForceParser(ABCIngredientParser):
+class _BlockingParser(ABCIngredientParser):
     """
-    Brute force ingredient parser.
+    Base class for parsers that parse and match ingredients synchronously; the work is done in the
+    threadpool, so it doesn't block the event loop.
     """
 
+    @abstractmethod
+    def _parse_one(self, ingredient_string: str) -> ParsedIngredient: ...
+
     async def parse_one(self, ingredient_string: str) -> ParsedIngredient:
+        return await run_in_threadpool(self._parse_one, ingredient_string)
+
+    async def parse(self, ingredients: list[str]) -> list[ParsedIngredient]:
+        return await run_in_threadpool(lambda: [self._parse_one(ingredient) for ingredient in ingredients])
+
+
+class BruteForceParser(_BlockingParser):
+    """
+    Brute force ingredient parser.
+    """
+
+    def _parse_one(self, ingredient_string: str) -> ParsedIngredient:
         bfi = brute.parse(ingredient_string, self)
 
         parsed_ingredient = ParsedIngredient(
@@ -66,11 +84,8 @@ class BruteForceParser(ABCIngredientParser):
 
         return matched_ingredient
 
-    async def parse(self, ingredients: list[str]) -> list[ParsedIngredient]:
-        return [await self.parse_one(ingredient) for ingredient in ingredients]
-
 
-class NLPParser(ABCIngredientParser):
+class NLPParser(_BlockingParser):
     """
     Class for Ingredient Parser library
     """
@@ -182,13 +197,10 @@ class NLPParser(ABCIngredientParser):
 
         return self.find_ingredient_match(parsed_ingredient)
 
-    async def parse_one(self, ingredient_string: str) -> ParsedIngredient:
+    def _parse_one(self, ingredient_string: str) -> ParsedIngredient:
         parsed_ingredient = parse_ingredient(ingredient_string)
         return self._convert_ingredient(parsed_ingredient)
 
-    async def parse(self, ingredients: list[str]) -> list[ParsedIngredient]:
-        return [await self.parse_one(ingredient) for ingredient in ingredients]
-
 
 __registrar: dict[RegisteredParser, type[ABCIngredientParser]] = {
     RegisteredParser.nlp: NLPParser,
@@ -1,14 +1,21 @@
 import asyncio
 import json
+from collections import defaultdict
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass
 
 from rapidfuzz import fuzz
+from starlette.concurrency import run_in_threadpool
 
+from mealie.core.root_logger import get_logger
 from mealie.schema.openai.recipe_ingredient import OpenAIIngredient, OpenAIIngredients
 from mealie.schema.recipe.recipe_ingredient import (
     CreateIngredientFood,
     CreateIngredientUnit,
     IngredientConfidence,
+    IngredientParserChunkStats,
     ParsedIngredient,
+    ParsedIngredientsBatchItem,
     RecipeIngredient,
 )
 from mealie.services.openai import OpenAIDataInjection, OpenAIService
@@ -16,8 +23,24 @@ from mealie.services.openai import OpenAIDataInjection, OpenAIService
 from .._base import ABCIngredientParser
 from ..parser_utils import extract_quantity_from_string
 
+logger = get_logger(__name__)
+
+
+@dataclass(slots=True)
+class _BatchLine:
+    recipe: int
+    position: int
+    text: str
+
 
 class OpenAIParser(ABCIngredientParser):
+    BATCH_CHUNK_SIZE = 25
+    """The most ingredients sent to OpenAI in one request when parsing a batch"""
+    BATCH_CHUNK_CHARACTERS = 4000
+    """The most characters of ingredient text sent to OpenAI in one request when parsing a batch"""
+    BATCH_RETRIES = 2
+    """How many times a failed chunk of a batch is retried before its recipes are given up on"""
+
     def _calculate_qty_conf(self, original_text: str, parsed_qty: float | None) -> float:
         """Compares the extracted quantity to a brute-force parsed quantity."""
 
@@ -133,7 +156,7 @@ class OpenAIParser(ABCIngredientParser):
 
     async def _parse(self, ingredients: list[str]) -> OpenAIIngredients:
         service = OpenAIService()
-        prompt = self._get_prompt(service)
+        prompt = await run_in_threadpool(self._get_prompt, service)
 
         # chunk ingredients and send each chunk to its own worker
         ingredient_chunks = self._chunk_messages(ingredients, n=service.workers)
@@ -156,6 +179,145 @@ class OpenAIParser(ABCIngredientParser):
             ingredients=[ingredient for response in responses for ingredient in response.ingredients]
         )
 
+    @classmethod
+    def _chunk_batch(cls, recipes: list[list[str]]) -> list[list[_BatchLine]]:
+        """Packs the ingredients of consecutive recipes into chunks, so small recipes share a request"""
+
+        chunks: list[list[_BatchLine]] = []
+        chunk: list[_BatchLine] = []
+        characters = 0
+        for recipe, ingredients in enumerate(recipes):
+            for position, text in enumerate(ingredients):
+                if chunk and (
+                    len(chunk) >= cls.BATCH_CHUNK_SIZE or characters + len(text) > cls.BATCH_CHUNK_CHARACTERS
+                ):
+                    chunks.append(chunk)
+                    chunk, characters = [], 0
+
+                chunk.append(_BatchLine(recipe, position, text))
+                characters += len(text)
+
+        if chunk:
+            chunks.append(chunk)
+
+        return chunks
+
+    async def _parse_batch_chunk(
+        self,
+        service: OpenAIService,
+        prompt: str,
+        chunk: list[_BatchLine],
+        attempt: int,
+        done: asyncio.Queue[tuple[list[_BatchLine], list[ParsedIngredient] | None]],
+        stats: defaultdict[int, list[IngredientParserChunkStats]],
+    ) -> None:
+        """
+        Parses a chunk of a batch, putting its lines on `done` once they've been parsed or have failed for the
+        last time. A failed chunk is retried in halves, since long chunks are the likeliest to come back
+        incomplete; each attempt is recorded in `stats` under the last recipe in its chunk.
+        """
+
+        chunk_stats = IngredientParserChunkStats(ingredients=len(chunk), attempt=attempt)
+        try:
+            ingredients = [line.text for line in chunk]
+            # a retry mustn't be answered with the cached response that just failed
+            response, usage = await service.get_response_with_usage(
+                prompt,
+                json.dumps(ingredients, separators=(",", ":")),
+                response_schema=OpenAIIngredients,
+                use_cache=attempt == 1,
+            )
+            chunk_stats.cached = usage.cached
+            chunk_stats.prompt_tokens = usage.prompt_tokens
+            chunk_stats.completion_tokens = usage.completion_tokens
+            chunk_stats.latency_ms = usage.latency_ms
+
+            if not response or len(response.ingredients) != len(chunk):
+                raise ValueError(
+                    "OpenAI returned an unexpected number of ingredients. "
+                    f"Expected {len(chunk)}, got {len(response.ingredients) if response else 0}"
+                )
+
+            parsed = await run_in_threadpool(
+                lambda: [
+                    self._convert_ingredient(line.text, ing)
+                    for line, ing in zip(chunk, response.ingredients, strict=True)
+                ]
+            )
+        except Exception as e:
+            chunk_stats.succeeded = False
+            stats[chunk[-1].recipe].append(chunk_stats)
+            if attempt > self.BATCH_RETRIES:
+                logger.warning(f"Giving up on {len(chunk)} ingredients after {attempt} attempts: {e}")
+                done.put_nowait((chunk, None))
+                return
+
+            logger.debug(f"Retrying {len(chunk)} ingredients after attempt {attempt} failed: {e}")
+            half = (len(chunk) + 1) // 2
+            retries = [chunk[:half], chunk[half:]] if len(chunk) > 1 else [chunk]
+            await asyncio.gather(
+                *(self._parse_batch_chunk(service, prompt, part, attempt + 1, done, stats) for part in retries)
+            )
+            return
+
+        logger.debug(
+            f"Parsed {len(chunk)} ingredients in {chunk_stats.latency_ms:.0f} ms "
+            f"({chunk_stats.prompt_tokens} prompt tokens, {chunk_stats.completion_tokens} completion tokens)"
+        )
+        stats[chunk[-1].recipe].append(chunk_stats)
+        done.put_nowait((chunk, parsed))
+
+    async def parse_batch(self, recipes: list[list[str]]) -> AsyncGenerator[ParsedIngredientsBatchItem, None]:
+        """
+        Parses the ingredients of many recipes, yielding each recipe in order as soon as it, and every recipe
+        before it, has been parsed. Ingredients are sent in chunks through the worker's shared OpenAI request
+        limiter, and chunks are retried independently, so a failure only affects the recipes in that chunk.
+        """
+
+        service = OpenAIService()
+        # chunks are matched concurrently in the threadpool, and the session can't be shared between threads
+        await run_in_threadpool(self.data_matcher.load)
+        prompt = await run_in_threadpool(self._get_prompt, service)
+
+        parsed: list[list[ParsedIngredient | None]] = [[None] * len(ingredients) for ingredients in recipes]
+        remaining = [len(ingredients) for ingredients in recipes]
+        failed: set[int] = set()
+        stats: defaultdict[int, list[IngredientParserChunkStats]] = defaultdict(list)
+        done: asyncio.Queue[tuple[list[_BatchLine], list[ParsedIngredient] | None]] = asyncio.Queue()
+
+        tasks = [
+            asyncio.create_task(self._parse_batch_chunk(service, prompt, chunk, 1, done, stats))
+            for chunk in self._chunk_batch(recipes)
+        ]
+        try:
+            for index in range(len(recipes)):
+                while remaining[index]:
+                    chunk, results = await done.get()
+                    for i, line in enumerate(chunk):
+                        remaining[line.recipe] -= 1
+                        if results is None:
+                            failed.add(line.recipe)
+                        else:
+                            parsed[line.recipe][line.position] = results[i]
+
+                # chunks finish in any order, so report them by attempt
+                chunks = sorted(stats.pop(index, []), key=lambda chunk_stats: chunk_stats.attempt)
+                if index in failed:
+                    yield ParsedIngredientsBatchItem(index=index, error="Failed to parse ingredients", chunks=chunks)
+                else:
+                    yield ParsedIngredientsBatchItem(
+                        index=index, ingredients=[ing for ing in parsed[index] if ing], chunks=chunks
+                    )
+
+                # the parsed ingredients have been handed off, so don't hold them for the rest of the batch
+                parsed[index] = []
+
+            # every chunk has reported back by now, this just lets their tasks finish
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
     async def parse_one(self, ingredient_string: str) -> ParsedIngredient:
         items = await self.parse([ingredient_string])
         return items[0]
@@ -168,7 +330,9 @@ class OpenAIParser(ABCIngredientParser):
                 f"Expected {len(ingredients)}, got {len(response.ingredients)}"
             )
 
-        return [
-            self._convert_ingredient(original_text, ing)
-            for original_text, ing in zip(ingredients, response.ingredients, strict=True)
-        ]
+        return await run_in_threadpool(
+            lambda: [
+                self._convert_ingredient(original_text, ing)
+                for original_text, ing in zip(ingredients, response.ingredients, strict=True)
+            ]
+        )
@@ -148,6 +148,52 @@ class QueryFilterBuilderComponent:
         )
 
 
+_EXISTS_KEYWORDS = {RelationalKeyword.NOT_IN, RelationalKeyword.CONTAINS_ALL}
+"""keywords that always filter related models through EXISTS, since they aren't about a single related row"""
+
+
+class QueryFilterPathCriterion:
+    """
+    Criteria on the rows reached through a chain of relationships that includes a one-to-many or many-to-many
+    relationship. They're compiled to a correlated EXISTS rather than joined, so the filtered query returns
+    each row once. Criteria on the same path that are combined with AND share one EXISTS, so they must all
+    be met by the same related row, as they would be with a join.
+    """
+
+    def __init__(
+        self, path: list[InstrumentedAttribute], criterion: sa.ColumnElement, *, match_missing: bool = False
+    ) -> None:
+        self.path = path
+        self.criteria = [criterion]
+        self.match_missing = match_missing
+        """also match rows with nothing to join at any step, like an outer join's NULL row (i.e. for `IS NULL`)"""
+
+    @property
+    def key(self) -> tuple[tuple[type, str], ...]:
+        return tuple((relationship.class_, relationship.key) for relationship in self.path)
+
+    def can_merge(self, other: QueryFilterPathCriterion) -> bool:
+        return not (self.match_missing or other.match_missing) and self.key == other.key
+
+    def compile(self) -> sa.ColumnElement:
+        return compile_relationship_path(self.path, sa.and_(*self.criteria), match_missing=self.match_missing)
+
+
+def compile_relationship_path(
+    path: list[InstrumentedAttribute], criterion: sa.ColumnElement, *, match_missing: bool = False
+) -> sa.ColumnElement:
+    """Wraps a criterion on the last model of a relationship path in a correlated EXISTS for each relationship"""
+
+    element = criterion
+    for relationship in reversed(path):
+        exists = relationship.any if relationship.property.uselist else relationship.has
+        element = exists(element)
+        if match_missing:
+            element = sa.or_(element, ~exists())
+
+    return element
+
+
 class QueryFilterBuilder:
     l_group_sep: str = "("
     r_group_sep: str = ")"
@@ -179,25 +225,78 @@ class QueryFilterBuilder:
 
         return f"<<{joined}>>"
 
+    @property
+    def shape(self) -> str:
+        """The filter with its values replaced by placeholders, so filters that only differ by value match"""
+
+        parts: list[str] = []
+        for component in self.filter_components:
+            if isinstance(component, QueryFilterBuilderComponent):
+                if component.raw_value is None:
+                    value = "NULL"
+                else:
+                    value = "[?]" if isinstance(component.raw_value, list) else "?"
+
+                parts.append(f"{component.attribute_name} {component.relationship.value} {value}")
+            elif isinstance(component, LogicalOperator):
+                parts.append(component.value)
+            else:
+                parts.append(component)
+
+        return " ".join(parts).replace(f"{self.l_group_sep} ", self.l_group_sep).replace(f" {self.r_group_sep}", ")")
+
     @classmethod
     def _consolidate_group(
-        cls, group: list[sa.ColumnElement], logical_operators: deque[LogicalOperator]
+        cls,
+        group: list[sa.ColumnElement | QueryFilterPathCriterion],
+        logical_operators: deque[LogicalOperator],
     ) -> sa.ColumnElement:
-        consolidated_group_builder: sa.ColumnElement | None = None
-        for i, element in enumerate(reversed(group)):
-            if not i:
-                consolidated_group_builder = element
+        if not group:
+            return None  # type: ignore
+
+        operators = [logical_operators.pop() for _ in range(len(group) - 1)]
+        if all(operator is LogicalOperator.AND for operator in operators):
+            group = cls._merge_path_criteria(group)
+            operators = operators[: len(group) - 1]
+
+        elements = [item.compile() if isinstance(item, QueryFilterPathCriterion) else item for item in group]
+
+        # operators are popped from the right, so the group is folded from right to left
+        consolidated_group_builder = elements[-1]
+        for element, operator in zip(reversed(elements[:-1]), operators, strict=True):
+            if operator is LogicalOperator.AND:
+                consolidated_group_builder = sa.and_(consolidated_group_builder, element)
+            elif operator is LogicalOperator.OR:
+                consolidated_group_builder = sa.or_(consolidated_group_builder, element)
             else:
-                operator = logical_operators.pop()
-                if operator is LogicalOperator.AND:
-                    consolidated_group_builder = sa.and_(consolidated_group_builder, element)
-                elif operator is LogicalOperator.OR:
-                    consolidated_group_builder = sa.or_(consolidated_group_builder, element)
-                else:
-                    raise ValueError(f"invalid logical operator {operator}")
+                raise ValueError(f"invalid logical operator {operator}")
+
+        return consolidated_group_builder.self_group()
+
+    @staticmethod
+    def _merge_path_criteria(
+        group: list[sa.ColumnElement | QueryFilterPathCriterion],
+    ) -> list[sa.ColumnElement | QueryFilterPathCriterion]:
+        """Combines the criteria of an AND group that share a relationship path, so they share one EXISTS"""
+
+        merged: list[sa.ColumnElement | QueryFilterPathCriterion] = []
+        for item in group:
+            if isinstance(item, QueryFilterPathCriterion):
+                target = next(
+                    (
+                        existing
+                        for existing in merged
+                        if isinstance(existing, QueryFilterPathCriterion) and existing.can_merge(item)
+                    ),
+                    None,
+                )
+                if target is not None:
+                    target.criteria.extend(item.criteria)
+                    continue
+
+            merged.append(item)
 
-            if i == len(group) - 1:
-                return consolidated_group_builder.self_group()
+        return merged
 
     @classmethod
     def get_model_and_model_attr_from_attr_string[Model: SqlAlchemyBase](
@@ -215,7 +314,24 @@ class QueryFilterBuilder:
         Works with shallow attributes (e.g. "slug" from `RecipeModel`)
         and arbitrarily deep ones (e.g. "recipe.group.preferences" on `RecipeTimelineEvent`).
         """
-        mapper: Mapper
+
+        path, current_model, model_attr = cls.get_relationship_path(attr_string, model)
+        if query is not None:
+            for relationship in path:
+                query = query.join(relationship, isouter=True)
+
+        return current_model, model_attr, query
+
+    @classmethod
+    def get_relationship_path[Model: SqlAlchemyBase](
+        cls, attr_string: str, model: type[Model]
+    ) -> tuple[list[InstrumentedAttribute], SqlAlchemyBase, InstrumentedAttribute]:
+        """
+        Like `get_model_and_model_attr_from_attr_string`, but returns the relationships traversed to reach the
+        attribute rather than joining them, along with the attribute's model and the attribute itself.
+        """
+
+        path: list[InstrumentedAttribute] = []
         model_attr: InstrumentedAttribute | None = None
 
         attribute_chain = decamelize(attr_string).split(".")
@@ -233,11 +349,9 @@ class QueryFilterBuilder:
                     proxied_attribute_link = model_attr.target_collection
                     next_attribute_link = model_attr.value_attr
                     model_attr = getattr(current_model, proxied_attribute_link)
+                    path.append(model_attr)
 
-                    if query is not None:
-                        query = query.join(model_attr, isouter=True)
-
-                    mapper = sa.inspect(current_model)
+                    mapper: Mapper = sa.inspect(current_model)
                     relationship = mapper.relationships[proxied_attribute_link]
                     current_model = relationship.mapper.class_
                     model_attr = getattr(current_model, next_attribute_link)
@@ -246,12 +360,8 @@ class QueryFilterBuilder:
                 if i == len(attribute_chain) - 1:
                     break
 
-                if query is not None:
-                    query = query.join(model_attr, isouter=True)
-
-                mapper = sa.inspect(current_model)
-                relationship = mapper.relationships[attribute_link]
-                current_model = relationship.mapper.class_
+                path.append(model_attr)
+                current_model = model_attr.property.mapper.class_
 
             except (AttributeError, KeyError) as e:
                 raise ValueError(f"invalid attribute string: '{attr_string}' does not exist on this schema") from e
@@ -259,7 +369,7 @@ class QueryFilterBuilder:
         if model_attr is None:
             raise ValueError(f"invalid attribute string: '{attr_string}'")
 
-        return current_model, model_attr, query
+        return path, current_model, model_attr
 
     @classmethod
     def _transform_model_attr(cls, model_attr: InstrumentedAttribute, model_attr_type: Any) -> InstrumentedAttribute:
@@ -269,15 +379,12 @@ class QueryFilterBuilder:
         return model_attr
 
     @classmethod
-    def _get_filter_element[Model: SqlAlchemyBase](
+    def _get_filter_element(
         cls,
-        query: sa.Select,
         component: QueryFilterBuilderComponent,
-        model: type[Model],
         model_attr: InstrumentedAttribute,
         model_attr_type: Any,
     ) -> sa.ColumnElement:
-        original_model_attr = model_attr
         model_attr = cls._transform_model_attr(model_attr, model_attr_type)
         value = component.validate(model_attr_type)
 
@@ -289,18 +396,9 @@ class QueryFilterBuilder:
         elif component.relationship is RelationalKeyword.IN:
             element = model_attr.in_(value)
         elif component.relationship is RelationalKeyword.NOT_IN:
-            if original_model_attr.parent.entity != model:
-                subq = query.with_only_columns(model.id).where(model_attr.in_(value))
-                element = sa.not_(model.id.in_(subq))
-            else:
-                element = sa.not_(model_attr.in_(value))
-
+            element = sa.not_(model_attr.in_(value))
         elif component.relationship is RelationalKeyword.CONTAINS_ALL:
-            if len(value) == 1:
-                element = model_attr.in_(value)
-            else:
-                primary_model_attr: InstrumentedAttribute = getattr(model, component.attribute_name.split(".")[0])
-                element = sa.and_(*(primary_model_attr.any(model_attr == v) for v in value))
+            element = sa.and_(*(model_attr == v for v in value)) if len(value) > 1 else model_attr.in_(value)
         elif component.relationship is RelationalKeyword.LIKE:
             element = model_attr.ilike(value)
         elif component.relationship is RelationalKeyword.NOT_LIKE:
@@ -324,30 +422,76 @@ class QueryFilterBuilder:
 
         return element
 
+    @staticmethod
+    def _compiles_to_exists(path: list[InstrumentedAttribute]) -> bool:
+        """
+        Whether criteria on a relationship path are compiled to EXISTS. Paths with a one-to-many or many-to-many
+        relationship would multiply the query's rows if joined; many-to-one paths are cheaper to join.
+        """
+
+        return any(relationship.property.uselist for relationship in path)
+
+    @classmethod
+    def _get_path_filter_element(
+        cls,
+        component: QueryFilterBuilderComponent,
+        path: list[InstrumentedAttribute],
+        model_attr: InstrumentedAttribute,
+        model_attr_type: Any,
+    ) -> sa.ColumnElement | QueryFilterPathCriterion:
+        """Filters on an attribute of a related model, through a correlated EXISTS for each relationship"""
+
+        if component.relationship is RelationalKeyword.NOT_IN:
+            # rows without a matching related row, including rows without any related rows
+            value = component.validate(model_attr_type)
+            model_attr = cls._transform_model_attr(model_attr, model_attr_type)
+            return sa.not_(compile_relationship_path(path, model_attr.in_(value)))
+
+        if component.relationship is RelationalKeyword.CONTAINS_ALL:
+            # each value may be matched by a different related row
+            value = component.validate(model_attr_type)
+            model_attr = cls._transform_model_attr(model_attr, model_attr_type)
+            return sa.and_(*(compile_relationship_path(path, model_attr == v) for v in value))
+
+        element = cls._get_filter_element(component, model_attr, model_attr_type)
+        return QueryFilterPathCriterion(
+            path, element, match_missing=component.relationship is RelationalKeyword.IS and component.value is None
+        )
+
     def filter_query[Model: SqlAlchemyBase](
         self, query: sa.Select, model: type[Model], column_aliases: dict[str, sa.ColumnElement] | None = None
     ) -> sa.Select:
         """
         Filters a query based on the parsed filter string.
         If you need to filter on a custom column expression (e.g. a computed property), you can supply column aliases
+
+        Attributes of related models are filtered through correlated EXISTS subqueries when their relationships
+        could match more than one row, so the query still returns each row once. Many-to-one relationships are
+        joined instead, once per relationship no matter how many components use it.
         """
         column_aliases = column_aliases or {}
 
-        # join tables and build model chain
-        attr_model_map: dict[int, Any] = {}
-        model_attr: InstrumentedAttribute
+        # build model chain, and join the relationships that don't multiply rows
+        component_paths: dict[int, tuple[list[InstrumentedAttribute], InstrumentedAttribute]] = {}
+        joined: set[tuple[tuple[type, str], ...]] = set()
         for i, component in enumerate(self.filter_components):
             if not isinstance(component, QueryFilterBuilderComponent):
                 continue
 
-            nested_model, model_attr, query = self.get_model_and_model_attr_from_attr_string(
-                component.attribute_name, model, query=query
-            )
-            attr_model_map[i] = nested_model
+            path, _, model_attr = self.get_relationship_path(component.attribute_name, model)
+            component_paths[i] = (path, model_attr)
+            if not path or self._compiles_to_exists(path) or component.relationship in _EXISTS_KEYWORDS:
+                continue
+
+            for depth, relationship in enumerate(path, start=1):
+                key = tuple((link.class_, link.key) for link in path[:depth])
+                if key not in joined:
+                    query = query.join(relationship, isouter=True)
+                    joined.add(key)
 
         # build query filter
-        partial_group: list[sa.ColumnElement] = []
-        partial_group_stack: deque[list[sa.ColumnElement]] = deque()
+        partial_group: list[sa.ColumnElement | QueryFilterPathCriterion] = []
+        partial_group_stack: deque[list[sa.ColumnElement | QueryFilterPathCriterion]] = deque()
         logical_operator_stack: deque[LogicalOperator] = deque()
         for i, component in enumerate(self.filter_components):
             if component == self.l_group_sep:
@@ -367,13 +511,16 @@ class QueryFilterBuilder:
 
             else:
                 component = cast(QueryFilterBuilderComponent, component)
+                path, model_attr = component_paths[i]
                 base_attribute_name = component.attribute_name.split(".")[-1]
-                model_attr = getattr(attr_model_map[i], base_attribute_name)
 
                 if (column_alias := column_aliases.get(base_attribute_name)) is not None:
-                    model_attr = column_alias
+                    element = self._get_filter_element(component, column_alias, column_alias.type)
+                elif path and (self._compiles_to_exists(path) or component.relationship in _EXISTS_KEYWORDS):
+                    element = self._get_path_filter_element(component, path, model_attr, model_attr.type)
+                else:
+                    element = self._get_filter_element(component, model_attr, model_attr.type)
 
-                element = self._get_filter_element(query, component, model, model_attr, model_attr.type)
                 partial_group.append(element)
 
         # combine the completed groups into one filter
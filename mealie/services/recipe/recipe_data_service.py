@@ -1,18 +1,49 @@
 import asyncio
+import os
 import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from logging import Logger
 from pathlib import Path
 
 from httpx import AsyncClient, Response
 from pydantic import UUID4
+from sqlalchemy.orm import Session
 
-from mealie.pkgs import img, safehttp
+from mealie.core.loop_clients import LoopClientPool
+from mealie.db.db_setup import session_context
+from mealie.pkgs import img
 from mealie.pkgs.safehttp.transport import AsyncSafeTransport
+from mealie.pkgs.stats import fs_stats
+from mealie.repos.all_repositories import get_repositories
 from mealie.schema.recipe.recipe import Recipe
 from mealie.schema.recipe.recipe_image_types import RecipeImageTypes
 from mealie.services._base_service import BaseService
 from mealie.services.scraper.user_agents_manager import get_user_agents_manager
 
+MAX_IMAGE_SIZE = 25 * 1024 * 1024
+"""Hard cap on the number of bytes downloaded for a single scraped image"""
+
+_image_executor = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="mealie-image")
+"""
+Worker pool for decoding and encoding images. Pillow releases the GIL while it works,
+so minifying in this pool keeps concurrent scrapes from blocking the event loop.
+"""
+
+_image_clients = LoopClientPool(
+    lambda: AsyncClient(transport=AsyncSafeTransport()), close=AsyncClient.aclose, is_closed=lambda c: c.is_closed
+)
+
+
+def get_image_client() -> AsyncClient:
+    """
+    Returns a client shared by all image requests on the running event loop, so connections
+    are pooled across scrapes instead of being opened and torn down for every image.
+    """
+
+    return _image_clients.get()
+
 
 async def gather_with_concurrency(n, *coros, ignore_exceptions=False):
     semaphore = asyncio.Semaphore(n)
@@ -38,14 +69,14 @@ async def largest_content_len(urls: list[str]) -> tuple[str, int]:
     async def do(client: AsyncClient, url: str) -> Response:
         return await client.head(url, headers=user_agent_manager.get_scrape_headers())
 
-    async with AsyncClient(transport=safehttp.AsyncSafeTransport()) as client:
-        tasks = [do(client, url) for url in urls]
-        responses: list[Response] = await gather_with_concurrency(max_concurrency, *tasks, ignore_exceptions=True)
-        for response in responses:
-            len_int = int(response.headers.get("Content-Length", 0))
-            if len_int > largest_len:
-                largest_url = str(response.url)
-                largest_len = len_int
+    client = get_image_client()
+    tasks = [do(client, url) for url in urls]
+    responses: list[Response] = await gather_with_concurrency(max_concurrency, *tasks, ignore_exceptions=True)
+    for response in responses:
+        len_int = int(response.headers.get("Content-Length", 0))
+        if len_int > largest_len:
+            largest_url = str(response.url)
+            largest_len = len_int
 
     return largest_url, largest_len
 
@@ -58,6 +89,10 @@ class InvalidDomainError(Exception):
     pass
 
 
+class ImageTooLargeError(Exception):
+    pass
+
+
 class RecipeDataService(BaseService):
     minifier: img.ABCMinifier
 
@@ -86,7 +121,7 @@ class RecipeDataService(BaseService):
         except Exception as e:
             self.logger.exception(f"Failed to delete recipe data: {e}")
 
-    def write_image(self, file_data: bytes | Path, extension: str, image_dir: Path | None = None) -> Path:
+    def _save_original(self, file_data: bytes | Path, extension: str, image_dir: Path | None = None) -> Path:
         if not image_dir:
             image_dir = self.dir_image
 
@@ -103,11 +138,72 @@ class RecipeDataService(BaseService):
             with open(image_path, "ab") as f:
                 shutil.copyfileobj(file_data, f)
 
+        return image_path
+
+    def record_storage(self, session: Session | None = None) -> int:
+        """
+        Records the bytes used by the recipe's data directory, so group storage stats don't have to walk it.
+        Call this after changing any of the recipe's files; failures are only logged, since the storage
+        reconciliation task corrects any drift.
+
+        Pass the caller's `session` when there is one. A second connection would have to wait for any
+        write transaction the caller's session holds, which on SQLite stalls until the lock times out.
+        """
+
+        size = fs_stats.get_dir_size(self.dir_data)
+        try:
+            if session is None:
+                with session_context() as own_session:
+                    self._set_storage_bytes(own_session, size)
+            else:
+                self._set_storage_bytes(session, size)
+        except Exception as e:
+            self.logger.error(f"Failed to record storage for recipe {self.recipe_id}: {e}")
+            if session is not None:
+                session.rollback()
+
+        return size
+
+    def _set_storage_bytes(self, session: Session, size: int) -> None:
+        repos = get_repositories(session, group_id=None, household_id=None)
+        repos.recipes.set_storage_bytes({self.recipe_id: size})
+
+    def write_image(
+        self,
+        file_data: bytes | Path,
+        extension: str,
+        image_dir: Path | None = None,
+        record: bool = True,
+        session: Session | None = None,
+    ) -> Path:
+        """
+        Saves and minifies the image, then records the recipe's storage through `session`. Pass `record=False`
+        when the caller records the recipe's storage itself, once it has finished changing the recipe's files.
+        """
+
+        image_path = self._save_original(file_data, extension, image_dir)
         self.minifier.minify(image_path)
+        if record:
+            self.record_storage(session)
 
         return image_path
 
-    def delete_image(self, image_dir: Path | None = None):
+    async def write_image_async(
+        self,
+        file_data: bytes | Path,
+        extension: str,
+        image_dir: Path | None = None,
+        record: bool = True,
+        session: Session | None = None,
+    ) -> Path:
+        """Same as `write_image`, but the file is written and minified in the image worker pool"""
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _image_executor, partial(self.write_image, file_data, extension, image_dir, record=record, session=session)
+        )
+
+    def delete_image(self, image_dir: Path | None = None, session: Session | None = None):
         if not image_dir:
             image_dir = self.dir_image
 
@@ -115,7 +211,11 @@ class RecipeDataService(BaseService):
             image_path = image_dir.joinpath(img_type.value)
             image_path.unlink(missing_ok=True)
 
-    async def scrape_image(self, image_url: str | dict[str, str] | list[str]) -> None:
+        self.record_storage(session)
+
+    async def scrape_image(
+        self, image_url: str | dict[str, str] | list[str], record: bool = True, session: Session | None = None
+    ) -> None:
         self.logger.info(f"Image URL: {image_url}")
         user_agent = get_user_agents_manager().user_agents[0]
 
@@ -138,32 +238,77 @@ class RecipeDataService(BaseService):
         if not image_url_str:
             raise ValueError(f"image url could not be parsed from input: {image_url}")
 
-        ext = image_url_str.split(".")[-1]
-
-        if ext not in img.IMAGE_EXTENSIONS:
-            ext = "jpg"  # Guess the extension
+        headers = {"User-Agent": user_agent}
+        try:
+            download = await self._download_image(get_image_client(), image_url_str, headers)
+        except (NotAnImageError, ImageTooLargeError):
+            raise
+        except Exception:
+            self.logger.exception("Fatal Image Request Exception")
+            return None
 
-        file_name = f"{self.recipe_id!s}.{ext}"
-        file_path = Recipe.directory_from_id(self.recipe_id).joinpath("images", file_name)
+        if download is None:
+            return None
 
-        async with AsyncClient(transport=AsyncSafeTransport()) as client:
-            try:
-                r = await client.get(image_url_str, headers={"User-Agent": user_agent})
-            except Exception:
-                self.logger.exception("Fatal Image Request Exception")
-                return None
+        tmp_path, ext = download
+        try:
+            self.logger.debug(f"File Name Suffix {ext}")
+            await self.write_image_async(tmp_path, ext, record=False)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+            if record:
+                await asyncio.to_thread(self.record_storage, session)
+
+    async def _download_image(self, client: AsyncClient, url: str, headers: dict) -> tuple[Path, str] | None:
+        """
+        Streams an image to a temporary file, without ever holding the whole image in memory. The image
+        format is sniffed from the first bytes of the body rather than trusting the Content-Type header,
+        and the download is aborted once it exceeds `MAX_IMAGE_SIZE`.
+        """
 
+        async with client.stream("GET", url, headers=headers) as r:
             if r.status_code != 200:
                 # TODO: Probably should throw an exception in this case as well, but before these changes
                 # we were returning None if it failed anyways.
                 return None
 
-            content_type = r.headers.get("content-type", "")
-
-            if "image" not in content_type:
-                self.logger.error(f"Content-Type: {content_type} is not an image")
-                raise NotAnImageError(f"Content-Type {content_type} is not an image")
-
-            self.logger.debug(f"File Name Suffix {file_path.suffix}")
-            self.write_image(r.read(), file_path.suffix)
-            file_path.unlink(missing_ok=True)
+            content_length = int(r.headers.get("content-length") or 0)
+            if content_length > MAX_IMAGE_SIZE:
+                raise ImageTooLargeError(f"Image is larger than {MAX_IMAGE_SIZE} bytes")
+
+            ext: str | None = None
+            header = b""
+            size = 0
+
+            # downloaded outside the recipe's directory, so a partial download never counts towards its storage
+            with tempfile.NamedTemporaryFile(suffix=".download", delete=False) as f:
+                tmp_path = Path(f.name)
+                try:
+                    async for chunk in r.aiter_bytes():
+                        size += len(chunk)
+                        if size > MAX_IMAGE_SIZE:
+                            raise ImageTooLargeError(f"Image is larger than {MAX_IMAGE_SIZE} bytes")
+
+                        if ext is None:
+                            header += chunk
+                            if len(header) >= img.SNIFF_LENGTH:
+                                ext = self._sniff(header, r.headers.get("content-type", ""))
+
+                        f.write(chunk)
+
+                    if ext is None:
+                        ext = self._sniff(header, r.headers.get("content-type", ""))
+                except BaseException:
+                    f.close()
+                    tmp_path.unlink(missing_ok=True)
+                    raise
+
+        return tmp_path, ext
+
+    def _sniff(self, header: bytes, content_type: str) -> str:
+        ext = img.sniff_image_extension(header)
+        if ext is None:
+            self.logger.error(f"Content-Type: {content_type} is not an image")
+            raise NotAnImageError(f"Content-Type {content_type} is not an image")
+
+        return ext
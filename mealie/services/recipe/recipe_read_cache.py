@@ -0,0 +1,159 @@
+import hashlib
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+
+from pydantic import UUID4
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+from mealie.core.cache import CLEAR_ALL, GenerationTTLCache, invalidate_on_commit, register_invalidation_hooks
+from mealie.core.config import get_app_settings
+from mealie.db.models.labels import MultiPurposeLabel
+from mealie.db.models.recipe import (
+    ApiExtras,
+    Category,
+    IngredientFoodModel,
+    IngredientUnitModel,
+    RecipeModel,
+    Tag,
+    Tool,
+)
+from mealie.db.models.users import User
+
+_NAME = "recipe_read_cache"
+
+RecipeVersion = tuple[datetime | None, datetime | None]
+"""(`date_updated`, `updated_at`) of the recipe row; either changes whenever the recipe itself is written"""
+
+
+@dataclass(frozen=True, slots=True)
+class CachedRecipe:
+    body: bytes
+    """the recipe, serialized exactly as the API returns it"""
+    etag: str
+
+    @classmethod
+    def from_body(cls, body: bytes) -> "CachedRecipe":
+        return cls(body=body, etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"')
+
+    def matches(self, if_none_match: str | None) -> bool:
+        """Returns True if an If-None-Match header matches this recipe, i.e. the client's copy is current"""
+
+        if not if_none_match:
+            return False
+
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or self.etag in tags
+
+
+@dataclass(slots=True)
+class _Entry:
+    version: RecipeVersion
+    recipe: CachedRecipe
+    references: frozenset[UUID4]
+
+
+class RecipeReadCache(GenerationTTLCache[UUID4, _Entry]):
+    """
+    In-process cache of serialized recipes, so viewing an unchanged recipe doesn't load its relationships
+    or run it through validation. Entries are only used while the recipe row's version matches, and are
+    explicitly invalidated when anything embedded in the recipe, like comments, tags, foods or referenced
+    sub-recipes, changes.
+
+    The cache is per-process, so with several workers a change to a recipe's related data made through
+    another worker can take up to `ttl` seconds to apply. Changes to the recipe itself apply immediately.
+    """
+
+    def get_recipe(self, recipe_id: UUID4, version: RecipeVersion) -> CachedRecipe | None:
+        with self._lock:
+            entry = self.get(recipe_id)
+            if entry is None:
+                return None
+
+            if entry.version != version:
+                self._remove(recipe_id)
+                return None
+
+            return entry.recipe
+
+    def set_recipe(
+        self,
+        recipe_id: UUID4,
+        version: RecipeVersion,
+        body: bytes,
+        generation: int,
+        references: Iterable[UUID4] = (),
+    ) -> CachedRecipe:
+        """
+        Caches a serialized recipe and returns it. `references` are the ids of any sub-recipes embedded in it,
+        so the recipe is invalidated along with them.
+        """
+
+        recipe = CachedRecipe.from_body(body)
+        self.set(recipe_id, _Entry(version, recipe, frozenset(references)), generation)
+        return recipe
+
+    def invalidate(self, *keys: UUID4) -> None:
+        """Invalidates the recipes, and any recipes that embed them"""
+
+        recipe_ids = set(keys)
+        self.invalidate_where(lambda key, entry: key in recipe_ids or not recipe_ids.isdisjoint(entry.references))
+
+
+_settings = get_app_settings()
+recipe_read_cache = RecipeReadCache(_settings.RECIPE_CACHE_TTL, _settings.RECIPE_CACHE_SIZE)
+
+_SHARED_MODELS = (Category, Tag, Tool, IngredientFoodModel, IngredientUnitModel, MultiPurposeLabel)
+"""models that are embedded in many recipes"""
+
+_BACKREFS = {"recipes", "ingredients", "foods", "shopping_list_items", "shopping_lists_label_settings"}
+"""collections that change when a recipe (or shopping list) links to a shared model, rather than the model itself"""
+
+_USER_ATTRS = {"username", "full_name", "admin"}
+"""the user fields shown on comments; users are written on every login, so other changes are ignored"""
+
+
+def _changed(target: object, attrs: set[str] | None = None) -> bool:
+    state = inspect(target)
+    keys = attrs if attrs is not None else set(state.attrs.keys()) - _BACKREFS
+    return any(state.attrs[key].history.has_changes() for key in keys)
+
+
+def _add_recipe(pending: set[UUID4 | str], obj: object) -> None:
+    if isinstance(obj, RecipeModel):
+        recipe_id = obj.id
+    elif isinstance(obj, ApiExtras):
+        recipe_id = obj.recipee_id
+    else:
+        # comments, ingredients, instructions, ratings, etc.
+        recipe_id = getattr(obj, "recipe_id", None)
+
+    if recipe_id is not None:
+        pending.add(recipe_id)
+
+
+def clear_on_commit(session: Session) -> None:
+    """
+    Clears the cache once the session's transaction commits. Changes made with bulk `UPDATE`/`DELETE`
+    statements don't pass through the flush, so whoever runs them has to say which recipes they affect.
+    """
+
+    invalidate_on_commit(session, _NAME, CLEAR_ALL)
+
+
+def _collect_invalidations(session: Session, pending: set[UUID4 | str]) -> None:
+    """Records which cached recipes are affected by the flushed changes"""
+
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if not isinstance(obj, (*_SHARED_MODELS, User)):
+            _add_recipe(pending, obj)
+        elif obj in session.new:
+            # a new tag, food, etc. isn't part of any cached recipe yet
+            continue
+        elif obj in session.deleted or _changed(obj, _USER_ATTRS if isinstance(obj, User) else None):
+            # renaming a tag, food, etc. changes every recipe that uses it; that's rare enough to start over
+            pending.add(CLEAR_ALL)
+
+
+register_invalidation_hooks(_NAME, _collect_invalidations, recipe_read_cache.invalidate, recipe_read_cache.clear)
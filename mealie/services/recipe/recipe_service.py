@@ -1,6 +1,7 @@
 import json
 import os
 import shutil
+from collections import defaultdict
 from datetime import UTC, datetime
 from pathlib import Path
 from shutil import copytree, rmtree
@@ -11,6 +12,7 @@ from zipfile import ZipFile
 
 import sqlalchemy as sa
 from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
 
 from mealie.core import exceptions
 from mealie.core.config import get_app_settings
@@ -34,6 +36,7 @@ from mealie.services._base_service import BaseService
 from mealie.services.household_services.household_service import HouseholdService
 from mealie.services.openai import OpenAILocalImage, OpenAIService
 from mealie.services.recipe.recipe_data_service import RecipeDataService
+from mealie.services.recipe.recipe_read_cache import CachedRecipe, recipe_read_cache
 from mealie.services.scraper import cleaner
 
 from .template_service import TemplateService
@@ -137,11 +140,16 @@ class RecipeService(RecipeServiceBase):
 
         all_asset_files = [x.file_name for x in recipe.assets]
 
+        removed = False
         for file in recipe.asset_dir.iterdir():
             if file.is_dir():
                 continue
             if file.name not in all_asset_files:
                 file.unlink()
+                removed = True
+
+        if removed:
+            RecipeDataService(recipe.id).record_storage(self.repos.session)
 
     def delete_assets(self, recipe: Recipe) -> None:
         recipe_dir = recipe.directory
@@ -187,6 +195,47 @@ class RecipeService(RecipeServiceBase):
         else:
             return self._get_recipe(slug_or_id, "slug")
 
+    def get_one_serialized(self, slug_or_id: str | UUID) -> CachedRecipe:
+        """
+        Returns a recipe as serialized JSON. Recipes are served from the read cache while the recipe is unchanged,
+        otherwise they're loaded and cached.
+        """
+
+        if isinstance(slug_or_id, str):
+            try:
+                slug_or_id = UUID(slug_or_id)
+            except ValueError:
+                pass
+
+        version = self.group_recipes.get_version(slug_or_id, "id" if isinstance(slug_or_id, UUID) else "slug")
+        if version is None:
+            raise exceptions.NoEntryFound("Recipe not found.")
+
+        recipe_id, date_updated, updated_at = version
+        generation = recipe_read_cache.generation
+        if cached := recipe_read_cache.get_recipe(recipe_id, (date_updated, updated_at)):
+            return cached
+
+        recipe = self._get_recipe(recipe_id, "id")
+        body = recipe.model_dump_json(by_alias=True).encode()
+        references = self._referenced_recipe_ids(recipe)
+        return recipe_read_cache.set_recipe(recipe_id, (date_updated, updated_at), body, generation, references)
+
+    @staticmethod
+    def _referenced_recipe_ids(recipe: Recipe) -> set[UUID]:
+        """Returns the ids of all sub-recipes embedded in a recipe's ingredients, at any depth"""
+
+        ids: set[UUID] = set()
+        pending = [recipe]
+        while pending:
+            for ingredient in pending.pop().recipe_ingredient:
+                sub_recipe = ingredient.referenced_recipe
+                if sub_recipe and sub_recipe.id and sub_recipe.id not in ids:
+                    ids.add(sub_recipe.id)
+                    pending.append(sub_recipe)
+
+        return ids
+
     def create_one(self, create_data: Recipe | CreateRecipe) -> Recipe:
         if create_data.name is None:
             create_data.name = "New Recipe"
@@ -316,7 +365,7 @@ class RecipeService(RecipeServiceBase):
             data_service = RecipeDataService(recipe.id)
 
         if recipe_image:
-            data_service.write_image(recipe_image, "webp")
+            data_service.write_image(recipe_image, "webp", session=self.repos.session)
 
         return recipe
 
@@ -334,11 +383,10 @@ class RecipeService(RecipeServiceBase):
             )
             recipe_data = cleaner.clean(recipe_data, self.translator)
 
-            recipe = self.create_one(recipe_data)
+            recipe = await run_in_threadpool(self.create_one, recipe_data)
             data_service = RecipeDataService(recipe.id)
 
-            with open(local_images[0], "rb") as f:
-                data_service.write_image(f.read(), "webp")
+            await data_service.write_image_async(local_images[0], "webp", session=self.repos.session)
             return recipe
 
     def duplicate_one(self, old_slug_or_id: str | UUID, dup_data: RecipeDuplicate) -> Recipe:
@@ -392,39 +440,48 @@ class RecipeService(RecipeServiceBase):
                 new_service.dir_data,
                 dirs_exist_ok=True,
             )
+            new_service.record_storage(self.repos.session)
         except Exception as e:
             self.logger.error(f"Failed to copy assets from {old_recipe.slug} to {new_recipe.slug}: {e}")
 
         return new_recipe
 
-    def has_recursive_recipe_link(self, recipe: Recipe, path: set[str] | None = None):
-        """Recursively checks if a recipe links to itself through its ingredients."""
-        if path is None:
-            path = set()
-
-        recipe_id = str(getattr(recipe, "id", None))
-
-        # Check if this recipe is already in the current path (cycle detected)
-        if recipe_id in path:
-            return True
-
-        # Add to the current path
-        path.add(recipe_id)
+    def has_recursive_recipe_link(self, recipe: Recipe, recipe_id: UUID | None = None) -> bool:
+        """
+        Checks if a recipe links to itself through its ingredients, or links to a sub-recipe that does.
 
-        try:
-            ingredients = getattr(recipe, "recipe_ingredient", [])
-            for ing in ingredients:
-                try:
-                    sub_recipe = self.get_one(ing.referenced_recipe.id)
-                except (AttributeError, exceptions.NoEntryFound):
-                    continue
-
-                # Recursively check - path is modified in place and cleaned up via backtracking
-                if self.has_recursive_recipe_link(sub_recipe, path):
+        The recipe's own links are taken from `recipe`, since it may not be saved yet, and the links of its
+        sub-recipes are loaded as ids with a single recursive query, rather than loading every sub-recipe.
+        """
+        recipe_id = recipe_id or recipe.id
+        own_links = {
+            ingredient.referenced_recipe.id
+            for ingredient in recipe.recipe_ingredient or []
+            if ingredient.referenced_recipe and ingredient.referenced_recipe.id
+        }
+
+        links: defaultdict[UUID | None, set[UUID]] = defaultdict(set)
+        for link in self.group_recipes.get_recipe_links(own_links):
+            links[link.recipe_id].add(link.referenced_recipe_id)
+        links[recipe_id] = own_links
+
+        # depth-first search; a link back to a recipe on the current path is a cycle
+        path: set[UUID | None] = {recipe_id}
+        checked: set[UUID | None] = set()
+        stack = [(recipe_id, iter(links[recipe_id]))]
+        while stack:
+            current_id, sub_recipe_ids = stack[-1]
+            for sub_recipe_id in sub_recipe_ids:
+                if sub_recipe_id in path:
                     return True
-        finally:
-            # Backtrack: remove this recipe from the path when done exploring this branch
-            path.discard(recipe_id)
+                if sub_recipe_id not in checked:
+                    path.add(sub_recipe_id)
+                    stack.append((sub_recipe_id, iter(links.get(sub_recipe_id, ()))))
+                    break
+            else:
+                stack.pop()
+                path.discard(current_id)
+                checked.add(current_id)
 
         return False
 
@@ -458,7 +515,7 @@ class RecipeService(RecipeServiceBase):
         if setting_lock and not self.can_lock_unlock(recipe):
             raise exceptions.PermissionDenied("You do not have permission to lock/unlock this recipe.")
 
-        if self.has_recursive_recipe_link(new_data):
+        if self.has_recursive_recipe_link(new_data, recipe.id):
             raise exceptions.RecursiveRecipe("Recursive recipe link detected. Update aborted.")
 
         return recipe
@@ -479,8 +536,7 @@ class RecipeService(RecipeServiceBase):
                     ref.id = recipe.id
                 # If id is provided, verify it belongs to this group
                 elif ref.id:
-                    recipe = self.group_recipes.get_one(ref.id, key="id")
-                    if not recipe:
+                    if not self.group_recipes.get_version(ref.id):
                         raise exceptions.NoEntryFound(f"Referenced recipe with id '{ref.id}' not found in this group")
 
         return update_data
@@ -501,7 +557,7 @@ class RecipeService(RecipeServiceBase):
             raise exceptions.PermissionDenied("You do not have permission to edit this recipe.")
 
         data_service = RecipeDataService(recipe.id)
-        data_service.write_image(image, extension)
+        data_service.write_image(image, extension, session=self.repos.session)
 
         return self.group_recipes.update_image(slug, extension)
 
@@ -511,7 +567,7 @@ class RecipeService(RecipeServiceBase):
             raise exceptions.PermissionDenied("You do not have permission to edit this recipe.")
 
         data_service = RecipeDataService(recipe.id)
-        data_service.delete_image()
+        data_service.delete_image(session=self.repos.session)
 
         self.group_recipes.delete_image(slug)
         return None
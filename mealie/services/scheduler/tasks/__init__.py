@@ -5,6 +5,8 @@ from .purge_expired_share_tokens import purge_expired_tokens
 from .purge_group_exports import purge_group_data_exports
 from .purge_password_reset import purge_password_reset_tokens
 from .purge_registration import purge_group_registration
+from .purge_shopping_list_item_changes import purge_shopping_list_item_changes
+from .reconcile_recipe_storage import reconcile_recipe_storage
 from .reset_locked_users import locked_user_reset
 
 __all__ = [
@@ -15,6 +17,8 @@ __all__ = [
     "purge_password_reset_tokens",
     "purge_group_data_exports",
     "purge_group_registration",
+    "purge_shopping_list_item_changes",
+    "reconcile_recipe_storage",
     "locked_user_reset",
 ]
 
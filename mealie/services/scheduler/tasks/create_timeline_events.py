@@ -1,134 +1,229 @@
+import time as perf_time
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import UTC, datetime, time, timedelta
+from itertools import batched
 
+import sqlalchemy as sa
 from dateutil.tz import tzlocal
 from pydantic import UUID4
 from sqlalchemy.orm import Session
 
+from mealie.core import root_logger
 from mealie.db.db_setup import session_context
-from mealie.repos.all_repositories import get_repositories
-from mealie.schema.household.household import HouseholdRecipeUpdate
+from mealie.db.models._model_utils.guid import GUID
+from mealie.db.models.household.household_to_recipe import HouseholdToRecipe
+from mealie.db.models.household.mealplan import GroupMealPlan
+from mealie.db.models.recipe.recipe import RecipeModel
+from mealie.db.models.recipe.recipe_timeline import RecipeTimelineEvent
+from mealie.db.models.users.users import User
 from mealie.schema.meal_plan.new_meal import PlanEntryType
-from mealie.schema.recipe.recipe import RecipeSummary
-from mealie.schema.recipe.recipe_timeline_events import RecipeTimelineEventCreate, TimelineEventType
-from mealie.schema.response.pagination import PaginationQuery
+from mealie.schema.recipe.recipe_timeline_events import TimelineEventImage, TimelineEventType
 from mealie.schema.user.user import DEFAULT_INTEGRATION_ID
 from mealie.services.event_bus_service.event_bus_service import EventBusService
 from mealie.services.event_bus_service.event_types import (
     EventOperation,
-    EventRecipeData,
-    EventRecipeTimelineEventData,
+    EventRecipeBulkData,
+    EventRecipeTimelineEventBulkData,
     EventTypes,
 )
-from mealie.services.household_services.household_service import HouseholdService
+from mealie.services.recipe.recipe_read_cache import recipe_read_cache
+
+logger = root_logger.get_logger()
+
+UPDATE_BATCH_SIZE = 1000
+
+
+@dataclass(frozen=True, slots=True)
+class MealplanTimelineEventStats:
+    events_created: int
+    recipes_updated: int
+    query_ms: float
+    insert_ms: float
+    update_ms: float
+    dispatch_ms: float
+
+    @property
+    def total_ms(self) -> float:
+        return self.query_ms + self.insert_ms + self.update_ms + self.dispatch_ms
+
+
+def _event_subject() -> sa.ColumnElement[str]:
+    # TODO: make this translatable
+    return sa.func.coalesce(User.full_name, "") + sa.case(
+        (GroupMealPlan.entry_type == PlanEntryType.side.value, " made this as a side"),
+        else_=" made this for " + GroupMealPlan.entry_type,
+    )
+
+
+def _find_missing_events(session: Session, event_time: datetime) -> sa.Result:
+    """
+    Finds every meal plan entry for today, across all groups and households, that doesn't have
+    a timeline event on its recipe yet, along with its household's last made date for the recipe
+    """
+
+    today = datetime.now(tz=tzlocal()).date()
+    day_start = datetime.combine(event_time.date(), time.min, tzinfo=UTC)
+    day_end = day_start + timedelta(days=1)
+
+    subject = _event_subject()
+    existing_event = sa.exists().where(
+        RecipeTimelineEvent.recipe_id == GroupMealPlan.recipe_id,
+        RecipeTimelineEvent.subject == subject,
+        RecipeTimelineEvent.timestamp >= day_start,
+        RecipeTimelineEvent.timestamp < day_end,
+    )
+
+    stmt = (
+        sa.select(
+            GroupMealPlan.group_id,
+            User.household_id,
+            User.id.label("user_id"),
+            GroupMealPlan.recipe_id,
+            RecipeModel.slug.label("recipe_slug"),
+            subject.label("subject"),
+            HouseholdToRecipe.id.label("household_recipe_id"),
+            HouseholdToRecipe.last_made,
+        )
+        .join(User, User.id == GroupMealPlan.user_id)
+        .join(RecipeModel, RecipeModel.id == GroupMealPlan.recipe_id)
+        .outerjoin(
+            HouseholdToRecipe,
+            sa.and_(
+                HouseholdToRecipe.household_id == User.household_id,
+                HouseholdToRecipe.recipe_id == GroupMealPlan.recipe_id,
+            ),
+        )
+        .where(GroupMealPlan.date == today, ~existing_event)
+    )
+
+    return session.execute(stmt)
 
 
-def _create_mealplan_timeline_events_for_household(
-    event_time: datetime, session: Session, group_id: UUID4, household_id: UUID4
+def _update_last_made(
+    session: Session, event_time: datetime, household_recipes: dict[tuple[UUID4, UUID4], UUID4 | None]
 ) -> None:
-    repos = get_repositories(session, group_id=group_id, household_id=household_id)
-    household_service = HouseholdService(group_id, household_id, repos)
-    event_bus_service = EventBusService(session=session)
+    """Bumps the last made date of each (household_id, recipe_id), and of the recipes themselves"""
 
-    timeline_events_to_create: list[RecipeTimelineEventCreate] = []
-    recipes_to_update: dict[UUID4, RecipeSummary] = {}
-    recipe_id_to_slug_map: dict[UUID4, str] = {}
-
-    local_tz = tzlocal()
-    mealplans = repos.meals.get_today(tz=local_tz)
-    for mealplan in mealplans:
-        if not (mealplan.recipe and mealplan.user_id):
-            continue
-
-        user = repos.users.get_one(mealplan.user_id)
-        if not user:
-            continue
-
-        # TODO: make this translatable
-        if mealplan.entry_type == PlanEntryType.side:
-            event_subject = f"{user.full_name} made this as a side"
-
-        else:
-            event_subject = f"{user.full_name} made this for {mealplan.entry_type.value}"
-
-        query_start_time = datetime.combine(datetime.now(UTC).date(), time.min)
-        query_end_time = query_start_time + timedelta(days=1)
-        query = PaginationQuery(
-            query_filter=(
-                f'recipe_id = "{mealplan.recipe_id}" '
-                f'AND timestamp >= "{query_start_time.isoformat()}" '
-                f'AND timestamp < "{query_end_time.isoformat()}" '
-                f'AND subject = "{event_subject}"'
-            )
+    existing = [id_ for id_ in household_recipes.values() if id_]
+    for batch in batched(existing, UPDATE_BATCH_SIZE):
+        session.execute(
+            sa.update(HouseholdToRecipe).where(HouseholdToRecipe.id.in_(batch)).values(last_made=event_time),
+            execution_options={"synchronize_session": False},
         )
 
-        # if this event already exists, don't create it again
-        events = repos.recipe_timeline_events.page_all(pagination=query)
-        if events.items:
-            continue
-
-        # bump up the last made date
-        household_to_recipe = household_service.get_household_recipe(mealplan.recipe.slug)
-        last_made = household_to_recipe.last_made if household_to_recipe else None
-        if (not last_made or last_made.date() < event_time.date()) and mealplan.recipe_id not in recipes_to_update:
-            recipes_to_update[mealplan.recipe_id] = mealplan.recipe
-
-        timeline_events_to_create.append(
-            RecipeTimelineEventCreate(
-                user_id=user.id,
-                subject=event_subject,
-                event_type=TimelineEventType.info,
-                timestamp=event_time,
-                recipe_id=mealplan.recipe_id,
+    new = [
+        {"id": GUID.generate(), "household_id": household_id, "recipe_id": recipe_id, "last_made": event_time}
+        for (household_id, recipe_id), id_ in household_recipes.items()
+        if not id_
+    ]
+    if new:
+        session.execute(sa.insert(HouseholdToRecipe), new)
+
+    # a recipe's last made date is the latest of its households', so never move it backwards
+    recipe_ids = list({recipe_id for _, recipe_id in household_recipes})
+    for batch in batched(recipe_ids, UPDATE_BATCH_SIZE):
+        session.execute(
+            sa.update(RecipeModel)
+            .where(
+                RecipeModel.id.in_(batch),
+                sa.or_(RecipeModel.last_made.is_(None), RecipeModel.last_made < event_time),
             )
+            .values(last_made=event_time),
+            execution_options={"synchronize_session": False},
+        )
+
+
+def _create_mealplan_timeline_events(session: Session, event_time: datetime) -> MealplanTimelineEventStats:
+    start = perf_time.perf_counter()
+    rows = _find_missing_events(session, event_time).all()
+    query_done = perf_time.perf_counter()
+
+    events: list[dict] = []
+    event_ids_by_household: dict[tuple[UUID4, UUID4], list[UUID4]] = defaultdict(list)
+    event_slugs_by_household: dict[tuple[UUID4, UUID4], set[str]] = defaultdict(set)
+    household_recipes: dict[tuple[UUID4, UUID4], UUID4 | None] = {}
+    updated_slugs_by_household: dict[tuple[UUID4, UUID4], set[str]] = defaultdict(set)
+
+    for row in rows:
+        event_id = GUID.generate()
+        events.append(
+            {
+                "id": event_id,
+                "recipe_id": row.recipe_id,
+                "user_id": row.user_id,
+                "subject": row.subject,
+                "event_type": TimelineEventType.info.value,
+                "image": TimelineEventImage.does_not_have_image.value,
+                "timestamp": event_time,
+            }
         )
 
-        recipe_id_to_slug_map[mealplan.recipe_id] = mealplan.recipe.slug
+        household = (row.group_id, row.household_id)
+        event_ids_by_household[household].append(event_id)
+        event_slugs_by_household[household].add(row.recipe_slug)
+
+        if not row.last_made or row.last_made.date() < event_time.date():
+            household_recipes[(row.household_id, row.recipe_id)] = row.household_recipe_id
+            updated_slugs_by_household[household].add(row.recipe_slug)
+
+    if events:
+        session.execute(sa.insert(RecipeTimelineEvent), events)
+    insert_done = perf_time.perf_counter()
 
-    if not timeline_events_to_create:
-        return
+    if household_recipes:
+        _update_last_made(session, event_time, household_recipes)
 
-    # TODO: use bulk operations
-    for event in timeline_events_to_create:
-        new_event = repos.recipe_timeline_events.create(event)
+    session.commit()
+    # bulk updates bypass the session events that normally invalidate cached recipes
+    recipe_read_cache.invalidate(*(recipe_id for _, recipe_id in household_recipes))
+    update_done = perf_time.perf_counter()
+
+    event_bus_service = EventBusService(session=session)
+    for (group_id, household_id), event_ids in event_ids_by_household.items():
         event_bus_service.dispatch(
             integration_id=DEFAULT_INTEGRATION_ID,
             group_id=group_id,
             household_id=household_id,
             event_type=EventTypes.recipe_updated,
-            document_data=EventRecipeTimelineEventData(
+            document_data=EventRecipeTimelineEventBulkData(
                 operation=EventOperation.create,
-                recipe_slug=recipe_id_to_slug_map[new_event.recipe_id],
-                recipe_timeline_event_id=new_event.id,
+                recipe_slugs=sorted(event_slugs_by_household[(group_id, household_id)]),
+                recipe_timeline_event_ids=event_ids,
             ),
         )
 
-    for recipe in recipes_to_update.values():
-        household_service.set_household_recipe(recipe.slug, HouseholdRecipeUpdate(last_made=event_time))
-        repos.recipes.patch(recipe.slug, {"last_made": event_time})
+    for (group_id, household_id), slugs in updated_slugs_by_household.items():
         event_bus_service.dispatch(
             integration_id=DEFAULT_INTEGRATION_ID,
             group_id=group_id,
             household_id=household_id,
             event_type=EventTypes.recipe_updated,
-            document_data=EventRecipeData(operation=EventOperation.update, recipe_slug=recipe.slug),
+            document_data=EventRecipeBulkData(operation=EventOperation.update, recipe_slugs=sorted(slugs)),
         )
+    dispatch_done = perf_time.perf_counter()
 
+    return MealplanTimelineEventStats(
+        events_created=len(events),
+        recipes_updated=len(household_recipes),
+        query_ms=(query_done - start) * 1000,
+        insert_ms=(insert_done - query_done) * 1000,
+        update_ms=(update_done - insert_done) * 1000,
+        dispatch_ms=(dispatch_done - update_done) * 1000,
+    )
 
-def _create_mealplan_timeline_events_for_group(event_time: datetime, session: Session, group_id: UUID4) -> None:
-    repos = get_repositories(session, group_id=group_id)
-    households_data = repos.households.page_all(PaginationQuery(page=1, per_page=-1))
-    household_ids = [household.id for household in households_data.items]
-    for household_id in household_ids:
-        _create_mealplan_timeline_events_for_household(event_time, session, group_id, household_id)
 
+def create_mealplan_timeline_events() -> MealplanTimelineEventStats:
+    """Adds a timeline event to each recipe on today's meal plans, and bumps the recipes' last made dates"""
 
-def create_mealplan_timeline_events() -> None:
     event_time = datetime.now(UTC)
 
     with session_context() as session:
-        repos = get_repositories(session)
-        groups_data = repos.groups.page_all(PaginationQuery(page=1, per_page=-1))
-        group_ids = [group.id for group in groups_data.items]
-
-        for group_id in group_ids:
-            _create_mealplan_timeline_events_for_group(event_time, session, group_id)
+        stats = _create_mealplan_timeline_events(session, event_time)
+
+    logger.info(
+        f"created {stats.events_created} meal plan timeline events and updated {stats.recipes_updated} household "
+        f"recipes in {stats.total_ms:.1f}ms (query {stats.query_ms:.1f}ms, insert {stats.insert_ms:.1f}ms, "
+        f"update {stats.update_ms:.1f}ms, dispatch {stats.dispatch_ms:.1f}ms)"
+    )
+    return stats
@@ -1,75 +1,154 @@
-from collections.abc import Callable
+import time
+from collections import defaultdict
+from dataclasses import dataclass
 
+import sqlalchemy as sa
 from pydantic import UUID4
+from sqlalchemy.orm import Session
 
+from mealie.core import root_logger
 from mealie.db.db_setup import session_context
+from mealie.db.models.household.preferences import HouseholdPreferencesModel
+from mealie.db.models.household.shopping_list import (
+    ItemOperation,
+    ShoppingList,
+    ShoppingListItem,
+    ShoppingListItemRecipeReference,
+    record_item_changes,
+)
+from mealie.db.models.recipe.api_extras import ShoppingListItemExtras
+from mealie.db.models.users.users import User
 from mealie.repos.all_repositories import get_repositories
-from mealie.routes.households.controller_shopping_lists import publish_list_item_events
-from mealie.schema.response.pagination import OrderDirection, PaginationQuery
 from mealie.schema.user.user import DEFAULT_INTEGRATION_ID
 from mealie.services.event_bus_service.event_bus_service import EventBusService
-from mealie.services.event_bus_service.event_types import EventDocumentDataBase, EventTypes
-from mealie.services.household_services.shopping_lists import ShoppingListService
+from mealie.services.event_bus_service.event_types import EventOperation, EventShoppingListItemBulkData, EventTypes
+
+logger = root_logger.get_logger()
 
 MAX_CHECKED_ITEMS = 100
+"""checked items kept on each list of a household that hasn't set `shopping_list_max_checked_items`"""
+DELETE_BATCH_SIZE = 1000
+
+
+@dataclass(frozen=True, slots=True)
+class CheckedItemCleanupStats:
+    items_deleted: int
+    lists_trimmed: int
+    duration_ms: float
 
 
-def _create_publish_event(event_bus_service: EventBusService):
-    def publish_event(
-        event_type: EventTypes,
-        document_data: EventDocumentDataBase,
-        group_id: UUID4,
-        household_id: UUID4 | None,
-        message: str = "",
-    ):
-        event_bus_service.dispatch(
-            integration_id=DEFAULT_INTEGRATION_ID,
-            group_id=group_id,
-            household_id=household_id,
-            event_type=event_type,
-            document_data=document_data,
-            message=message,
+def _select_items_to_delete(batch_size: int) -> sa.Select:
+    """Ranks each list's checked items, newest first, and selects the ones past their household's limit"""
+
+    rank = sa.func.row_number().over(
+        partition_by=ShoppingListItem.shopping_list_id,
+        order_by=(ShoppingListItem.update_at.desc(), ShoppingListItem.id),
+    )
+    ranked = (
+        sa.select(
+            ShoppingListItem.id,
+            ShoppingListItem.shopping_list_id,
+            ShoppingList.group_id,
+            User.household_id,
+            rank.label("rank"),
+            sa.func.coalesce(HouseholdPreferencesModel.shopping_list_max_checked_items, MAX_CHECKED_ITEMS).label(
+                "max_checked_items"
+            ),
         )
+        .join(ShoppingList, ShoppingList.id == ShoppingListItem.shopping_list_id)
+        .join(User, User.id == ShoppingList.user_id)
+        .outerjoin(HouseholdPreferencesModel, HouseholdPreferencesModel.household_id == User.household_id)
+        .where(ShoppingListItem.checked.is_(True))
+        .subquery()
+    )
+
+    return (
+        sa.select(ranked.c.id, ranked.c.shopping_list_id, ranked.c.group_id, ranked.c.household_id)
+        .where(ranked.c.rank > ranked.c.max_checked_items)
+        .limit(batch_size)
+    )
 
-    return publish_event
 
+def _delete_items(session: Session, item_ids: list[UUID4]) -> tuple[set[UUID4], bool]:
+    """
+    Deletes the items, returning the ids that were deleted and whether any of them referenced a recipe.
+    Bulk deletes skip the ORM cascades, so the items' children are deleted first.
+    """
 
-def _trim_list_items(shopping_list_service: ShoppingListService, shopping_list_id: UUID4, event_publisher: Callable):
-    pagination = PaginationQuery(
-        page=1,
-        per_page=-1,
-        query_filter=f'shopping_list_id="{shopping_list_id}" AND checked=true',
-        order_by="updated_at",
-        order_direction=OrderDirection.desc,
+    recipe_refs_deleted = session.execute(
+        sa.delete(ShoppingListItemRecipeReference).where(
+            ShoppingListItemRecipeReference.shopping_list_item_id.in_(item_ids)
+        ),
+        execution_options={"synchronize_session": False},
+    ).rowcount
+    session.execute(
+        sa.delete(ShoppingListItemExtras).where(ShoppingListItemExtras.shopping_list_item_id.in_(item_ids)),
+        execution_options={"synchronize_session": False},
     )
-    query = shopping_list_service.list_items.page_all(pagination)
-    if len(query.items) <= MAX_CHECKED_ITEMS:
-        return
+    deleted_ids = session.scalars(
+        sa.delete(ShoppingListItem).where(ShoppingListItem.id.in_(item_ids)).returning(ShoppingListItem.id),
+        execution_options={"synchronize_session": False},
+    ).all()
+
+    return set(deleted_ids), bool(recipe_refs_deleted)
+
 
-    items_to_delete = query.items[MAX_CHECKED_ITEMS:]
-    items_response = shopping_list_service.bulk_delete_items([item.id for item in items_to_delete])
-    publish_list_item_events(event_publisher, items_response)
+def _trim_checked_items(session: Session, batch_size: int) -> dict[tuple[UUID4, UUID4, UUID4], list[UUID4]]:
+    """
+    Deletes the checked items past each household's limit, one batch at a time.
+    Returns the deleted item ids by (group_id, household_id, shopping_list_id).
+    """
 
+    shopping_lists = get_repositories(session, group_id=None, household_id=None).group_shopping_lists
+    deleted: dict[tuple[UUID4, UUID4, UUID4], list[UUID4]] = defaultdict(list)
+    while rows := session.execute(_select_items_to_delete(batch_size)).all():
+        deleted_ids, had_recipe_refs = _delete_items(session, [row.id for row in rows])
+        if not deleted_ids:
+            break
 
-def delete_old_checked_list_items():
+        changes: dict[UUID4, dict[UUID4, ItemOperation]] = defaultdict(dict)
+        for row in rows:
+            if row.id in deleted_ids:
+                deleted[(row.group_id, row.household_id, row.shopping_list_id)].append(row.id)
+                changes[row.shopping_list_id][row.id] = "delete"
+
+        if had_recipe_refs:
+            shopping_lists.delete_unused_recipe_references(set(changes), commit=False)
+
+        record_item_changes(session, changes)
+        session.commit()
+
+    return deleted
+
+
+def delete_old_checked_list_items(batch_size: int = DELETE_BATCH_SIZE) -> CheckedItemCleanupStats:
+    """Deletes the oldest checked items from every shopping list, keeping the household's configured number"""
+
+    start = time.perf_counter()
     with session_context() as session:
-        repos = get_repositories(session)
-        groups = repos.groups.page_all(PaginationQuery(page=1, per_page=-1)).items
-
-        for group in groups:
-            group_repos = get_repositories(session, group_id=group.id)
-            households = group_repos.households.page_all(PaginationQuery(page=1, per_page=-1)).items
-            event_bus_service = EventBusService(session=session)
-            event_publisher = _create_publish_event(event_bus_service)
-
-            for household in households:
-                household_repos = get_repositories(session, group_id=group.id, household_id=household.id)
-
-                shopping_list_service = ShoppingListService(household_repos)
-                shopping_list_data = household_repos.group_shopping_lists.page_all(PaginationQuery(page=1, per_page=-1))
-                for shopping_list in shopping_list_data.items:
-                    _trim_list_items(
-                        shopping_list_service,
-                        shopping_list.id,
-                        event_publisher,
-                    )
+        deleted = _trim_checked_items(session, batch_size)
+
+        event_bus_service = EventBusService(session=session)
+        for (group_id, household_id, shopping_list_id), item_ids in deleted.items():
+            event_bus_service.dispatch(
+                integration_id=DEFAULT_INTEGRATION_ID,
+                group_id=group_id,
+                household_id=household_id,
+                event_type=EventTypes.shopping_list_updated,
+                document_data=EventShoppingListItemBulkData(
+                    operation=EventOperation.delete,
+                    shopping_list_id=shopping_list_id,
+                    shopping_list_item_ids=item_ids,
+                ),
+            )
+
+    stats = CheckedItemCleanupStats(
+        items_deleted=sum(len(item_ids) for item_ids in deleted.values()),
+        lists_trimmed=len(deleted),
+        duration_ms=(time.perf_counter() - start) * 1000,
+    )
+    logger.info(
+        f"deleted {stats.items_deleted} old checked items from {stats.lists_trimmed} shopping lists "
+        f"in {stats.duration_ms:.1f}ms"
+    )
+    return stats
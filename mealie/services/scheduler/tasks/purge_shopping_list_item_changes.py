@@ -0,0 +1,43 @@
+from datetime import UTC, datetime, timedelta
+
+import sqlalchemy as sa
+
+from mealie.core import root_logger
+from mealie.db.db_setup import session_context
+from mealie.db.models.household.shopping_list import ShoppingList, ShoppingListItemChange
+
+logger = root_logger.get_logger()
+
+MAX_DAYS_OLD = 30
+"""how long the change log keeps deleted items; clients that haven't synced in this long fetch the whole list"""
+
+
+def purge_shopping_list_item_changes() -> int:
+    """
+    Prunes deleted items from the shopping list change logs once they're older than `MAX_DAYS_OLD`, and raises
+    each list's `pruned_revision` so clients that last synced before the pruned deletions fetch the whole list.
+    Changes to items that still exist are kept, since there's only one per item.
+    """
+
+    limit = datetime.now(UTC) - timedelta(days=MAX_DAYS_OLD)
+    expired = sa.and_(ShoppingListItemChange.deleted.is_(True), ShoppingListItemChange.update_at < limit)
+
+    with session_context() as session:
+        pruned_revision = (
+            sa.select(sa.func.max(ShoppingListItemChange.revision))
+            .where(ShoppingListItemChange.shopping_list_id == ShoppingList.id, expired)
+            .scalar_subquery()
+        )
+        session.execute(
+            sa.update(ShoppingList)
+            .where(ShoppingList.id.in_(sa.select(ShoppingListItemChange.shopping_list_id).where(expired)))
+            .values(pruned_revision=pruned_revision),
+            execution_options={"synchronize_session": False},
+        )
+        purged = session.execute(
+            sa.delete(ShoppingListItemChange).where(expired), execution_options={"synchronize_session": False}
+        ).rowcount
+        session.commit()
+
+    logger.info(f"purged {purged} deleted items from shopping list change logs")
+    return purged
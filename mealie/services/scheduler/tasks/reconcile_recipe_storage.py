@@ -0,0 +1,65 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from uuid import UUID
+
+from pydantic import UUID4
+
+from mealie.core import root_logger
+from mealie.core.config import get_app_dirs
+from mealie.db.db_setup import session_context
+from mealie.pkgs.stats import fs_stats
+from mealie.repos.all_repositories import get_repositories
+
+logger = root_logger.get_logger()
+
+MAX_WORKERS = 8
+"""directories are mostly waiting on the filesystem, which can be a slow network volume, so walk several at once"""
+
+
+def _scan_recipe_dirs(recipe_data_dir: Path) -> dict[UUID4, int]:
+    try:
+        entries = [entry for entry in os.scandir(recipe_data_dir) if entry.is_dir()]
+    except FileNotFoundError:
+        return {}
+
+    recipe_dirs: dict[UUID4, str] = {}
+    for entry in entries:
+        try:
+            recipe_dirs[UUID(entry.name)] = entry.path
+        except ValueError:
+            # not a recipe directory
+            continue
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="mealie-storage") as pool:
+        sizes = pool.map(fs_stats.get_dir_size, recipe_dirs.values())
+        return dict(zip(recipe_dirs.keys(), sizes, strict=True))
+
+
+def reconcile_recipe_storage() -> int:
+    """
+    Walks every recipe data directory and corrects the storage recorded for any recipe whose files
+    were changed without going through `RecipeDataService`, e.g. by a backup restore or by hand.
+    Returns the number of recipes that were corrected.
+    """
+
+    logger.debug("reconciling recipe storage")
+    start = time.perf_counter()
+    sizes = _scan_recipe_dirs(get_app_dirs().RECIPE_DATA_DIR)
+
+    with session_context() as session:
+        recipes_repo = get_repositories(session, group_id=None, household_id=None).recipes
+        recorded = recipes_repo.get_all_storage_bytes()
+        corrections = {
+            recipe_id: sizes.get(recipe_id, 0)
+            for recipe_id, storage_bytes in recorded.items()
+            if sizes.get(recipe_id, 0) != storage_bytes
+        }
+        recipes_repo.set_storage_bytes(corrections)
+
+    logger.info(
+        f"recipe storage reconciled: scanned {len(sizes)} directories and corrected {len(corrections)} recipes "
+        f"in {(time.perf_counter() - start) * 1000:.0f}ms"
+    )
+    return len(corrections)
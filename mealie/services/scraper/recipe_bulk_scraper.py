@@ -1,25 +1,67 @@
 import asyncio
+import contextlib
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from re import search as regex_search
+from typing import Any
+from uuid import uuid4
 
+import orjson
 from pydantic import UUID4
+from slugify import slugify
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from mealie.lang.providers import Translator
+from mealie.core.config import get_app_settings
+from mealie.core.root_logger import get_logger
+from mealie.db.db_setup import session_context
+from mealie.db.models._model_utils.datetime import get_utc_now
+from mealie.lang.providers import Translator, get_locale_provider
+from mealie.repos.all_repositories import get_repositories
 from mealie.repos.repository_factory import AllRepositories
-from mealie.schema.recipe.recipe import CreateRecipeByUrlBulk, Recipe
+from mealie.schema.recipe.recipe import CreateRecipeByUrlBulk, Recipe, RecipeCategory, RecipeTag
+from mealie.schema.recipe.recipe_bulk_import import BulkImportItemStatus, BulkImportJobItemOut
 from mealie.schema.reports.reports import (
     ReportCategory,
     ReportCreate,
     ReportEntryCreate,
-    ReportEntryOut,
+    ReportOut,
     ReportSummaryStatus,
 )
 from mealie.schema.user.user import GroupInDB
 from mealie.services._base_service import BaseService
+from mealie.services.recipe.recipe_data_service import RecipeDataService
 from mealie.services.recipe.recipe_service import RecipeService
-from mealie.services.scraper.scraper import create_from_html
+from mealie.services.scraper.recipe_scraper import RecipeScraper
+from mealie.services.scraper.scraper_strategies import safe_scrape_html
+
+RUNNER_ID = uuid4().hex
+"""Identifies this process as the owner of the bulk import jobs it runs"""
+
+
+@dataclass(slots=True)
+class _ImportContext:
+    item: BulkImportJobItemOut
+    url: str
+    html: str | None = None
+    recipe: Recipe | None = None
+    recipe_id: UUID4 | None = None
+    image_url: str | None = None
 
 
 class RecipeBulkScraperService(BaseService):
-    report_entries: list[ReportEntryCreate]
+    """
+    Imports recipes from a list of URLs as a staged pipeline:
+
+        fetch -> parse -> persist -> image
+
+    Each stage has its own concurrency and the stages are connected by bounded queues, so a slow stage
+    applies backpressure to the ones in front of it. Progress is persisted per URL, so a job interrupted
+    by a restart can be resumed, and each URL is written to the report as soon as it is done.
+
+    Database work is run in the threadpool with `_db`, so it never blocks the event loop.
+    """
 
     def __init__(
         self, service: RecipeService, repos: AllRepositories, group: GroupInDB, translator: Translator
@@ -27,11 +69,22 @@ class RecipeBulkScraperService(BaseService):
         self.service = service
         self.repos = repos
         self.group = group
-        self.report_entries = []
         self.translator = translator
+        self._report: ReportOut | None = None
+        self._db_lock = asyncio.Lock()
 
         super().__init__()
 
+    @property
+    def report(self) -> ReportOut:
+        if self._report is None:
+            raise ValueError("bulk import report has not been created")
+        return self._report
+
+    @report.setter
+    def report(self, report: ReportOut | None) -> None:
+        self._report = report
+
     def get_report_id(self) -> UUID4:
         import_report = ReportCreate(
             name="Bulk Import",
@@ -43,85 +96,355 @@ class RecipeBulkScraperService(BaseService):
         self.report = self.repos.group_reports.create(import_report)
         return self.report.id
 
-    def _add_error_entry(self, message: str, exception: str = "") -> None:
-        self.report_entries.append(
+    def create_job(self, urls: CreateRecipeByUrlBulk) -> UUID4:
+        """Persists a new bulk import job, which can then be run with `run_bulk_import_job`"""
+
+        if self._report is None:
+            self.get_report_id()
+
+        job = self.repos.bulk_import_jobs.create_job(self.report.id, self.service.user, urls.imports)
+        return job.id
+
+    async def scrape(self, urls: CreateRecipeByUrlBulk) -> None:
+        await self.run(await self._db(self.create_job, urls))
+
+    async def _db[T](self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Runs sync database work in the threadpool. The stages share one session, which isn't thread-safe, so
+        only one call runs at a time; the stages' network and parsing work still run concurrently.
+        """
+
+        async with self._db_lock:
+            return await run_in_threadpool(func, *args, **kwargs)
+
+    # ==================================================================================================================
+    # Report
+
+    def _add_entry(self, message: str, success: bool = True, exception: str = "") -> None:
+        self.repos.group_report_entries.create(
             ReportEntryCreate(
                 report_id=self.report.id,
-                success=False,
+                success=success,
                 message=message,
                 exception=exception,
             )
         )
 
-    def _save_all_entries(self) -> None:
-        is_success = True
-        is_failure = True
+    def _fail(self, ctx: _ImportContext, message: str, e: Exception | None = None) -> None:
+        self.service.logger.error(message)
+        if e is not None:
+            self.service.logger.exception(e)
 
-        new_entries: list[ReportEntryOut] = []
-        for entry in self.report_entries:
-            if is_failure and entry.success:
-                is_failure = False
+        self.repos.bulk_import_jobs.set_item_status(ctx.item.id, BulkImportItemStatus.failure)
+        self._add_entry(message, success=False, exception=str(e) if e else "")
 
-            if is_success and not entry.success:
-                is_success = False
+    def _succeed(self, ctx: _ImportContext, name: str) -> None:
+        self.repos.bulk_import_jobs.set_item_status(ctx.item.id, BulkImportItemStatus.success)
+        self._add_entry(f"Successfully imported recipe {name}")
 
-            new_entries.append(self.repos.group_report_entries.create(entry))
+    def _finalize(self, job_id: UUID4) -> None:
+        counts = self.repos.bulk_import_jobs.count_item_statuses(job_id)
+        succeeded = counts.get(BulkImportItemStatus.success, 0) + counts.get(BulkImportItemStatus.duplicate, 0)
+        failed = counts.get(BulkImportItemStatus.failure, 0)
 
-        if is_success:
-            self.report.status = ReportSummaryStatus.success
+        if failed and not succeeded:
+            status = ReportSummaryStatus.failure
+        elif failed:
+            status = ReportSummaryStatus.partial
+        else:
+            status = ReportSummaryStatus.success
 
-        if is_failure:
-            self.report.status = ReportSummaryStatus.failure
+        # entries are written as the import runs, so only patch the status; `self.report` has none of them
+        self.report = self.repos.group_reports.patch(self.report.id, {"status": status})
+        self.repos.bulk_import_jobs.complete(job_id)
 
-        if not is_success and not is_failure:
-            self.report.status = ReportSummaryStatus.partial
+    # ==================================================================================================================
+    # Pipeline Stages
 
-        self.report.entries = new_entries
-        self.repos.group_reports.update(self.report.id, self.report)
+    async def _fetch(self, ctx: _ImportContext) -> _ImportContext | None:
+        extracted_url = regex_search(r"(https?://|www\.)[^\s]+", ctx.url)
+        if not extracted_url:
+            await self._db(self._fail, ctx, f"failed to scrape url {ctx.url}")
+            return None
 
-    async def scrape(self, urls: CreateRecipeByUrlBulk) -> None:
-        sem = asyncio.Semaphore(3)
+        ctx.url = extracted_url.group(0)
+        try:
+            ctx.html = await safe_scrape_html(ctx.url)
+        except Exception as e:
+            await self._db(self._fail, ctx, f"failed to scrape url {ctx.url}", e)
+            return None
+
+        return ctx
 
-        async def _do(url: str) -> Recipe | None:
-            async with sem:
+    async def _parse(self, ctx: _ImportContext) -> _ImportContext | None:
+        try:
+            recipe, _ = await RecipeScraper(self.translator).scrape(ctx.url, ctx.html)
+        except Exception as e:
+            await self._db(self._fail, ctx, f"failed to scrape url {ctx.url}", e)
+            return None
+        finally:
+            ctx.html = None
+
+        if not recipe:
+            await self._db(self._fail, ctx, f"failed to scrape url {ctx.url}")
+            return None
+
+        recipe.id = uuid4()
+        recipe.org_url = recipe.org_url or ctx.url
+        if not recipe.name:
+            recipe.name = f"No Recipe Name Found - {uuid4()!s}"
+        recipe.slug = slugify(recipe.name)
+
+        image = recipe.image
+        if isinstance(image, list):
+            image = image[0] if image else None
+        if isinstance(image, dict):
+            image = image.get("url")
+        ctx.image_url = image if isinstance(image, str) and image else None
+        recipe.image = "no image"
+
+        if ctx.item.tags:
+            recipe.tags = [RecipeTag.model_validate(tag) for tag in orjson.loads(ctx.item.tags)]
+        if ctx.item.categories:
+            recipe.recipe_category = [RecipeCategory.model_validate(cat) for cat in orjson.loads(ctx.item.categories)]
+
+        ctx.recipe = recipe
+        return ctx
+
+    async def _persist(self, ctx: _ImportContext) -> _ImportContext | None:
+        assert ctx.recipe is not None
+
+        try:
+            new_recipe = await self._db(self.service.create_one, ctx.recipe)
+        except Exception as e:
+            await self._db(self._fail, ctx, f"Failed to save recipe to database during bulk url import {ctx.url}", e)
+            return None
+
+        ctx.recipe = new_recipe
+        ctx.recipe_id = new_recipe.id
+        if not ctx.image_url:
+            await self._db(self._succeed, ctx, new_recipe.name or ctx.url)
+            return None
+
+        await self._db(
+            self.repos.bulk_import_jobs.set_item_status,
+            ctx.item.id,
+            BulkImportItemStatus.persisted,
+            recipe_id=new_recipe.id,
+            image_url=ctx.image_url,
+        )
+        return ctx
+
+    async def _image(self, ctx: _ImportContext) -> None:
+        assert ctx.recipe_id is not None and ctx.image_url is not None
+
+        data_service = RecipeDataService(ctx.recipe_id)
+        try:
+            await data_service.scrape_image(ctx.image_url, record=False)
+            await self._db(self.service.group_recipes.update_image, str(ctx.recipe_id), match_key="id")
+        except Exception as e:
+            # the recipe itself was imported, so a missing image doesn't fail the item
+            data_service.logger.exception(f"Error Scraping Image: {e}")
+
+        await self._db(data_service.record_storage, self.repos.session)
+
+        await self._db(self._succeed, ctx, ctx.recipe.name if ctx.recipe and ctx.recipe.name else ctx.url)
+
+    def _start_stage(
+        self,
+        inbox: asyncio.Queue[_ImportContext],
+        handler: Callable[[_ImportContext], Awaitable[_ImportContext | None]],
+        workers: int,
+        outbox: asyncio.Queue[_ImportContext] | None = None,
+    ) -> list[asyncio.Task]:
+        async def _worker() -> None:
+            while True:
+                ctx = await inbox.get()
                 try:
-                    recipe, _ = await create_from_html(url, self.translator)
-                    return recipe
+                    result = await handler(ctx)
+                    if result is not None and outbox is not None:
+                        await outbox.put(result)
                 except Exception as e:
-                    self.service.logger.error(f"failed to scrape url during bulk url import {url}")
-                    self.service.logger.exception(e)
-                    self._add_error_entry(f"failed to scrape url {url}", str(e))
-                    return None
+                    try:
+                        await self._db(self._fail, ctx, f"Unexpected error during bulk url import {ctx.url}", e)
+                    except Exception as fail_error:
+                        # a worker must never exit, otherwise `run` would wait on its queue forever
+                        self.service.logger.exception(
+                            f"Failed to record the failed bulk url import {ctx.url}: {fail_error}"
+                        )
+                        with contextlib.suppress(Exception):
+                            await self._db(self.repos.session.rollback)
+                finally:
+                    inbox.task_done()
 
-        if self.report is None:
-            self.get_report_id()
-        tasks = [_do(b.url) for b in urls.imports]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        for b, recipe in zip(urls.imports, results, strict=True):
-            if not recipe or isinstance(recipe, BaseException):
-                continue
+        return [asyncio.create_task(_worker()) for _ in range(max(1, workers))]
 
-            if b.tags:
-                recipe.tags = b.tags
+    # ==================================================================================================================
+    # Job Execution
 
-            if b.categories:
-                recipe.recipe_category = b.categories
+    def _skip_duplicates(self, items: list[BulkImportJobItemOut]) -> list[BulkImportJobItemOut]:
+        imported_urls = self.repos.bulk_import_jobs.get_imported_urls(item.url for item in items)
 
-            try:
-                self.service.create_one(recipe)
-            except Exception as e:
-                self.service.logger.error(f"Failed to save recipe to database during bulk url import {b.url}")
-                self.service.logger.exception(e)
-                self._add_error_entry(f"Failed to save recipe to database during bulk url import {b.url}", str(e))
+        seen: set[str] = set()
+        remaining: list[BulkImportJobItemOut] = []
+        for item in items:
+            if item.url in imported_urls or item.url in seen:
+                self.repos.bulk_import_jobs.set_item_status(item.id, BulkImportItemStatus.duplicate)
+                self._add_entry(f"Skipped {item.url}, it has already been imported")
                 continue
 
-            self.report_entries.append(
-                ReportEntryCreate(
-                    report_id=self.report.id,
-                    success=True,
-                    message=f"Successfully imported recipe {recipe.name}",
-                    exception="",
+            seen.add(item.url)
+            remaining.append(item)
+
+        return remaining
+
+    def _load_items(self, job_id: UUID4) -> tuple[list[BulkImportJobItemOut], list[BulkImportJobItemOut]] | None:
+        """Returns the job's items which still need to be imported, and those which still need their image"""
+
+        if self._report is None:
+            job = self.repos.bulk_import_jobs.get_one(job_id)
+            if job is None:
+                return None
+            self.report = self.repos.group_reports.get_one(job.report_id)
+
+        pending = self._skip_duplicates(self.repos.bulk_import_jobs.get_items(job_id, [BulkImportItemStatus.pending]))
+        persisted = self.repos.bulk_import_jobs.get_items(job_id, [BulkImportItemStatus.persisted])
+        return pending, persisted
+
+    async def run(self, job_id: UUID4) -> None:
+        if (items := await self._db(self._load_items, job_id)) is None:
+            return
+
+        pending, persisted = items
+
+        settings = self.settings
+        fetch_q: asyncio.Queue[_ImportContext] = asyncio.Queue(maxsize=settings.BULK_IMPORT_FETCH_WORKERS * 2)
+        parse_q: asyncio.Queue[_ImportContext] = asyncio.Queue(maxsize=settings.BULK_IMPORT_PARSE_WORKERS * 2)
+        persist_q: asyncio.Queue[_ImportContext] = asyncio.Queue(maxsize=settings.BULK_IMPORT_PERSIST_WORKERS * 2)
+        image_q: asyncio.Queue[_ImportContext] = asyncio.Queue(maxsize=settings.BULK_IMPORT_IMAGE_WORKERS * 2)
+
+        tasks = [
+            *self._start_stage(fetch_q, self._fetch, settings.BULK_IMPORT_FETCH_WORKERS, parse_q),
+            *self._start_stage(parse_q, self._parse, settings.BULK_IMPORT_PARSE_WORKERS, persist_q),
+            *self._start_stage(persist_q, self._persist, settings.BULK_IMPORT_PERSIST_WORKERS, image_q),
+            *self._start_stage(image_q, self._image, settings.BULK_IMPORT_IMAGE_WORKERS),
+        ]
+
+        try:
+            # items from a previous run which were saved, but never got their image
+            for item in persisted:
+                await image_q.put(
+                    _ImportContext(item=item, url=item.url, recipe_id=item.recipe_id, image_url=item.image_url)
                 )
-            )
 
-        self._save_all_entries()
+            for item in pending:
+                await fetch_q.put(_ImportContext(item=item, url=item.url))
+
+            # each stage hands its results to the next one before marking them as done,
+            # so joining the queues in order drains the whole pipeline
+            for queue in (fetch_q, parse_q, persist_q, image_q):
+                await queue.join()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        await self._db(self._finalize, job_id)
+
+
+def _lease_expires_before() -> datetime:
+    return get_utc_now() - timedelta(seconds=get_app_settings().BULK_IMPORT_LEASE_SECONDS)
+
+
+def _renew_lease(job_id: UUID4) -> bool:
+    with session_context() as session:
+        return get_repositories(session, group_id=None, household_id=None).bulk_import_jobs.renew_lease(
+            job_id, RUNNER_ID
+        )
+
+
+async def _keep_lease(job_id: UUID4, run: asyncio.Task) -> None:
+    """Renews this runner's lease on the job until cancelled, and stops the run if another runner takes the job over"""
+
+    while True:
+        await asyncio.sleep(get_app_settings().BULK_IMPORT_LEASE_SECONDS / 4)
+        if not await run_in_threadpool(_renew_lease, job_id):
+            run.cancel()
+            return
+
+
+def _load_job(session: Session, job_id: UUID4, translator: Translator) -> RecipeBulkScraperService | None:
+    """Claims the job, and sets up a bulk scraper to run it, or returns `None` if it can't be run"""
+
+    repos = get_repositories(session, group_id=None, household_id=None)
+    job = repos.bulk_import_jobs.get_one(job_id)
+    if job is None or not repos.bulk_import_jobs.claim(job.id, RUNNER_ID, _lease_expires_before()):
+        return None
+
+    job_repos = get_repositories(session, group_id=job.group_id, household_id=job.household_id)
+    user = job_repos.users.get_one(job.user_id)
+    household = job_repos.households.get_one(job.household_id)
+    group = job_repos.groups.get_one(job.group_id)
+    if user is None or household is None or group is None:
+        get_logger().error(f"Unable to resume bulk import job {job.id}; its user or household no longer exists")
+        repos.bulk_import_jobs.complete(job.id)
+        return None
+
+    service = RecipeService(job_repos, user, household, translator)
+    bulk_scraper = RecipeBulkScraperService(service, job_repos, group, translator)
+    bulk_scraper.report = job_repos.group_reports.get_one(job.report_id)
+    return bulk_scraper
+
+
+async def run_bulk_import_job(job_id: UUID4, translator: Translator | None = None) -> None:
+    """
+    Runs a persisted bulk import job in its own database session. The job is only run if it can be claimed,
+    i.e. no other runner holds a current lease on it, and its lease is renewed for as long as it runs, so a
+    job is never processed by two workers at once.
+    """
+
+    logger = get_logger()
+    translator = translator or get_locale_provider("en-US")
+
+    with session_context() as session:
+        bulk_scraper = await run_in_threadpool(_load_job, session, job_id, translator)
+        if bulk_scraper is None:
+            return
+
+        run = asyncio.create_task(bulk_scraper.run(job_id))
+        lease = asyncio.create_task(_keep_lease(job_id, run))
+        try:
+            await run
+        except asyncio.CancelledError:
+            if not lease.done():
+                raise
+            logger.warning(f"Stopped bulk import job {job_id}; another worker has taken it over")
+        except Exception as e:
+            logger.exception(f"Bulk import job {job_id} failed: {e}")
+        finally:
+            lease.cancel()
+
+
+_resumed_jobs: set[asyncio.Task] = set()
+
+
+async def resume_bulk_import_jobs() -> None:
+    """
+    Runs for the life of the app, resuming the bulk import jobs whose lease has lapsed, e.g. because the worker
+    running them was restarted. Jobs that a live worker is still running keep their lease, and are left alone.
+    """
+
+    def get_claimable_jobs():
+        with session_context() as session:
+            repos = get_repositories(session, group_id=None, household_id=None)
+            return repos.bulk_import_jobs.get_claimable(_lease_expires_before())
+
+    while True:
+        for job in await run_in_threadpool(get_claimable_jobs):
+            get_logger().info(f"Resuming bulk import job {job.id}")
+
+            # keep a reference to each task, otherwise they may be garbage collected before they finish
+            task = asyncio.create_task(run_bulk_import_job(job.id))
+            _resumed_jobs.add(task)
+            task.add_done_callback(_resumed_jobs.discard)
+
+        await asyncio.sleep(get_app_settings().BULK_IMPORT_LEASE_SECONDS / 2)
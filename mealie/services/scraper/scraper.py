@@ -56,7 +56,8 @@ async def create_from_html(
     try:
         if new_recipe.image and isinstance(new_recipe.image, list):
             new_recipe.image = new_recipe.image[0]
-        await recipe_data_service.scrape_image(new_recipe.image)  # type: ignore
+        # the recipe isn't saved yet, so there's no row to record its storage on
+        await recipe_data_service.scrape_image(new_recipe.image, record=False)  # type: ignore
 
         if new_recipe.name is None:
             new_recipe.name = "Untitled"
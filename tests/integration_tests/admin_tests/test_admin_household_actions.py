@@ -3,7 +3,7 @@ from fastapi.testclient import TestClient
 from mealie.repos.repository_factory import AllRepositories
 from tests.utils import api_routes
 from tests.utils.assertion_helpers import assert_ignore_keys
-from tests.utils.factories import random_bool, random_string
+from tests.utils.factories import random_bool, random_int, random_string
 from tests.utils.fixture_schemas import TestUser
 
 
@@ -49,6 +49,7 @@ def test_admin_update_household(api_client: TestClient, admin_user: TestUser, un
             "recipeShowAssets": random_bool(),
             "recipeLandscapeView": random_bool(),
             "recipeDisableComments": random_bool(),
+            "shoppingListMaxCheckedItems": random_int(1, 100),
         },
     }
 
@@ -0,0 +1,68 @@
+from collections.abc import Generator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from mealie.db.db_setup import engine
+from mealie.db.query_stats import QueryStatsRecorder, query_stats_recorder
+from tests.utils import api_routes
+from tests.utils.factories import random_string
+from tests.utils.fixture_schemas import TestUser
+
+
+@pytest.fixture()
+def recorder() -> Generator[QueryStatsRecorder, None, None]:
+    # every statement counts as slow, so each one has its plan captured
+    slow_query_ms = query_stats_recorder.slow_query_ms
+    query_stats_recorder.slow_query_ms = 0
+    query_stats_recorder.reset()
+    query_stats_recorder.install(engine)
+    try:
+        yield query_stats_recorder
+    finally:
+        query_stats_recorder.uninstall(engine)
+        query_stats_recorder.slow_query_ms = slow_query_ms
+        query_stats_recorder.reset()
+
+
+def test_admin_query_stats_disabled(api_client: TestClient, admin_user: TestUser, unique_user: TestUser):
+    response = api_client.get(api_routes.admin_debug_query_stats, headers=unique_user.token)
+    assert response.status_code == 403
+
+    response = api_client.get(api_routes.admin_debug_query_stats, headers=admin_user.token)
+    assert response.status_code == 200
+    assert response.json()["enabled"] is False
+
+
+def test_admin_query_stats_report(
+    api_client: TestClient, admin_user: TestUser, unique_user: TestUser, recorder: QueryStatsRecorder
+):
+    for food_name in [random_string(), random_string()]:
+        params = {"queryFilter": f'recipeIngredient.food.name IN ["{food_name}"]', "orderBy": "name"}
+        response = api_client.get(api_routes.recipes, params=params, headers=unique_user.token)
+        assert response.status_code == 200
+
+    response = api_client.get(api_routes.admin_debug_query_stats, headers=admin_user.token)
+    assert response.status_code == 200
+    report = response.json()
+    assert report["enabled"] is True
+
+    # both requests have the same shape, regardless of the food they filtered on
+    shape = "RecipeModel | filter: recipe_ingredient.food.name IN [?] | order by: name"
+    shape_report = next(s for s in report["shapes"] if s["shape"] == shape)
+    assert shape_report["requests"] == 2
+    assert shape_report["statements"] >= 4
+
+    statements = [s for s in report["statements"] if shape in s["queryShapes"]]
+    assert statements
+    assert all(s["plan"] for s in statements if s["template"].startswith("SELECT"))
+    assert not any(food_name in s["template"] for s in statements)
+
+    # recipe ingredients aren't indexed by recipe, so filtering on their foods scans them
+    recommendation = next(r for r in report["indexRecommendations"] if r["table"] == "recipes_ingredients")
+    assert recommendation["columns"][0] == "recipe_id"
+    assert recommendation["ddl"].startswith("CREATE INDEX ix_recipes_ingredients_recipe_id")
+
+    response = api_client.delete(api_routes.admin_debug_query_stats, headers=admin_user.token)
+    assert response.status_code == 200
+    assert api_client.get(api_routes.admin_debug_query_stats, headers=admin_user.token).json()["shapes"] == []
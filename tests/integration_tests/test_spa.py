@@ -1,5 +1,10 @@
+import gzip
+from pathlib import Path
+
 import pytest
 from bs4 import BeautifulSoup
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
 
 from mealie.routes import spa
 from mealie.schema.recipe.recipe import Recipe, RecipeSettings
@@ -9,6 +14,8 @@ from tests import data as test_data
 from tests.utils.factories import random_string
 from tests.utils.fixture_schemas import TestUser
 
+STATIC_JS = "console.log('mealie');" * 100
+
 
 @pytest.fixture(autouse=True)
 def set_spa_contents():
@@ -110,13 +117,12 @@ def test_spa_recipe_json_injection():
 
 
 @pytest.mark.parametrize("use_public_user", [True, False])
-@pytest.mark.asyncio
-async def test_spa_serve_recipe_with_meta(unique_user: TestUser, use_public_user: bool):
+def test_spa_serve_recipe_with_meta(unique_user: TestUser, use_public_user: bool):
     recipe = create_recipe(unique_user)
     user = unique_user.repos.users.get_by_username(unique_user.username)
     assert user
 
-    response = await spa.serve_recipe_with_meta(
+    response = spa.serve_recipe_with_meta(
         user.group_slug, recipe.slug, user=None if use_public_user else user, session=unique_user.repos.session
     )
     assert response.status_code == 200
@@ -124,24 +130,23 @@ async def test_spa_serve_recipe_with_meta(unique_user: TestUser, use_public_user
 
 
 @pytest.mark.parametrize("use_public_user", [True, False])
-@pytest.mark.asyncio
-async def test_spa_serve_recipe_with_meta_invalid_data(unique_user: TestUser, use_public_user: bool):
+def test_spa_serve_recipe_with_meta_invalid_data(unique_user: TestUser, use_public_user: bool):
     recipe = create_recipe(unique_user)
     user = unique_user.repos.users.get_by_username(unique_user.username)
     assert user
 
-    response = await spa.serve_recipe_with_meta(
+    response = spa.serve_recipe_with_meta(
         random_string(), recipe.slug, user=None if use_public_user else user, session=unique_user.repos.session
     )
     assert response.status_code == 404
 
-    response = await spa.serve_recipe_with_meta(
+    response = spa.serve_recipe_with_meta(
         user.group_slug, random_string(), user=None if use_public_user else user, session=unique_user.repos.session
     )
     assert response.status_code == 404
 
     set_recipe_is_public(unique_user, recipe, is_public=False)
-    response = await spa.serve_recipe_with_meta(
+    response = spa.serve_recipe_with_meta(
         user.group_slug, recipe.slug, user=None if use_public_user else user, session=unique_user.repos.session
     )
     if use_public_user:
@@ -151,7 +156,7 @@ async def test_spa_serve_recipe_with_meta_invalid_data(unique_user: TestUser, us
 
     set_group_is_private(unique_user, is_private=True)
     set_recipe_is_public(unique_user, recipe, is_public=True)
-    response = await spa.serve_recipe_with_meta(
+    response = spa.serve_recipe_with_meta(
         user.group_slug, recipe.slug, user=None if use_public_user else user, session=unique_user.repos.session
     )
     if use_public_user:
@@ -162,10 +167,7 @@ async def test_spa_serve_recipe_with_meta_invalid_data(unique_user: TestUser, us
 
 @pytest.mark.parametrize("use_private_group", [True, False])
 @pytest.mark.parametrize("use_public_recipe", [True, False])
-@pytest.mark.asyncio
-async def test_spa_service_shared_recipe_with_meta(
-    unique_user: TestUser, use_private_group: bool, use_public_recipe: bool
-):
+def test_spa_service_shared_recipe_with_meta(unique_user: TestUser, use_private_group: bool, use_public_recipe: bool):
     group = unique_user.repos.groups.get_by_slug_or_id(unique_user.group_id)
     assert group
     recipe = create_recipe(unique_user)
@@ -178,17 +180,16 @@ async def test_spa_service_shared_recipe_with_meta(
         RecipeShareTokenSave(recipe_id=recipe.id, group_id=unique_user.group_id)
     )
 
-    response = await spa.serve_shared_recipe_with_meta(group.slug, token.id, session=unique_user.repos.session)
+    response = spa.serve_shared_recipe_with_meta(group.slug, token.id, session=unique_user.repos.session)
     assert response.status_code == 200
     assert "https://schema.org" in response.body.decode()
 
 
-@pytest.mark.asyncio
-async def test_spa_service_shared_recipe_with_meta_invalid_data(unique_user: TestUser):
+def test_spa_service_shared_recipe_with_meta_invalid_data(unique_user: TestUser):
     group = unique_user.repos.groups.get_by_slug_or_id(unique_user.group_id)
     assert group
 
-    response = await spa.serve_shared_recipe_with_meta(group.slug, random_string(), session=unique_user.repos.session)
+    response = spa.serve_shared_recipe_with_meta(group.slug, random_string(), session=unique_user.repos.session)
     assert response.status_code == 404
 
 
@@ -215,3 +216,55 @@ def test_spa_escapes_malicious_recipe_data(unique_user: TestUser, malicious_cont
     response = spa.content_with_meta(unique_user.group_id, recipe)
     for string in malicious_strings:
         assert string not in response
+
+
+@pytest.fixture
+def static_client(tmp_path: Path) -> TestClient:
+    tmp_path.joinpath("index.html").write_text("<html></html>")
+
+    assets = tmp_path.joinpath("_nuxt")
+    assets.mkdir()
+    assets.joinpath("entry.abc123.js").write_text(STATIC_JS)
+    assets.joinpath("entry.abc123.js.gz").write_bytes(gzip.compress(STATIC_JS.encode()))
+    assets.joinpath("entry.abc123.js.br").write_bytes(random_string().encode())
+
+    app = FastAPI()
+    app.mount("/", spa.SPAStaticFiles(directory=tmp_path, html=True))
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected_encoding",
+    [
+        ("gzip, deflate, br", "br"),
+        ("gzip", "gzip"),
+        ("br;q=0, gzip", "gzip"),
+        ("identity", None),
+    ],
+)
+def test_spa_serves_precompressed_assets(
+    static_client: TestClient, accept_encoding: str, expected_encoding: str | None
+):
+    response = static_client.get("/_nuxt/entry.abc123.js", headers={"Accept-Encoding": accept_encoding})
+    assert response.status_code == 200
+    assert response.headers.get("content-encoding") == expected_encoding
+    assert response.headers["content-type"].startswith("text/javascript")
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["cache-control"] == spa.IMMUTABLE_CACHE_CONTROL
+
+    if expected_encoding != "br":
+        assert response.text == STATIC_JS
+
+    response = static_client.get(
+        "/_nuxt/entry.abc123.js",
+        headers={"Accept-Encoding": accept_encoding, "If-None-Match": response.headers["etag"]},
+    )
+    assert response.status_code == 304
+
+
+def test_spa_index_is_revalidated(static_client: TestClient):
+    response = static_client.get(f"/{random_string()}")
+    assert response.status_code == 200
+    assert response.text == "<html></html>"
+    assert response.headers["cache-control"] == spa.REVALIDATE_CACHE_CONTROL
+    assert "content-encoding" not in response.headers
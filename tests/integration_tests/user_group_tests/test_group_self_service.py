@@ -3,7 +3,11 @@ import random
 import pytest
 from fastapi.testclient import TestClient
 
+from mealie.pkgs.stats import fs_stats
 from mealie.repos.repository_factory import AllRepositories
+from mealie.schema.recipe.recipe import Recipe
+from mealie.services.scheduler.tasks.reconcile_recipe_storage import reconcile_recipe_storage
+from tests import data
 from tests.utils import api_routes, random_int, random_string
 from tests.utils.fixture_schemas import TestUser
 
@@ -79,3 +83,53 @@ def test_get_one_household(api_client: TestClient, unique_user: TestUser):
 def test_get_one_household_not_found(api_client: TestClient, unique_user: TestUser):
     response = api_client.get(api_routes.groups_households_household_slug(random_string()), headers=unique_user.token)
     assert response.status_code == 404
+
+
+def _recipe_dirs_size(unique_user: TestUser) -> int:
+    recipe_ids = unique_user.repos.recipes.all_ids(unique_user.group_id)
+    return sum(fs_stats.get_dir_size(Recipe.directory_from_id(recipe_id)) for recipe_id in recipe_ids)
+
+
+def test_get_group_storage(api_client: TestClient, unique_user: TestUser):
+    response = api_client.post(api_routes.recipes, json={"name": random_string()}, headers=unique_user.token)
+    assert response.status_code == 201
+    slug = response.json()
+
+    response = api_client.get(api_routes.groups_storage, headers=unique_user.token)
+    assert response.status_code == 200
+    initial_size = response.json()["usedStorageBytes"]
+
+    response = api_client.post(
+        api_routes.recipes_slug_assets(slug),
+        data={"name": random_string(), "icon": random_string(), "extension": "jpg"},
+        files={"file": data.images_test_image_1.read_bytes()},
+        headers=unique_user.token,
+    )
+    assert response.status_code == 200
+
+    response = api_client.get(api_routes.groups_storage, headers=unique_user.token)
+    used_size = response.json()["usedStorageBytes"]
+    assert used_size >= initial_size + data.images_test_image_1.stat().st_size
+    assert used_size == _recipe_dirs_size(unique_user)
+
+
+def test_reconcile_group_storage(api_client: TestClient, unique_user: TestUser):
+    response = api_client.post(api_routes.recipes, json={"name": random_string()}, headers=unique_user.token)
+    assert response.status_code == 201
+    recipe = unique_user.repos.recipes.get_one(response.json())
+    assert recipe
+
+    # files written without going through the recipe data service aren't counted until storage is reconciled
+    recipe.asset_dir.mkdir(parents=True, exist_ok=True)
+    recipe.asset_dir.joinpath("untracked.bin").write_bytes(b"0" * random_int(1000, 5000))
+    response = api_client.get(api_routes.groups_storage, headers=unique_user.token)
+    assert response.json()["usedStorageBytes"] != _recipe_dirs_size(unique_user)
+
+    assert reconcile_recipe_storage() >= 1
+
+    response = api_client.get(api_routes.groups_storage, headers=unique_user.token)
+    assert response.json()["usedStorageBytes"] == _recipe_dirs_size(unique_user)
+
+    # storage bookkeeping isn't an edit to the recipe
+    updated_recipe = unique_user.repos.recipes.get_one(recipe.id, "id")
+    assert updated_recipe and updated_recipe.updated_at == recipe.updated_at
@@ -338,3 +338,47 @@ def test_get_mealplan_with_rules_households_filter_includes_any_households(
         assert response.json()["recipe"]["slug"] == recipe.slug
     finally:
         unique_user.repos.group_meal_plan_rules.delete(rule.id)
+
+
+def test_create_random_mealplans_in_bulk(api_client: TestClient, unique_user: TestUser):
+    tag = unique_user.repos.tags.create(TagSave(name=random_string(), group_id=unique_user.group_id))
+    recipes = [create_recipe(unique_user, tags=[tag]) for _ in range(10)]
+    breakfast_tag = unique_user.repos.tags.create(TagSave(name=random_string(), group_id=unique_user.group_id))
+    breakfast = create_recipe(unique_user, tags=[tag, breakfast_tag])
+
+    rules = [
+        create_rule(unique_user, day=PlanRulesDay.unset, entry_type=PlanRulesType.unset, tags=[tag]),
+        create_rule(unique_user, day=PlanRulesDay.unset, entry_type=PlanRulesType.breakfast, tags=[breakfast_tag]),
+    ]
+
+    try:
+        payload = {"startDate": "2023-02-20", "endDate": "2023-02-24", "entryTypes": ["breakfast", "dinner"]}
+        response = api_client.post(api_routes.households_mealplans_random_bulk, json=payload, headers=unique_user.token)
+        assert response.status_code == 201
+        entries = response.json()
+
+        # every day gets a breakfast from the breakfast rule; the other recipes are spread over the dinners
+        assert [(entry["date"], entry["entryType"]) for entry in entries] == [
+            (f"2023-02-{day}", entry_type) for day in range(20, 25) for entry_type in ["breakfast", "dinner"]
+        ]
+        assert {entry["recipeId"] for entry in entries if entry["entryType"] == "breakfast"} == {str(breakfast.id)}
+
+        dinner_ids = [entry["recipeId"] for entry in entries if entry["entryType"] == "dinner"]
+        assert len(set(dinner_ids)) == len(dinner_ids)
+        assert set(dinner_ids) <= {str(recipe.id) for recipe in recipes}
+
+        response = api_client.get(route_all_slice(1, -1, "2023-02-20", "2023-02-24"), headers=unique_user.token)
+        assert len(response.json()["items"]) == len(entries)
+    finally:
+        for rule in rules:
+            unique_user.repos.group_meal_plan_rules.delete(rule.id)
+
+
+def test_create_random_mealplans_in_bulk_invalid_range(api_client: TestClient, unique_user: TestUser):
+    payload = {"startDate": "2023-02-24", "endDate": "2023-02-20"}
+    response = api_client.post(api_routes.households_mealplans_random_bulk, json=payload, headers=unique_user.token)
+    assert response.status_code == 422
+
+    payload = {"startDate": "2023-01-01", "endDate": "2023-12-31"}
+    response = api_client.post(api_routes.households_mealplans_random_bulk, json=payload, headers=unique_user.token)
+    assert response.status_code == 422
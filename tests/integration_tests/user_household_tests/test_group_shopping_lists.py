@@ -1350,3 +1350,178 @@ def test_bulk_modify_shopping_list_items_updates_shopping_list(
     )
     assert updated_list and updated_list.updated_at
     assert updated_list.updated_at > last_update_at
+
+
+def test_shopping_list_changes_since_revision(
+    api_client: TestClient, unique_user: TestUser, shopping_lists: list[ShoppingListOut]
+):
+    shopping_list = random.choice(shopping_lists)
+    response = api_client.get(api_routes.households_shopping_lists_item_id(shopping_list.id), headers=unique_user.token)
+    revision = assert_deserialize(response, 200)["revision"]
+
+    # an unchanged list has nothing to report
+    response = api_client.get(
+        api_routes.households_shopping_lists_item_id_changes(shopping_list.id),
+        params={"since": revision},
+        headers=unique_user.token,
+    )
+    changes = assert_deserialize(response, 200)
+    assert changes == {
+        "revision": revision,
+        "fullResync": False,
+        "createdItems": [],
+        "updatedItems": [],
+        "deletedItemIds": [],
+    }
+
+    # Create
+    new_item_data = [
+        {"note": random_string(), "shopping_list_id": str(shopping_list.id)} for _ in range(random_int(3, 5))
+    ]
+    response = api_client.post(
+        api_routes.households_shopping_items_create_bulk, json=new_item_data, headers=unique_user.token
+    )
+    created_items = assert_deserialize(response, 201)["createdItems"]
+    created_ids = {item["id"] for item in created_items}
+
+    response = api_client.get(
+        api_routes.households_shopping_lists_item_id_changes(shopping_list.id),
+        params={"since": revision},
+        headers=unique_user.token,
+    )
+    changes = assert_deserialize(response, 200)
+    assert changes["revision"] > revision
+    assert {item["id"] for item in changes["createdItems"]} == created_ids
+    assert not changes["updatedItems"]
+    assert not changes["deletedItemIds"]
+    revision_after_create = changes["revision"]
+
+    # Update one item and delete another
+    updated_item = ShoppingListItemOut.model_validate(created_items[0])
+    updated_item.note = random_string()
+    response = api_client.put(
+        api_routes.households_shopping_items_item_id(updated_item.id),
+        json=utils.jsonify(updated_item.cast(ShoppingListItemUpdate).model_dump()),
+        headers=unique_user.token,
+    )
+    assert response.status_code == 200
+
+    deleted_item_id = created_items[1]["id"]
+    response = api_client.delete(
+        api_routes.households_shopping_items_item_id(deleted_item_id), headers=unique_user.token
+    )
+    assert response.status_code == 200
+
+    response = api_client.get(
+        api_routes.households_shopping_lists_item_id_changes(shopping_list.id),
+        params={"since": revision_after_create},
+        headers=unique_user.token,
+    )
+    changes = assert_deserialize(response, 200)
+    assert not changes["createdItems"]
+    assert [item["id"] for item in changes["updatedItems"]] == [str(updated_item.id)]
+    assert changes["updatedItems"][0]["note"] == updated_item.note
+    assert changes["deletedItemIds"] == [deleted_item_id]
+
+    # a client that never saw the deleted item doesn't need to hear about it
+    response = api_client.get(
+        api_routes.households_shopping_lists_item_id_changes(shopping_list.id),
+        params={"since": revision},
+        headers=unique_user.token,
+    )
+    changes = assert_deserialize(response, 200)
+    assert {item["id"] for item in changes["createdItems"]} == created_ids - {deleted_item_id}
+    assert not changes["updatedItems"]
+    assert not changes["deletedItemIds"]
+
+    response = api_client.get(api_routes.households_shopping_lists_item_id(shopping_list.id), headers=unique_user.token)
+    assert assert_deserialize(response, 200)["revision"] == changes["revision"]
+
+
+def test_shopping_list_changes_other_household(
+    api_client: TestClient, unique_user: TestUser, h2_user: TestUser, shopping_lists: list[ShoppingListOut]
+):
+    shopping_list = random.choice(shopping_lists)
+    response = api_client.get(
+        api_routes.households_shopping_lists_item_id_changes(shopping_list.id), headers=h2_user.token
+    )
+    assert response.status_code == 404
+
+
+def test_shopping_lists_add_and_remove_recipe_delta(
+    api_client: TestClient,
+    unique_user: TestUser,
+    shopping_lists: list[ShoppingListOut],
+    recipe_ingredient_only: Recipe,
+):
+    sample_list = random.choice(shopping_lists)
+    recipe = recipe_ingredient_only
+
+    # an unrelated item on the list shouldn't show up in the delta
+    response = api_client.post(
+        api_routes.households_shopping_items,
+        json={"note": random_string(), "shopping_list_id": str(sample_list.id)},
+        headers=unique_user.token,
+    )
+    other_item_id = assert_deserialize(response, 201)["createdItems"][0]["id"]
+
+    response = api_client.post(
+        api_routes.households_shopping_lists_item_id_recipe_delta(sample_list.id),
+        json=[{"recipeId": str(recipe.id), "recipeIncrementQuantity": 2}],
+        headers=unique_user.token,
+    )
+    changes = assert_deserialize(response, 200)
+    assert len(changes["createdItems"]) == len(recipe.recipe_ingredient)
+    assert other_item_id not in {item["id"] for item in changes["createdItems"]}
+    assert not changes["updatedItems"]
+    assert not changes["deletedItems"]
+    assert [(ref["recipeId"], ref["recipeQuantity"]) for ref in changes["recipeReferences"]] == [(str(recipe.id), 2)]
+    assert not changes["deletedRecipeReferenceIds"]
+
+    response = api_client.get(api_routes.households_shopping_lists_item_id(sample_list.id), headers=unique_user.token)
+    shopping_list = assert_deserialize(response, 200)
+    assert shopping_list["revision"] == changes["revision"]
+    assert len(shopping_list["listItems"]) == len(recipe.recipe_ingredient) + 1
+
+    # remove part of the recipe
+    response = api_client.post(
+        api_routes.households_shopping_lists_item_id_recipe_recipe_id_delete_delta(sample_list.id, recipe.id),
+        json={"recipeDecrementQuantity": 1},
+        headers=unique_user.token,
+    )
+    changes = assert_deserialize(response, 200)
+    assert not changes["createdItems"]
+    assert other_item_id not in {item["id"] for item in changes["updatedItems"]}
+    assert [(ref["recipeId"], ref["recipeQuantity"]) for ref in changes["recipeReferences"]] == [(str(recipe.id), 1)]
+    assert not changes["deletedRecipeReferenceIds"]
+    reference_id = changes["recipeReferences"][0]["id"]
+
+    # and then the rest of it
+    response = api_client.post(
+        api_routes.households_shopping_lists_item_id_recipe_recipe_id_delete_delta(sample_list.id, recipe.id),
+        json={"recipeDecrementQuantity": 1},
+        headers=unique_user.token,
+    )
+    changes = assert_deserialize(response, 200)
+    assert not changes["recipeReferences"]
+    assert changes["deletedRecipeReferenceIds"] == [reference_id]
+
+    response = api_client.get(api_routes.households_shopping_lists_item_id(sample_list.id), headers=unique_user.token)
+    shopping_list = assert_deserialize(response, 200)
+    assert [item["id"] for item in shopping_list["listItems"]] == [other_item_id]
+    assert not shopping_list["recipeReferences"]
+
+
+def test_shopping_lists_add_recipe_delta_other_household(
+    api_client: TestClient,
+    h2_user: TestUser,
+    shopping_lists: list[ShoppingListOut],
+    recipe_ingredient_only: Recipe,
+):
+    sample_list = random.choice(shopping_lists)
+    response = api_client.post(
+        api_routes.households_shopping_lists_item_id_recipe_delta(sample_list.id),
+        json=[{"recipeId": str(recipe_ingredient_only.id)}],
+        headers=h2_user.token,
+    )
+    assert response.status_code == 404
@@ -0,0 +1,8 @@
+from fastapi.testclient import TestClient
+
+from tests.utils import api_routes
+
+
+def test_event_stream_requires_login(api_client: TestClient):
+    response = api_client.get(api_routes.households_events_stream)
+    assert response.status_code == 401
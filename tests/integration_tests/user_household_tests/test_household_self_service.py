@@ -83,3 +83,30 @@ def test_get_household_recipe_invalid_recipe(api_client: TestClient, unique_user
         api_routes.households_self_recipes_recipe_slug(random_string()), headers=unique_user.token
     )
     assert response.status_code == 404
+
+
+def test_get_household_statistics(api_client: TestClient, unique_user: TestUser):
+    response = api_client.get(api_routes.households_statistics, headers=unique_user.token)
+    assert response.status_code == 200
+    initial = response.json()
+
+    # statistics are cached between requests, but creating or deleting a counted model invalidates them
+    response = api_client.post(api_routes.recipes, json={"name": random_string()}, headers=unique_user.token)
+    assert response.status_code == 201
+    slug = response.json()
+    response = api_client.post(api_routes.organizers_tags, json={"name": random_string()}, headers=unique_user.token)
+    assert response.status_code == 201
+
+    response = api_client.get(api_routes.households_statistics, headers=unique_user.token)
+    statistics = response.json()
+    assert statistics["totalRecipes"] == initial["totalRecipes"] + 1
+    assert statistics["totalTags"] == initial["totalTags"] + 1
+    assert statistics["totalUsers"] == initial["totalUsers"]
+    assert statistics["totalCategories"] == initial["totalCategories"]
+    assert statistics["totalTools"] == initial["totalTools"]
+
+    response = api_client.delete(api_routes.recipes_slug(slug), headers=unique_user.token)
+    assert response.status_code == 200
+
+    response = api_client.get(api_routes.households_statistics, headers=unique_user.token)
+    assert response.json()["totalRecipes"] == initial["totalRecipes"]
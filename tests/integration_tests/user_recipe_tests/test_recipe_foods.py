@@ -1,9 +1,12 @@
 from collections.abc import Generator
+from uuid import uuid4
 
 import pytest
 from fastapi.testclient import TestClient
 
-from mealie.schema.recipe.recipe_ingredient import CreateIngredientFood
+from mealie.schema.household.group_shopping_list import ShoppingListItemCreate, ShoppingListSave
+from mealie.schema.recipe.recipe_ingredient import CreateIngredientFood, SaveIngredientFood
+from mealie.schema.response.pagination import PaginationQuery
 from tests import utils
 from tests.utils import api_routes
 from tests.utils.factories import random_string
@@ -115,3 +118,100 @@ def test_food_extras(
     assert key_str_2 in extras
     assert extras[key_str_1] == val_str_1
     assert extras[key_str_2] == val_str_2
+
+
+def test_food_duplicates(api_client: TestClient, unique_user: TestUser):
+    database = unique_user.repos
+    group_id = unique_user.group_id
+
+    foods = [
+        database.ingredient_foods.create(SaveIngredientFood(name=name, group_id=group_id))
+        for name in ["Tomato", "tomatoes", "Cherry Tomatoes", "cherry tomato", "garlic"]
+    ]
+    database.ingredient_foods.create(SaveIngredientFood(name="onion", group_id=group_id))
+
+    response = api_client.get(api_routes.foods_duplicates, headers=unique_user.token)
+    clusters = utils.assert_deserialize(response, 200)
+
+    clustered_names = [{item["name"] for item in cluster["items"]} for cluster in clusters]
+    assert {"Tomato", "tomatoes"} in clustered_names
+    assert {"Cherry Tomatoes", "cherry tomato"} in clustered_names
+    assert all("garlic" not in names and "onion" not in names for names in clustered_names)
+
+    merge_data = {
+        "clusters": [
+            {
+                "fromFoods": [item["id"] for item in cluster["items"] if item["id"] != cluster["targetId"]],
+                "toFood": cluster["targetId"],
+            }
+            for cluster in clusters
+        ]
+    }
+    response = api_client.put(api_routes.foods_duplicates_merge, json=merge_data, headers=unique_user.token)
+    assert response.status_code == 200
+
+    remaining = {food.name for food in database.ingredient_foods.page_all(PaginationQuery(per_page=-1)).items}
+    assert len(remaining & {food.name for food in foods[:2]}) == 1
+    assert len(remaining & {food.name for food in foods[2:4]}) == 1
+    assert {"garlic", "onion"} <= remaining
+
+    response = api_client.get(api_routes.foods_duplicates, headers=unique_user.token)
+    assert utils.assert_deserialize(response, 200) == []
+
+
+def test_merge_food_records_shopping_list_changes(api_client: TestClient, unique_user: TestUser, food: dict):
+    database = unique_user.repos
+    from_food = database.ingredient_foods.create(
+        SaveIngredientFood(name=random_string(10), group_id=unique_user.group_id)
+    )
+    shopping_list = database.group_shopping_lists.create(
+        ShoppingListSave(name=random_string(), group_id=unique_user.group_id, user_id=unique_user.user_id)
+    )
+    item = database.group_shopping_list_item.create(
+        ShoppingListItemCreate(shopping_list_id=shopping_list.id, food_id=from_food.id)
+    )
+    revision = database.group_shopping_lists.get_revision(shopping_list.id)
+
+    data = {"fromFood": str(from_food.id), "toFood": food["id"]}
+    response = api_client.put(api_routes.foods_merge, json=data, headers=unique_user.token)
+    assert response.status_code == 200
+
+    response = api_client.get(
+        api_routes.households_shopping_lists_item_id_changes(shopping_list.id),
+        params={"since": revision},
+        headers=unique_user.token,
+    )
+    changes = utils.assert_deserialize(response, 200)
+    assert changes["revision"] == revision + 1
+    assert [(changed["id"], changed["foodId"]) for changed in changes["updatedItems"]] == [(str(item.id), food["id"])]
+
+
+def test_merge_food_duplicates_is_all_or_nothing(api_client: TestClient, unique_user: TestUser):
+    database = unique_user.repos
+    a, b, c = (
+        database.ingredient_foods.create(SaveIngredientFood(name=random_string(10), group_id=unique_user.group_id))
+        for _ in range(3)
+    )
+
+    # the second cluster merges a food which doesn't exist, so the first one is rolled back too
+    merge_data = {
+        "clusters": [
+            {"fromFoods": [str(a.id)], "toFood": str(b.id)},
+            {"fromFoods": [str(uuid4())], "toFood": str(c.id)},
+        ]
+    }
+    response = api_client.put(api_routes.foods_duplicates_merge, json=merge_data, headers=unique_user.token)
+    assert response.status_code == 500
+    assert database.ingredient_foods.get_one(a.id)
+
+    # a food can't be merged by more than one cluster
+    merge_data = {
+        "clusters": [
+            {"fromFoods": [str(a.id)], "toFood": str(b.id)},
+            {"fromFoods": [str(b.id)], "toFood": str(c.id)},
+        ]
+    }
+    response = api_client.put(api_routes.foods_duplicates_merge, json=merge_data, headers=unique_user.token)
+    assert response.status_code == 400
+    assert database.ingredient_foods.get_one(a.id)
+    assert database.ingredient_foods.get_one(b.id)
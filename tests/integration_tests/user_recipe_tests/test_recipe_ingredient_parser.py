@@ -1,3 +1,5 @@
+import json
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -65,3 +67,17 @@ def test_recipe_ingredient_parser_brute(api_client: TestClient):
 @pytest.mark.skip("TODO: Implement")
 def test_recipe_ingredients_parser_brute(api_client: TestClient):
     pass
+
+
+def test_recipe_ingredients_parser_batch(api_client: TestClient, unique_user: TestUser):
+    recipes = [["1 cup flour", "2 eggs"], [], ["1 tablespoon butter"]]
+    payload = {"parser": RegisteredParser.brute, "recipes": recipes}
+    response = api_client.post(api_routes.parser_ingredients_batch, json=payload, headers=unique_user.token)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    items = [json.loads(line) for line in response.text.splitlines()]
+    assert [item["index"] for item in items] == [0, 1, 2]
+    for item, ingredients in zip(items, recipes, strict=True):
+        assert item["error"] is None
+        assert [ing["input"] for ing in item["ingredients"]] == ingredients
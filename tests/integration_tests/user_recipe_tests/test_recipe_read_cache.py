@@ -0,0 +1,113 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from mealie.schema.recipe.recipe import Recipe
+from mealie.schema.recipe.recipe_category import TagSave
+from mealie.schema.recipe.recipe_ingredient import RecipeIngredient
+from mealie.services.recipe.recipe_service import RecipeService
+from tests.utils import api_routes
+from tests.utils.factories import random_string
+from tests.utils.fixture_schemas import TestUser
+
+
+def create_recipe(unique_user: TestUser, **kwargs) -> Recipe:
+    return unique_user.repos.recipes.create(
+        Recipe(
+            name=random_string(),
+            user_id=unique_user.user_id,
+            group_id=unique_user.group_id,
+            **kwargs,
+        )
+    )
+
+
+def test_recipe_etag(api_client: TestClient, unique_user: TestUser):
+    recipe = create_recipe(unique_user)
+    recipe_url = api_routes.recipes_slug(recipe.slug)
+
+    response = api_client.get(recipe_url, headers=unique_user.token)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    response = api_client.get(recipe_url, headers=unique_user.token | {"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert not response.content
+
+    response = api_client.patch(recipe_url, json={"name": random_string()}, headers=unique_user.token)
+    assert response.status_code == 200
+
+    response = api_client.get(recipe_url, headers=unique_user.token | {"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_recipe_served_from_cache(api_client: TestClient, unique_user: TestUser, monkeypatch: pytest.MonkeyPatch):
+    recipe = create_recipe(unique_user)
+
+    response = api_client.get(api_routes.recipes_slug(recipe.slug), headers=unique_user.token)
+    assert response.status_code == 200
+    expected = unique_user.repos.recipes.get_one(recipe.id, "id").model_dump(mode="json", by_alias=True)
+    assert response.json() == expected
+
+    def fail(*_, **__):
+        raise AssertionError("recipe should be served from the cache")
+
+    monkeypatch.setattr(RecipeService, "_get_recipe", fail)
+
+    # by id or slug
+    for key in (recipe.slug, str(recipe.id)):
+        response = api_client.get(api_routes.recipes_slug(key), headers=unique_user.token)
+        assert response.status_code == 200
+        assert response.json() == expected
+
+
+def test_recipe_cache_invalidated_by_comment(api_client: TestClient, unique_user: TestUser):
+    recipe = create_recipe(unique_user)
+    recipe_url = api_routes.recipes_slug(recipe.slug)
+
+    response = api_client.get(recipe_url, headers=unique_user.token)
+    assert response.json()["comments"] == []
+
+    comment = {"recipeId": str(recipe.id), "text": random_string()}
+    response = api_client.post(api_routes.comments, json=comment, headers=unique_user.token)
+    assert response.status_code == 201
+
+    response = api_client.get(recipe_url, headers=unique_user.token)
+    assert [c["text"] for c in response.json()["comments"]] == [comment["text"]]
+
+
+def test_recipe_cache_invalidated_by_tag_rename(api_client: TestClient, unique_user: TestUser):
+    tag = unique_user.repos.tags.create(TagSave(name=random_string(), group_id=unique_user.group_id))
+    recipe = create_recipe(unique_user, tags=[tag])
+    recipe_url = api_routes.recipes_slug(recipe.slug)
+
+    response = api_client.get(recipe_url, headers=unique_user.token)
+    assert response.json()["tags"][0]["name"] == tag.name
+
+    new_name = random_string()
+    response = api_client.put(
+        api_routes.organizers_tags_item_id(tag.id), json={"name": new_name}, headers=unique_user.token
+    )
+    assert response.status_code == 200
+
+    response = api_client.get(recipe_url, headers=unique_user.token)
+    assert response.json()["tags"][0]["name"] == new_name
+
+
+def test_recipe_cache_invalidated_by_sub_recipe(api_client: TestClient, unique_user: TestUser):
+    sub_recipe = create_recipe(unique_user)
+    recipe = create_recipe(unique_user, recipe_ingredient=[RecipeIngredient(note="", referenced_recipe=sub_recipe)])
+    recipe_url = api_routes.recipes_slug(recipe.slug)
+
+    response = api_client.get(recipe_url, headers=unique_user.token)
+    assert response.json()["recipeIngredient"][0]["referencedRecipe"]["name"] == sub_recipe.name
+
+    new_name = random_string()
+    response = api_client.patch(
+        api_routes.recipes_slug(sub_recipe.slug), json={"name": new_name}, headers=unique_user.token
+    )
+    assert response.status_code == 200
+
+    response = api_client.get(recipe_url, headers=unique_user.token)
+    assert response.json()["recipeIngredient"][0]["referencedRecipe"]["name"] == new_name
@@ -1,7 +1,11 @@
+from uuid import uuid4
+
 import pytest
 from fastapi.testclient import TestClient
 
-from mealie.schema.recipe.recipe_ingredient import CreateIngredientUnit
+from mealie.schema.household.group_shopping_list import ShoppingListItemCreate, ShoppingListSave
+from mealie.schema.recipe.recipe import Recipe
+from mealie.schema.recipe.recipe_ingredient import CreateIngredientUnit, RecipeIngredient, SaveIngredientUnit
 from tests.utils import api_routes
 from tests.utils.factories import random_bool, random_string
 from tests.utils.fixture_schemas import TestUser
@@ -81,3 +85,120 @@ def test_delete_unit(api_client: TestClient, unit: dict, unique_user: TestUser):
 
     response = api_client.get(api_routes.units_item_id(item_id), headers=unique_user.token)
     assert response.status_code == 404
+
+
+def test_merge_many_units(api_client: TestClient, unique_user: TestUser, unit: dict):
+    database = unique_user.repos
+    from_units = [
+        database.ingredient_units.create(SaveIngredientUnit(name=random_string(10), group_id=unique_user.group_id))
+        for _ in range(3)
+    ]
+
+    recipe = database.recipes.create(
+        Recipe(
+            name=random_string(10),
+            user_id=unique_user.user_id,
+            group_id=unique_user.group_id,
+            recipe_ingredient=[RecipeIngredient(note="", unit=from_unit) for from_unit in from_units],
+        )
+    )
+    # read the recipe first, so the merge has to replace what was cached
+    response = api_client.get(api_routes.recipes_slug(recipe.slug), headers=unique_user.token)
+    assert response.status_code == 200
+
+    data = {"fromUnits": [str(from_unit.id) for from_unit in from_units], "toUnit": unit["id"]}
+    response = api_client.put(api_routes.units_merge_bulk, json=data, headers=unique_user.token)
+    assert response.status_code == 200
+
+    for from_unit in from_units:
+        response = api_client.get(api_routes.units_item_id(from_unit.id), headers=unique_user.token)
+        assert response.status_code == 404
+
+    response = api_client.get(api_routes.recipes_slug(recipe.slug), headers=unique_user.token)
+    assert response.status_code == 200
+    assert [ing["unit"]["id"] for ing in response.json()["recipeIngredient"]] == [unit["id"]] * 3
+
+
+def test_merge_many_units_from_another_group(
+    api_client: TestClient, unique_user: TestUser, g2_user: TestUser, unit: dict
+):
+    other_unit = g2_user.repos.ingredient_units.create(
+        SaveIngredientUnit(name=random_string(10), group_id=g2_user.group_id)
+    )
+
+    data = {"fromUnits": [str(other_unit.id)], "toUnit": unit["id"]}
+    response = api_client.put(api_routes.units_merge_bulk, json=data, headers=unique_user.token)
+    assert response.status_code == 500
+    assert g2_user.repos.ingredient_units.get_one(other_unit.id)
+
+
+def test_merge_unit_records_shopping_list_changes(api_client: TestClient, unique_user: TestUser, unit: dict):
+    database = unique_user.repos
+    from_unit = database.ingredient_units.create(
+        SaveIngredientUnit(name=random_string(10), group_id=unique_user.group_id)
+    )
+    shopping_list = database.group_shopping_lists.create(
+        ShoppingListSave(name=random_string(), group_id=unique_user.group_id, user_id=unique_user.user_id)
+    )
+    item = database.group_shopping_list_item.create(
+        ShoppingListItemCreate(shopping_list_id=shopping_list.id, unit_id=from_unit.id, note=random_string())
+    )
+    revision = database.group_shopping_lists.get_revision(shopping_list.id)
+
+    data = {"fromUnit": str(from_unit.id), "toUnit": unit["id"]}
+    response = api_client.put(api_routes.units_merge, json=data, headers=unique_user.token)
+    assert response.status_code == 200
+
+    response = api_client.get(
+        api_routes.households_shopping_lists_item_id_changes(shopping_list.id),
+        params={"since": revision},
+        headers=unique_user.token,
+    )
+    assert response.status_code == 200
+    changes = response.json()
+    assert changes["revision"] == revision + 1
+    assert [(changed["id"], changed["unitId"]) for changed in changes["updatedItems"]] == [(str(item.id), unit["id"])]
+
+
+def test_unit_duplicates_compare_abbreviations_case_sensitively(api_client: TestClient, unique_user: TestUser):
+    database = unique_user.repos
+    for name, abbreviation in [("tablespoon", "T"), ("tablespoons", "T"), ("teaspoon", "t"), ("tsp", "")]:
+        database.ingredient_units.create(
+            SaveIngredientUnit(name=name, abbreviation=abbreviation, group_id=unique_user.group_id)
+        )
+
+    response = api_client.get(api_routes.units_duplicates, params={"threshold": 50}, headers=unique_user.token)
+    assert response.status_code == 200
+    clusters = [{item["name"] for item in cluster["items"]} for cluster in response.json()]
+    assert clusters == [{"tablespoon", "tablespoons"}]
+
+
+def test_merge_unit_duplicates_is_all_or_nothing(api_client: TestClient, unique_user: TestUser):
+    database = unique_user.repos
+    a, b, c = (
+        database.ingredient_units.create(SaveIngredientUnit(name=random_string(10), group_id=unique_user.group_id))
+        for _ in range(3)
+    )
+
+    # the second cluster merges a unit which doesn't exist, so the first one is rolled back too
+    merge_data = {
+        "clusters": [
+            {"fromUnits": [str(a.id)], "toUnit": str(b.id)},
+            {"fromUnits": [str(uuid4())], "toUnit": str(c.id)},
+        ]
+    }
+    response = api_client.put(api_routes.units_duplicates_merge, json=merge_data, headers=unique_user.token)
+    assert response.status_code == 500
+    assert database.ingredient_units.get_one(a.id)
+
+    # a unit can't be merged by more than one cluster
+    merge_data = {
+        "clusters": [
+            {"fromUnits": [str(a.id)], "toUnit": str(b.id)},
+            {"fromUnits": [str(b.id)], "toUnit": str(c.id)},
+        ]
+    }
+    response = api_client.put(api_routes.units_duplicates_merge, json=merge_data, headers=unique_user.token)
+    assert response.status_code == 400
+    assert database.ingredient_units.get_one(a.id)
+    assert database.ingredient_units.get_one(b.id)
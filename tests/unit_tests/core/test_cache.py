@@ -0,0 +1,57 @@
+import time
+
+import pytest
+
+from mealie.core.cache import GenerationTTLCache
+
+
+@pytest.fixture
+def cache() -> GenerationTTLCache[str, int]:
+    return GenerationTTLCache(ttl=60, max_size=2)
+
+
+def test_cache_evicts_least_recently_used(cache: GenerationTTLCache[str, int]):
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_cache_expires(cache: GenerationTTLCache[str, int]):
+    cache.ttl = 0.01
+    cache.set("a", 1)
+
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_cache_disabled():
+    cache: GenerationTTLCache[str, int] = GenerationTTLCache(ttl=0, max_size=2)
+    cache.set("a", 1)
+
+    assert not cache.enabled
+    assert cache.get("a") is None
+
+
+def test_cache_ignores_stale_generation(cache: GenerationTTLCache[str, int]):
+    generation = cache.generation
+    cache.invalidate("a")
+    cache.set("a", 1, generation)
+    assert cache.get("a") is None
+
+    cache.set("a", 1, cache.generation)
+    assert cache.get("a") == 1
+
+
+def test_cache_invalidate_where(cache: GenerationTTLCache[str, int]):
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.invalidate_where(lambda _, value: value % 2 == 0)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
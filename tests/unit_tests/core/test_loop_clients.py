@@ -0,0 +1,71 @@
+import asyncio
+import threading
+
+import pytest
+
+from mealie.core.loop_clients import LoopClientPool, close_loop_clients
+
+
+class FakeClient:
+    def __init__(self, **options) -> None:
+        self.options = options
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def _pool() -> LoopClientPool[FakeClient]:
+    return LoopClientPool(FakeClient, close=FakeClient.close, is_closed=lambda c: c.closed)
+
+
+@pytest.mark.asyncio
+async def test_loop_client_pool_shares_clients_per_key():
+    pool = _pool()
+
+    client = pool.get("a", base_url="a")
+    assert pool.get("a", base_url="a") is client
+    assert pool.get("b", base_url="b") is not client
+    assert client.options == {"base_url": "a"}
+
+    await pool.aclose()
+    assert client.closed
+    assert pool.get("a") is not client
+
+
+@pytest.mark.asyncio
+async def test_loop_client_pool_replaces_closed_clients():
+    pool = _pool()
+
+    client = pool.get()
+    await client.close()
+    assert pool.get() is not client
+
+
+@pytest.mark.asyncio
+async def test_loop_client_pool_keeps_clients_per_loop():
+    pool = _pool()
+    client = pool.get()
+
+    other: list[FakeClient] = []
+
+    async def get_and_close() -> None:
+        other.append(pool.get())
+        await pool.aclose()
+
+    thread = threading.Thread(target=lambda: asyncio.new_event_loop().run_until_complete(get_and_close()))
+    thread.start()
+    thread.join()
+
+    assert other[0] is not client
+    assert other[0].closed
+    assert not client.closed
+
+
+@pytest.mark.asyncio
+async def test_close_loop_clients_closes_every_pool():
+    pools = [_pool(), _pool()]
+    clients = [pool.get() for pool in pools]
+
+    await close_loop_clients()
+    assert all(client.closed for client in clients)
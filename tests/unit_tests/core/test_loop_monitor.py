@@ -0,0 +1,46 @@
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from mealie.core.loop_monitor import LoopLagMonitor
+
+
+def _block_the_loop(seconds: float):
+    time.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_loop_monitor_reports_blocking_call():
+    logger = MagicMock()
+    monitor = LoopLagMonitor(threshold_ms=50, logger=logger)
+    task = asyncio.create_task(monitor.run())
+
+    try:
+        await asyncio.sleep(0.05)
+        _block_the_loop(0.3)
+        await asyncio.sleep(0.05)
+    finally:
+        task.cancel()
+
+    messages = [call.args[0] for call in logger.warning.call_args_list]
+    assert any(msg.startswith("Event loop was blocked for") for msg in messages)
+
+    stack_messages = [msg for msg in messages if msg.startswith("Event loop has been blocked")]
+    assert len(stack_messages) == 1
+    assert "_block_the_loop" in stack_messages[0]
+
+
+@pytest.mark.asyncio
+async def test_loop_monitor_quiet_when_idle():
+    logger = MagicMock()
+    monitor = LoopLagMonitor(threshold_ms=200, logger=logger)
+    task = asyncio.create_task(monitor.run())
+
+    try:
+        await asyncio.sleep(0.3)
+    finally:
+        task.cancel()
+
+    logger.warning.assert_not_called()
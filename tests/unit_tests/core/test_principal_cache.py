@@ -0,0 +1,108 @@
+import time
+from datetime import timedelta
+
+import pytest
+
+from mealie.core.dependencies.principal_cache import PrincipalCache, principal_cache
+from mealie.core.security import create_access_token
+from mealie.schema.user.user import CreateToken, PrivateUser
+from tests.utils.factories import random_string
+from tests.utils.fixture_schemas import TestUser
+
+
+@pytest.fixture
+def cache():
+    return PrincipalCache(ttl=60, max_size=2)
+
+
+def _get_user(unique_user: TestUser) -> PrivateUser:
+    user = unique_user.repos.users.get_one(unique_user.user_id)
+    assert user
+    return user
+
+
+def test_principal_cache_get_returns_copy(cache: PrincipalCache, unique_user: TestUser):
+    user = _get_user(unique_user)
+    key = cache.user_key(user.id)
+    cache.set(key, user, cache.generation)
+
+    cached = cache.get(key)
+    assert cached == user
+
+    assert cached
+    cached.full_name = random_string()
+    assert cache.get(key) == user
+
+
+def test_principal_cache_expires(cache: PrincipalCache, unique_user: TestUser):
+    cache.ttl = 0.01
+    user = _get_user(unique_user)
+    key = cache.user_key(user.id)
+    cache.set(key, user, cache.generation)
+
+    time.sleep(0.02)
+    assert cache.get(key) is None
+    assert len(cache) == 0
+
+
+def test_principal_cache_evicts_least_recently_used(cache: PrincipalCache, unique_user: TestUser):
+    user = _get_user(unique_user)
+    keys = [cache.token_key(random_string()) for _ in range(3)]
+
+    cache.set(keys[0], user, cache.generation)
+    cache.set(keys[1], user, cache.generation)
+    cache.get(keys[0])
+    cache.set(keys[2], user, cache.generation)
+
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is not None
+
+
+def test_principal_cache_ignores_stale_generation(cache: PrincipalCache, unique_user: TestUser):
+    user = _get_user(unique_user)
+    key = cache.user_key(user.id)
+
+    generation = cache.generation
+    cache.invalidate_user(user.id)
+    cache.set(key, user, generation)
+
+    assert cache.get(key) is None
+
+
+def test_principal_cache_invalidated_on_user_update(unique_user: TestUser):
+    user = _get_user(unique_user)
+    user_key = principal_cache.user_key(user.id)
+    token_key = principal_cache.token_key(random_string())
+    principal_cache.set(user_key, user, principal_cache.generation)
+    principal_cache.set(token_key, user, principal_cache.generation)
+
+    user.full_name = random_string()
+    unique_user.repos.users.update(user.id, user)
+
+    assert principal_cache.get(user_key) is None
+    assert principal_cache.get(token_key) is None
+
+
+def test_principal_cache_invalidated_on_token_delete(unique_user: TestUser):
+    user = _get_user(unique_user)
+    token = create_access_token({"long_token": True, "id": str(user.id)}, timedelta(days=1))
+    token_in_db = unique_user.repos.api_tokens.create(CreateToken(name=random_string(), token=token, user_id=user.id))
+
+    key = principal_cache.token_key(token)
+    principal_cache.set(key, user, principal_cache.generation)
+    unique_user.repos.api_tokens.delete(token_in_db.id)
+
+    assert principal_cache.get(key) is None
+
+
+def test_principal_cache_cleared_on_household_rename(unique_user: TestUser):
+    user = _get_user(unique_user)
+    key = principal_cache.user_key(user.id)
+    principal_cache.set(key, user, principal_cache.generation)
+
+    household = unique_user.repos.households.get_one(unique_user.household_id)
+    assert household
+    unique_user.repos.households.update(household.id, {**household.model_dump(), "name": random_string()})
+
+    assert principal_cache.get(key) is None
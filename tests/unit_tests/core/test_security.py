@@ -1,8 +1,13 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from pytest import MonkeyPatch
 
 from mealie.core.config import get_app_settings
-from mealie.core.security.hasher import BcryptHasher, FakeHasher, get_hasher
+from mealie.core.security.hasher import BcryptHasher, FakeHasher, HashingPool, get_hasher
+from mealie.core.security.providers.credentials_provider import CredentialsProvider
+from mealie.schema.user.auth import CredentialsRequest
 from tests.utils.factories import random_string
+from tests.utils.fixture_schemas import TestUser
 
 
 def clear_hasher_cache():
@@ -42,3 +47,55 @@ def test_hasher_long_password(monkeypatch: MonkeyPatch):
         assert hasher.verify(password, hashed_password)
     finally:
         clear_hasher_cache()
+
+
+def test_bcrypt_hasher_rounds():
+    hasher = BcryptHasher(rounds=4)
+    hashed_password = hasher.hash("password")
+
+    assert hashed_password.startswith("$2b$04$")
+    assert hasher.verify("password", hashed_password)
+    assert not hasher.needs_rehash(hashed_password)
+
+    assert BcryptHasher(rounds=5).needs_rehash(hashed_password)
+    assert hasher.needs_rehash("not-a-bcrypt-hash")
+
+
+def test_hashing_pool_stats():
+    pool = HashingPool(workers=2)
+    hasher = BcryptHasher(rounds=4, pool=pool)
+
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            hashes = list(executor.map(hasher.hash, [random_string() for _ in range(8)]))
+
+        assert all(hashed.startswith("$2b$04$") for hashed in hashes)
+
+        stats = pool.stats()
+        assert stats.workers == 2
+        assert stats.completed == 8
+        assert stats.queued == 0
+        assert stats.running == 0
+        assert stats.max_wait_ms >= stats.avg_wait_ms >= 0
+    finally:
+        pool.shutdown()
+
+
+def test_login_rehashes_password(monkeypatch: MonkeyPatch, unique_user: TestUser):
+    try:
+        monkeypatch.setenv("TESTING", "0")
+        monkeypatch.setenv("SECURITY_BCRYPT_ROUNDS", "5")
+        clear_hasher_cache()
+
+        db = unique_user.repos
+        password = random_string()
+        db.users.update_password(unique_user.user_id, BcryptHasher(rounds=4).hash(password))
+
+        data = CredentialsRequest(username=unique_user.username, password=password)
+        assert CredentialsProvider(db.session, data).authenticate() is not None
+
+        user = db.users.get_one(unique_user.user_id)
+        assert user.password.startswith("$2b$05$")
+        assert get_hasher().verify(password, user.password)
+    finally:
+        clear_hasher_cache()
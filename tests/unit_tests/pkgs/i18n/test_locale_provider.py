@@ -1,5 +1,8 @@
-from mealie.pkgs.i18n import JsonProvider, ProviderFactory
+import pytest
+
+from mealie.pkgs.i18n import JsonProvider, ProviderFactory, parse_accept_language
 from tests.data import locale_dir
+from tests.utils.factories import random_string
 
 
 def test_json_provider():
@@ -56,33 +59,51 @@ def test_json_provider_nested_keys_not_found():
     assert provider.t("root.tier2") == "root.tier2"
 
 
-def test_locale_provider_defaults():
-    factory = ProviderFactory(locale_dir)
-
-    assert factory.get("en-US") is not None
-    assert factory.get("asdfadsf") is not None
-
-    assert factory._store["en-US"].locks == 1
+def test_json_provider_is_flattened():
+    provider = JsonProvider({"root": {"tier1": {"tier2": "value"}}})
 
-    factory.release("en-US")
+    assert dict(provider.translations) == {"root.tier1.tier2": "value"}
+    assert provider.t("root.tier1") == "root.tier1"
 
-    assert "en-US" not in factory._store
 
-
-def test_locale_providers_store_locks():
+def test_locale_provider_defaults():
     factory = ProviderFactory(locale_dir)
 
-    factory.get("en-US")
-    factory.get("en-US")
-    factory.get("en-US")
+    assert factory.get("en-US") is not None
+    assert factory.get("asdfadsf") is factory.get("en-US")
 
-    assert factory._store["en-US"].locks == 3
 
-    factory.release("en-US")
+def test_locale_provider_store_is_preloaded_and_bounded():
+    factory = ProviderFactory(locale_dir)
+    assert set(factory.providers) == {"af-ZA", "en-US"}
+
+    for accept_language in ["af-ZA", "af", "en-US,en;q=0.9", "de-DE", random_string()]:
+        factory.get(accept_language)
+
+    assert set(factory.providers) == {"af-ZA", "en-US"}
+
+
+@pytest.mark.parametrize(
+    "accept_language, expected",
+    [
+        (None, "en-US"),
+        ("en-US,en;q=0.9,de;q=0.8", "en-US"),
+        ("de-DE,af;q=0.5", "af-ZA"),
+        ("en;q=0.5,af-ZA", "af-ZA"),
+        ("af;q=0, en-GB", "en-US"),
+        ("AF_za", "af-ZA"),
+        ("fr-FR, *;q=0.1", "en-US"),
+    ],
+)
+def test_locale_provider_negotiation(accept_language: str | None, expected: str):
+    factory = ProviderFactory(locale_dir)
 
-    assert factory._store["en-US"].locks == 2
+    assert factory.negotiate(accept_language) == expected
+    assert factory.get(accept_language) is factory.providers[expected]
 
-    factory.release("en-US")
-    factory.release("en-US")
 
-    assert "en-US" not in factory._store
+def test_parse_accept_language():
+    assert parse_accept_language("en-US,en;q=0.9,de;q=0.8") == ["en-US", "en", "de"]
+    assert parse_accept_language("de;q=0.5, fr, en;q=0") == ["fr", "de"]
+    assert parse_accept_language("") == []
+    assert parse_accept_language(None) == []
@@ -0,0 +1,25 @@
+import pytest
+
+from mealie.pkgs.img import SNIFF_LENGTH, sniff_image_extension
+from tests import data as test_data
+
+
+def test_sniff_image_files():
+    assert sniff_image_extension(test_data.images_test_image_1.read_bytes()[:SNIFF_LENGTH]) == ".jpg"
+    assert sniff_image_extension(test_data.images_test_image_2.read_bytes()[:SNIFF_LENGTH]) == ".png"
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (b"RIFF\x00\x00\x00\x00WEBPVP8 ", ".webp"),
+        (b"GIF89a\x01\x00", ".gif"),
+        (b"\x00\x00\x00\x1cftypavif", ".avif"),
+        (b"\x00\x00\x00\x18ftypheic", ".heic"),
+        (b"\x00\x00\x00\x18ftypisom", None),
+        (b"<!DOCTYPE html><html>", None),
+        (b"", None),
+    ],
+)
+def test_sniff_image_headers(header: bytes, expected: str | None):
+    assert sniff_image_extension(header) == expected
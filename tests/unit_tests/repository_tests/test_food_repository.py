@@ -1,7 +1,8 @@
 from uuid import UUID
 
+from mealie.schema.household.group_shopping_list import ShoppingListItemCreate, ShoppingListSave
 from mealie.schema.recipe.recipe import Recipe
-from mealie.schema.recipe.recipe_ingredient import RecipeIngredient, SaveIngredientFood
+from mealie.schema.recipe.recipe_ingredient import CreateIngredientFoodAlias, RecipeIngredient, SaveIngredientFood
 from tests.utils.factories import random_string
 from tests.utils.fixture_schemas import TestUser
 
@@ -50,3 +51,61 @@ def test_food_merger(unique_user: TestUser):
 
     for ingredient in recipe.recipe_ingredient:
         assert ingredient.food.id == food_1.id  # type: ignore
+
+
+def test_food_merge_many(unique_user: TestUser):
+    database = unique_user.repos
+    household = database.households.get_one(unique_user.household_id)
+    assert household
+    label = database.group_multi_purpose_labels.create({"name": random_string(10), "group_id": unique_user.group_id})
+
+    to_food = database.ingredient_foods.create(
+        SaveIngredientFood(name=random_string(10), group_id=unique_user.group_id, extras={"shared": "kept"})
+    )
+    from_foods = [
+        database.ingredient_foods.create(
+            SaveIngredientFood(
+                name=random_string(10),
+                group_id=unique_user.group_id,
+                label_id=label.id if i == 1 else None,
+                aliases=[CreateIngredientFoodAlias(name=random_string(10))],
+                households_with_ingredient_food=[household.slug],
+                extras={"shared": "dropped", f"key-{i}": "moved"},
+            )
+        )
+        for i in range(3)
+    ]
+
+    recipe = database.recipes.create(
+        Recipe(
+            name=random_string(10),
+            user_id=unique_user.user_id,
+            group_id=UUID(unique_user.group_id),
+            recipe_ingredient=[RecipeIngredient(note="", food=food) for food in [to_food, *from_foods]],  # type: ignore
+        )  # type: ignore
+    )
+    shopping_list = database.group_shopping_lists.create(
+        ShoppingListSave(name=random_string(10), group_id=unique_user.group_id, user_id=unique_user.user_id)
+    )
+    item = database.group_shopping_list_item.create(
+        ShoppingListItemCreate(shopping_list_id=shopping_list.id, food_id=from_foods[2].id)
+    )
+
+    merged = database.ingredient_foods.merge_many([food.id for food in from_foods], to_food.id)
+    assert merged
+
+    for food in from_foods:
+        assert database.ingredient_foods.get_one(food.id) is None
+
+    recipe = database.recipes.get_one(recipe.slug)
+    assert recipe
+    assert [ing.food.id for ing in recipe.recipe_ingredient] == [to_food.id] * 4  # type: ignore
+
+    updated_item = database.group_shopping_list_item.get_one(item.id)
+    assert updated_item and updated_item.food_id == to_food.id
+
+    # the merged foods' aliases, label, extras, and on-hand households move to the remaining food
+    assert {alias.name for alias in merged.aliases} == {food.aliases[0].name for food in from_foods}
+    assert merged.label_id == label.id
+    assert merged.extras == {"shared": "kept", "key-0": "moved", "key-1": "moved", "key-2": "moved"}
+    assert merged.households_with_ingredient_food == [household.slug]
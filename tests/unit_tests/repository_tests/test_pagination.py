@@ -429,6 +429,39 @@ def test_pagination_filter_not_in_includes_null(unique_user: TestUser):
     assert recipe_3.id in recipe_results_ids
 
 
+def test_pagination_filter_m2m_shared_path(unique_user: TestUser):
+    db = unique_user.repos
+    tag_1, tag_2 = (db.tags.create(TagSave(group_id=unique_user.group_id, name=random_string(10))) for _ in range(2))
+    recipe_1, recipe_2, recipe_3 = (
+        db.recipes.create(Recipe(user_id=unique_user.user_id, group_id=unique_user.group_id, name=random_string()))
+        for _ in range(3)
+    )
+
+    recipe_1.tags = [tag_1, tag_2]
+    recipe_2.tags = [tag_2]
+    db.recipes.update(recipe_1.slug, recipe_1)
+    db.recipes.update(recipe_2.slug, recipe_2)
+    recipe_ids = {recipe_1.id, recipe_2.id, recipe_3.id}
+
+    def get_ids(query_filter: str) -> set[UUID4]:
+        query = PaginationQuery(page=1, per_page=-1, query_filter=query_filter)
+        results = db.recipes.page_all(query)
+        assert results.total == len(results.items)
+        return {recipe.id for recipe in results.items} & recipe_ids
+
+    # a recipe matching through several tags is still counted once
+    assert get_ids(f"tags.name IN [{tag_1.name}, {tag_2.name}]") == {recipe_1.id, recipe_2.id}
+
+    # criteria on the same path combined with AND must be met by the same tag, as with a join
+    assert get_ids(f'tags.name = "{tag_1.name}" AND tags.name = "{tag_2.name}"') == set()
+    assert get_ids(f'tags.name = "{tag_1.name}" AND tags.slug = "{tag_1.slug}"') == {recipe_1.id}
+    assert get_ids(f'tags.name = "{tag_1.name}" OR tags.name = "{tag_2.name}"') == {recipe_1.id, recipe_2.id}
+
+    # a recipe without tags matches IS NULL, like the NULL row of an outer join
+    assert get_ids("tags.id IS NULL") == {recipe_3.id}
+    assert get_ids("tags.id IS NOT NULL") == {recipe_1.id, recipe_2.id}
+
+
 def test_pagination_filter_in_advanced(unique_user: TestUser):
     database = unique_user.repos
     slug1, slug2 = (random_string(10) for _ in range(2))
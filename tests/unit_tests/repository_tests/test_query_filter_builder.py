@@ -1,3 +1,6 @@
+import sqlalchemy as sa
+
+from mealie.db.models.recipe.recipe import RecipeModel
 from mealie.services.query_filter.builder import (
     LogicalOperator,
     QueryFilterBuilder,
@@ -74,3 +77,29 @@ def test_query_filter_builder_json_uses_raw_value():
             ),
         ]
     )
+
+
+def test_query_filter_builder_shape():
+    builder = QueryFilterBuilder('(tags.name IN ["a", "b"] OR lastMade IS NULL) AND name LIKE "%soup%"')
+    assert builder.shape == "(tags.name IN [?] OR last_made IS NULL) AND name LIKE ?"
+    assert QueryFilterBuilder('(tags.name IN ["c"] OR lastMade IS NULL) AND name LIKE "x"').shape == builder.shape
+
+
+def test_query_filter_builder_relationship_paths():
+    def compile_filter(query_filter: str) -> str:
+        query = QueryFilterBuilder(query_filter).filter_query(sa.select(RecipeModel.id), RecipeModel)
+        return str(query.compile()).upper()
+
+    # to-many relationships are filtered through EXISTS instead of joins that would multiply rows
+    sql = compile_filter('tags.name = "tag1" AND recipe_ingredient.food.name IN ["flour"]')
+    assert "JOIN" not in sql
+    assert sql.count("EXISTS") == 3
+
+    # criteria on the same path combined with AND share one EXISTS
+    sql = compile_filter('tags.name = "tag1" AND tags.slug = "tag-1"')
+    assert sql.count("EXISTS") == 1
+
+    # many-to-one relationships are joined once, however many components use them
+    sql = compile_filter('user.username = "me" OR user.email = "me@example.com"')
+    assert sql.count("JOIN") == 1
+    assert "EXISTS" not in sql
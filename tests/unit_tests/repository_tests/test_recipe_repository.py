@@ -2,13 +2,16 @@ from datetime import UTC, datetime, timedelta
 from uuid import UUID
 
 import pytest
+import sqlalchemy as sa
 from sqlalchemy.orm import Session
 
+from mealie.db.models.recipe.ingredient import RecipeIngredientModel
 from mealie.repos.all_repositories import get_repositories
 from mealie.repos.repository_factory import AllRepositories
+from mealie.repos.repository_recipes import RecipeLink
 from mealie.schema.household.household import HouseholdCreate, HouseholdRecipeCreate
 from mealie.schema.recipe import RecipeIngredient, SaveIngredientFood
-from mealie.schema.recipe.recipe import Recipe
+from mealie.schema.recipe.recipe import Recipe, RecipeSummary
 from mealie.schema.recipe.recipe_category import CategorySave, TagSave
 from mealie.schema.recipe.recipe_tool import RecipeToolSave
 from mealie.schema.response import OrderDirection, PaginationQuery
@@ -429,6 +432,48 @@ def test_recipe_repo_pagination_by_tools(unique_user: TestUser):
     assert not all(i == random_ordered[0] for i in random_ordered)
 
 
+def test_recipe_repo_pagination_matches_recipe(unique_user: TestUser):
+    database = unique_user.repos
+    household = database.households.get_one(unique_user.household_id)
+    category = database.categories.create(CategorySave(group_id=unique_user.group_id, name=random_string()))
+    tags = [database.tags.create(TagSave(group_id=unique_user.group_id, name=random_string())) for _ in range(2)]
+    tool = database.tools.create(
+        RecipeToolSave(group_id=unique_user.group_id, name=random_string(), households_with_tool=[household.slug])
+    )
+
+    created = [
+        database.recipes.create(
+            Recipe(
+                user_id=unique_user.user_id,
+                group_id=unique_user.group_id,
+                name=random_string(),
+                description=random_string(),
+                recipe_yield="2 loaves",
+                recipe_category=[category] if i % 2 else [],
+                tags=tags[: i % 3],
+                tools=[tool] if i % 2 else [],
+            )
+        )
+        for i in range(6)
+    ]
+
+    query = PaginationQuery(page=1, per_page=-1, order_by="name", order_direction=OrderDirection.asc)
+    created_ids = {recipe.id for recipe in created}
+    summaries = [summary for summary in database.recipes.page_all(query).items if summary.id in created_ids]
+    assert [summary.id for summary in summaries] == [recipe.id for recipe in sorted(created, key=lambda r: r.name)]
+
+    for summary in summaries:
+        recipe = database.recipes.get_one(summary.id, "id")
+        assert recipe
+        expected = RecipeSummary.model_validate(recipe.model_dump()).model_dump()
+        actual = summary.model_dump()
+        for organizers in ("recipe_category", "tags", "tools"):
+            expected[organizers].sort(key=lambda organizer: organizer["name"])
+            actual[organizers].sort(key=lambda organizer: organizer["name"])
+
+        assert actual == expected
+
+
 def test_recipe_repo_pagination_by_foods(unique_user: TestUser):
     database = unique_user.repos
     slug1, slug2 = (random_string(10) for _ in range(2))
@@ -769,3 +814,51 @@ def test_order_by_rating(user_tuple: tuple[TestUser, TestUser]):
     assert data[0].slug == recipe_2.slug  # global rating == 2.5 (avg of 4 and 1)
     assert data[1].slug == recipe_3.slug  # global rating == 3
     assert data[2].slug == recipe_1.slug  # global rating == 4.25 (avg of 5 and 3.5)
+
+
+def test_recipe_links_and_flattened_ingredients(unique_user: TestUser):
+    database = unique_user.repos
+    food = database.ingredient_foods.create(SaveIngredientFood(name=random_string(), group_id=unique_user.group_id))
+
+    def create_recipe(*ingredients: RecipeIngredient) -> Recipe:
+        return database.recipes.create(
+            Recipe(
+                user_id=unique_user.user_id,
+                group_id=unique_user.group_id,
+                name=random_string(),
+                recipe_ingredient=list(ingredients),
+            )
+        )
+
+    recipe_c = create_recipe(RecipeIngredient(quantity=1, food=food))
+    recipe_b = create_recipe(RecipeIngredient(quantity=2, referenced_recipe=recipe_c), RecipeIngredient(note="salt"))
+    recipe_a = create_recipe(RecipeIngredient(quantity=3, referenced_recipe=recipe_b))
+    unrelated = create_recipe(RecipeIngredient(food=food))
+
+    links = database.recipes.get_recipe_links([recipe_a.id])
+    assert set(links) == {
+        RecipeLink(recipe_a.id, recipe_b.id, 3),
+        RecipeLink(recipe_b.id, recipe_c.id, 2),
+    }
+    assert database.recipes.get_recipe_links([recipe_c.id, unrelated.id]) == []
+
+    ingredients = database.recipes.get_flattened_ingredient_projections([recipe_a.id])
+    assert ingredients.keys() == {recipe_a.id, recipe_b.id, recipe_c.id}
+    assert [ingredient.note for ingredient in ingredients[recipe_b.id]] == ["", "salt"]
+    assert ingredients[recipe_c.id][0].food_id == food.id
+
+    # links that form a cycle are each returned once, rather than followed forever
+    session = database.session
+    stmt = sa.update(RecipeIngredientModel).where(RecipeIngredientModel.recipe_id == recipe_c.id)
+    session.execute(stmt.values(referenced_recipe_id=recipe_a.id))
+    session.commit()
+    try:
+        links = database.recipes.get_recipe_links([recipe_b.id])
+        assert {(link.recipe_id, link.referenced_recipe_id) for link in links} == {
+            (recipe_a.id, recipe_b.id),
+            (recipe_b.id, recipe_c.id),
+            (recipe_c.id, recipe_a.id),
+        }
+    finally:
+        session.execute(stmt.values(referenced_recipe_id=None))
+        session.commit()
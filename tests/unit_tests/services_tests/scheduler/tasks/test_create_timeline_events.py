@@ -251,3 +251,37 @@ def test_preserve_future_made_date(api_client: TestClient, unique_user: TestUser
     response = api_client.get(api_routes.households_self_recipes_recipe_slug(recipe.slug), headers=h2_user.token)
     household_recipe = HouseholdRecipeSummary.model_validate(response.json())
     assert household_recipe.last_made is None
+
+
+def test_mealplan_event_stats(api_client: TestClient, unique_user: TestUser):
+    recipe_name = random_string(length=25)
+    response = api_client.post(api_routes.recipes, json={"name": recipe_name}, headers=unique_user.token)
+    assert response.status_code == 201
+
+    response = api_client.get(api_routes.recipes_slug(recipe_name), headers=unique_user.token)
+    recipe = RecipeSummary.model_validate(response.json())
+
+    # clear out any events from other tests
+    create_mealplan_timeline_events()
+
+    for entry_type in ["breakfast", "side"]:
+        new_plan = {"date": datetime.now(UTC).date().isoformat(), "entryType": entry_type, "recipeId": str(recipe.id)}
+        response = api_client.post(api_routes.households_mealplans, json=new_plan, headers=unique_user.token)
+        assert response.status_code == 201
+
+    stats = create_mealplan_timeline_events()
+    assert stats.events_created == 2
+    assert stats.recipes_updated == 1
+    assert stats.total_ms >= 0
+
+    params = {"page": "1", "perPage": "-1", "queryFilter": f"recipe_id={recipe.id}"}
+    response = api_client.get(api_routes.recipes_timeline_events, headers=unique_user.token, params=params)
+    subjects = {event["subject"] for event in response.json()["items"]}
+    assert subjects >= {
+        f"{unique_user.full_name} made this for breakfast",
+        f"{unique_user.full_name} made this as a side",
+    }
+
+    stats = create_mealplan_timeline_events()
+    assert stats.events_created == 0
+    assert stats.recipes_updated == 0
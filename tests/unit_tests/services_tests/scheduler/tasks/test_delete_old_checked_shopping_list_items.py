@@ -1,6 +1,8 @@
 from datetime import UTC, datetime
 
 from mealie.schema.household.group_shopping_list import ShoppingListItemCreate, ShoppingListItemOut, ShoppingListSave
+from mealie.schema.household.household_preferences import UpdateHouseholdPreferences
+from mealie.services.household_services.shopping_lists import ShoppingListService
 from mealie.services.scheduler.tasks.delete_old_checked_shopping_list_items import (
     MAX_CHECKED_ITEMS,
     delete_old_checked_list_items,
@@ -103,3 +105,54 @@ def test_no_cleanup(unique_user: TestUser):
     assert len(shopping_list.list_items) == len(unchecked_items) + len(checked_items)
     for item in unchecked_items + checked_items:
         assert item in shopping_list.list_items
+
+
+def test_cleanup_uses_household_limit(unique_user: TestUser):
+    database = unique_user.repos
+    list_repo = database.group_shopping_lists
+    list_item_repo = database.group_shopping_list_item
+
+    preferences = database.household_preferences.get_one(unique_user.household_id)
+    assert preferences
+    preferences.shopping_list_max_checked_items = max_checked_items = random_int(2, 5)
+    database.household_preferences.update(unique_user.household_id, preferences.cast(UpdateHouseholdPreferences))
+
+    shopping_lists = [
+        list_repo.create(
+            ShoppingListSave(name=random_string(), group_id=unique_user.group_id, user_id=unique_user.user_id)
+        )
+        for _ in range(2)
+    ]
+
+    checked_items: dict[str, list[ShoppingListItemOut]] = {}
+    revisions: dict[str, int] = {}
+    for shopping_list in shopping_lists:
+        items: list[ShoppingListItemOut] = []
+        for _ in range(max_checked_items + random_int(1, 5)):
+            new_item = list_item_repo.create(
+                ShoppingListItemCreate(note=random_string(), shopping_list_id=shopping_list.id)
+            )
+            new_item.checked = True
+            items.append(list_item_repo.update(new_item.id, new_item))
+
+        items.sort(key=lambda x: x.updated_at or datetime.now(UTC), reverse=True)
+        checked_items[str(shopping_list.id)] = items
+        revisions[str(shopping_list.id)] = list_repo.get_one(shopping_list.id).revision  # type: ignore
+
+    # a small batch size makes sure lists are trimmed across several batches
+    stats = delete_old_checked_list_items(batch_size=2)
+    database.session.commit()
+
+    expected_deleted = sum(len(items) - max_checked_items for items in checked_items.values())
+    assert stats.items_deleted >= expected_deleted
+    assert stats.lists_trimmed >= len(shopping_lists)
+
+    for shopping_list_id, items in checked_items.items():
+        shopping_list = list_repo.get_one(shopping_list_id)
+        assert shopping_list
+        assert {item.id for item in shopping_list.list_items} == {item.id for item in items[:max_checked_items]}
+
+        # clients syncing the list see the deletions
+        changes = ShoppingListService(database).get_changes(shopping_list.id, revisions[shopping_list_id])
+        assert changes
+        assert set(changes.deleted_item_ids) == {item.id for item in items[max_checked_items:]}
@@ -0,0 +1,64 @@
+from datetime import UTC, datetime, timedelta
+
+import sqlalchemy as sa
+
+from mealie.db.models.household.shopping_list import ShoppingListItemChange
+from mealie.schema.household.group_shopping_list import ShoppingListItemCreate, ShoppingListSave
+from mealie.services.household_services.shopping_lists import ShoppingListService
+from mealie.services.scheduler.tasks.purge_shopping_list_item_changes import (
+    MAX_DAYS_OLD,
+    purge_shopping_list_item_changes,
+)
+from tests.utils.factories import random_string
+from tests.utils.fixture_schemas import TestUser
+
+
+def test_no_expired_changes():
+    # make sure this task runs successfully even if there is nothing to purge
+    purge_shopping_list_item_changes()
+
+
+def test_purge_deleted_item_changes(unique_user: TestUser):
+    database = unique_user.repos
+    list_repo = database.group_shopping_lists
+    list_item_repo = database.group_shopping_list_item
+
+    shopping_list = list_repo.create(
+        ShoppingListSave(name=random_string(), group_id=unique_user.group_id, user_id=unique_user.user_id)
+    )
+    kept_item, deleted_item = list_item_repo.create_many(
+        [ShoppingListItemCreate(note=random_string(), shopping_list_id=shopping_list.id) for _ in range(2)]
+    )
+    revision_before_delete = list_repo.get_revision(shopping_list.id)
+    assert revision_before_delete
+
+    list_item_repo.delete(deleted_item.id)
+    revision = list_repo.get_revision(shopping_list.id)
+    assert revision
+
+    # age every change past the retention window
+    database.session.execute(
+        sa.update(ShoppingListItemChange)
+        .where(ShoppingListItemChange.shopping_list_id == shopping_list.id)
+        .values(update_at=datetime.now(UTC) - timedelta(days=MAX_DAYS_OLD + 1))
+    )
+    database.session.commit()
+
+    purge_shopping_list_item_changes()
+    database.session.expire_all()
+
+    # only the deleted item's change is purged
+    item_ids = {change.item_id for change in list_repo.get_item_changes(shopping_list.id, 0)}
+    assert item_ids == {kept_item.id}
+
+    service = ShoppingListService(database)
+    changes = service.get_changes(shopping_list.id, revision_before_delete)
+    assert changes and changes.full_resync
+    assert changes.revision == revision
+
+    changes = service.get_changes(shopping_list.id, 0)
+    assert changes and not changes.full_resync
+    assert [item.id for item in changes.created_items] == [kept_item.id]
+
+    changes = service.get_changes(shopping_list.id, revision)
+    assert changes and not changes.full_resync
@@ -0,0 +1,201 @@
+import asyncio
+import threading
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from mealie.lang.providers import get_locale_provider
+from mealie.schema.recipe.recipe import CreateRecipeBulk, CreateRecipeByUrlBulk, Recipe
+from mealie.schema.recipe.recipe_bulk_import import BulkImportItemStatus, BulkImportJobStatus
+from mealie.schema.reports.reports import ReportSummaryStatus
+from mealie.services.recipe.recipe_service import RecipeService
+from mealie.services.scraper import recipe_bulk_scraper
+from mealie.services.scraper.recipe_bulk_scraper import RecipeBulkScraperService
+from mealie.services.scraper.recipe_scraper import RecipeScraper
+from tests.utils.factories import random_string
+from tests.utils.fixture_schemas import TestUser
+
+
+def _get_bulk_scraper(unique_user: TestUser) -> RecipeBulkScraperService:
+    repos = unique_user.repos
+    translator = get_locale_provider()
+
+    user = repos.users.get_one(unique_user.user_id)
+    household = repos.households.get_one(unique_user.household_id)
+    group = repos.groups.get_one(unique_user.group_id)
+    assert user and household and group
+
+    service = RecipeService(repos, user, household, translator)
+    return RecipeBulkScraperService(service, repos, group, translator)
+
+
+@pytest.fixture
+def mock_scraper(monkeypatch: pytest.MonkeyPatch):
+    async def safe_scrape_html(url: str) -> str:
+        return f"<html>{url}</html>"
+
+    async def scrape(self, url: str, html: str | None = None):
+        if "broken" in url:
+            return None, None
+        return Recipe(name=random_string(), org_url=url), None
+
+    monkeypatch.setattr(recipe_bulk_scraper, "safe_scrape_html", safe_scrape_html)
+    monkeypatch.setattr(RecipeScraper, "scrape", scrape)
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_pipeline(unique_user: TestUser, mock_scraper):
+    already_imported = f"https://{random_string()}.com/recipe"
+    unique_user.repos.recipes.create(
+        Recipe(
+            name=random_string(),
+            org_url=already_imported,
+            user_id=unique_user.user_id,
+            group_id=unique_user.group_id,
+            household_id=unique_user.household_id,
+        )
+    )
+
+    new_url = f"https://{random_string()}.com/recipe"
+    broken_url = f"https://{random_string()}.com/broken"
+    bulk_scraper = _get_bulk_scraper(unique_user)
+    job_id = bulk_scraper.create_job(
+        CreateRecipeByUrlBulk(
+            imports=[
+                CreateRecipeBulk(url=new_url),
+                CreateRecipeBulk(url=new_url),
+                CreateRecipeBulk(url=already_imported),
+                CreateRecipeBulk(url=broken_url),
+            ]
+        )
+    )
+    await bulk_scraper.run(job_id)
+
+    jobs_repo = unique_user.repos.bulk_import_jobs
+    job = jobs_repo.get_one(job_id)
+    assert job and job.status == BulkImportJobStatus.complete
+    assert jobs_repo.count_item_statuses(job_id) == {
+        BulkImportItemStatus.success: 1,
+        BulkImportItemStatus.duplicate: 2,
+        BulkImportItemStatus.failure: 1,
+    }
+
+    report = unique_user.repos.group_reports.get_one(bulk_scraper.report.id)
+    assert report and report.status == ReportSummaryStatus.partial
+    assert len(report.entries) == 4
+
+    assert jobs_repo.get_imported_urls([new_url, broken_url]) == {new_url}
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_resumes_image_stage(unique_user: TestUser, mock_scraper, monkeypatch: pytest.MonkeyPatch):
+    scraped_images: list[str] = []
+
+    async def scrape_image(self, image_url, record=True):
+        scraped_images.append(image_url)
+
+    monkeypatch.setattr(recipe_bulk_scraper.RecipeDataService, "scrape_image", scrape_image)
+
+    recipe = unique_user.repos.recipes.create(
+        Recipe(
+            name=random_string(),
+            user_id=unique_user.user_id,
+            group_id=unique_user.group_id,
+            household_id=unique_user.household_id,
+        )
+    )
+    bulk_scraper = _get_bulk_scraper(unique_user)
+    job_id = bulk_scraper.create_job(
+        CreateRecipeByUrlBulk(imports=[CreateRecipeBulk(url=f"https://{random_string()}.com/recipe")])
+    )
+
+    # simulate a restart after the recipe was saved, but before its image was downloaded
+    jobs_repo = unique_user.repos.bulk_import_jobs
+    [item] = jobs_repo.get_items(job_id, [BulkImportItemStatus.pending])
+    image_url = f"https://{random_string()}.com/image.jpg"
+    jobs_repo.set_item_status(item.id, BulkImportItemStatus.persisted, recipe_id=recipe.id, image_url=image_url)
+
+    await bulk_scraper.run(job_id)
+
+    assert scraped_images == [image_url]
+    assert jobs_repo.count_item_statuses(job_id) == {BulkImportItemStatus.success: 1}
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_survives_failure_bookkeeping_errors(
+    unique_user: TestUser, mock_scraper, monkeypatch: pytest.MonkeyPatch
+):
+    def fail(self, ctx, message, e=None):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(RecipeBulkScraperService, "_fail", fail)
+
+    new_url = f"https://{random_string()}.com/recipe"
+    bulk_scraper = _get_bulk_scraper(unique_user)
+
+    # with a single parser, a worker which dies on the broken url would leave the new one stuck in its queue
+    monkeypatch.setattr(bulk_scraper.settings, "BULK_IMPORT_PARSE_WORKERS", 1)
+    job_id = bulk_scraper.create_job(
+        CreateRecipeByUrlBulk(
+            imports=[
+                CreateRecipeBulk(url=f"https://{random_string()}.com/broken"),
+                CreateRecipeBulk(url=new_url),
+            ]
+        )
+    )
+    await asyncio.wait_for(bulk_scraper.run(job_id), timeout=30)
+
+    jobs_repo = unique_user.repos.bulk_import_jobs
+    job = jobs_repo.get_one(job_id)
+    assert job and job.status == BulkImportJobStatus.complete
+    assert jobs_repo.get_imported_urls([new_url]) == {new_url}
+
+
+def test_bulk_import_job_lease(unique_user: TestUser):
+    bulk_scraper = _get_bulk_scraper(unique_user)
+    job_id = bulk_scraper.create_job(
+        CreateRecipeByUrlBulk(imports=[CreateRecipeBulk(url=f"https://{random_string()}.com/recipe")])
+    )
+
+    jobs_repo = unique_user.repos.bulk_import_jobs
+    lease_expires_before = datetime.now(UTC) - timedelta(minutes=5)
+    try:
+        assert job_id in {job.id for job in jobs_repo.get_claimable(lease_expires_before)}
+        assert jobs_repo.claim(job_id, "runner-1", lease_expires_before)
+
+        # the lease is current, so neither another worker nor a restarted one can take the job
+        assert job_id not in {job.id for job in jobs_repo.get_claimable(lease_expires_before)}
+        assert not jobs_repo.claim(job_id, "runner-2", lease_expires_before)
+        assert jobs_repo.renew_lease(job_id, "runner-1")
+
+        # once the lease lapses the job is taken over, and the previous runner can't renew it
+        assert jobs_repo.claim(job_id, "runner-2", datetime.now(UTC) + timedelta(seconds=1))
+        assert not jobs_repo.renew_lease(job_id, "runner-1")
+        assert jobs_repo.renew_lease(job_id, "runner-2")
+    finally:
+        jobs_repo.complete(job_id)
+
+    assert not jobs_repo.claim(job_id, "runner-3", datetime.now(UTC) + timedelta(seconds=1))
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_runs_database_work_off_the_event_loop(
+    unique_user: TestUser, mock_scraper, monkeypatch: pytest.MonkeyPatch
+):
+    threads: set[int] = set()
+    create_one = RecipeService.create_one
+
+    def record_thread(self, create_data):
+        threads.add(threading.get_ident())
+        return create_one(self, create_data)
+
+    monkeypatch.setattr(RecipeService, "create_one", record_thread)
+
+    bulk_scraper = _get_bulk_scraper(unique_user)
+    job_id = bulk_scraper.create_job(
+        CreateRecipeByUrlBulk(imports=[CreateRecipeBulk(url=f"https://{random_string()}.com/recipe")])
+    )
+    await bulk_scraper.run(job_id)
+
+    assert threads and threading.get_ident() not in threads
+    assert unique_user.repos.bulk_import_jobs.count_item_statuses(job_id) == {BulkImportItemStatus.success: 1}
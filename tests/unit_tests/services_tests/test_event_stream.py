@@ -0,0 +1,94 @@
+import asyncio
+import json
+from uuid import uuid4
+
+import pytest
+
+from mealie.schema.user.user import DEFAULT_INTEGRATION_ID
+from mealie.services.event_bus_service.event_bus_service import EventBusService
+from mealie.services.event_bus_service.event_stream import RESYNC_MESSAGE, EventStreamBroker, event_stream_broker
+from mealie.services.event_bus_service.event_types import (
+    Event,
+    EventBusMessage,
+    EventOperation,
+    EventShoppingListData,
+    EventTypes,
+)
+
+
+def _event() -> Event:
+    return Event(
+        message=EventBusMessage.from_type(EventTypes.shopping_list_updated),
+        event_type=EventTypes.shopping_list_updated,
+        integration_id=DEFAULT_INTEGRATION_ID,
+        document_data=EventShoppingListData(operation=EventOperation.update, shopping_list_id=uuid4()),
+    )
+
+
+def _parse(message: str) -> dict[str, str]:
+    return dict(line.split(": ", 1) for line in message.strip().splitlines())
+
+
+@pytest.mark.asyncio
+async def test_event_stream_receives_household_events():
+    broker = EventStreamBroker(queue_size=10)
+    group_id, household_id = uuid4(), uuid4()
+
+    stream = broker.stream(group_id, household_id)
+    assert (await anext(stream)).startswith("retry:")
+
+    event = _event()
+    other_household = broker.channel(group_id, uuid4())
+    # events are published from worker threads, not the event loop
+    await asyncio.to_thread(broker.publish, event, [other_household, broker.channel(group_id, household_id)])
+
+    message = _parse(await asyncio.wait_for(anext(stream), 1))
+    assert message["id"] == str(event.event_id)
+    assert message["event"] == "shopping_list_updated"
+    assert json.loads(message["data"])["documentData"]["shoppingListId"] == str(event.document_data.shopping_list_id)
+
+    await stream.aclose()
+    assert not broker.is_listening(broker.channel(group_id, household_id))
+
+
+@pytest.mark.asyncio
+async def test_event_stream_slow_client_is_told_to_resync():
+    broker = EventStreamBroker(queue_size=3)
+    group_id, household_id = uuid4(), uuid4()
+    channel = broker.channel(group_id, household_id)
+
+    stream = broker.stream(group_id, household_id)
+    await anext(stream)
+
+    events = [_event() for _ in range(5)]
+    for event in events:
+        broker.publish(event, [channel])
+    await asyncio.sleep(0)
+
+    # the backlog is replaced by a single resync, and events after the overflow are delivered after it
+    assert await anext(stream) == RESYNC_MESSAGE
+    assert _parse(await asyncio.wait_for(anext(stream), 1))["id"] == str(events[-1].event_id)
+
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_event_bus_dispatches_to_event_stream():
+    group_id, household_id = uuid4(), uuid4()
+    stream = event_stream_broker.stream(group_id, household_id)
+    await anext(stream)
+
+    try:
+        await asyncio.to_thread(
+            EventBusService().dispatch,
+            integration_id=DEFAULT_INTEGRATION_ID,
+            group_id=group_id,
+            household_id=household_id,
+            event_type=EventTypes.shopping_list_updated,
+            document_data=EventShoppingListData(operation=EventOperation.update, shopping_list_id=uuid4()),
+        )
+
+        message = _parse(await asyncio.wait_for(anext(stream), 1))
+        assert message["event"] == "shopping_list_updated"
+    finally:
+        await stream.aclose()
@@ -0,0 +1,68 @@
+from uuid import uuid4
+
+from mealie.services.group_services.ingredient_duplicates import (
+    DuplicateCandidate,
+    canonical_name,
+    find_duplicate_clusters,
+)
+
+
+def _clustered_names(candidates: list[DuplicateCandidate], threshold: float = 85) -> list[set[str]]:
+    return [
+        {candidates[i].names[0] for i in cluster.members} for cluster in find_duplicate_clusters(candidates, threshold)
+    ]
+
+
+def test_canonical_name():
+    assert canonical_name("tomatoes, diced") == canonical_name("diced tomato")
+    assert canonical_name("berries") == "berry"
+    assert canonical_name("peaches") == "peach"
+    assert canonical_name("asparagus") == "asparagus"
+    assert canonical_name("") == ""
+
+
+def test_find_duplicate_clusters():
+    candidates = [
+        DuplicateCandidate(id=uuid4(), names=[name])
+        for name in ["tomato", "tomatoes", "diced tomato", "tomatoes, diced", "tomatoe", "garlic", "onion"]
+    ]
+
+    clusters = _clustered_names(candidates)
+    assert {"tomato", "tomatoes", "tomatoe"} in clusters
+    assert {"diced tomato", "tomatoes, diced"} in clusters
+    assert all("garlic" not in cluster and "onion" not in cluster for cluster in clusters)
+
+    # exact matches rank ahead of fuzzy ones
+    assert clusters[0] == {"diced tomato", "tomatoes, diced"}
+
+
+def test_find_duplicate_clusters_respects_threshold():
+    candidates = [DuplicateCandidate(id=uuid4(), names=[name]) for name in ["tablespoon", "teaspoon"]]
+
+    assert _clustered_names(candidates, threshold=90) == []
+    assert _clustered_names(candidates, threshold=50) == [{"tablespoon", "teaspoon"}]
+
+
+def test_find_duplicate_clusters_abbreviations():
+    candidates = [
+        DuplicateCandidate(id=uuid4(), names=["cup"], abbreviations={"c"}),
+        DuplicateCandidate(id=uuid4(), names=["cups"], abbreviations={"c"}),
+        # a shared abbreviation alone isn't a match
+        DuplicateCandidate(id=uuid4(), names=["pinch"], abbreviations={"p"}),
+        DuplicateCandidate(id=uuid4(), names=["pound"], abbreviations={"p"}),
+        DuplicateCandidate(id=uuid4(), names=["tablespoon"], abbreviations={"tbsp"}),
+        DuplicateCandidate(id=uuid4(), names=["tbsp"]),
+    ]
+
+    assert _clustered_names(candidates) == [{"cup", "cups"}]
+
+
+def test_find_duplicate_clusters_case_sensitive_abbreviations():
+    # "T" and "t" are different units, even when their names are close enough to match
+    candidates = [
+        DuplicateCandidate(id=uuid4(), names=["tablespoon"], abbreviations={"T", "tbsp"}),
+        DuplicateCandidate(id=uuid4(), names=["teaspoon"], abbreviations={"t", "tsp"}),
+        DuplicateCandidate(id=uuid4(), names=["tablespoons"], abbreviations={"T"}),
+    ]
+
+    assert _clustered_names(candidates, threshold=50) == [{"tablespoon", "tablespoons"}]
@@ -1,7 +1,18 @@
+import asyncio
+import base64
+import itertools
+import time
+from io import BytesIO
+from unittest.mock import MagicMock
+
 import pytest
+from PIL import Image
 
 import mealie.services.openai.openai as openai_module
-from mealie.services.openai.openai import OpenAIService
+from mealie.schema.openai.general import OpenAIText
+from mealie.services.openai.openai import OpenAILocalImage, OpenAIService
+from mealie.services.openai.request_limiter import OpenAIRequestLimiter
+from mealie.services.openai.response_cache import OpenAIResponseCache
 
 
 class _SettingsStub:
@@ -75,3 +86,131 @@ def test_get_prompt_raises_when_no_files(settings_stub, monkeypatch):
     with pytest.raises(OSError) as ei:
         svc.get_prompt("recipes.parse-recipe-ingredients")
     assert "Unable to load prompt" in str(ei.value)
+
+
+def test_get_prompt_reloads_changed_files(settings_stub, tmp_path):
+    svc = OpenAIService()
+    default_prompt = OpenAIService.PROMPTS_DIR / "recipes" / "parse-recipe-ingredients.txt"
+    assert svc.get_prompt("recipes.parse-recipe-ingredients") == "DEFAULT PROMPT"
+
+    default_prompt.write_text("UPDATED DEFAULT PROMPT")
+    assert svc.get_prompt("recipes.parse-recipe-ingredients") == "UPDATED DEFAULT PROMPT"
+
+    # a custom prompt created after the default was cached takes over
+    custom_dir = tmp_path / "custom"
+    settings_stub.OPENAI_CUSTOM_PROMPT_DIR = str(custom_dir)
+    svc = OpenAIService()
+    assert svc.get_prompt("recipes.parse-recipe-ingredients") == "UPDATED DEFAULT PROMPT"
+
+    (custom_dir / "recipes").mkdir(parents=True)
+    (custom_dir / "recipes" / "parse-recipe-ingredients.txt").write_text("CUSTOM PROMPT")
+    assert svc.get_prompt("recipes.parse-recipe-ingredients") == "CUSTOM PROMPT"
+
+
+def test_get_prompt_reads_unchanged_files_once(settings_stub, monkeypatch):
+    svc = OpenAIService()
+    assert svc.get_prompt("recipes.parse-recipe-ingredients") == "DEFAULT PROMPT"
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("prompt was read again")
+
+    monkeypatch.setattr(OpenAIService, "_read_prompt_file", _fail)
+    assert svc.get_prompt("recipes.parse-recipe-ingredients") == "DEFAULT PROMPT"
+
+
+def test_get_client_is_reused(settings_stub):
+    async def get_clients():
+        return OpenAIService().get_client(), OpenAIService().get_client()
+
+    loop = asyncio.new_event_loop()
+    other_loop = asyncio.new_event_loop()
+    try:
+        first, second = loop.run_until_complete(get_clients())
+        assert first is second
+        assert loop.run_until_complete(get_clients())[0] is first
+
+        # clients are bound to their event loop, so another loop gets its own
+        assert other_loop.run_until_complete(get_clients())[0] is not first
+    finally:
+        loop.close()
+        other_loop.close()
+
+
+@pytest.mark.asyncio
+async def test_get_response_reuses_cached_response(settings_stub, monkeypatch):
+    monkeypatch.setattr(openai_module, "openai_response_cache", OpenAIResponseCache(ttl=60, max_size=10))
+    calls: list[list[dict]] = []
+
+    async def mock_get_raw_response(self, prompt: str, content: list[dict], response_schema) -> MagicMock:
+        calls.append(content)
+        response = MagicMock()
+        response.choices = [MagicMock()]
+        response.choices[0].message.content = OpenAIText(text=f"response {len(calls)}").model_dump_json()
+        return response
+
+    monkeypatch.setattr(OpenAIService, "_get_raw_response", mock_get_raw_response)
+
+    svc = OpenAIService()
+    responses = [
+        await svc.get_response("prompt", "message", response_schema=OpenAIText),
+        await svc.get_response("prompt", "message", response_schema=OpenAIText),
+        await svc.get_response("prompt", "other message", response_schema=OpenAIText),
+        await svc.get_response("prompt", "message", response_schema=OpenAIText, use_cache=False),
+    ]
+    assert [r.text for r in responses if r] == ["response 1", "response 1", "response 2", "response 3"]
+    assert len(calls) == 3
+
+
+def test_local_image_is_downscaled_in_memory(tmp_path):
+    path = tmp_path / "photo.png"
+    exif = Image.Exif()
+    exif[0x0112] = 6  # stored sideways, displayed rotated 90 degrees
+    Image.new("RGBA", (4032, 3024), (200, 100, 50, 255)).save(path, exif=exif)
+
+    url = OpenAILocalImage(filename=path.name, path=path).get_image_url()
+    assert url.startswith("data:image/jpeg;base64,")
+
+    with Image.open(BytesIO(base64.b64decode(url.removeprefix("data:image/jpeg;base64,")))) as image:
+        assert image.format == "JPEG"
+        assert image.size == (768, 1024)
+
+    # nothing is written next to the upload
+    assert [p.name for p in tmp_path.iterdir()] == ["photo.png"]
+
+    small_path = tmp_path / "small.jpg"
+    Image.new("RGB", (300, 200)).save(small_path)
+    url = OpenAILocalImage(filename=small_path.name, path=small_path).get_image_url()
+    with Image.open(BytesIO(base64.b64decode(url.removeprefix("data:image/jpeg;base64,")))) as image:
+        assert image.size == (300, 200)
+
+
+@pytest.mark.asyncio
+async def test_request_limiter_bounds_concurrency():
+    limiter = OpenAIRequestLimiter(max_concurrent=2, requests_per_minute=0)
+    in_flight = 0
+    most_in_flight = 0
+
+    async def request():
+        nonlocal in_flight, most_in_flight
+        async with limiter.slot():
+            in_flight += 1
+            most_in_flight = max(most_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    await asyncio.gather(*(request() for _ in range(6)))
+    assert most_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_request_limiter_spaces_out_requests():
+    limiter = OpenAIRequestLimiter(max_concurrent=0, requests_per_minute=1200)
+    starts: list[float] = []
+
+    async def request():
+        async with limiter.slot():
+            starts.append(time.monotonic())
+
+    await asyncio.gather(*(request() for _ in range(4)))
+    gaps = [b - a for a, b in itertools.pairwise(starts)]
+    assert all(gap >= 0.045 for gap in gaps)
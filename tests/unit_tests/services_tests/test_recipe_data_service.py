@@ -0,0 +1,106 @@
+import tempfile
+from pathlib import Path
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from mealie.schema.recipe.recipe import Recipe
+from mealie.services.recipe import recipe_data_service
+from mealie.services.recipe.recipe_data_service import ImageTooLargeError, NotAnImageError, RecipeDataService
+from tests import data as test_data
+from tests.utils.factories import random_string
+from tests.utils.fixture_schemas import TestUser
+
+
+def _client(content: bytes, content_type: str = "image/jpeg") -> httpx.AsyncClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=content, headers={"content-type": content_type})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_download_image_sniffs_format():
+    service = RecipeDataService(uuid4())
+    content = test_data.images_test_image_2.read_bytes()
+
+    # the content type header is ignored in favor of the actual image bytes
+    async with _client(content, content_type="application/octet-stream") as client:
+        download = await service._download_image(client, "https://example.com/image.jpg", {})
+
+    assert download is not None
+    path, ext = download
+    assert ext == ".png"
+    assert path.read_bytes() == content
+    path.unlink()
+
+
+@pytest.mark.asyncio
+async def test_download_image_rejects_non_images(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    service = RecipeDataService(uuid4())
+
+    async with _client(b"<html><body>not an image</body></html>", content_type="image/jpeg") as client:
+        with pytest.raises(NotAnImageError):
+            await service._download_image(client, "https://example.com/image.jpg", {})
+
+    assert not list(tmp_path.glob("*.download"))
+
+
+@pytest.mark.asyncio
+async def test_download_image_size_cap(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    service = RecipeDataService(uuid4())
+    content = test_data.images_test_image_1.read_bytes()
+    monkeypatch.setattr(recipe_data_service, "MAX_IMAGE_SIZE", len(content) - 1)
+
+    async with _client(content) as client:
+        with pytest.raises(ImageTooLargeError):
+            await service._download_image(client, "https://example.com/image.jpg", {})
+
+    assert not list(tmp_path.glob("*.download"))
+
+
+@pytest.mark.asyncio
+async def test_scrape_image_records_storage_once(monkeypatch: pytest.MonkeyPatch):
+    service = RecipeDataService(uuid4())
+    content = test_data.images_test_image_2.read_bytes()
+
+    recorded: list[list[Path]] = []
+    monkeypatch.setattr(
+        service, "record_storage", lambda session=None: recorded.append(list(service.dir_data.rglob("*")))
+    )
+
+    async with _client(content) as client:
+        monkeypatch.setattr(recipe_data_service, "get_image_client", lambda: client)
+        await service.scrape_image("https://example.com/image.png")
+
+    # storage is recorded once, after the image is written and the download is gone
+    assert len(recorded) == 1
+    assert not [path for path in recorded[0] if path.suffix == ".download"]
+    assert service.dir_image.joinpath("original.webp").exists()
+
+
+def test_record_storage_uses_the_callers_session(unique_user: TestUser, monkeypatch: pytest.MonkeyPatch):
+    recipe = unique_user.repos.recipes.create(
+        Recipe(
+            name=random_string(),
+            user_id=unique_user.user_id,
+            group_id=unique_user.group_id,
+            household_id=unique_user.household_id,
+        )
+    )
+    assert recipe.id
+
+    def session_context():
+        raise AssertionError("storage was recorded through a second connection")
+
+    monkeypatch.setattr(recipe_data_service, "session_context", session_context)
+
+    service = RecipeDataService(recipe.id)
+    service.write_image(test_data.images_test_image_1.read_bytes(), "jpg", session=unique_user.repos.session)
+
+    size = unique_user.repos.recipes.get_all_storage_bytes()[recipe.id]
+    assert size > 0
+    assert size == service.record_storage(unique_user.repos.session)
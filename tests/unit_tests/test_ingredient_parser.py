@@ -1,5 +1,6 @@
 import asyncio
 import json
+import threading
 from dataclasses import dataclass
 from typing import cast
 from unittest.mock import MagicMock
@@ -28,6 +29,7 @@ from mealie.schema.recipe.recipe_ingredient import (
 from mealie.schema.user.user import GroupBase
 from mealie.services.openai import OpenAIService
 from mealie.services.parser_services import RegisteredParser, get_parser
+from mealie.services.parser_services.openai import OpenAIParser
 from tests.utils.factories import random_int, random_string
 from tests.utils.fixture_schemas import TestUser
 
@@ -226,6 +228,38 @@ def test_brute_parser(
             assert not comment
 
 
+@pytest.mark.asyncio
+async def test_brute_parser_batch_off_event_loop(
+    unique_local_group_id: UUID4,
+    parsed_ingredient_data: tuple[list[IngredientFood], list[IngredientUnit]],  # required so database is populated
+    monkeypatch: pytest.MonkeyPatch,
+):
+    with session_context() as session:
+        parser = get_parser(RegisteredParser.brute, unique_local_group_id, session)
+        parser.data_matcher.load()
+
+    # the foods and units are loaded, so matching no longer needs the session
+    monkeypatch.setattr(parser, "session", None)
+
+    threads: set[int] = set()
+    find_unit_match = parser.data_matcher.find_unit_match
+
+    def record_thread(unit):
+        threads.add(threading.get_ident())
+        return find_unit_match(unit)
+
+    monkeypatch.setattr(parser.data_matcher, "find_unit_match", record_thread)
+
+    items = [item async for item in parser.parse_batch([["1 cup potatoes"], ["2 cups potatoes"]])]
+    assert [item.index for item in items] == [0, 1]
+    for item in items:
+        assert item.ingredients
+        assert isinstance(item.ingredients[0].ingredient.food, IngredientFood)
+
+    assert threads
+    assert threading.get_ident() not in threads
+
+
 @pytest.mark.parametrize(
     "unit, food, expect_unit_match, expect_food_match, expected_avg",
     [
@@ -545,6 +579,65 @@ def test_openai_parser_sanitize_output(
         )
 
 
+def test_openai_parser_batch(
+    unique_local_group_id: UUID4,
+    parsed_ingredient_data: tuple[list[IngredientFood], list[IngredientUnit]],  # required so database is populated
+    monkeypatch: pytest.MonkeyPatch,
+):
+    recipes = [[random_string() for _ in range(3)], [], [random_string()], [random_string() for _ in range(2)]]
+    always_fails = recipes[2][0]
+    sent: list[list[str]] = []
+
+    async def mock_get_raw_response(self, prompt: str, content: list[dict], response_schema) -> MagicMock:
+        ingredients: list[str] = json.loads(content[0]["text"])
+        sent.append(ingredients)
+
+        # drop an ingredient from any chunk containing the failing one, as if the response was cut short
+        data = OpenAIIngredients(
+            ingredients=[OpenAIIngredient(food=text) for text in ingredients if text != always_fails]
+        )
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = data.model_dump_json()
+        mock_response.usage.prompt_tokens = 100
+        mock_response.usage.completion_tokens = 10 * len(ingredients)
+        return mock_response
+
+    monkeypatch.setattr(OpenAIService, "_get_raw_response", mock_get_raw_response)
+    monkeypatch.setattr(OpenAIParser, "BATCH_CHUNK_SIZE", 2)
+
+    async def parse_batch():
+        with session_context() as session:
+            parser = get_parser(RegisteredParser.openai, unique_local_group_id, session)
+            return [item async for item in parser.parse_batch(recipes)]
+
+    loop = asyncio.new_event_loop()
+    try:
+        items = loop.run_until_complete(parse_batch())
+    finally:
+        loop.close()
+
+    # recipes are packed into chunks, and a failed chunk is retried in halves
+    assert sent[:3] == [recipes[0][:2], [recipes[0][2], always_fails], recipes[3]]
+    assert sorted(map(tuple, sent[3:])) == sorted([(recipes[0][2],), (always_fails,), (always_fails,)])
+
+    assert [item.index for item in items] == [0, 1, 2, 3]
+    for item, ingredients in zip(items, recipes, strict=True):
+        if item.index == 2:
+            assert item.error
+            assert not item.ingredients
+        else:
+            assert not item.error
+            assert [ing.input for ing in item.ingredients] == ingredients
+
+    # every request is reported once, with the last recipe it contained
+    assert [(c.ingredients, c.attempt, c.succeeded) for c in items[0].chunks] == [(2, 1, True), (1, 2, True)]
+    assert not items[1].chunks
+    assert [(c.attempt, c.succeeded) for c in items[2].chunks] == [(1, False), (2, False), (3, False)]
+    assert [(c.prompt_tokens, c.completion_tokens) for c in items[3].chunks] == [(100, 20)]
+
+
 @pytest.mark.parametrize(
     "original_text,quantity,unit,food,note,qty_range,unit_range,food_range,note_range",
     [
@@ -0,0 +1,110 @@
+import sqlalchemy as sa
+
+from mealie.db.query_stats import (
+    FULL_SCAN,
+    UNINDEXED_SORT,
+    QueryStatsRecorder,
+    StatementStats,
+    normalize_statement,
+    recommend_indexes,
+)
+
+
+def _metadata() -> sa.MetaData:
+    metadata = sa.MetaData()
+    sa.Table(
+        "items",
+        metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("list_id", sa.Integer, index=True),
+        sa.Column("checked", sa.Boolean),
+        sa.Column("position", sa.Integer),
+    )
+    sa.Table(
+        "lists",
+        metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("group_id", sa.Integer, index=True),
+        sa.Column("name", sa.String),
+    )
+    return metadata
+
+
+def test_normalize_statement():
+    sqlite = normalize_statement("SELECT items.id FROM items\n WHERE items.list_id IN (?, ?, ?) AND items.id = 5")
+    assert sqlite == "SELECT items.id FROM items WHERE items.list_id IN (?...) AND items.id = ?"
+
+    postgres = normalize_statement(
+        "SELECT items.id FROM items WHERE items.list_id IN (%(list_id_1_1)s, %(list_id_1_2)s) LIMIT %(param_1)s"
+    )
+    assert postgres == "SELECT items.id FROM items WHERE items.list_id IN (?...) LIMIT ?"
+
+
+def test_query_stats_recorder():
+    engine = sa.create_engine("sqlite://")
+    metadata = _metadata()
+    metadata.create_all(engine)
+
+    recorder = QueryStatsRecorder(slow_query_ms=0, max_entries=2)
+    recorder.install(engine)
+    with engine.connect() as connection:
+        for list_id in [1, 2]:
+            with recorder.query_shape("items | filter: list_id = ?"):
+                connection.execute(sa.text("SELECT items.id FROM items WHERE items.checked = :checked"), {"checked": 1})
+                connection.execute(sa.text("SELECT lists.id FROM lists WHERE lists.id = :id"), {"id": list_id})
+
+        # only two distinct statements are tracked
+        connection.execute(sa.text("SELECT lists.name FROM lists"))
+    recorder.uninstall(engine)
+
+    shape = recorder.top_shapes()[0]
+    assert (shape.requests, shape.statements) == (2, 4)
+    assert recorder.dropped == 1
+
+    statements = {stats.template: stats for stats in recorder.top_statements()}
+    items_stats = statements["SELECT items.id FROM items WHERE items.checked = ?"]
+    assert items_stats.calls == 2
+    assert items_stats.query_shapes == {"items | filter: list_id = ?"}
+    assert items_stats.plan == ["SCAN items"]
+
+    [recommendation] = recorder.recommend_indexes(metadata)
+    assert (recommendation.table, recommendation.columns) == ("items", ["checked"])
+
+
+def test_recommend_indexes():
+    metadata = _metadata()
+    statements = [
+        StatementStats(
+            template=(
+                "SELECT items.id FROM items JOIN lists ON lists.id = items.list_id "
+                "WHERE items.checked = ? AND lists.group_id = ? ORDER BY items.position"
+            ),
+            total_ms=10,
+            plan=["SEARCH lists USING INDEX ix_lists_group_id (group_id=?)", "SCAN items"],
+        ),
+        StatementStats(
+            template="SELECT lists.id FROM lists WHERE lists.group_id = ? ORDER BY lists.name LIMIT ?",
+            total_ms=20,
+            plan=["SEARCH lists USING INDEX ix_lists_group_id (group_id=?)", "USE TEMP B-TREE FOR ORDER BY"],
+        ),
+        # the primary key already covers this lookup
+        StatementStats(
+            template="SELECT lists.id FROM lists WHERE lists.id = ? AND lists.name = ?",
+            total_ms=30,
+            plan=["SCAN lists"],
+        ),
+        # plans from Postgres are read too
+        StatementStats(
+            template="SELECT items.id FROM items WHERE items.list_id = ? ORDER BY items.position",
+            total_ms=5,
+            plan=["Sort  (cost=1.02..1.03 rows=1 width=16)", "  Sort Key: items.position"],
+        ),
+    ]
+
+    recommendations = recommend_indexes(statements, metadata)
+    assert [(r.table, r.columns, r.reason) for r in recommendations] == [
+        ("lists", ["group_id", "name"], UNINDEXED_SORT),
+        ("items", ["list_id", "checked", "position"], FULL_SCAN),
+        ("items", ["list_id", "position"], UNINDEXED_SORT),
+    ]
+    assert recommendations[0].ddl == "CREATE INDEX ix_lists_group_id_name ON lists (group_id, name)"
@@ -13,6 +13,8 @@ admin_backups_upload = "/api/admin/backups/upload"
 """`/api/admin/backups/upload`"""
 admin_debug_openai = "/api/admin/debug/openai"
 """`/api/admin/debug/openai`"""
+admin_debug_query_stats = "/api/admin/debug/query-stats"
+"""`/api/admin/debug/query-stats`"""
 admin_email = "/api/admin/email"
 """`/api/admin/email`"""
 admin_groups = "/api/admin/groups"
@@ -55,8 +57,14 @@ comments = "/api/comments"
 """`/api/comments`"""
 foods = "/api/foods"
 """`/api/foods`"""
+foods_duplicates = "/api/foods/duplicates"
+"""`/api/foods/duplicates`"""
+foods_duplicates_merge = "/api/foods/duplicates/merge"
+"""`/api/foods/duplicates/merge`"""
 foods_merge = "/api/foods/merge"
 """`/api/foods/merge`"""
+foods_merge_bulk = "/api/foods/merge/bulk"
+"""`/api/foods/merge/bulk`"""
 groups_households = "/api/groups/households"
 """`/api/groups/households`"""
 groups_labels = "/api/groups/labels"
@@ -83,6 +91,8 @@ households_cookbooks = "/api/households/cookbooks"
 """`/api/households/cookbooks`"""
 households_events_notifications = "/api/households/events/notifications"
 """`/api/households/events/notifications`"""
+households_events_stream = "/api/households/events/stream"
+"""`/api/households/events/stream`"""
 households_invitations = "/api/households/invitations"
 """`/api/households/invitations`"""
 households_invitations_email = "/api/households/invitations/email"
@@ -91,6 +101,8 @@ households_mealplans = "/api/households/mealplans"
 """`/api/households/mealplans`"""
 households_mealplans_random = "/api/households/mealplans/random"
 """`/api/households/mealplans/random`"""
+households_mealplans_random_bulk = "/api/households/mealplans/random/bulk"
+"""`/api/households/mealplans/random/bulk`"""
 households_mealplans_rules = "/api/households/mealplans/rules"
 """`/api/households/mealplans/rules`"""
 households_mealplans_today = "/api/households/mealplans/today"
@@ -133,6 +145,8 @@ parser_ingredient = "/api/parser/ingredient"
 """`/api/parser/ingredient`"""
 parser_ingredients = "/api/parser/ingredients"
 """`/api/parser/ingredients`"""
+parser_ingredients_batch = "/api/parser/ingredients/batch"
+"""`/api/parser/ingredients/batch`"""
 recipes = "/api/recipes"
 """`/api/recipes`"""
 recipes_bulk_actions_categorize = "/api/recipes/bulk-actions/categorize"
@@ -169,8 +183,14 @@ shared_recipes = "/api/shared/recipes"
 """`/api/shared/recipes`"""
 units = "/api/units"
 """`/api/units`"""
+units_duplicates = "/api/units/duplicates"
+"""`/api/units/duplicates`"""
+units_duplicates_merge = "/api/units/duplicates/merge"
+"""`/api/units/duplicates/merge`"""
 units_merge = "/api/units/merge"
 """`/api/units/merge`"""
+units_merge_bulk = "/api/units/merge/bulk"
+"""`/api/units/merge/bulk`"""
 users_api_tokens = "/api/users/api-tokens"
 """`/api/users/api-tokens`"""
 users_forgot_password = "/api/users/forgot-password"
@@ -381,6 +401,11 @@ def households_shopping_lists_item_id(item_id):
     return f"{prefix}/households/shopping/lists/{item_id}"
 
 
+def households_shopping_lists_item_id_changes(item_id):
+    """`/api/households/shopping/lists/{item_id}/changes`"""
+    return f"{prefix}/households/shopping/lists/{item_id}/changes"
+
+
 def households_shopping_lists_item_id_label_settings(item_id):
     """`/api/households/shopping/lists/{item_id}/label-settings`"""
     return f"{prefix}/households/shopping/lists/{item_id}/label-settings"
@@ -391,6 +416,11 @@ def households_shopping_lists_item_id_recipe(item_id):
     return f"{prefix}/households/shopping/lists/{item_id}/recipe"
 
 
+def households_shopping_lists_item_id_recipe_delta(item_id):
+    """`/api/households/shopping/lists/{item_id}/recipe/delta`"""
+    return f"{prefix}/households/shopping/lists/{item_id}/recipe/delta"
+
+
 def households_shopping_lists_item_id_recipe_recipe_id(item_id, recipe_id):
     """`/api/households/shopping/lists/{item_id}/recipe/{recipe_id}`"""
     return f"{prefix}/households/shopping/lists/{item_id}/recipe/{recipe_id}"
@@ -401,6 +431,11 @@ def households_shopping_lists_item_id_recipe_recipe_id_delete(item_id, recipe_id
     return f"{prefix}/households/shopping/lists/{item_id}/recipe/{recipe_id}/delete"
 
 
+def households_shopping_lists_item_id_recipe_recipe_id_delete_delta(item_id, recipe_id):
+    """`/api/households/shopping/lists/{item_id}/recipe/{recipe_id}/delete/delta`"""
+    return f"{prefix}/households/shopping/lists/{item_id}/recipe/{recipe_id}/delete/delta"
+
+
 def households_webhooks_item_id(item_id):
     """`/api/households/webhooks/{item_id}`"""
     return f"{prefix}/households/webhooks/{item_id}"